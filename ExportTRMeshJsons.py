@@ -14,14 +14,11 @@ bl_info = {
 # credits for trmsh/trmbf exporting go to @mv at Pokémon Switch Modding Discord Server
 
 import re
-import os, json, struct, subprocess, bpy
+import os, json, struct, bpy
+import numpy as np
 from statistics import mean
 from mathutils import Vector, Euler
-
-if hasattr(os.environ, "FLATC_PATH"):
-    FLATC_PATH = os.environ["FLATC_PATH"]
-else:
-    FLATC_PATH = "YOUR PATH TO FLATC.EXE HERE"
+from FlatBufferWriter import FlatBuilder
 
 TRMSH = ".trmsh"
 TRSKL = ".trskl"
@@ -45,7 +42,168 @@ def get_poly_count_for_mat(obj, material_name):
     return polyCount
 
 
-def get_mesh_data(context, obj, settings):
+def vertex_dtype(settings):
+    """The vertex layout get_mesh_data describes, as a NumPy record."""
+    fields = [("position", "<f4", 3)]
+    if settings["normal"] == 1:
+        fields.append(("normal", "<f2", 4))
+    if settings["tangent"] == 1:
+        fields.append(("tangent", "<f2", 4))
+    if settings["uv"] == 1:
+        fields.append(("uv", "<f4", 2))
+    if settings["skinning"] == 1:
+        fields.append(("blend_indices", "u1", 4))
+        fields.append(("blend_weights", "<u2", 4))
+    return np.dtype(fields)
+
+
+def index_format(vert_count):
+    """The polygon type and index dtype needed for a vertex count."""
+    if vert_count <= 0x10000:
+        return "UINT16", "<u2"
+    return "UINT32", "<u4"
+
+
+def foreach_array(collection, name, size, dtype=np.float32):
+    values = np.empty(len(collection) * size, dtype=dtype)
+    collection.foreach_get(name, values)
+    return values.reshape(-1, size) if size > 1 else values
+
+
+# Post-transform cache entries the optimizer plans for.
+CACHE_SIZE = 32
+
+
+def cache_stats(polys, cache_size=CACHE_SIZE):
+    """ACMR and ATVR of an index buffer on a FIFO post-transform cache."""
+    if len(polys) == 0:
+        return 0.0, 0.0
+    added = {}
+    misses = 0
+    for v in polys.ravel().tolist():
+        if misses - added.get(v, -cache_size - 1) > cache_size:
+            added[v] = misses
+            misses += 1
+    return misses / len(polys), misses / len(added)
+
+
+def tipsify(polys, cache_size=CACHE_SIZE):
+    """Triangle order for the vertex cache, after Sander et al.'s Tipsify.
+
+    Fans around one vertex at a time and moves on to the neighbour that is
+    still in the cache and has the fewest triangles left. Returns the
+    triangle order and the triangles where it had to jump elsewhere.
+    """
+    vert_ids, local = np.unique(polys, return_inverse=True)
+    local = local.reshape(-1, 3)
+    vert_count = len(vert_ids)
+    flat = local.ravel()
+    uses = np.bincount(flat, minlength=vert_count)
+    adj_start = np.concatenate(([0], np.cumsum(uses))).tolist()
+    adj_tris = (np.argsort(flat, kind="stable") // 3).tolist()
+    live = uses.tolist()
+    tris = local.tolist()
+    added = [-cache_size - 1] * vert_count
+    emitted = [False] * len(tris)
+    order = []
+    jumps = []
+    dead_ends = []
+    time = 0
+    cursor = 0
+    fan = 0
+    while fan >= 0:
+        ring = []
+        for t in adj_tris[adj_start[fan] : adj_start[fan + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = True
+            order.append(t)
+            for v in tris[t]:
+                dead_ends.append(v)
+                ring.append(v)
+                live[v] -= 1
+                if time - added[v] > cache_size:
+                    added[v] = time
+                    time += 1
+
+        # The neighbour that stays in the cache while its fan is drawn.
+        fan = -1
+        best = -1
+        for v in ring:
+            if live[v] > 0:
+                age = time - added[v]
+                priority = age if age + 2 * live[v] <= cache_size else 0
+                if priority > best:
+                    best = priority
+                    fan = v
+        if fan >= 0:
+            continue
+        while dead_ends and fan < 0:
+            v = dead_ends.pop()
+            if live[v] > 0:
+                fan = v
+        while fan < 0 and cursor < vert_count:
+            if live[cursor] > 0:
+                fan = cursor
+            cursor += 1
+        if fan >= 0:
+            jumps.append(len(order))
+    return np.array(order, dtype=np.int64), jumps
+
+
+def sort_clusters(polys, order, jumps, positions):
+    """Draws the outward facing parts of a range first, to cut overdraw.
+
+    The Tipsify order gets cut into clusters where it jumped, and the
+    clusters are sorted by how far out along their normal they sit.
+    """
+    tris = positions[polys[order]]
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    centers = tris.mean(axis=1)
+    mesh_center = centers.mean(axis=0)
+    clusters = np.split(np.arange(len(order)), jumps)
+    facing = []
+    for cluster in clusters:
+        normal = normals[cluster].sum(axis=0)
+        length = np.linalg.norm(normal)
+        if length > 0:
+            normal /= length
+        facing.append(np.dot(centers[cluster].mean(axis=0) - mesh_center, normal))
+    sorted_clusters = [clusters[i] for i in np.argsort(facing, kind="stable")[::-1]]
+    return order[np.concatenate(sorted_clusters)]
+
+
+def optimize_index_order(name, polys, verts, range_counts, overdraw):
+    """Reorders each material range's triangles, then the vertices to match."""
+    acmr, atvr = cache_stats(polys)
+    ranges = np.split(polys, np.cumsum(range_counts)[:-1])
+    optimized = []
+    for range_polys in ranges:
+        if len(range_polys) == 0:
+            continue
+        order, jumps = tipsify(range_polys)
+        if overdraw:
+            order = sort_clusters(range_polys, order, jumps, verts["position"])
+        optimized.append(range_polys[order])
+    polys = np.concatenate(optimized)
+
+    # Vertices in the order the triangles first use them.
+    used, first = np.unique(polys, return_index=True)
+    fetch_order = used[np.argsort(first)]
+    remap = np.empty(len(verts), dtype=np.int64)
+    remap[fetch_order] = np.arange(len(fetch_order))
+    polys = remap[polys]
+    verts = verts[fetch_order]
+
+    new_acmr, new_atvr = cache_stats(polys)
+    print(
+        f"{name}: ACMR {acmr:.3f} -> {new_acmr:.3f}, "
+        f"ATVR {atvr:.3f} -> {new_atvr:.3f}"
+    )
+    return polys, verts
+
+
+def get_mesh_data(context, obj, settings, vert_count):
     if obj.type != "MESH":
         return -1
 
@@ -212,7 +370,7 @@ def get_mesh_data(context, obj, settings):
     mesh = {
         "mesh_shape_name": re.sub(r'^[\d*] ','',obj.name),
         "bounds": bbox,
-        "polygon_type": "UINT16",
+        "polygon_type": index_format(vert_count)[0],
         "attributes": attributes,
         "materials": materials,
         "clip_sphere": clip_sphere,
@@ -237,11 +395,6 @@ def get_buffer_data(context, obj, settings, armature):
     mesh = obj.data
     mesh.calc_tangents()
 
-    vert_data = [None] * len(mesh.vertices)
-    poly_data = []
-
-    material_data = []
-
     bone_dict = {}
 
     if settings["armature"]:
@@ -261,93 +414,92 @@ def get_buffer_data(context, obj, settings, armature):
     # if settings["uv"] == 1:
     # uv = mesh.uv_layers.active.data
 
-    for poly in mesh.polygons:
-        pol = []
-        for loop_index in poly.loop_indices:
-            vert_d = []
-
-            loop = mesh.loops[loop_index]
-            vidx = loop.vertex_index
-            pol.append(loop.vertex_index)
-
-            vert = mesh.vertices[vidx]
-            pos = (vert.co[0], vert.co[1], vert.co[2])
-            vert_d.append(pos)
-
-            if settings["normal"] == 1:
-                nor = (loop.normal[0], loop.normal[1], loop.normal[2])
-                vert_d.append(nor)
-            if settings["tangent"] == 1:
-                tan = (loop.tangent[0], loop.tangent[1], loop.tangent[2])
-                vert_d.append(tan)
-            if settings["uv"] == 1:
-                tex = (uv[loop_index].uv[0], uv[loop_index].uv[1])
-                vert_d.append(tex)
-
-            if settings["skinning"] == 1:
-                grp = []
-
-                for gp in vert.groups:
-                    group_name = obj.vertex_groups[gp.group].name
-                    if group_name in bone_dict:
-                        bone_id = bone_dict[group_name]
-                        print("Bone ID:", bone_id)
-                        grp.append((bone_id, gp.weight))
-                    else:
-                        print("Bone not found.")
-
-                while len(grp) < 4:
-                    grp.append((0, 0.0))
-
-                grp = grp[0:4]
-                vert_d.append(grp)
-
-            vert_data[vidx] = vert_d
-        poly_data.append(pol)
-
-    ## Write poly bytes
-    ## TODO: make it possible later for different polytypes
-    poly_bytes = b""
-
-    for poly in poly_data:
-        poly_bytes += polyFormat.pack(poly[0], poly[1], poly[2])
-
-    ## Write vert bytes
+    # Polygons grouped by material, in the order get_mesh_data lists them.
+    material_ids = foreach_array(mesh.polygons, "material_index", 1, np.int64)
+    poly_order = np.argsort(material_ids, kind="stable")
+    range_counts = np.bincount(material_ids)
+    range_counts = range_counts[range_counts > 0]
+    loop_starts = foreach_array(mesh.polygons, "loop_start", 1, np.int64)[poly_order]
+    loop_totals = foreach_array(mesh.polygons, "loop_total", 1, np.int64)[poly_order]
+    loop_verts = foreach_array(mesh.loops, "vertex_index", 1, np.int64)
+
+    # Loops in the order the polygons visit them.
+    loop_offsets = loop_starts - np.cumsum(loop_totals) + loop_totals
+    loop_order = np.repeat(loop_offsets, loop_totals) + np.arange(loop_totals.sum())
+    corner_verts = loop_verts[loop_order]
+
+    ## One packed vertex per corner, welded back together below
     ## TODO: make it possible later for using different presets
     ## Such as extra UVs for Buildings, extra vertex colors, etc.
-    vert_bytes = b""
+    corners = np.zeros(len(loop_order), dtype=vertex_dtype(settings))
+    corners["position"] = foreach_array(mesh.vertices, "co", 3)[corner_verts]
 
-    for vert in vert_data:
-        cursor = 0
-        co = vert[cursor]
-        vert_bytes += vertFormat.pack(co[0], co[1], co[2])
-        cursor += 1
+    if settings["normal"] == 1:
+        normals = foreach_array(mesh.loops, "normal", 3)
+        corners["normal"][:, :3] = normals[loop_order]
 
-        if settings["normal"] == 1:
-            norm = vert[cursor]
-            vert_bytes += normFormat.pack(norm[0], norm[1], norm[2], 0.0)
-            cursor += 1
+    if settings["tangent"] == 1:
+        tangents = foreach_array(mesh.loops, "tangent", 3)
+        corners["tangent"][:, :3] = tangents[loop_order]
 
-        if settings["tangent"] == 1:
-            tan = vert[cursor]
-            vert_bytes += normFormat.pack(tan[0], tan[1], tan[2], 0.0)
-            cursor += 1
+    if settings["uv"] == 1:
+        corners["uv"] = foreach_array(uv, "uv", 2)[loop_order]
 
-        if settings["uv"] == 1:
-            tex = vert[cursor]
-            vert_bytes += uvFormat.pack(tex[0], tex[1])
-            cursor += 1
+    if settings["skinning"] == 1:
+        group_bones = [bone_dict.get(group.name) for group in obj.vertex_groups]
+        missing = set()
+        blend_indices = []
+        blend_weights = []
+        for vert in mesh.vertices:
+            grp = []
+            for gp in vert.groups:
+                bone_id = group_bones[gp.group]
+                if bone_id is not None:
+                    grp.append((bone_id, gp.weight))
+                else:
+                    missing.add(obj.vertex_groups[gp.group].name)
+
+            while len(grp) < 4:
+                grp.append((0, 0.0))
+
+            for bone_id, weight in grp[0:4]:
+                blend_indices.append(bone_id)
+                blend_weights.append(weight)
+
+        if missing:
+            print("Bones not found:", ", ".join(sorted(missing)))
+        blend_indices = np.array(blend_indices, dtype=np.uint8).reshape(-1, 4)
+        weights = np.array(blend_weights, dtype=np.float64).reshape(-1, 4)
+        blend_weights = (weights * 0xFFFF).astype(np.uint16)
+        corners["blend_indices"] = blend_indices[corner_verts]
+        corners["blend_weights"] = blend_weights[corner_verts]
+
+    # Corners whose packed bytes match become one vertex, so UV seams and hard
+    # edges split and nothing else does. Vertices keep the order of first use.
+    rows = corners.view(np.dtype((np.void, corners.dtype.itemsize)))
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    first_use = np.argsort(first)
+    remap = np.empty_like(first_use)
+    remap[first_use] = np.arange(len(first_use))
+    corner_ids = remap[inverse.reshape(-1)]
+    verts = corners[first[first_use]]
 
-        if settings["skinning"] == 1:
-            grps = list([x[0] for x in vert[cursor]])
-            vert_bytes += mtFormat.pack(grps[0], grps[1], grps[2], grps[3])
+    ## Write poly bytes
+    ## TODO: make it possible later for different polytypes
+    corner_starts = np.cumsum(loop_totals) - loop_totals
+    polys = corner_ids[corner_starts[:, None] + np.arange(3)]
+    if settings["optimize_cache"] == 1 and len(polys) > 0:
+        polys, verts = optimize_index_order(
+            obj.name, polys, verts, range_counts, settings["optimize_overdraw"]
+        )
+    poly_bytes = polys.astype(index_format(len(verts))[1]).tobytes()
 
-            wgts = list([int(x[1] * 0xFFFF) for x in vert[cursor]])
-            vert_bytes += wtFormat.pack(wgts[0], wgts[1], wgts[2], wgts[3])
+    ## Write vert bytes
+    vert_bytes = verts.tobytes()
 
     data = {
-        "index_buffer": [{"buffer": list(poly_bytes)}],
-        "vertex_buffer": [{"buffer": list(vert_bytes)}],
+        "index_buffer": [{"buffer": poly_bytes}],
+        "vertex_buffer": [{"buffer": vert_bytes}],
         "morphs": [],
     }
 
@@ -422,14 +574,16 @@ def get_model_data(collection_name, armature_name, meshes, array, settings):
     export_model = {
         "unk0": 0,
         "meshes": [
-            {"filename": collection_name + TRMSH},
-            {"filename": collection_name + "_lod1" + TRMSH},
-            {"filename": collection_name + "_lod2" + TRMSH},
+            {"filename": collection_name + lod_suffix(lod) + TRMSH}
+            for lod in range(settings["lod_count"])
         ],
         "skeleton": [],
         "materials": [collection_name + ".trmtr"],
         "lods": [
-            {"index": [{"unk0": 0}, {"unk0": 1}, {"unk0": 2}], "lod_type": "Custom"}
+            {
+                "index": [{"unk0": lod} for lod in range(settings["lod_count"])],
+                "lod_type": "Custom",
+            }
         ],
         "bounds": find_bounds(meshes),
         "texture_space": {
@@ -452,14 +606,70 @@ def get_model_data(collection_name, armature_name, meshes, array, settings):
     return export_model
 
 
+def lod_suffix(lod):
+    return f"_lod{lod}" if lod > 0 else ""
+
+
+def get_lod_data(context, obj, settings, armature, lod, ratio, lod0_mesh):
+    """Buffer and mesh data of a decimated copy of obj.
+
+    Collapse decimation interpolates the UVs and the vertex group weights of
+    the vertices it merges. The other modifiers are off while it runs so the
+    LOD matches the unposed mesh LOD0 is exported from.
+    """
+    hidden = [m for m in obj.modifiers if m.show_viewport]
+    for modifier in hidden:
+        modifier.show_viewport = False
+    decimate = obj.modifiers.new("TRMSH LOD", "DECIMATE")
+    decimate.decimate_type = "COLLAPSE"
+    decimate.ratio = ratio
+    decimate.use_collapse_triangulate = True
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        lod_mesh = bpy.data.meshes.new_from_object(
+            obj.evaluated_get(depsgraph),
+            preserve_all_data_layers=True,
+            depsgraph=depsgraph,
+        )
+    finally:
+        obj.modifiers.remove(decimate)
+        for modifier in hidden:
+            modifier.show_viewport = True
+
+    lod_obj = bpy.data.objects.new(obj.name + lod_suffix(lod), lod_mesh)
+    # Same groups in the same order, the mesh's weights point at them by index.
+    # Blender 3.0+ keeps the group names on the mesh, so the copy has them
+    # already and adding them again would duplicate them.
+    if not lod_obj.vertex_groups:
+        for group in obj.vertex_groups:
+            lod_obj.vertex_groups.new(name=group.name)
+    print(
+        f"{obj.name} LOD{lod}: {len(lod_mesh.polygons)} of "
+        f"{len(obj.data.polygons)} polygons"
+    )
+    try:
+        buffer = get_buffer_data(context, lod_obj, settings, armature)
+        vert_size = vertex_dtype(settings).itemsize
+        vert_count = len(buffer["vertex_buffer"][0]["buffer"]) // vert_size
+        mesh = get_mesh_data(context, lod_obj, settings, vert_count)
+    finally:
+        bpy.data.objects.remove(lod_obj)
+        bpy.data.meshes.remove(lod_mesh)
+
+    # The copy isn't in the scene, so it has no bounds of its own.
+    for key in ("mesh_shape_name", "mesh_name", "bounds", "clip_sphere"):
+        mesh[key] = lod0_mesh[key]
+    return buffer, mesh
+
+
 ### Blender Integration ###
 from bpy_extras.io_utils import ExportHelper
-from bpy.props import StringProperty, BoolProperty, IntProperty
+from bpy.props import StringProperty, BoolProperty, IntProperty, FloatProperty
 from bpy.types import Operator
 
 
 class ExportTRMeshJsons(Operator, ExportHelper):
-    """Saves TRMDL, TRMSH and TRMBF JSONs for Pokémon Scarlet and Violet."""
+    """Saves TRMDL, TRMSH and TRMBF files for Pokémon Scarlet and Violet."""
 
     bl_idname = "pokemonswitch.exporttrmesh"  # important since its how bpy.ops.import_test.some_data is constructed
     bl_label = "Export Here"
@@ -509,6 +719,40 @@ class ExportTRMeshJsons(Operator, ExportHelper):
         name="Use Skinning",
         default=True,
     )
+    optimize_cache: BoolProperty(
+        name="Optimize Vertex Cache",
+        description="Reorder triangles and vertices for the GPU's vertex cache",
+        default=True,
+    )
+    optimize_overdraw: BoolProperty(
+        name="Optimize Overdraw",
+        description="Also draw the outward facing parts of each material first",
+        default=False,
+    )
+    generate_lods: BoolProperty(
+        name="Generate LODs",
+        description="Write decimated LOD1 and LOD2 meshes next to the full one",
+        default=True,
+    )
+    lod1_ratio: FloatProperty(
+        name="LOD1 Ratio",
+        description="Share of the polygons LOD1 keeps",
+        default=0.5,
+        min=0.01,
+        max=1.0,
+    )
+    lod2_ratio: FloatProperty(
+        name="LOD2 Ratio",
+        description="Share of the polygons LOD2 keeps",
+        default=0.25,
+        min=0.01,
+        max=1.0,
+    )
+    write_json: BoolProperty(
+        name="Write JSONs",
+        description="Also save the files as JSON, for debugging",
+        default=False,
+    )
 
     def execute(self, context):
         objs = []
@@ -551,77 +795,194 @@ class ExportTRMeshJsons(Operator, ExportHelper):
             "color": self.use_color,
             "color_count": self.color_count,
             "skinning": self.use_skinning,
+            "optimize_cache": self.optimize_cache,
+            "optimize_overdraw": self.optimize_overdraw,
         }
+        lod_ratios = [1.0]
+        if self.generate_lods:
+            lod_ratios += [self.lod1_ratio, self.lod2_ratio]
+        export_settings["lod_count"] = len(lod_ratios)
         collection_name = collections[0]
-        buffers = []
+        vert_size = vertex_dtype(export_settings).itemsize
+        files = []
+        # LOD0's meshes, the decimated LODs copy their names and bounds.
         meshes = []
-        for obj in objs:
-            buffers.append(
-                get_buffer_data(context, obj, export_settings, obj.find_armature())
-            )
-            meshes.append(get_mesh_data(context, obj, export_settings))
-        export_buffers = {
-            "unused": 0,
-            "buffers": buffers,
-        }
-        export_meshes = {
-            "unk0": 0,
-            "meshes": meshes,
-            "buffer_name": collection_name + TRMBF,
-        }
+        for lod, ratio in enumerate(lod_ratios):
+            buffers = []
+            lod_meshes = []
+            for index, obj in enumerate(objs):
+                armature = obj.find_armature()
+                if lod == 0:
+                    buffer = get_buffer_data(context, obj, export_settings, armature)
+                    vert_count = len(buffer["vertex_buffer"][0]["buffer"]) // vert_size
+                    mesh = get_mesh_data(context, obj, export_settings, vert_count)
+                else:
+                    buffer, mesh = get_lod_data(
+                        context,
+                        obj,
+                        export_settings,
+                        armature,
+                        lod,
+                        ratio,
+                        meshes[index],
+                    )
+                buffers.append(buffer)
+                lod_meshes.append(mesh)
+            if lod == 0:
+                meshes = lod_meshes
+            name = collection_name + lod_suffix(lod)
+            export_meshes = {
+                "unk0": 0,
+                "meshes": lod_meshes,
+                "buffer_name": name + TRMBF,
+            }
+            export_buffers = {
+                "unused": 0,
+                "buffers": buffers,
+            }
+            files.append((export_meshes, name + TRMSH, TRMSH_SCHEMA))
+            files.append((export_buffers, name + TRMBF, TRMBF_SCHEMA))
+
         export_model = get_model_data(
             collection_name, armatures[0], meshes, objs, export_settings
         )
-        meshes_filepath = os.path.join(
-            dest_dir, collection_name + TRMSH + self.filename_ext
-        )
-        with open(meshes_filepath, "w", encoding="utf-8") as f:
-            f.write(json.dumps(export_meshes, indent=2))
-        buffers_filepath = os.path.join(
-            dest_dir, collection_name + TRMBF + self.filename_ext
-        )
-        with open(buffers_filepath, "w", encoding="utf-8") as f:
-            f.write(json.dumps(export_buffers, indent=2))
-        model_filepath = os.path.join(
-            dest_dir, collection_name + TRMDL + self.filename_ext
-        )
-        with open(model_filepath, "w", encoding="utf-8") as f:
-            f.write(json.dumps(export_model, indent=2))
-
-        to_binary(meshes_filepath, TRMSH)
-        to_binary(buffers_filepath, TRMBF)
-        to_binary(model_filepath, TRMDL)
+        files.append((export_model, collection_name + TRMDL, TRMDL_SCHEMA))
+
+        if self.write_json:
+            for export_data, filename, schema in files:
+                json_filepath = os.path.join(dest_dir, filename + self.filename_ext)
+                with open(json_filepath, "w", encoding="utf-8") as f:
+                    # Buffers are bytes, written out as one number per byte.
+                    f.write(json.dumps(export_data, indent=2, default=list))
+
+        # Where flatc used to put them.
+        out_dir = os.path.join(dest_dir, "Modded")
+        os.makedirs(out_dir, exist_ok=True)
+        for export_data, filename, schema in files:
+            if schema is TRMDL_SCHEMA:
+                export_data = trmdl_binary_data(export_data)
+            filepath = os.path.join(out_dir, filename)
+            with open(filepath, "wb") as f:
+                f.write(FlatBuilder().finish(export_data, schema))
+            print(f"Saved '{filepath}'.")
         return {"FINISHED"}
 
 
-def to_binary(filepath, fileext):
-    filetype = fileext.strip(".")
-    schema_dir = os.path.dirname(FLATC_PATH) + f"\\Schemas\\Filetypes\\{filetype}.fbs"
-    flatc_call = [
-        FLATC_PATH,
-        "--filename-ext",
-        filetype,
-        "-o",
-        os.path.dirname(filepath) + "\\Modded\\",
-        "-b",
-        schema_dir,
-        filepath,
-    ]
-    print(flatc_call)
-    result = subprocess.run(flatc_call, check=True)
-    if isinstance(result, subprocess.CalledProcessError):
-        print(f"Failed to convert '{filepath}' to binary.")
-    else:
-        output_file = os.path.realpath(os.path.dirname(filepath) + 
-        "\\Modded\\" + 
-        os.path.basename(filepath).strip(".json") +
-        fileext 
-        )
-        if os.path.exists(output_file):
-            rename_call = ["powershell.exe", "-Command", 
-            f"Move-Item '{output_file}' '{output_file.removesuffix(fileext)}' -Force"]
-            subprocess.run(rename_call, check=True)
-        print(f"Successfully converted '{filepath}' to binary.")
+def trmdl_binary_data(export_model):
+    # The JSON lists the skeleton, in the file it's a single filename table.
+    skeleton = None
+    if export_model["skeleton"]:
+        skeleton = {"filename": export_model["skeleton"][0]}
+    return {**export_model, "skeleton": skeleton}
+
+
+# Layouts of the TR* tables, fields in vtable order as (name, type). Types are
+# scalars, ("enum", names), ("struct", format, keys), ("table", layout),
+# ("vector", type) or "string".
+VEC3 = ("struct", "<3f", ("x", "y", "z"))
+VEC4 = ("struct", "<4f", ("x", "y", "z", "w"))
+SPHERE = ("struct", "<4f", ("x", "y", "z", "radius"))
+BOUNDS = (
+    "struct",
+    "<6f",
+    ("min.x", "min.y", "min.z", "max.x", "max.y", "max.z"),
+)
+
+POLYGON_TYPES = {"UINT8": 0, "UINT16": 1, "UINT32": 2, "UINT64": 3}
+VERTEX_ATTRIBUTES = {
+    "NONE": 0,
+    "POSITION": 1,
+    "NORMAL": 2,
+    "TANGENT": 3,
+    "BINORMAL": 4,
+    "COLOR": 5,
+    "TEXCOORD": 6,
+    "BLEND_INDICES": 7,
+    "BLEND_WEIGHTS": 8,
+}
+VERTEX_TYPES = {
+    "NONE": 0,
+    "RGBA_8_UNORM": 0x14,
+    "RGBA_8_UNSIGNED": 0x16,
+    "R_32_UINT": 0x24,
+    "R_32_INT": 0x25,
+    "RGBA_16_UNORM": 0x27,
+    "RGBA_16_FLOAT": 0x2B,
+    "RG_32_FLOAT": 0x30,
+    "RGB_32_FLOAT": 0x33,
+    "RGBA_32_FLOAT": 0x36,
+}
+
+TRMSH_ATTRIBUTE = (
+    ("attr_0", "uint"),
+    ("attribute", ("enum", VERTEX_ATTRIBUTES)),
+    ("attribute_layer", "uint"),
+    ("type", ("enum", VERTEX_TYPES)),
+    ("position", "uint"),
+)
+TRMSH_ATTRIBUTES = (
+    ("attrs", ("vector", ("table", TRMSH_ATTRIBUTE))),
+    ("size", ("vector", ("table", (("size", "uint"),)))),
+)
+TRMSH_MATERIAL = (
+    ("poly_count", "uint"),
+    ("poly_offset", "uint"),
+    ("sh_unk3", "uint"),
+    ("material_name", "string"),
+    ("sh_unk4", "uint"),
+)
+TRMSH_MESH = (
+    ("mesh_shape_name", "string"),
+    ("bounds", BOUNDS),
+    ("polygon_type", ("enum", POLYGON_TYPES)),
+    ("attributes", ("vector", ("table", TRMSH_ATTRIBUTES))),
+    ("materials", ("vector", ("table", TRMSH_MATERIAL))),
+    ("res0", "uint"),
+    ("res1", "uint"),
+    ("res2", "uint"),
+    ("res3", "uint"),
+    ("clip_sphere", SPHERE),
+    ("influence", ("vector", ("table", (("index", "uint"), ("scale", "float"))))),
+    ("vis_shapes", ("vector", ("table", (("index", "int"), ("name", "string"))))),
+    ("mesh_name", "string"),
+    ("unk13", "uint"),
+    # Never filled in by this exporter.
+    ("morph_shape", ("vector", ("table", ()))),
+)
+TRMSH_SCHEMA = (
+    ("unk0", "uint"),
+    ("meshes", ("vector", ("table", TRMSH_MESH))),
+    ("buffer_name", "string"),
+)
+
+TRMBF_BYTES = (("buffer", ("vector", "ubyte")),)
+TRMBF_BUFFER = (
+    ("index_buffer", ("vector", ("table", TRMBF_BYTES))),
+    ("vertex_buffer", ("vector", ("table", TRMBF_BYTES))),
+    ("morphs", ("vector", ("table", TRMBF_BYTES))),
+)
+TRMBF_SCHEMA = (
+    ("unused", "uint"),
+    ("buffers", ("vector", ("table", TRMBF_BUFFER))),
+)
+
+TRMDL_FILENAME = (("filename", "string"),)
+TRMDL_LOD = (
+    ("index", ("vector", ("table", (("unk0", "uint"),)))),
+    ("lod_type", "string"),
+)
+TRMDL_SCHEMA = (
+    ("unk0", "uint"),
+    ("meshes", ("vector", ("table", TRMDL_FILENAME))),
+    ("skeleton", ("table", TRMDL_FILENAME)),
+    ("materials", ("vector", "string")),
+    ("lods", ("vector", ("table", TRMDL_LOD))),
+    ("bounds", BOUNDS),
+    ("texture_space", VEC4),
+    ("unk7", "uint"),
+    ("unk8", "uint"),
+    ("unk9", "uint"),
+)
 
 
 def ExportTRMesh_menu_func_export(self, context):
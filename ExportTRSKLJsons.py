@@ -9,15 +9,11 @@ bl_info = {
     "category": "Export",
 }
 
-import os, bpy, json, subprocess
+import os, bpy, json
 from bpy_extras.io_utils import ExportHelper
 from bpy.props import StringProperty, BoolProperty, IntProperty
 from bpy.types import Operator
-
-if hasattr(os.environ, "FLATC_PATH"):
-    FLATC_PATH = os.environ["FLATC_PATH"]
-else:
-    FLATC_PATH = "PATH TO FLATC.EXE HERE"
+from FlatBufferWriter import FlatBuilder
 
 class ExportTRSKLJsons(Operator, ExportHelper):
     """Save a TRSKL JSON for Pokémon Scarlet/Violet"""
@@ -25,45 +21,71 @@ class ExportTRSKLJsons(Operator, ExportHelper):
     bl_idname = "pokemonswitch.exportarmature"  # important since its how bpy.ops.import_test.some_data is constructed
     bl_label = "Export Armature"
     filename_ext = ".json"
+    write_json: BoolProperty(
+        name="Write JSON",
+        description="Also save the skeleton as JSON, for debugging",
+        default=False,
+    )
 
     def execute(self, context):
         dest_dir = os.path.dirname(self.filepath)
         filedata = []
         for obj in bpy.context.selected_objects:
             if obj.type == "ARMATURE":
-                save_skeleton_data(obj, dest_dir)
+                save_skeleton_data(obj, dest_dir, self.write_json)
             elif obj.find_armature() is not None:
-                save_skeleton_data(obj.find_armature(), dest_dir)
+                save_skeleton_data(obj.find_armature(), dest_dir, self.write_json)
         return {"FINISHED"}
 
-def to_binary(filepath, fileext):
-    filetype = fileext.strip(".")
-    schema_dir = os.path.dirname(FLATC_PATH) + f"\\Schemas\\Filetypes\\{filetype}.fbs"
-    flatc_call = [
-        FLATC_PATH,
-        "--filename-ext",
-        filetype,
-        "-o",
-        os.path.dirname(filepath) + "\\Modded\\",
-        "-b",
-        schema_dir,
-        filepath,
-    ]
-    print(flatc_call)
-    result = subprocess.run(flatc_call, check=True)
-    if isinstance(result, subprocess.CalledProcessError):
-        print(f"Failed to convert '{filepath}' to binary.")
-    else:
-        output_file = os.path.realpath(os.path.dirname(filepath) + 
-                                       "\\Modded\\" + 
-                                       os.path.basename(filepath).strip(".json") +
-                                       fileext 
-        )
-        if os.path.exists(output_file):
-            rename_call = ["powershell.exe", "-Command", 
-            f"Move-Item '{output_file}' '{output_file.removesuffix(fileext)}' -Force"]
-            subprocess.run(rename_call, check=True)
-        print(f"Successfully converted '{filepath}' to binary.")
+# Layouts of the TRSKL tables, fields in vtable order as (name, type). Types are
+# scalars, ("enum", names), ("struct", format, keys), ("table", layout),
+# ("vector", type) or "string".
+VEC3 = ("struct", "<3f", ("x", "y", "z"))
+MATRIX4X3 = (
+    "struct",
+    "<12f",
+    tuple(f"{row}.{col}" for row in "xyzw" for col in "xyz"),
+)
+
+NODE_TYPES = {"Default": 0}
+
+TRSKL_TRANSFORM = (
+    ("VecScale", VEC3),
+    ("VecRot", VEC3),
+    ("VecTranslate", VEC3),
+)
+TRSKL_NODE = (
+    ("name", "string"),
+    ("transform", ("table", TRSKL_TRANSFORM)),
+    ("scalePivot", VEC3),
+    ("rotatePivot", VEC3),
+    ("parent_idx", "int"),
+    ("rig_idx", "int"),
+    ("effect_node", "string"),
+    ("type", ("enum", NODE_TYPES)),
+)
+TRSKL_BONE = (
+    ("inherit_position", "ubyte"),
+    ("unk_bool_2", "ubyte"),
+    ("matrix", MATRIX4X3),
+)
+TRSKL_IK = (
+    ("ik_name", "string"),
+    ("ik_chain_start", "string"),
+    ("ik_chain_end", "string"),
+    ("ik_type", "string"),
+    ("res_4", "uint"),
+    ("ik_pos", VEC3),
+    ("ik_rot", ("struct", "<4f", ("w", "x", "y", "z"))),
+)
+TRSKL_SCHEMA = (
+    ("res_0", "uint"),
+    ("transform_nodes", ("vector", ("table", TRSKL_NODE))),
+    ("bones", ("vector", ("table", TRSKL_BONE))),
+    ("iks", ("vector", ("table", TRSKL_IK))),
+    ("rig_offset", "int"),
+)
+
 
 # Only needed if you want to add into a dynamic menu
 def ExportTRSKL_menu_func_export(self, context):
@@ -149,7 +171,7 @@ def get_ik_data(pose_bone):
     return ik_data
 
 
-def save_skeleton_data(armature, path):
+def save_skeleton_data(armature, path, write_json=False):
     def serialize(o):
         if isinstance(o, float):
             if abs(o) < 1e-5:
@@ -205,14 +227,20 @@ def save_skeleton_data(armature, path):
         }
     )
 
-    dest_file = os.path.join(path, armature.data.name + ".json")
+    if write_json:
+        json_file = os.path.join(path, armature.data.name + ".json")
+        with open(json_file, "w") as f:
+            json.dump(data, f, indent=2)
 
-    with open(dest_file, "w") as f:
-        json.dump(data, f, indent=2)
-    
-    to_binary(dest_file, ".trskl")
+    # Where flatc used to put it.
+    out_dir = os.path.join(path, "Modded")
+    os.makedirs(out_dir, exist_ok=True)
+    dest_file = os.path.join(out_dir, armature.data.name)
+    if not dest_file.endswith(".trskl"):
+        dest_file += ".trskl"
+    with open(dest_file, "wb") as f:
+        f.write(FlatBuilder().finish(data, TRSKL_SCHEMA))
 
     print(f"Skeleton data saved to '{dest_file}'.")
 
     return {"FINISHED"}
-
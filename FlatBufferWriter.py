@@ -0,0 +1,122 @@
+# FlatBuffers writing shared by ExportTRMeshJsons.py and ExportTRSKLJsons.py.
+# Not an add-on itself, it goes in the add-ons folder next to them.
+
+import struct
+
+
+class FlatBuilder:
+    """Writes a FlatBuffers file straight from the export dicts.
+
+    Offsets in FlatBuffers only have to point forward, so tables, vectors
+    and strings get written after whatever refers to them and the offset is
+    patched in then. Fields at their default are still written, the
+    importers check the vtable lengths.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.vtables = {}
+
+    def finish(self, value, schema):
+        self.buffer += bytes(4)
+        self.patch(0, self.table(value, schema))
+        return bytes(self.buffer)
+
+    def pad(self, size=4):
+        self.buffer += bytes(-len(self.buffer) % size)
+
+    def patch(self, at, target):
+        struct.pack_into("<I", self.buffer, at, target - at)
+
+    def write(self, value, kind):
+        """Writes a table, vector or string and returns where it starts."""
+        self.pad()
+        start = len(self.buffer)
+        if kind == "string":
+            data = value.encode("utf-8")
+            self.buffer += struct.pack("<I", len(data)) + data + b"\0"
+        elif kind[0] == "table":
+            start = self.table(value, kind[1])
+        elif kind[1] == "ubyte":
+            self.buffer += struct.pack("<I", len(value)) + bytes(value)
+        elif inline_format(kind[1]) is not None:
+            self.buffer += struct.pack("<I", len(value))
+            for item in value:
+                self.buffer += pack_inline(item, kind[1])
+        else:
+            self.buffer += struct.pack("<I", len(value))
+            slots = []
+            for item in value:
+                slots.append(len(self.buffer))
+                self.buffer += bytes(4)
+            for slot, item in zip(slots, value):
+                self.patch(slot, self.write(item, kind[1]))
+        return start
+
+    def table(self, value, schema):
+        layout = bytearray(4)
+        field_offsets = []
+        references = []
+        for name, kind in schema:
+            item = value.get(name)
+            if item is None:
+                field_offsets.append(0)
+                continue
+            fmt = inline_format(kind)
+            size = struct.calcsize(fmt) if fmt is not None else 4
+            layout += bytes(-len(layout) % min(size, 4))
+            field_offsets.append(len(layout))
+            if fmt is not None:
+                layout += pack_inline(item, kind)
+            else:
+                references.append((len(layout), item, kind))
+                layout += bytes(4)
+
+        vtable = struct.pack(
+            f"<{len(field_offsets) + 2}H",
+            len(field_offsets) * 2 + 4,
+            len(layout),
+            *field_offsets,
+        )
+        vtable_start = self.vtables.get(vtable)
+        if vtable_start is None:
+            self.pad()
+            vtable_start = len(self.buffer)
+            self.buffer += vtable
+            self.vtables[vtable] = vtable_start
+
+        self.pad()
+        start = len(self.buffer)
+        struct.pack_into("<i", layout, 0, start - vtable_start)
+        self.buffer += layout
+        for offset, item, kind in references:
+            self.patch(start + offset, self.write(item, kind))
+        return start
+
+
+SCALAR_FORMATS = {"ubyte": "<B", "int": "<i", "uint": "<I", "float": "<f"}
+
+
+def inline_format(kind):
+    """The struct format of a field stored in its table, None for offsets."""
+    if isinstance(kind, str):
+        return SCALAR_FORMATS.get(kind)
+    if kind[0] == "enum":
+        return "<I"
+    if kind[0] == "struct":
+        return kind[1]
+    return None
+
+
+def pack_inline(value, kind):
+    if isinstance(kind, str):
+        return struct.pack(SCALAR_FORMATS[kind], value)
+    if kind[0] == "enum":
+        return struct.pack("<I", kind[1].get(value, value))
+    values = []
+    for path in kind[2]:
+        item = value
+        for key in path.split("."):
+            item = item[key]
+        values.append(item)
+    return struct.pack(kind[1], *values)
@@ -9,23 +9,51 @@ bl_info = {
     "category": "Import",
 }
 
+import hashlib
+import json
+import multiprocessing
 import os
 import os.path
+import shutil
 import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from bpy.props import (
-    BoolProperty,
-    StringProperty,
-    EnumProperty,
-    CollectionProperty,
-)
-from bpy_extras.io_utils import ImportHelper
-from bpy.types import (
-    Operator,
-)
-import bpy
-import mathutils
 
+try:
+    from bpy.props import (
+        BoolProperty,
+        IntProperty,
+        StringProperty,
+        EnumProperty,
+        CollectionProperty,
+    )
+    from bpy_extras.io_utils import ImportHelper
+    from bpy.types import (
+        Operator,
+        PropertyGroup,
+    )
+    import bpy
+    import mathutils
+except ImportError:
+    # Parse workers import this file in a Python without Blender's modules.
+    # They only run the bpy-free parsing, these just let the classes load.
+    bpy = mathutils = None
+
+    class Operator:
+        pass
+
+    class ImportHelper:
+        pass
+
+    PropertyGroup = Operator
+    BoolProperty = IntProperty = StringProperty = lambda **kwargs: None
+    EnumProperty = CollectionProperty = lambda **kwargs: None
+import numpy as np
 
 # READ THIS: change to True when running in Blender, False when running using fake-bpy-module-latest
 IN_BLENDER_ENV = True
@@ -42,10 +70,10 @@ class PokeSVImport(Operator, ImportHelper):
         options={"HIDDEN"},
         maxlen=255,
     )
-    filepath = bpy.props.StringProperty(
+    filepath = StringProperty(
         subtype="FILE_PATH",
     )
-    files = CollectionProperty(type=bpy.types.PropertyGroup)
+    files = CollectionProperty(type=PropertyGroup)
     basearmature: EnumProperty(
         default='donothing',
         items=(('donothing','Load armature in .trmdl','Load armature in .trmdl'),
@@ -62,11 +90,40 @@ class PokeSVImport(Operator, ImportHelper):
         description="Uses rare material instead of normal one",
         default=False,
     )
+    batch: BoolProperty(
+        name="Batch Import Subfolders",
+        description="Import every model under the folder and its subfolders, "
+        "resuming where the last batch stopped",
+        default=False,
+    )
     loadlods: BoolProperty(
         name="Load LODS",
         description="Uses rare material instead of normal one",
         default=False,
     )
+    ignorecase: BoolProperty(
+        name="Ignore File Name Case",
+        description="Match the model's files regardless of upper/lower case",
+        default=False,
+    )
+    cachesize: IntProperty(
+        name="Parse Cache Size (MB)",
+        description="Memory kept for parsed files between imports, 0 turns it off",
+        default=512,
+        min=0,
+    )
+    diskcache: BoolProperty(
+        name="Disk Cache",
+        description="Keep decoded meshes and materials on disk for later sessions",
+        default=False,
+    )
+    diskcachesize: IntProperty(
+        name="Disk Cache Size (MB)",
+        description="Disk space kept for decoded files, the least recently used "
+        "are removed first",
+        default=1024,
+        min=0,
+    )
     bonestructh: BoolProperty(
         name="Bone Extras (WIP)",
         description="Bone Extras (WIP)",
@@ -78,64 +135,126 @@ class PokeSVImport(Operator, ImportHelper):
         box.prop(self, "rare")
         box = layout.box()
         box.prop(self, "multiple")
+        box.prop(self, "batch")
         box = layout.box()
         box.prop(self, "loadlods")
         box = layout.box()
+        box.prop(self, "ignorecase")
+        box = layout.box()
         box.prop(self, "bonestructh")
         box = layout.box()
         box.prop(self, "basearmature")
-        
+        box = layout.box()
+        box.prop(self, "cachesize")
+        box.label(text=parse_cache.summary())
+        box.operator(ClearParseCache.bl_idname)
+        box = layout.box()
+        box.prop(self, "diskcache")
+        box.prop(self, "diskcachesize")
+        box.operator(ClearDiskCache.bl_idname)
+
     def execute(self, context):
         directory = os.path.dirname(self.filepath)
-        if self.multiple == False:
+        image_cache = ImageCache()
+        material_cache = MaterialCache()
+        dir_index = DirectoryIndex(directory, self.ignorecase)
+        parse_cache.resize(self.cachesize * 1024 * 1024)
+        disk_cache_settings = None
+        if self.diskcache:
+            disk_cache_settings = {
+                "directory": disk_cache.root(),
+                "max_bytes": self.diskcachesize * 1024 * 1024,
+            }
+        options = {
+            "game": "sv",
+            "rare": self.rare,
+            "loadlods": self.loadlods,
+            "bonestructh": self.bonestructh,
+            "basearmature": self.basearmature,
+        }
+        if self.multiple == False and self.batch == False:
             filename = os.path.basename(self.filepath)
-            f = open(os.path.join(directory, filename), "rb")
-            from_trmdlsv(directory, f, self.rare, self.loadlods,
-                         self.bonestructh, self.basearmature)
-            f.close()
+            model = parse_model(
+                os.path.join(directory, filename),
+                options,
+                dir_index,
+                disk_cache_settings,
+            )
+            build_in_blender(model, dir_index, image_cache, material_cache)
+            image_cache.report()
+            material_cache.report()
+            parse_cache.report()
+            disk_cache.report()
             return {"FINISHED"}
         else:
-            file_list = sorted(os.listdir(directory))
-            obj_list = [item for item in file_list if item.endswith(".trmdl")]
-            for item in obj_list:
-                f = open(os.path.join(directory, item), "rb")
-                from_trmdlsv(
-                    directory,
-                    f,
-                    self.rare,
-                    self.loadlods,
-                    self.bonestructh,
-                    self.basearmature,
-                )
-                f.close()
-            return {"FINISHED"}
-
-
-def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
-    # make collection
-    if IN_BLENDER_ENV:
-      if basearmature == "assigntobase":
-        for collection in bpy.data.collections:
-          for obj in collection.all_objects:
-            if obj.data.name == "p0_base.trskl":
-                new_collection = collection
-                break
-      else:
-        new_collection = bpy.data.collections.new(os.path.basename(trmdl.name[:-6]))
-        bpy.context.scene.collection.children.link(new_collection)
-
-    textureextension = ".png"
+            manifest = None
+            if self.batch:
+                filepaths, dir_indexes = find_models(directory, self.ignorecase)
+                manifest = BatchManifest(directory, options)
+                filepaths, dir_indexes = manifest.pending(filepaths, dir_indexes)
+            else:
+                file_list = sorted(dir_index.names())
+                obj_list = [item for item in file_list if item.endswith(".trmdl")]
+                filepaths = [os.path.join(directory, item) for item in obj_list]
+                dir_indexes = [dir_index] * len(filepaths)
+            self.folder_import = FolderImport(
+                filepaths,
+                options,
+                dir_indexes,
+                image_cache,
+                material_cache,
+                manifest,
+                disk_cache_settings,
+            )
+            return self.folder_import.start(self, context)
+
+    def modal(self, context, event):
+        return self.folder_import.modal(self, context, event)
+
+
+def from_trmdlsv(
+    filep,
+    trmdl,
+    rare,
+    loadlods,
+    bonestructh,
+    basearmature,
+    image_cache=None,
+    dir_index=None,
+    material_cache=None,
+):
+    if dir_index is None:
+        dir_index = DirectoryIndex(filep)
+    options = {
+        "game": "sv",
+        "rare": rare,
+        "loadlods": loadlods,
+        "bonestructh": bonestructh,
+        "basearmature": basearmature,
+    }
+    loader = FileLoader(dir_index)
+    model = parse_trmdlsv(trmdl, options, dir_index, loader)
+    loader.close()
+    build_trmdlsv(model, dir_index, image_cache, material_cache)
+
+
+def parse_trmdlsv(trmdl, options, dir_index, loader, built_skeletons=()):
+    """Reads a Scarlet/Violet TRMDL and the files it points to, without bpy.
+
+    A base skeleton whose ArmatureRegistry key is in built_skeletons isn't
+    read, the build binds to that armature instead.
+    """
+    rare = options["rare"]
+    loadlods = options["loadlods"]
+    basearmature = options["basearmature"]
+    bonestructh = options["bonestructh"]
 
-    materials = []
-    bone_structure = None
     trskl = None
     trmsh = None
     trmtr = None
 
     trmsh_lods_array = []
     bone_array = []
-    bone_id_map = {}
-    bone_rig_array = []
     trskl_bone_adjust = 0
     chara_check = "None"
 
@@ -143,43 +262,14 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
 
     trmdl_file_start = readlong(trmdl)
     fseek(trmdl, trmdl_file_start)
-    trmdl_struct = ftell(trmdl) - readlong(trmdl)
-    fseek(trmdl, trmdl_struct)
-    trmdl_struct_len = readshort(trmdl)
-
-    if trmdl_struct_len == 0x0012:
-        trmdl_struct_section_len = readshort(trmdl)
-        trmdl_struct_start = readshort(trmdl)
-        trmdl_struct_trmsh = readshort(trmdl)
-        trmdl_struct_trskl = readshort(trmdl)
-        trmdl_struct_trmtr = readshort(trmdl)
-        trmdl_struct_custom = readshort(trmdl)
-        trmdl_struct_bound_box = readshort(trmdl)
-        trmdl_struct_float = readshort(trmdl)
-    elif trmdl_struct_len == 0x0014:  # ScarletViolet Only
-        trmdl_struct_section_len = readshort(trmdl)
-        trmdl_struct_start = readshort(trmdl)
-        trmdl_struct_trmsh = readshort(trmdl)
-        trmdl_struct_trskl = readshort(trmdl)
-        trmdl_struct_trmtr = readshort(trmdl)
-        trmdl_struct_custom = readshort(trmdl)
-        trmdl_struct_bound_box = readshort(trmdl)
-        trmdl_struct_float = readshort(trmdl)
-        trmdl_struct_trltt = readshort(trmdl)
-    elif trmdl_struct_len == 0x0018:  # ScarletViolet Only
-        trmdl_struct_section_len = readshort(trmdl)
-        trmdl_struct_start = readshort(trmdl)
-        trmdl_struct_trmsh = readshort(trmdl)
-        trmdl_struct_trskl = readshort(trmdl)
-        trmdl_struct_trmtr = readshort(trmdl)
-        trmdl_struct_custom = readshort(trmdl)
-        trmdl_struct_bound_box = readshort(trmdl)
-        trmdl_struct_float = readshort(trmdl)
-        trmdl_struct_trltt = readshort(trmdl)
-        trmdl_struct_unka = readshort(trmdl)
-        trmdl_struct_unkb = readshort(trmdl)
-    else:
+    trmdl_struct = FlatTable(trmdl, trmdl_file_start, TRMDL_SCHEMA)
+
+    # 0x0014 and 0x0018 are ScarletViolet Only
+    if trmdl_struct.vtable_len not in (0x0012, 0x0014, 0x0018):
         raise AssertionError("Unexpected TRMDL header struct length!")
+    trmdl_struct_trmsh = trmdl_struct.field("trmsh")
+    trmdl_struct_trskl = trmdl_struct.field("trskl")
+    trmdl_struct_trmtr = trmdl_struct.field("trmtr")
 
     if trmdl_struct_trmsh != 0:
         fseek(trmdl, trmdl_file_start + trmdl_struct_trmsh)
@@ -190,15 +280,11 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
             trmsh_offset = ftell(trmdl) + readlong(trmdl)
             trmsh_ret = ftell(trmdl)
             fseek(trmdl, trmsh_offset)
-            trmsh_struct = ftell(trmdl) - readlong(trmdl)
-            fseek(trmdl, trmsh_struct)
-            trmsh_struct_len = readshort(trmdl)
+            trmsh_struct = FlatTable(trmdl, trmsh_offset, TRMDL_NAME_SCHEMA)
 
-            if trmsh_struct_len != 0x0006:
+            if trmsh_struct.vtable_len != 0x0006:
                 raise AssertionError("Unexpected TRMSH struct length!")
-
-            trmsh_struct_section_len = readshort(trmdl)
-            trmsh_struct_ptr_name = readshort(trmdl)
+            trmsh_struct_ptr_name = trmsh_struct.field("name")
 
             if trmsh_struct_ptr_name != 0:
                 fseek(trmdl, trmsh_offset + trmsh_struct_ptr_name)
@@ -235,21 +321,19 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                 print(trmsh_name)
                 print(chara_check)
                 trmsh_lods_array.append(trmsh_name)
+                if loadlods or x == 0:
+                    loader.fetch_mesh(trmsh_name)
             fseek(trmdl, trmsh_ret)
 
     if trmdl_struct_trskl != 0:
         fseek(trmdl, trmdl_file_start + trmdl_struct_trskl)
         trskl_start = ftell(trmdl) + readlong(trmdl)
         fseek(trmdl, trskl_start)
-        trskl_struct = ftell(trmdl) - readlong(trmdl)
-        fseek(trmdl, trskl_struct)
-        trskl_struct_len = readshort(trmdl)
+        trskl_struct = FlatTable(trmdl, trskl_start, TRMDL_NAME_SCHEMA)
 
-        if trskl_struct_len != 0x0006:
+        if trskl_struct.vtable_len != 0x0006:
             raise AssertionError("Unexpected TRSKL struct length!")
-
-        trskl_struct_section_len = readshort(trmdl)
-        trskl_struct_ptr_name = readshort(trmdl)
+        trskl_struct_ptr_name = trskl_struct.field("name")
 
         if trskl_struct_ptr_name != 0:
             fseek(trmdl, trskl_start + trskl_struct_ptr_name)
@@ -259,8 +343,8 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
             trskl_name = readfixedstring(trmdl, trskl_name_len)
             print(trskl_name)
 
-            if os.path.exists(os.path.join(filep, trskl_name)):
-                trskl = open(os.path.join(filep, trskl_name), "rb")
+            if dir_index.exists(trskl_name):
+                trskl = loader.open(trskl_name)
             else:
                 print(f"Can't find {trskl_name}!")
 
@@ -282,47 +366,44 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
             print(trmtr_name)
             if x == 0:
                 if rare:
-                    trmtr = open(
-                        os.path.join(filep, Path(trmtr_name).stem + "_rare.trmtr"), "rb"
-                    )
+                    trmtr = loader.open(Path(trmtr_name).stem + "_rare.trmtr")
                 else:
-                    trmtr = open(os.path.join(filep, trmtr_name), "rb")
+                    trmtr = loader.open(trmtr_name)
             fseek(trmdl, trmtr_ret)
     fclose(trmdl)
-    
-    if basearmature == "assigntobase":
-      if IN_BLENDER_ENV:
-        bone_structure = bpy.data.objects.get(new_collection.name + ".trmdl")
 
     # TODO create bone_rig_array
     # LINE 1247
+    skeleton_path = None
     if basearmature == "loadbasearm":
-        trskl = open(os.path.join(filep, "p0_base.trskl"), "rb")
         trskl_name = "p0_base.trskl"
+        trskl = None
+        skeleton_path = dir_index.path(trskl_name)
+        key = armature_registry.key(skeleton_path, ("sv", bonestructh))
+        if key in built_skeletons:
+            print("Base armature is already built, not parsing its TRSKL")
+        else:
+            trskl = loader.open(trskl_name)
+    if trskl is not None:
+        skeleton_path = trskl.name
 
+    bones = None
     if trskl is not None:
+        bones = parse_cache.get(trskl.name, "sv")
+        if bones is not None:
+            print("Using cached TRSKL...")
+            fclose(trskl)
+
+    if trskl is not None and bones is None:
         print("Parsing TRSKL...")
+        bones = []
         trskl_file_start = readlong(trskl)
         fseek(trskl, trskl_file_start)
-        trskl_struct = ftell(trskl) - readlong(trskl)
-        fseek(trskl, trskl_struct)
-        trskl_struct_len = readshort(trskl)
-        if trskl_struct_len == 0x000C:
-            trskl_struct_section_len = readshort(trskl)
-            trskl_struct_start = readshort(trskl)
-            trskl_struct_bone = readshort(trskl)
-            trskl_struct_b = readshort(trskl)
-            trskl_struct_c = readshort(trskl)
-            trskl_struct_bone_adjust = 0
-        elif trskl_struct_len == 0x000E:
-            trskl_struct_section_len = readshort(trskl)
-            trskl_struct_start = readshort(trskl)
-            trskl_struct_bone = readshort(trskl)
-            trskl_struct_b = readshort(trskl)
-            trskl_struct_c = readshort(trskl)
-            trskl_struct_bone_adjust = readshort(trskl)
-        else:
+        trskl_struct = FlatTable(trskl, trskl_file_start, TRSKL_SCHEMA)
+        if trskl_struct.vtable_len not in (0x000C, 0x000E):
             raise AssertionError("Unexpected TRSKL header struct length!")
+        trskl_struct_bone = trskl_struct.field("bone")
+        trskl_struct_bone_adjust = trskl_struct.field("bone_adjust")
 
         if trskl_struct_bone_adjust != 0:
             fseek(trskl, trskl_file_start + trskl_struct_bone_adjust)
@@ -335,54 +416,18 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
             fseek(trskl, trskl_bone_start)
             bone_count = readlong(trskl)
 
-            if IN_BLENDER_ENV:
-                new_armature = bpy.data.armatures.new(os.path.basename(trskl_name))
-                bone_structure = bpy.data.objects.new(
-                    os.path.basename(trmdl.name), new_armature
-                )
-                new_collection.objects.link(bone_structure)
-                bpy.context.view_layer.objects.active = bone_structure
-                bpy.ops.object.editmode_toggle()
-
             for x in range(bone_count):
                 bone_offset = ftell(trskl) + readlong(trskl)
                 bone_ret = ftell(trskl)
                 fseek(trskl, bone_offset)
                 print(f"Bone {x} start: {hex(bone_offset)}")
-                trskl_bone_struct = ftell(trskl) - readlong(trskl)
-                fseek(trskl, trskl_bone_struct)
-                trskl_bone_struct_len = readshort(trskl)
-
-                if trskl_bone_struct_len == 0x0012:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = 0
-                elif trskl_bone_struct_len == 0x0014:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = readshort(trskl)
-                else:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = readshort(trskl)
+                trskl_bone_struct = FlatTable(trskl, bone_offset, TRSKL_BONE_SCHEMA)
+                trskl_bone_struct_ptr_string = trskl_bone_struct.field("string")
+                trskl_bone_struct_ptr_bone = trskl_bone_struct.field("bone")
+                trskl_bone_struct_ptr_parent = trskl_bone_struct.field("parent")
+                trskl_bone_struct_ptr_rig_id = trskl_bone_struct.field("rig_id")
+                trskl_bone_struct_ptr_bone_merge = trskl_bone_struct.field("bone_merge")
+                trskl_bone_struct_ptr_h = trskl_bone_struct.field("h")
 
                 if trskl_bone_struct_ptr_bone_merge != 0:
                     fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone_merge)
@@ -475,17 +520,15 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                     fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone)
                     bone_pos_start = ftell(trskl) + readlong(trskl)
                     fseek(trskl, bone_pos_start)
-                    bone_pos_struct = ftell(trskl) - readlong(trskl)
-                    fseek(trskl, bone_pos_struct)
-                    bone_pos_struct_len = readshort(trskl)
+                    bone_pos_struct = FlatTable(
+                        trskl, bone_pos_start, TRSKL_TRANSFORM_SCHEMA
+                    )
 
-                    if bone_pos_struct_len != 0x000A:
+                    if bone_pos_struct.vtable_len != 0x000A:
                         raise AssertionError("Unexpected bone position struct length!")
-
-                    bone_pos_struct_section_len = readshort(trskl)
-                    bone_pos_struct_ptr_scl = readshort(trskl)
-                    bone_pos_struct_ptr_rot = readshort(trskl)
-                    bone_pos_struct_ptr_trs = readshort(trskl)
+                    bone_pos_struct_ptr_scl = bone_pos_struct.field("scl")
+                    bone_pos_struct_ptr_rot = bone_pos_struct.field("rot")
+                    bone_pos_struct_ptr_trs = bone_pos_struct.field("trs")
 
                     fseek(trskl, bone_pos_start + bone_pos_struct_ptr_trs)
                     bone_tx = readfloat(trskl)
@@ -514,75 +557,48 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                     else:
                         bone_parent = 0
                     print(bone_parent)
+                    bone_rig_id = None
                     if trskl_bone_struct_ptr_rig_id != 0:
                         fseek(trskl, bone_offset + trskl_bone_struct_ptr_rig_id)
                         bone_rig_id = readlong(trskl) + trskl_bone_adjust
 
-                        while len(bone_rig_array) <= bone_rig_id:
-                            bone_rig_array.append("")
-                        bone_rig_array[bone_rig_id] = bone_name
-
-                    bone_matrix = mathutils.Matrix.LocRotScale(
-                        (bone_tx, bone_ty, bone_tz),
-                        mathutils.Euler((bone_rx, bone_ry, bone_rz)),
-                        (bone_sx, bone_sy, bone_sz),
+                    bones.append(
+                        {
+                            "name": bone_name,
+                            "parent": bone_parent,
+                            "rig_id": bone_rig_id,
+                            "h": trskl_bone_struct_ptr_h,
+                            "trs": (bone_tx, bone_ty, bone_tz),
+                            "rot": (bone_rx, bone_ry, bone_rz),
+                            "scl": (bone_sx, bone_sy, bone_sz),
+                        }
                     )
-
-                    if IN_BLENDER_ENV:
-                        new_bone = new_armature.edit_bones.new(bone_name)
-
-                        new_bone.use_connect = False
-                        new_bone.use_inherit_rotation = True
-
-                        if bonestructh:
-                            if (
-                                trskl_bone_struct_ptr_h
-                                == 0 & bpy.app.version
-                                < (4, 1, 0)
-                            ):
-                                new_bone.use_inherit_scale = True
-                            else:
-                                new_bone.use_inherit_scale = False
-
-                        new_bone.use_local_location = True
-
-                        new_bone.head = (0, 0, 0)
-                        new_bone.tail = (0, 0, 0.1)
-                        new_bone.matrix = bone_matrix
-
-                        if bone_parent != 0:
-                            new_bone.parent = new_armature.edit_bones[bone_parent - 1]
-                            new_bone.matrix = (
-                                new_armature.edit_bones[bone_parent - 1].matrix
-                                @ bone_matrix
-                            )
-
-                        if bone_name in bone_rig_array:
-                            bone_id_map[bone_rig_array.index(bone_name)] = bone_name
-                        else:
-                            bone_rig_array.append(bone_name)
-                            bone_id_map[len(bone_rig_array) - 1] = bone_name
-
-                        bone_array.append(new_bone)
                 fseek(trskl, bone_ret)
         fclose(trskl)
-        if IN_BLENDER_ENV:
-            bpy.ops.object.editmode_toggle()
+        parse_cache.put(trskl.name, "sv", bones)
 
+    mat_data_array = None
     if trmtr is not None:
+        mat_data_array = parse_cache.get(trmtr.name, "sv")
+        if mat_data_array is None:
+            trmtr_entry = disk_cache.entry(trmtr.name, "sv")
+            mat_data_array = disk_cache.get_materials(trmtr_entry)
+            if mat_data_array is not None:
+                parse_cache.put(trmtr.name, "sv", mat_data_array)
+        if mat_data_array is not None:
+            print("Using cached TRMTR...")
+            fclose(trmtr)
+
+    if trmtr is not None and mat_data_array is None:
         print("Parsing TRMTR...")
         trmtr_file_start = readlong(trmtr)
         mat_data_array = []
         fseek(trmtr, trmtr_file_start)
-        trmtr_struct = ftell(trmtr) - readlong(trmtr)
-        fseek(trmtr, trmtr_struct)
-        trmtr_struct_len = readshort(trmtr)
+        trmtr_struct = FlatTable(trmtr, trmtr_file_start, TRMTR_SCHEMA)
 
-        if trmtr_struct_len != 0x0008:
+        if trmtr_struct.vtable_len != 0x0008:
             raise AssertionError("Unexpected TRMTR header struct length!")
-        trmtr_struct_section_len = readshort(trmtr)
-        trmtr_struct_start = readshort(trmtr)
-        trmtr_struct_material = readshort(trmtr)
+        trmtr_struct_material = trmtr_struct.field("material")
 
         if trmtr_struct_material != 0:
             fseek(trmtr, trmtr_file_start + trmtr_struct_material)
@@ -665,29 +681,26 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
 
                 fseek(trmtr, mat_offset)
                 print("--------------------")
-                mat_struct = ftell(trmtr) - readlong(trmtr)
-                fseek(trmtr, mat_struct)
-                mat_struct_len = readshort(trmtr)
+                mat_struct = FlatTable(trmtr, mat_offset, TRMTR_MATERIAL_SCHEMA)
 
-                if mat_struct_len != 0x0024:
+                if mat_struct.vtable_len != 0x0024:
                     raise AssertionError("Unexpected material struct length!")
-                mat_struct_section_len = readshort(trmtr)
-                mat_struct_ptr_param_a = readshort(trmtr)
-                mat_struct_ptr_param_b = readshort(trmtr)
-                mat_struct_ptr_param_c = readshort(trmtr)
-                mat_struct_ptr_param_d = readshort(trmtr)
-                mat_struct_ptr_param_e = readshort(trmtr)
-                mat_struct_ptr_param_f = readshort(trmtr)
-                mat_struct_ptr_param_g = readshort(trmtr)
-                mat_struct_ptr_param_h = readshort(trmtr)
-                mat_struct_ptr_param_i = readshort(trmtr)
-                mat_struct_ptr_param_j = readshort(trmtr)
-                mat_struct_ptr_param_k = readshort(trmtr)
-                mat_struct_ptr_param_l = readshort(trmtr)
-                mat_struct_ptr_param_m = readshort(trmtr)
-                mat_struct_ptr_param_n = readshort(trmtr)
-                mat_struct_ptr_param_o = readshort(trmtr)
-                mat_struct_ptr_param_p = readshort(trmtr)
+                mat_struct_ptr_param_a = mat_struct.field("param_a")
+                mat_struct_ptr_param_b = mat_struct.field("param_b")
+                mat_struct_ptr_param_c = mat_struct.field("param_c")
+                mat_struct_ptr_param_d = mat_struct.field("param_d")
+                mat_struct_ptr_param_e = mat_struct.field("param_e")
+                mat_struct_ptr_param_f = mat_struct.field("param_f")
+                mat_struct_ptr_param_g = mat_struct.field("param_g")
+                mat_struct_ptr_param_h = mat_struct.field("param_h")
+                mat_struct_ptr_param_i = mat_struct.field("param_i")
+                mat_struct_ptr_param_j = mat_struct.field("param_j")
+                mat_struct_ptr_param_k = mat_struct.field("param_k")
+                mat_struct_ptr_param_l = mat_struct.field("param_l")
+                mat_struct_ptr_param_m = mat_struct.field("param_m")
+                mat_struct_ptr_param_n = mat_struct.field("param_n")
+                mat_struct_ptr_param_o = mat_struct.field("param_o")
+                mat_struct_ptr_param_p = mat_struct.field("param_p")
 
                 if mat_struct_ptr_param_a != 0:
                     fseek(trmtr, mat_offset + mat_struct_ptr_param_a)
@@ -705,17 +718,20 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                         mat_param_b_offset = ftell(trmtr) + readlong(trmtr)
                         mat_param_b_ret = ftell(trmtr)
                         fseek(trmtr, mat_param_b_offset)
-                        mat_param_b_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_b_struct)
-                        mat_param_b_struct_len = readshort(trmtr)
+                        mat_param_b_struct = FlatTable(
+                            trmtr, mat_param_b_offset, TRMTR_SHADER_SCHEMA
+                        )
 
-                        if mat_param_b_struct_len != 0x0008:
+                        if mat_param_b_struct.vtable_len != 0x0008:
                             raise AssertionError(
                                 "Unexpected material param b struct length!"
                             )
-                        mat_param_b_struct_section_len = readshort(trmtr)
-                        mat_param_b_struct_ptr_string = readshort(trmtr)
-                        mat_param_b_struct_ptr_params = readshort(trmtr)
+                        mat_param_b_struct_ptr_string = mat_param_b_struct.field(
+                            "string"
+                        )
+                        mat_param_b_struct_ptr_params = mat_param_b_struct.field(
+                            "params"
+                        )
 
                         if mat_param_b_struct_ptr_string != 0:
                             fseek(
@@ -742,17 +758,20 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                 mat_param_b_sub_offset = ftell(trmtr) + readlong(trmtr)
                                 mat_param_b_sub_ret = ftell(trmtr)
                                 fseek(trmtr, mat_param_b_sub_offset)
-                                mat_param_b_sub_struct = ftell(trmtr) - readlong(trmtr)
-                                fseek(trmtr, mat_param_b_sub_struct)
-                                mat_param_b_sub_struct_len = readshort(trmtr)
+                                mat_param_b_sub_struct = FlatTable(
+                                    trmtr, mat_param_b_sub_offset, TRMTR_PARAM_SCHEMA
+                                )
 
-                                if mat_param_b_sub_struct_len != 0x0008:
+                                if mat_param_b_sub_struct.vtable_len != 0x0008:
                                     raise AssertionError(
                                         "Unexpected material param b sub struct length!"
                                     )
-                                mat_param_b_sub_struct_section_len = readshort(trmtr)
-                                mat_param_b_sub_struct_ptr_string = readshort(trmtr)
-                                mat_param_b_sub_struct_ptr_value = readshort(trmtr)
+                                mat_param_b_sub_struct_ptr_string = (
+                                    mat_param_b_sub_struct.field("string")
+                                )
+                                mat_param_b_sub_struct_ptr_value = (
+                                    mat_param_b_sub_struct.field("value")
+                                )
 
                                 if mat_param_b_sub_struct_ptr_string != 0:
                                     fseek(
@@ -833,24 +852,19 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                         mat_param_c_offset = ftell(trmtr) + readlong(trmtr)
                         mat_param_c_ret = ftell(trmtr)
                         fseek(trmtr, mat_param_c_offset)
-                        mat_param_c_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_c_struct)
-                        mat_param_c_struct_len = readshort(trmtr)
-
-                        if mat_param_c_struct_len == 0x0008:
-                            mat_param_c_struct_section_len = readshort(trmtr)
-                            mat_param_c_struct_ptr_string = readshort(trmtr)
-                            mat_param_c_struct_ptr_value = readshort(trmtr)
-                            mat_param_c_struct_ptr_id = 0
-                        elif mat_param_c_struct_len == 0x000A:
-                            mat_param_c_struct_section_len = readshort(trmtr)
-                            mat_param_c_struct_ptr_string = readshort(trmtr)
-                            mat_param_c_struct_ptr_value = readshort(trmtr)
-                            mat_param_c_struct_ptr_id = readshort(trmtr)
-                        else:
+                        mat_param_c_struct = FlatTable(
+                            trmtr, mat_param_c_offset, TRMTR_TEXTURE_SCHEMA
+                        )
+
+                        if mat_param_c_struct.vtable_len not in (0x0008, 0x000A):
                             raise AssertionError(
                                 "Unexpected material param c struct length!"
                             )
+                        mat_param_c_struct_ptr_string = mat_param_c_struct.field(
+                            "string"
+                        )
+                        mat_param_c_struct_ptr_value = mat_param_c_struct.field("value")
+                        mat_param_c_struct_ptr_id = mat_param_c_struct.field("id")
 
                         if mat_param_c_struct_ptr_string != 0:
                             fseek(
@@ -934,28 +948,27 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                         mat_param_d_offset = ftell(trmtr) + readlong(trmtr)
                         mat_param_d_ret = ftell(trmtr)
                         fseek(trmtr, mat_param_d_offset)
-                        mat_param_d_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_d_struct)
-                        mat_param_d_struct_len = readshort(trmtr)
+                        mat_param_d_struct = FlatTable(
+                            trmtr, mat_param_d_offset, TRMTR_SAMPLER_SCHEMA
+                        )
 
-                        if mat_param_d_struct_len != 0x001E:
+                        if mat_param_d_struct.vtable_len != 0x001E:
                             raise AssertionError(
                                 "Unexpected material param d struct length!"
                             )
-                        mat_param_d_struct_section_len = readshort(trmtr)
-                        mat_param_d_struct_ptr_a = readshort(trmtr)
-                        mat_param_d_struct_ptr_b = readshort(trmtr)
-                        mat_param_d_struct_ptr_c = readshort(trmtr)
-                        mat_param_d_struct_ptr_d = readshort(trmtr)
-                        mat_param_d_struct_ptr_e = readshort(trmtr)
-                        mat_param_d_struct_ptr_f = readshort(trmtr)
-                        mat_param_d_struct_ptr_g = readshort(trmtr)
-                        mat_param_d_struct_ptr_h = readshort(trmtr)
-                        mat_param_d_struct_ptr_i = readshort(trmtr)
-                        mat_param_d_struct_ptr_j = readshort(trmtr)
-                        mat_param_d_struct_ptr_k = readshort(trmtr)
-                        mat_param_d_struct_ptr_l = readshort(trmtr)
-                        mat_param_d_struct_ptr_m = readshort(trmtr)
+                        mat_param_d_struct_ptr_a = mat_param_d_struct.field("a")
+                        mat_param_d_struct_ptr_b = mat_param_d_struct.field("b")
+                        mat_param_d_struct_ptr_c = mat_param_d_struct.field("c")
+                        mat_param_d_struct_ptr_d = mat_param_d_struct.field("d")
+                        mat_param_d_struct_ptr_e = mat_param_d_struct.field("e")
+                        mat_param_d_struct_ptr_f = mat_param_d_struct.field("f")
+                        mat_param_d_struct_ptr_g = mat_param_d_struct.field("g")
+                        mat_param_d_struct_ptr_h = mat_param_d_struct.field("h")
+                        mat_param_d_struct_ptr_i = mat_param_d_struct.field("i")
+                        mat_param_d_struct_ptr_j = mat_param_d_struct.field("j")
+                        mat_param_d_struct_ptr_k = mat_param_d_struct.field("k")
+                        mat_param_d_struct_ptr_l = mat_param_d_struct.field("l")
+                        mat_param_d_struct_ptr_m = mat_param_d_struct.field("m")
 
                         if mat_param_d_struct_ptr_a != 0:
                             fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_a)
@@ -1042,20 +1055,16 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                         mat_param_e_offset = ftell(trmtr) + readlong(trmtr)
                         mat_param_e_ret = ftell(trmtr)
                         fseek(trmtr, mat_param_e_offset)
-                        mat_param_e_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_e_struct)
-                        mat_param_e_struct_len = readshort(trmtr)
-
-                        if mat_param_e_struct_len == 0x0006:
-                            mat_param_e_struct_section_len = readshort(trmtr)
-                            mat_param_e_struct_ptr_string = readshort(trmtr)
-                            mat_param_e_struct_ptr_value = 0
-                        elif mat_param_e_struct_len == 0x0008:
-                            mat_param_e_struct_section_len = readshort(trmtr)
-                            mat_param_e_struct_ptr_string = readshort(trmtr)
-                            mat_param_e_struct_ptr_value = readshort(trmtr)
-                        else:
+                        mat_param_e_struct = FlatTable(
+                            trmtr, mat_param_e_offset, TRMTR_PARAM_SCHEMA
+                        )
+
+                        if mat_param_e_struct.vtable_len not in (0x0006, 0x0008):
                             raise Exception(f"Unknown mat_param_e struct length!")
+                        mat_param_e_struct_ptr_string = mat_param_e_struct.field(
+                            "string"
+                        )
+                        mat_param_e_struct_ptr_value = mat_param_e_struct.field("value")
 
                         if mat_param_e_struct_ptr_string != 0:
                             fseek(
@@ -1212,15 +1221,18 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                         mat_param_h_offset = ftell(trmtr) + readlong(trmtr)
                         mat_param_h_ret = ftell(trmtr)
                         fseek(trmtr, mat_param_h_offset)
-                        mat_param_h_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_h_struct)
-                        mat_param_h_struct_len = readshort(trmtr)
+                        mat_param_h_struct = FlatTable(
+                            trmtr, mat_param_h_offset, TRMTR_VECTOR_SCHEMA
+                        )
 
-                        if mat_param_h_struct_len != 0x0008:
+                        if mat_param_h_struct.vtable_len != 0x0008:
                             raise Exception(f"Unknown mat_param_h struct length!")
-                        mat_param_h_struct_section_len = readshort(trmtr)
-                        mat_param_h_struct_ptr_string = readshort(trmtr)
-                        mat_param_h_struct_ptr_values = readshort(trmtr)
+                        mat_param_h_struct_ptr_string = mat_param_h_struct.field(
+                            "string"
+                        )
+                        mat_param_h_struct_ptr_values = mat_param_h_struct.field(
+                            "values"
+                        )
 
                         if mat_param_h_struct_ptr_string != 0:
                             fseek(
@@ -1327,20 +1339,16 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                         mat_param_j_offset = ftell(trmtr) + readlong(trmtr)
                         mat_param_j_ret = ftell(trmtr)
                         fseek(trmtr, mat_param_j_offset)
-                        mat_param_j_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_j_struct)
-                        mat_param_j_struct_len = readshort(trmtr)
-
-                        if mat_param_j_struct_len == 0x0006:
-                            mat_param_j_struct_section_len = readshort(trmtr)
-                            mat_param_j_struct_ptr_string = readshort(trmtr)
-                            mat_param_j_struct_ptr_value = 0
-                        elif mat_param_j_struct_len == 0x0008:
-                            mat_param_j_struct_section_len = readshort(trmtr)
-                            mat_param_j_struct_ptr_string = readshort(trmtr)
-                            mat_param_j_struct_ptr_value = readshort(trmtr)
-                        else:
+                        mat_param_j_struct = FlatTable(
+                            trmtr, mat_param_j_offset, TRMTR_PARAM_SCHEMA
+                        )
+
+                        if mat_param_j_struct.vtable_len not in (0x0006, 0x0008):
                             raise Exception(f"Unknown mat_param_j struct length!")
+                        mat_param_j_struct_ptr_string = mat_param_j_struct.field(
+                            "string"
+                        )
+                        mat_param_j_struct_ptr_value = mat_param_j_struct.field("value")
 
                         if mat_param_j_struct_ptr_string != 0:
                             fseek(
@@ -1525,1246 +1533,679 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
             print("--------------------")
 
         fclose(trmtr)
+        parse_cache.put(trmtr.name, "sv", mat_data_array)
+        disk_cache.put_materials(trmtr_entry, mat_data_array)
 
-        if IN_BLENDER_ENV:
-            # process materials
-            for m, mat in enumerate(mat_data_array):
-                material = bpy.data.materials.new(name=mat["mat_name"])
-                material.use_nodes = True
-                materials.append(material)
-
-                if "skin" in mat["mat_name"]:
-                    blend_type = "MULTIPLY"
-                else:
-                    blend_type = "MIX"
+    if loadlods == False:
+        trmsh_count = 1
 
-                material_output = material.node_tree.nodes.get("Material Output")
-                principled_bsdf = material.node_tree.nodes.get("Principled BSDF")
-                material.node_tree.links.new(
-                    principled_bsdf.outputs[0], material_output.inputs[0]
-                )
+    # Assigned models get weighted to the base armature when they're built.
+    read_weights = skeleton_path is not None or basearmature == "assigntobase"
 
-                print(f"mat_shader = {mat['mat_shader']}")
+    # What gets read from the meshes also depends on the material order and
+    # on whether there are bone weights to read.
+    mesh_context = (
+        "sv",
+        tuple(mat["mat_name"] for mat in mat_data_array or ()),
+        read_weights,
+    )
+    lods = []
+    buffer_paths = []
+    for w in range(trmsh_count):
+        poly_groups = None
+        trmbf_path = None
+        meshes = None
+        if dir_index.exists(trmsh_lods_array[w]):
+            trmsh_path = dir_index.path(trmsh_lods_array[w])
+            meshes = parse_cache.get(trmsh_path, mesh_context)
+            if meshes is None:
+                trmsh_entry = disk_cache.entry(trmsh_path, mesh_context)
+                meshes = disk_cache.get_meshes(trmsh_entry, dir_index)
+
+        if meshes is not None:
+            print("Using cached TRMSH...")
+            poly_groups = meshes["poly_groups"]
+            trmbf_path = meshes["trmbf_path"]
+        elif dir_index.exists(trmsh_lods_array[w]):
+            poly_groups = []
+            poly_group_array = []
+            trmsh = loader.open(trmsh_lods_array[w])
+            trmsh_file_start = readlong(trmsh)
+            print("Parsing TRMSH...")
+            fseek(trmsh, trmsh_file_start)
+            trmsh_struct = FlatTable(trmsh, trmsh_file_start, TRMSH_SCHEMA)
 
-                material.blend_method = "BLEND"
-                material.show_transparent_back = False
-                material.shadow_method = "OPAQUE"
+            if trmsh_struct.vtable_len != 0x000A:
+                raise AssertionError("Unexpected TRMSH header struct length!")
+            trmsh_struct_poly_group = trmsh_struct.field("poly_group")
+            trmsh_struct_trmbf = trmsh_struct.field("trmbf")
 
-                color_output = principled_bsdf.inputs[0]
-                if mat["mat_shader"] == "Unlit":
-                    color_output = material_output.inputs[0]
-                if mat["mat_shader"] == "Transparent":
-                    material.blend_method = "BLEND"
-                    reflectionpart1 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart1.operation = "SQRT"
-                    reflectionpart1.inputs[0].default_value = mat["mat_reflectance"]
+            if trmsh_struct_trmbf != 0:
+                fseek(trmsh, trmsh_file_start + trmsh_struct_trmbf)
+                trmbf_filename_start = ftell(trmsh) + readlong(trmsh)
+                fseek(trmsh, trmbf_filename_start)
+                trmbf_filename_len = readlong(trmsh)
+                trmbf_filename = readfixedstring(trmsh, trmbf_filename_len)
+                print(trmbf_filename)
 
-                    reflectionpart2 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart2.inputs[0].default_value = 1.0
-                    reflectionpart2.operation = "ADD"
+                trmbf = None
+                if dir_index.exists(trmbf_filename):
+                    trmbf = loader.open(trmbf_filename)
+                else:
+                    raise AssertionError(f"Can't find {trmbf_filename}!")
 
-                    reflectionpart3 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart3.inputs[0].default_value = 1.0
-                    reflectionpart3.operation = "SUBTRACT"
+                if trmbf != None:
+                    print("Parsing TRMBF...")
+                    trmbf_file_start = readlong(trmbf)
+                    fseek(trmbf, trmbf_file_start)
+                    trmbf_struct = FlatTable(trmbf, trmbf_file_start, TRMBF_SCHEMA)
 
-                    reflectionpart4 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart4.operation = "DIVIDE"
+                    if trmbf_struct.vtable_len != 0x0008:
+                        raise AssertionError("Unexpected TRMBF header struct length!")
+                    trmbf_struct_buffer = trmbf_struct.field("buffer")
 
-                    reflectionpart5 = material.node_tree.nodes.new("ShaderNodeFresnel")
+                    if trmsh_struct_poly_group != 0:
+                        fseek(trmsh, trmsh_file_start + trmsh_struct_poly_group)
+                        poly_group_start = ftell(trmsh) + readlong(trmsh)
+                        fseek(trmsh, poly_group_start)
+                        poly_group_count = readlong(trmsh)
 
-                    reflectionpart6 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart6.inputs[0].default_value = 0.25
-                    reflectionpart6.operation = "SUBTRACT"
+                        fseek(trmbf, trmbf_file_start + trmbf_struct_buffer)
+                        vert_buffer_start = ftell(trmbf) + readlong(trmbf)
+                        vert_buffer_count = readlong(trmbf)
 
-                    material.node_tree.links.new(
-                        reflectionpart1.outputs[0], reflectionpart2.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        reflectionpart1.outputs[0], reflectionpart3.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        reflectionpart2.outputs[0], reflectionpart4.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        reflectionpart3.outputs[0], reflectionpart4.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        reflectionpart4.outputs[0], reflectionpart5.inputs[0]
-                    )
+                        for x in range(poly_group_count):
+                            vert_array = []
+                            normal_array = []
+                            color_array = []
+                            alpha_array = []
+                            uv_array = []
+                            uv2_array = []
+                            uv3_array = []
+                            uv4_array = []
+                            face_array = []
+                            face_mat_id_array = []
+                            b1_array = []
+                            w1_array = []
+                            Morphs_array = []
+                            MorphName_array = []
+                            groupoffset_array = []
+                            poly_group_name = ""
+                            vis_group_name = ""
+                            vert_buffer_stride = 0
+                            vert_attributes = []
+                            polygon_type = None
+                            mat_id = 0
+                            positions_fmt = "None"
+                            normals_fmt = "None"
+                            tangents_fmt = "None"
+                            bitangents_fmt = "None"
+                            tritangents_fmt = "None"
+                            uvs_fmt = "None"
+                            uvs2_fmt = "None"
+                            uvs3_fmt = "None"
+                            uvs4_fmt = "None"
+                            colors_fmt = "None"
+                            colors2_fmt = "None"
+                            bones_fmt = "None"
+                            weights_fmt = "None"
+                            svunk_fmt = "None"
 
-                material.use_backface_culling = True
+                            poly_group_offset = ftell(trmsh) + readlong(trmsh)
+                            poly_group_ret = ftell(trmsh)
+                            fseek(trmsh, poly_group_offset)
+                            print(f"PolyGroup offset #{x}: {hex(poly_group_offset)}")
+                            poly_group_struct = FlatTable(
+                                trmsh, poly_group_offset, TRMSH_POLY_GROUP_SCHEMA
+                            )
+                            poly_group_struct_ptr_poly_group_name = (
+                                poly_group_struct.field("poly_group_name")
+                            )
+                            poly_group_struct_ptp_unc_a = poly_group_struct.field(
+                                "unc_a"
+                            )
+                            poly_group_struct_ptr_vert_buff = poly_group_struct.field(
+                                "vert_buff"
+                            )
+                            poly_group_struct_ptr_mat_list = poly_group_struct.field(
+                                "mat_list"
+                            )
+                            poly_group_struct_ptr_morphname = poly_group_struct.field(
+                                "morphname"
+                            )
+                            poly_group_struct_ptr_vis_group_name = (
+                                poly_group_struct.field("vis_group_name")
+                            )
+                            poly_group_struct_ptr_group_name = poly_group_struct.field(
+                                "group_name"
+                            )
 
-                basecolor = (
-                    mat["mat_color_r"],
-                    mat["mat_color_g"],
-                    mat["mat_color_b"],
-                    1.0,
-                )
-                # LAYER MASK MAP
+                            if poly_group_struct_ptp_unc_a != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset + poly_group_struct_ptp_unc_a,
+                                )
+                                polygon_type = readlong(trmsh)
 
-                lym_image_texture = material.node_tree.nodes.new("ShaderNodeTexImage")
-                if (
-                    os.path.exists(
-                        os.path.join(filep, mat["mat_lym0"][:-5] + textureextension)
-                    )
-                   is True
-                ):
-                    lym_image_texture.image = bpy.data.images.load(
-                        os.path.join(filep, mat["mat_lym0"][:-5] + textureextension)
-                    )
-                    lym_image_texture.image.colorspace_settings.name = "Non-Color"
-                huesaturationvalue = material.node_tree.nodes.new(
-                    "ShaderNodeHueSaturation"
-                )
-                huesaturationvalue.inputs[2].default_value = 2.0
-                huesaturationvalue2 = material.node_tree.nodes.new(
-                    "ShaderNodeHueSaturation"
-                )
-                huesaturationvalue2.inputs[2].default_value = 2.0
+                            if poly_group_struct_ptr_mat_list != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset + poly_group_struct_ptr_mat_list,
+                                )
+                                mat_offset = ftell(trmsh) + readlong(trmsh)
+                                fseek(trmsh, mat_offset)
+                                mat_count = readlong(trmsh)
+                                for y in range(mat_count):
+                                    mat_entry_offset = ftell(trmsh) + readlong(trmsh)
+                                    mat_ret = ftell(trmsh)
+                                    fseek(trmsh, mat_entry_offset)
+                                    mat_struct = FlatTable(
+                                        trmsh, mat_entry_offset, TRMSH_MATERIAL_SCHEMA
+                                    )
 
-                color1 = (
-                    mat["mat_color1_r"],
-                    mat["mat_color1_g"],
-                    mat["mat_color1_b"],
-                    1.0,
-                )
-                color2 = (
-                    mat["mat_color2_r"],
-                    mat["mat_color2_g"],
-                    mat["mat_color2_b"],
-                    1.0,
-                )
-                color3 = (
-                    mat["mat_color3_r"],
-                    mat["mat_color3_g"],
-                    mat["mat_color3_b"],
-                    1.0,
-                )
-                color4 = (
-                    mat["mat_color4_r"],
-                    mat["mat_color4_g"],
-                    mat["mat_color4_b"],
-                    1.0,
-                )
+                                    if mat_struct.vtable_len != 0x000E:
+                                        raise AssertionError(
+                                            "Unexpected material struct length!"
+                                        )
+                                    mat_struct_ptr_facepoint_count = mat_struct.field(
+                                        "facepoint_count"
+                                    )
+                                    mat_struct_ptr_facepoint_start = mat_struct.field(
+                                        "facepoint_start"
+                                    )
+                                    mat_struct_ptr_unk_c = mat_struct.field("unk_c")
+                                    mat_struct_ptr_string = mat_struct.field("string")
+                                    mat_struct_ptr_unk_d = mat_struct.field("unk_d")
 
-                emcolor1 = (
-                    mat["mat_emcolor1_r"],
-                    mat["mat_emcolor1_g"],
-                    mat["mat_emcolor1_b"],
-                    1.0,
-                )
-                emcolor2 = (
-                    mat["mat_emcolor2_r"],
-                    mat["mat_emcolor2_g"],
-                    mat["mat_emcolor2_b"],
-                    1.0,
-                )
-                emcolor3 = (
-                    mat["mat_emcolor3_r"],
-                    mat["mat_emcolor3_g"],
-                    mat["mat_emcolor3_b"],
-                    1.0,
-                )
-                emcolor4 = (
-                    mat["mat_emcolor4_r"],
-                    mat["mat_emcolor4_g"],
-                    mat["mat_emcolor4_b"],
-                    1.0,
-                )
-                if emcolor1 == (1.0, 1.0, 1.0, 1.0):
-                    emcolor1 = (0.0, 0.0, 0.0, 0.0)
-                if emcolor2 == (1.0, 1.0, 1.0, 1.0):
-                    emcolor2 = (0.0, 0.0, 0.0, 0.0)
-                if emcolor3 == (1.0, 1.0, 1.0, 1.0):
-                    emcolor3 = (0.0, 0.0, 0.0, 0.0)
-                if emcolor4 == (1.0, 1.0, 1.0, 1.0):
-                    emcolor4 = (0.0, 0.0, 0.0, 0.0)
-                print(f'Material {mat["mat_name"]}:')
-                print(f"Color 1: {color1}")
-                print(f"Color 2: {color2}")
-                print(f"Color 3: {color3}")
-                print(f"Color 4: {color4}")
-                print(f"Emission Color 1: {emcolor1}")
-                print(f"Emission Color 2: {emcolor2}")
-                print(f"Emission Color 3: {emcolor3}")
-                print(f"Emission Color 4: {emcolor4}")
-                print("---")
-
-                mix_color1 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_color1.blend_type = blend_type
-                mix_color1.inputs[0].default_value = 0.0
-                mix_color1.inputs[1].default_value = (1, 1, 1, 1)
-                mix_color1.inputs[2].default_value = color1
-                mix_color2 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_color2.blend_type = blend_type
-                mix_color2.inputs[0].default_value = 0.0
-                mix_color2.inputs[1].default_value = (0, 0, 0, 0)
-                mix_color2.inputs[2].default_value = color2
-                mix_color3 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_color3.blend_type = blend_type
-                mix_color3.inputs[0].default_value = 0.0
-                mix_color3.inputs[1].default_value = (0, 0, 0, 0)
-                mix_color3.inputs[2].default_value = color3
-                mix_color4 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_color4.blend_type = blend_type
-                mix_color4.inputs[0].default_value = 0.0
-                mix_color4.inputs[1].default_value = (0, 0, 0, 0)
-                mix_color4.inputs[2].default_value = color4
-                mix_color5 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_color5.blend_type = blend_type
-                mix_color5.inputs[0].default_value = 0.0
-                mix_color5.inputs[1].default_value = (0, 0, 0, 0)
-                mix_color5.inputs[2].default_value = (1, 1, 1, 1)
-
-                mix_emcolor1 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_emcolor1.blend_type = blend_type
-                mix_emcolor1.inputs[1].default_value = (0, 0, 0, 0)
-                mix_emcolor1.inputs[2].default_value = emcolor1
-                mix_emcolor2 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_emcolor2.blend_type = blend_type
-                mix_emcolor2.inputs[1].default_value = (0, 0, 0, 0)
-                mix_emcolor2.inputs[2].default_value = emcolor2
-                mix_emcolor3 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_emcolor3.blend_type = blend_type
-                mix_emcolor3.inputs[1].default_value = (0, 0, 0, 0)
-                mix_emcolor3.inputs[2].default_value = emcolor3
-                mix_emcolor4 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                mix_emcolor4.blend_type = blend_type
-                mix_emcolor4.inputs[1].default_value = (0, 0, 0, 0)
-                mix_emcolor4.inputs[2].default_value = emcolor4
+                                    if mat_struct_ptr_facepoint_count != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset
+                                            + mat_struct_ptr_facepoint_count,
+                                        )
+                                        mat_facepoint_count = int(readlong(trmsh) / 3)
 
-                material.node_tree.links.new(
-                    mix_color1.outputs[0], mix_color2.inputs[1]
-                )
-                material.node_tree.links.new(
-                    mix_color2.outputs[0], mix_color3.inputs[1]
-                )
-                material.node_tree.links.new(
-                    mix_color3.outputs[0], mix_color4.inputs[1]
-                )
-                material.node_tree.links.new(
-                    mix_color3.outputs[0], mix_color4.inputs[1]
-                )
-                material.node_tree.links.new(mix_color4.outputs[0], color_output)
+                                    if mat_struct_ptr_facepoint_start != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset
+                                            + mat_struct_ptr_facepoint_start,
+                                        )
+                                        mat_facepoint_start = int(readlong(trmsh) / 3)
+                                    else:
+                                        mat_facepoint_start = 0
 
-                material.node_tree.links.new(
-                    mix_emcolor1.outputs[0], mix_emcolor2.inputs[1]
-                )
-                material.node_tree.links.new(
-                    mix_emcolor2.outputs[0], mix_emcolor3.inputs[1]
-                )
-                material.node_tree.links.new(
-                    mix_emcolor3.outputs[0], mix_emcolor4.inputs[1]
-                )
-                material.node_tree.links.new(
-                    mix_emcolor3.outputs[0], mix_emcolor4.inputs[1]
-                )
-                material.node_tree.links.new(
-                    mix_emcolor4.outputs[0], principled_bsdf.inputs[26]
-                )
+                                    if mat_struct_ptr_unk_c != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset + mat_struct_ptr_unk_c,
+                                        )
+                                        mat_unk_c = readlong(trmsh)
 
-                separate_color = material.node_tree.nodes.new("ShaderNodeSeparateRGB")
-                material.node_tree.links.new(
-                    lym_image_texture.outputs[0], huesaturationvalue.inputs[4]
-                )
-                material.node_tree.links.new(
-                    huesaturationvalue.outputs[0], separate_color.inputs[0]
-                )
-                material.node_tree.links.new(
-                    separate_color.outputs[0], mix_color1.inputs[0]
-                )
-                material.node_tree.links.new(
-                    separate_color.outputs[1], mix_color2.inputs[0]
-                )
-                material.node_tree.links.new(
-                    separate_color.outputs[2], mix_color3.inputs[0]
-                )
-                material.node_tree.links.new(
-                    lym_image_texture.outputs[1], huesaturationvalue2.inputs[4]
-                )
-                material.node_tree.links.new(
-                    huesaturationvalue2.outputs[0], mix_color4.inputs[0]
-                )
+                                    if mat_struct_ptr_string != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset + mat_struct_ptr_string,
+                                        )
+                                        mat_name_offset = ftell(trmsh) + readlong(trmsh)
+                                        fseek(trmsh, mat_name_offset)
+                                        mat_name_len = readlong(trmsh)
+                                        mat_name = readfixedstring(trmsh, mat_name_len)
 
-                material.node_tree.links.new(
-                    separate_color.outputs[0], mix_emcolor1.inputs[0]
-                )
-                material.node_tree.links.new(
-                    separate_color.outputs[1], mix_emcolor2.inputs[0]
-                )
-                material.node_tree.links.new(
-                    separate_color.outputs[2], mix_emcolor3.inputs[0]
-                )
-                material.node_tree.links.new(
-                    huesaturationvalue2.outputs[0], mix_emcolor4.inputs[0]
-                )
+                                    if mat_struct_ptr_unk_d != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset + mat_struct_ptr_unk_d,
+                                        )
+                                        mat_unk_d = readlong(trmsh)
 
-                if (
-                    os.path.exists(
-                        os.path.join(filep, mat["mat_col0"][:-5] + textureextension)
-                    )
-                   is True
-                ):
-                    alb_image_texture = material.node_tree.nodes.new(
-                        "ShaderNodeTexImage"
-                    )
-                    alb_image_texture.image = bpy.data.images.load(
-                        os.path.join(filep, mat["mat_col0"][:-5] + textureextension)
-                    )
-                    material.node_tree.links.new(
-                        alb_image_texture.outputs[0], mix_color1.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        alb_image_texture.outputs[1], principled_bsdf.inputs[4]
-                    )
-                    if "hair" in mat["mat_name"] in mat["mat_name"] and basecolor != (
-                        1,
-                        1,
-                        1,
-                        1,
-                    ):
-                        haircolor = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                        haircolor.blend_type = "MULTIPLY"
-                        haircolor.inputs[0].default_value = 1.0
-                        material.node_tree.links.new(
-                            alb_image_texture.outputs[0], haircolor.inputs[1]
-                        )
-                        haircolor.inputs[2].default_value = basecolor
-                        material.node_tree.links.new(haircolor.outputs[0], color_output)
+                                    mat_id = 0
+                                    for z in range(len(mat_data_array)):
+                                        if mat_data_array[z]["mat_name"] == mat_name:
+                                            mat_id = z
+                                            break
 
-                if mat["mat_enable_highlight_map"]:
-                    highlight_image_texture = material.node_tree.nodes.new(
-                        "ShaderNodeTexImage"
-                    )
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_highmsk0"][:-5] + ".png")
-                        )
-                       is True
-                    ):
-                        highlight_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_highmsk0"][:-5] + ".png")
-                        )
-                        highlight_image_texture.image.colorspace_settings.name = (
-                            "Non-Color"
-                        )
-                    elif (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                        )
-                       is True
-                    ):
-                        highlight_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                        )
-                        highlight_image_texture.image.colorspace_settings.name = (
-                            "Non-Color"
-                        )
-                    elif (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                        )
-                       is True
-                    ):
-                        highlight_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                        )
-                        highlight_image_texture.image.colorspace_settings.name = (
-                            "Non-Color"
-                        )
-                    elif (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_col0"][:-12] + "r_eye_msk.png")
-                        )
-                       is True
-                        and mat["mat_name"] == "eye_r"
-                    ):
-                        highlight_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_col0"][:-12] + "r_eye_msk.png")
-                        )
-                        highlight_image_texture.image.colorspace_settings.name = (
-                            "Non-Color"
-                        )
-                    elif (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_col0"][:-12] + "l_eye_msk.png")
-                        )
-                       is True
-                        and mat["mat_name"] == "eye_l"
-                    ):
-                        highlight_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_col0"][:-12] + "l_eye_msk.png")
-                        )
-                        highlight_image_texture.image.colorspace_settings.name = (
-                            "Non-Color"
-                        )
-                    else:
-                        print("No Highlight")
-                    material.node_tree.links.new(
-                        highlight_image_texture.outputs[0], mix_color5.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        mix_color4.outputs[0], mix_color5.inputs[1]
-                    )
-                    material.node_tree.links.new(mix_color5.outputs[0], color_output)
+                                    for z in range(mat_facepoint_count):
+                                        face_mat_id_array.append(mat_id)
 
-                if mat["mat_enable_normal_map"]:
-                    normal_image_texture = material.node_tree.nodes.new(
-                        "ShaderNodeTexImage"
-                    )
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_nrm0"][:-5] + textureextension)
-                        )
-                       is True
-                    ):
-                        normal_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_nrm0"][:-5] + textureextension)
-                        )
-                        normal_image_texture.image.colorspace_settings.name = (
-                            "Non-Color"
-                        )
-                    separate_color2 = material.node_tree.nodes.new(
-                        "ShaderNodeSeparateRGB"
-                    )
-                    combine_color2 = material.node_tree.nodes.new(
-                        "ShaderNodeCombineColor"
-                    )
-                    normal_map2 = material.node_tree.nodes.new("ShaderNodeNormalMap")
-                    material.node_tree.links.new(
-                        normal_image_texture.outputs[0], separate_color2.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        separate_color2.outputs[0], combine_color2.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        separate_color2.outputs[1], combine_color2.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        normal_image_texture.outputs[1], combine_color2.inputs[2]
-                    )
-                    material.node_tree.links.new(
-                        combine_color2.outputs[0], normal_map2.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        normal_map2.outputs[0], principled_bsdf.inputs[5]
-                    )
+                                    print(
+                                        f"Material {mat_name}: FaceCount = {mat_facepoint_count}, FaceStart = {mat_facepoint_start}"
+                                    )
+                                    fseek(trmsh, mat_ret)
 
-                if mat["mat_enable_metallic_map"]:
-                    metalness_image_texture = material.node_tree.nodes.new(
-                        "ShaderNodeTexImage"
-                    )
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_mtl0"][:-5] + textureextension)
-                        )
-                       is True
-                    ):
-                        metalness_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_mtl0"][:-5] + textureextension)
-                        )
-                        metalness_image_texture.image.colorspace_settings.name = (
-                            "Non-Color"
-                        )
-                    material.node_tree.links.new(
-                        metalness_image_texture.outputs[0], principled_bsdf.inputs[1]
-                    )
+                            if poly_group_struct_ptr_poly_group_name != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset
+                                    + poly_group_struct_ptr_poly_group_name,
+                                )
+                                poly_group_name_offset = ftell(trmsh) + readlong(trmsh)
+                                fseek(trmsh, poly_group_name_offset)
+                                poly_group_name_len = readlong(trmsh)
+                                poly_group_name = readfixedstring(
+                                    trmsh, poly_group_name_len
+                                )
+                                print(f"Building {poly_group_name}...")
 
-                if mat["mat_enable_emission_color_map"]:
-                    emission_image_texture = material.node_tree.nodes.new(
-                        "ShaderNodeTexImage"
-                    )
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_emi0"][:-5] + textureextension)
-                        )
-                       is True
-                    ):
-                        emission_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_emi0"][:-5] + textureextension)
-                        )
-                    material.node_tree.links.new(
-                        emission_image_texture.outputs[0], principled_bsdf.inputs[26]
-                    )
-
-                if mat["mat_enable_roughness_map"]:
-                    roughness_image_texture = material.node_tree.nodes.new(
-                        "ShaderNodeTexImage"
-                    )
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_rgh0"][:-5] + textureextension)
-                        )
-                       is True
-                    ):
-                        roughness_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_rgh0"][:-5] + textureextension)
-                        )
-                        roughness_image_texture.image.colorspace_settings.name = (
-                            "Non-Color"
-                        )
-                    material.node_tree.links.new(
-                        roughness_image_texture.outputs[0], principled_bsdf.inputs[2]
-                    )
-
-                if mat["mat_enable_ao_map"]:
-                    ambientocclusion_image_texture = material.node_tree.nodes.new(
-                        "ShaderNodeTexImage"
-                    )
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_ao0"][:-5] + textureextension)
-                        )
-                       is True
-                    ):
-                        ambientocclusion_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_ao0"][:-5] + textureextension)
-                        )
-                    mix_color6 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_color6.blend_type = "MULTIPLY"
-                    if (
-                        mat["mat_ao0"][:-5]
-                        == "../../glb_share_tex/texture_white_ao/texture_white_ao"
-                    ):
-                        mix_color6.inputs[0].default_value = 0
-                    else:
-                        mix_color6.inputs[0].default_value = 1.0
-                    if mix_color5is True:
-                        material.node_tree.links.new(
-                            mix_color5.outputs[0], mix_color6.inputs[0]
-                        )
-                        material.node_tree.links.new(
-                            ambientocclusion_image_texture.outputs[0],
-                            mix_color6.inputs[1],
-                        )
-                        material.node_tree.links.new(
-                            mix_color6.outputs[0], color_output
-                        )
-                    else:
-                        material.node_tree.links.new(
-                            mix_color4.outputs[0], mix_color6.inputs[1]
-                        )
-                        material.node_tree.links.new(
-                            ambientocclusion_image_texture.outputs[0],
-                            mix_color6.inputs[2],
-                        )
-                        material.node_tree.links.new(
-                            mix_color6.outputs[0], color_output
-                        )
-                    if "hair" in mat["mat_name"] in mat["mat_name"] and basecolor != (
-                        1,
-                        1,
-                        1,
-                        1,
-                    ):
-                        material.node_tree.links.new(
-                            mix_color6.outputs[0], haircolor.inputs[1]
-                        )
-                        material.node_tree.links.new(haircolor.outputs[0], color_output)
-                if (
-                    os.path.exists(
-                        os.path.join(filep, mat["mat_col0"][:-5] + textureextension)
-                    )
-                   is True
-                ):
-                    if (
-                        color1 == (1.0, 1.0, 1.0, 1.0)
-                        and color2 == (1.0, 1.0, 1.0, 1.0)
-                        and color3 == (1.0, 1.0, 1.0, 1.0)
-                        and color4 == (1.0, 1.0, 1.0, 1.0)
-                    ):
-                        if mat["mat_enable_ao_map"]:
-                            material.node_tree.links.new(
-                                alb_image_texture.outputs[0], mix_color6.inputs[1]
-                            )
-                        else:
-                            material.node_tree.links.new(
-                                alb_image_texture.outputs[0], mix_color5.inputs[1]
-                            )
-
-                if (
-                    mat["mat_color1_r"] == (1.0)
-                    and mat["mat_color1_g"] == (1.0)
-                    and mat["mat_color1_b"] == (1.0)
-                ):
-                    color1 = mix_color1.inputs[0].links[0]
-                    material.node_tree.links.remove(color1)
+                            if poly_group_struct_ptr_group_name != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset
+                                    + poly_group_struct_ptr_group_name,
+                                )
+                                group_name_header_offset = ftell(trmsh) + readlong(
+                                    trmsh
+                                )
+                                fseek(trmsh, group_name_header_offset)
+                                group_name_count = readlong(trmsh)
+                                for g in range(group_name_count):
+                                    group_name_offset = ftell(trmsh) + readlong(trmsh)
+                                    groupoffset_array.append(group_name_offset)
 
-                if (
-                    mat["mat_color2_r"] == (1.0)
-                    and mat["mat_color2_g"] == (1.0)
-                    and mat["mat_color2_b"] == (1.0)
-                ):
-                    color2 = mix_color2.inputs[0].links[0]
-                    material.node_tree.links.remove(color2)
+                            if poly_group_struct_ptr_vis_group_name != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset
+                                    + poly_group_struct_ptr_vis_group_name,
+                                )
+                                vis_group_name_offset = ftell(trmsh) + readlong(trmsh)
+                                fseek(trmsh, vis_group_name_offset)
+                                vis_group_name_len = readlong(trmsh)
+                                vis_group_name = readfixedstring(
+                                    trmsh, vis_group_name_len
+                                )
+                                # changed the output variable because the original seems to be a typo
+                                print(f"VisGroup: {vis_group_name}")
+                            if poly_group_struct_ptr_morphname != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset + poly_group_struct_ptr_morphname,
+                                )
+                                morph_name_header_offset = ftell(trmsh) + readlong(
+                                    trmsh
+                                )
+                                fseek(trmsh, morph_name_header_offset)
+                                morph_name_count = readlong(trmsh)
+                                for m in range(morph_name_count):
+                                    morph_name_header_offset = ftell(trmsh) + readlong(
+                                        trmsh
+                                    )
+                                    morph_ret = ftell(trmsh)
+                                    fseek(trmsh, morph_name_header_offset)
+                                    morph_name_struct = FlatTable(
+                                        trmsh,
+                                        morph_name_header_offset,
+                                        TRMSH_MORPH_NAME_SCHEMA,
+                                    )
 
-                if (
-                    mat["mat_color3_r"] == (1.0)
-                    and mat["mat_color3_g"] == (1.0)
-                    and mat["mat_color3_b"] == (1.0)
-                ):
-                    color3 = mix_color3.inputs[0].links[0]
-                    material.node_tree.links.remove(color3)
+                                    if morph_name_struct.vtable_len != 0x0008:
+                                        raise AssertionError(
+                                            "Unexpected morph name struct length!"
+                                        )
+                                    morph_name_struct_ptr_ID = morph_name_struct.field(
+                                        "ID"
+                                    )
+                                    morph_name_struct_ptr_name = (
+                                        morph_name_struct.field("name")
+                                    )
+                                    fseek(
+                                        trmsh,
+                                        morph_name_header_offset
+                                        + morph_name_struct_ptr_ID,
+                                    )
+                                    morph_name_ID = readlong(trmsh)
+                                    fseek(
+                                        trmsh,
+                                        morph_name_header_offset
+                                        + morph_name_struct_ptr_name,
+                                    )
+                                    morph_name_start = ftell(trmsh) + readlong(trmsh)
+                                    fseek(trmsh, morph_name_start)
+                                    morph_name_len = readlong(trmsh)
+                                    morph_name = readfixedstring(trmsh, morph_name_len)
+                                    MorphName_array.append(morph_name)
+                                    fseek(trmsh, morph_ret)
+                            if poly_group_struct_ptr_vert_buff != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset + poly_group_struct_ptr_vert_buff,
+                                )
+                                poly_group_vert_buff_offset = ftell(trmsh) + readlong(
+                                    trmsh
+                                )
+                                fseek(trmsh, poly_group_vert_buff_offset)
+                                vert_buff_count = readlong(trmsh)
+                                vert_buff_offset = ftell(trmsh) + readlong(trmsh)
+                                fseek(trmsh, vert_buff_offset)
+                                vert_buff_struct = FlatTable(
+                                    trmsh, vert_buff_offset, TRMSH_VERT_BUFF_SCHEMA
+                                )
 
-                if (
-                    mat["mat_color4_r"] == (1.0)
-                    and mat["mat_color4_g"] == (1.0)
-                    and mat["mat_color4_b"] == (1.0)
-                ):
-                    color4 = mix_color4.inputs[0].links[0]
-                    material.node_tree.links.remove(color4)
-                if (
-                    "eyelash" in mat["mat_name"]
-                    and os.path.exists(
-                        os.path.join(filep, mat["mat_col0"][:-5] + textureextension)
-                    )
-                    == False
-                ):
-                    material.node_tree.links.remove(principled_bsdf.inputs[0].links[0])
-                    color_output.default_value = basecolor
+                                if vert_buff_struct.vtable_len != 0x0008:
+                                    raise AssertionError(
+                                        "Unexpected VertexBuffer struct length!"
+                                    )
+                                vert_buff_struct_ptr_param = vert_buff_struct.field(
+                                    "param"
+                                )
 
-    if loadlods == False:
-        trmsh_count = 1
+                                if vert_buff_struct_ptr_param != 0:
+                                    fseek(
+                                        trmsh,
+                                        vert_buff_offset + vert_buff_struct_ptr_param,
+                                    )
+                                    vert_buff_param_offset = ftell(trmsh) + readlong(
+                                        trmsh
+                                    )
+                                    fseek(trmsh, vert_buff_param_offset)
+                                    vert_buff_param_count = readlong(trmsh)
+                                    for y in range(vert_buff_param_count):
+                                        vert_buff_param_offset = ftell(
+                                            trmsh
+                                        ) + readlong(trmsh)
+                                        vert_buff_param_ret = ftell(trmsh)
+                                        fseek(trmsh, vert_buff_param_offset)
+                                        vert_buff_param_struct = FlatTable(
+                                            trmsh,
+                                            vert_buff_param_offset,
+                                            TRMSH_VERT_BUFF_PARAM_SCHEMA,
+                                        )
 
-    for w in range(trmsh_count):
-        if os.path.exists(os.path.join(filep, trmsh_lods_array[w])):
-            poly_group_array = []
-            trmsh = open(os.path.join(filep, trmsh_lods_array[w]), "rb")
-            trmsh_file_start = readlong(trmsh)
-            print("Parsing TRMSH...")
-            fseek(trmsh, trmsh_file_start)
-            trmsh_struct = ftell(trmsh) - readlong(trmsh)
-            fseek(trmsh, trmsh_struct)
-            trmsh_struct_len = readshort(trmsh)
+                                        if vert_buff_param_struct.vtable_len not in (
+                                            0x000C,
+                                            0x000E,
+                                        ):
+                                            raise AssertionError(
+                                                "Unknown vertex buffer parameter struct length!"
+                                            )
+                                        vert_buff_param_ptr_type = (
+                                            vert_buff_param_struct.field("type")
+                                        )
+                                        vert_buff_param_ptr_layer = (
+                                            vert_buff_param_struct.field("layer")
+                                        )
+                                        vert_buff_param_ptr_fmt = (
+                                            vert_buff_param_struct.field("fmt")
+                                        )
+                                        vert_buff_param_ptr_position = (
+                                            vert_buff_param_struct.field("position")
+                                        )
 
-            if trmsh_struct_len != 0x000A:
-                raise AssertionError("Unexpected TRMSH header struct length!")
-            trmsh_struct_section_len = readshort(trmsh)
-            trmsh_struct_start = readshort(trmsh)
-            trmsh_struct_poly_group = readshort(trmsh)
-            trmsh_struct_trmbf = readshort(trmsh)
+                                        vert_buff_param_layer = 0
 
-            if trmsh_struct_trmbf != 0:
-                fseek(trmsh, trmsh_file_start + trmsh_struct_trmbf)
-                trmbf_filename_start = ftell(trmsh) + readlong(trmsh)
-                fseek(trmsh, trmbf_filename_start)
-                trmbf_filename_len = readlong(trmsh)
-                trmbf_filename = readfixedstring(trmsh, trmbf_filename_len)
-                print(trmbf_filename)
+                                        if vert_buff_param_ptr_type != 0:
+                                            fseek(
+                                                trmsh,
+                                                vert_buff_param_offset
+                                                + vert_buff_param_ptr_type,
+                                            )
+                                            vert_buff_param_type = readlong(trmsh)
+                                        if vert_buff_param_ptr_layer != 0:
+                                            fseek(
+                                                trmsh,
+                                                vert_buff_param_offset
+                                                + vert_buff_param_ptr_layer,
+                                            )
+                                            vert_buff_param_layer = readlong(trmsh)
+                                        if vert_buff_param_ptr_fmt != 0:
+                                            fseek(
+                                                trmsh,
+                                                vert_buff_param_offset
+                                                + vert_buff_param_ptr_fmt,
+                                            )
+                                            vert_buff_param_format = readlong(trmsh)
+                                        if vert_buff_param_ptr_position != 0:
+                                            fseek(
+                                                trmsh,
+                                                vert_buff_param_offset
+                                                + vert_buff_param_ptr_position,
+                                            )
+                                            vert_buff_param_position = readlong(trmsh)
+                                        else:
+                                            # Older meshes leave out the position,
+                                            # attributes are packed back to back.
+                                            vert_buff_param_position = (
+                                                vert_buffer_stride
+                                            )
+                                        vert_attributes.append(
+                                            (
+                                                vert_buff_param_type,
+                                                vert_buff_param_layer,
+                                                vert_buff_param_format,
+                                                vert_buff_param_position,
+                                            )
+                                        )
 
-                trmbf = None
-                if os.path.exists(os.path.join(filep, trmbf_filename)):
-                    trmbf = open(os.path.join(filep, trmbf_filename), "rb")
-                else:
-                    raise AssertionError(f"Can't find {trmbf_filename}!")
-
-                if trmbf != None:
-                    print("Parsing TRMBF...")
-                    trmbf_file_start = readlong(trmbf)
-                    fseek(trmbf, trmbf_file_start)
-                    trmbf_struct = ftell(trmbf) - readlong(trmbf)
-                    fseek(trmbf, trmbf_struct)
-                    trmbf_struct_len = readshort(trmbf)
+                                        # -- Types:
+                                        # -- 0x01: = Positions
+                                        # -- 0x02 = Normals
+                                        # -- 0x03 = Tangents
+                                        # -- 0x05 = Colors
+                                        # -- 0x06 = UVs
+                                        # -- 0x07 = NodeIDs
+                                        # -- 0x08 = Weights
+                                        #
+                                        # -- Formats:
+                                        # -- 0x14 = 4 bytes as float
+                                        # -- 0x16 = 4 bytes
+                                        # -- 0x27 = 4 shorts as float
+                                        # -- 0x2B = 4 half-floats
+                                        # -- 0x30 = 2 floats
+                                        # -- 0x33 = 3 floats
+                                        # -- 0x36 = 4 floats
+                                        print(
+                                            f"vert_buff_param_type = {vert_buff_param_type}"
+                                        )
+                                        if vert_buff_param_type == 0x01:
+                                            if vert_buff_param_layer != 0:
+                                                raise AssertionError(
+                                                    "Unexpected positions layer!"
+                                                )
 
-                    if trmbf_struct_len != 0x0008:
-                        raise AssertionError("Unexpected TRMBF header struct length!")
-                    trmbf_struct_section_len = readshort(trmbf)
-                    trmbf_struct_start = readshort(trmbf)
-                    trmbf_struct_buffer = readshort(trmbf)
+                                            if vert_buff_param_format != 0x33:
+                                                raise AssertionError(
+                                                    "Unexpected positions format!"
+                                                )
 
-                    if trmsh_struct_poly_group != 0:
-                        fseek(trmsh, trmsh_file_start + trmsh_struct_poly_group)
-                        poly_group_start = ftell(trmsh) + readlong(trmsh)
-                        fseek(trmsh, poly_group_start)
-                        poly_group_count = readlong(trmsh)
+                                            positions_fmt = "3Floats"
+                                            vert_buffer_stride = (
+                                                vert_buffer_stride + 0x0C
+                                            )
+                                        elif vert_buff_param_type == 0x02:
+                                            if vert_buff_param_layer != 0:
+                                                raise AssertionError(
+                                                    "Unexpected normals layer!"
+                                                )
 
-                        fseek(trmbf, trmbf_file_start + trmbf_struct_buffer)
-                        vert_buffer_start = ftell(trmbf) + readlong(trmbf)
-                        vert_buffer_count = readlong(trmbf)
+                                            if vert_buff_param_format != 0x2B:
+                                                raise AssertionError(
+                                                    "Unexpected normals format!"
+                                                )
 
-                        for x in range(poly_group_count):
-                            vert_array = []
-                            normal_array = []
-                            color_array = []
-                            alpha_array = []
-                            uv_array = []
-                            uv2_array = []
-                            uv3_array = []
-                            uv4_array = []
-                            face_array = []
-                            face_mat_id_array = []
-                            b1_array = []
-                            w1_array = []
-                            weight_array = []
-                            Morphs_array = []
-                            MorphName_array = []
-                            groupoffset_array = []
-                            poly_group_name = ""
-                            vis_group_name = ""
-                            vert_buffer_stride = 0
-                            mat_id = 0
-                            positions_fmt = "None"
-                            normals_fmt = "None"
-                            tangents_fmt = "None"
-                            bitangents_fmt = "None"
-                            tritangents_fmt = "None"
-                            uvs_fmt = "None"
-                            uvs2_fmt = "None"
-                            uvs3_fmt = "None"
-                            uvs4_fmt = "None"
-                            colors_fmt = "None"
-                            colors2_fmt = "None"
-                            bones_fmt = "None"
-                            weights_fmt = "None"
-                            svunk_fmt = "None"
+                                            normals_fmt = "4HalfFloats"
+                                            vert_buffer_stride = (
+                                                vert_buffer_stride + 0x08
+                                            )
+                                        elif vert_buff_param_type == 0x03:
+                                            if vert_buff_param_layer == 0:
+                                                if vert_buff_param_format != 0x2B:
+                                                    raise AssertionError(
+                                                        "Unexpected tangents format!"
+                                                    )
 
-                            poly_group_offset = ftell(trmsh) + readlong(trmsh)
-                            poly_group_ret = ftell(trmsh)
-                            fseek(trmsh, poly_group_offset)
-                            print(f"PolyGroup offset #{x}: {hex(poly_group_offset)}")
-                            poly_group_struct = ftell(trmsh) - readlong(trmsh)
-                            fseek(trmsh, poly_group_struct)
-                            poly_group_struct_len = readshort(trmsh)
-
-                            if poly_group_struct_len == 0x001E:
-                                poly_group_struct_section_len = readshort(trmsh)
-                                poly_group_struct_ptr_poly_group_name = readshort(trmsh)
-                                poly_group_struct_ptr_bbbox = readshort(trmsh)
-                                poly_group_struct_ptp_unc_a = readshort(trmsh)
-                                poly_group_struct_ptr_vert_buff = readshort(trmsh)
-                                poly_group_struct_ptr_mat_list = readshort(trmsh)
-                                poly_group_struct_ptr_unk_b = readshort(trmsh)
-                                poly_group_struct_ptr_unk_c = readshort(trmsh)
-                                poly_group_struct_ptr_unk_d = readshort(trmsh)
-                                poly_group_struct_ptr_unk_e = readshort(trmsh)
-                                poly_group_struct_ptr_unk_float = readshort(trmsh)
-                                poly_group_struct_ptr_unk_g = readshort(trmsh)
-                                poly_group_struct_ptr_morphname = readshort(trmsh)
-                                poly_group_struct_ptr_vis_group_name = readshort(trmsh)
-                                poly_group_struct_ptr_unk_i = 0
-                                poly_group_struct_ptr_group_name = 0
-                            elif poly_group_struct_len == 0x0022:
-                                poly_group_struct_section_len = readshort(trmsh)
-                                poly_group_struct_ptr_poly_group_name = readshort(trmsh)
-                                poly_group_struct_ptr_bbbox = readshort(trmsh)
-                                poly_group_struct_ptp_unc_a = readshort(trmsh)
-                                poly_group_struct_ptr_vert_buff = readshort(trmsh)
-                                poly_group_struct_ptr_mat_list = readshort(trmsh)
-                                poly_group_struct_ptr_unk_b = readshort(trmsh)
-                                poly_group_struct_ptr_unk_c = readshort(trmsh)
-                                poly_group_struct_ptr_unk_d = readshort(trmsh)
-                                poly_group_struct_ptr_unk_e = readshort(trmsh)
-                                poly_group_struct_ptr_unk_float = readshort(trmsh)
-                                poly_group_struct_ptr_unk_g = readshort(trmsh)
-                                poly_group_struct_ptr_morphname = readshort(trmsh)
-                                poly_group_struct_ptr_vis_group_name = readshort(trmsh)
-                                poly_group_struct_ptr_unk_i = readshort(trmsh)
-                                poly_group_struct_ptr_group_name = readshort(trmsh)
+                                                tangents_fmt = "4HalfFloats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 1:
+                                                if vert_buff_param_format != 0x2B:
+                                                    raise AssertionError(
+                                                        "Unexpected bitangents format!"
+                                                    )
 
-                            if poly_group_struct_ptr_mat_list != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset + poly_group_struct_ptr_mat_list,
-                                )
-                                mat_offset = ftell(trmsh) + readlong(trmsh)
-                                fseek(trmsh, mat_offset)
-                                mat_count = readlong(trmsh)
-                                for y in range(mat_count):
-                                    mat_entry_offset = ftell(trmsh) + readlong(trmsh)
-                                    mat_ret = ftell(trmsh)
-                                    fseek(trmsh, mat_entry_offset)
-                                    mat_struct = ftell(trmsh) - readlong(trmsh)
-                                    fseek(trmsh, mat_struct)
-                                    mat_struct_len = readshort(trmsh)
+                                                bitangents_fmt = "4HalfFloats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 2:
+                                                if vert_buff_param_format != 0x2B:
+                                                    raise AssertionError(
+                                                        "Unexpected tritangents format!"
+                                                    )
 
-                                    if mat_struct_len != 0x000E:
-                                        raise AssertionError(
-                                            "Unexpected material struct length!"
-                                        )
-                                    mat_struct_section_len = readshort(trmsh)
-                                    mat_struct_ptr_facepoint_count = readshort(trmsh)
-                                    mat_struct_ptr_facepoint_start = readshort(trmsh)
-                                    mat_struct_ptr_unk_c = readshort(trmsh)
-                                    mat_struct_ptr_string = readshort(trmsh)
-                                    mat_struct_ptr_unk_d = readshort(trmsh)
+                                                tritangents_fmt = "4HalfFloats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            else:
+                                                raise AssertionError(
+                                                    "Unexpected tangents layer!"
+                                                )
 
-                                    if mat_struct_ptr_facepoint_count != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset
-                                            + mat_struct_ptr_facepoint_count,
-                                        )
-                                        mat_facepoint_count = int(readlong(trmsh) / 3)
+                                        elif vert_buff_param_type == 0x05:
+                                            print(
+                                                f"vert_buff_param_layer = {vert_buff_param_layer}"
+                                            )
+                                            if vert_buff_param_layer == 0:
+                                                print("bufflayer0 confirmed")
+                                                if vert_buff_param_format == 0x14:
+                                                    print(
+                                                        "vert_buff_param_format0x14 confirmed"
+                                                    )
+                                                    colors_fmt = "4BytesAsFloat"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x04
+                                                    )
+                                                elif vert_buff_param_format == 0x16:
+                                                    colors_fmt = "4Bytes"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x04
+                                                    )
+                                                elif vert_buff_param_format == 0x36:
+                                                    print(
+                                                        "vert_buff_param_format0x36 confirmed"
+                                                    )
+                                                    colors_fmt = "4Floats"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x10
+                                                    )
+                                                else:
+                                                    raise AssertionError(
+                                                        hex(vert_buff_param_format)
+                                                    )
+                                            elif vert_buff_param_layer == 1:
+                                                if vert_buff_param_format == 0x14:
+                                                    colors2_fmt = "4BytesAsFloat"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x04
+                                                    )
+                                                elif vert_buff_param_format == 0x16:
+                                                    colors_fmt = "4Bytes"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x04
+                                                    )
+                                                elif vert_buff_param_format == 0x36:
+                                                    colors2_fmt = "4Floats"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x10
+                                                    )
+                                                else:
+                                                    raise AssertionError(
+                                                        "Unexpected colors2 format!"
+                                                    )
 
-                                    if mat_struct_ptr_facepoint_start != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset
-                                            + mat_struct_ptr_facepoint_start,
-                                        )
-                                        mat_facepoint_start = int(readlong(trmsh) / 3)
-                                    else:
-                                        mat_facepoint_start = 0
+                                        elif vert_buff_param_type == 0x06:
+                                            if vert_buff_param_layer == 0:
+                                                if vert_buff_param_format != 0x30:
+                                                    raise AssertionError(
+                                                        "Unexpected UVs format!"
+                                                    )
 
-                                    if mat_struct_ptr_unk_c != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset + mat_struct_ptr_unk_c,
-                                        )
-                                        mat_unk_c = readlong(trmsh)
+                                                uvs_fmt = "2Floats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 1:
+                                                if vert_buff_param_format != 0x30:
+                                                    raise AssertionError(
+                                                        "Unexpected UVs2 format!"
+                                                    )
 
-                                    if mat_struct_ptr_string != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset + mat_struct_ptr_string,
-                                        )
-                                        mat_name_offset = ftell(trmsh) + readlong(trmsh)
-                                        fseek(trmsh, mat_name_offset)
-                                        mat_name_len = readlong(trmsh)
-                                        mat_name = readfixedstring(trmsh, mat_name_len)
+                                                uvs2_fmt = "2Floats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 2:
+                                                if vert_buff_param_format != 0x30:
+                                                    raise AssertionError(
+                                                        "Unexpected UVs3 format!"
+                                                    )
 
-                                    if mat_struct_ptr_unk_d != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset + mat_struct_ptr_unk_d,
-                                        )
-                                        mat_unk_d = readlong(trmsh)
-
-                                    mat_id = 0
-                                    for z in range(len(mat_data_array)):
-                                        if mat_data_array[z]["mat_name"] == mat_name:
-                                            mat_id = z
-                                            break
-
-                                    for z in range(mat_facepoint_count):
-                                        face_mat_id_array.append(mat_id)
-
-                                    print(
-                                        f"Material {mat_name}: FaceCount = {mat_facepoint_count}, FaceStart = {mat_facepoint_start}"
-                                    )
-                                    fseek(trmsh, mat_ret)
-
-                            if poly_group_struct_ptr_poly_group_name != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset
-                                    + poly_group_struct_ptr_poly_group_name,
-                                )
-                                poly_group_name_offset = ftell(trmsh) + readlong(trmsh)
-                                fseek(trmsh, poly_group_name_offset)
-                                poly_group_name_len = readlong(trmsh)
-                                poly_group_name = readfixedstring(
-                                    trmsh, poly_group_name_len
-                                )
-                                print(f"Building {poly_group_name}...")
-
-                            if poly_group_struct_ptr_group_name != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset
-                                    + poly_group_struct_ptr_group_name,
-                                )
-                                group_name_header_offset = ftell(trmsh) + readlong(
-                                    trmsh
-                                )
-                                fseek(trmsh, group_name_header_offset)
-                                group_name_count = readlong(trmsh)
-                                for g in range(group_name_count):
-                                    group_name_offset = ftell(trmsh) + readlong(trmsh)
-                                    groupoffset_array.append(group_name_offset)
-
-                            if poly_group_struct_ptr_vis_group_name != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset
-                                    + poly_group_struct_ptr_vis_group_name,
-                                )
-                                vis_group_name_offset = ftell(trmsh) + readlong(trmsh)
-                                fseek(trmsh, vis_group_name_offset)
-                                vis_group_name_len = readlong(trmsh)
-                                vis_group_name = readfixedstring(
-                                    trmsh, vis_group_name_len
-                                )
-                                # changed the output variable because the original seems to be a typo
-                                print(f"VisGroup: {vis_group_name}")
-                            if poly_group_struct_ptr_morphname != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset + poly_group_struct_ptr_morphname,
-                                )
-                                morph_name_header_offset = ftell(trmsh) + readlong(
-                                    trmsh
-                                )
-                                fseek(trmsh, morph_name_header_offset)
-                                morph_name_count = readlong(trmsh)
-                                for m in range(morph_name_count):
-                                    morph_name_header_offset = ftell(trmsh) + readlong(
-                                        trmsh
-                                    )
-                                    morph_ret = ftell(trmsh)
-                                    fseek(trmsh, morph_name_header_offset)
-                                    morph_name_struct = ftell(trmsh) - readlong(trmsh)
-                                    fseek(trmsh, morph_name_struct)
-                                    morph_name_struct_len = readshort(trmsh)
-                                    if morph_name_struct_len == 0x0008:
-                                        morph_name_struct_section_len = readshort(trmsh)
-                                        morph_name_struct_ptr_ID = readshort(trmsh)
-                                        morph_name_struct_ptr_name = readshort(trmsh)
-                                    else:
-                                        raise AssertionError(
-                                            "Unexpected morph name struct length!"
-                                        )
-                                    fseek(
-                                        trmsh,
-                                        morph_name_header_offset
-                                        + morph_name_struct_ptr_ID,
-                                    )
-                                    morph_name_ID = readlong(trmsh)
-                                    fseek(
-                                        trmsh,
-                                        morph_name_header_offset
-                                        + morph_name_struct_ptr_name,
-                                    )
-                                    morph_name_start = ftell(trmsh) + readlong(trmsh)
-                                    fseek(trmsh, morph_name_start)
-                                    morph_name_len = readlong(trmsh)
-                                    morph_name = readfixedstring(trmsh, morph_name_len)
-                                    MorphName_array.append(morph_name)
-                                    fseek(trmsh, morph_ret)
-                            if poly_group_struct_ptr_vert_buff != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset + poly_group_struct_ptr_vert_buff,
-                                )
-                                poly_group_vert_buff_offset = ftell(trmsh) + readlong(
-                                    trmsh
-                                )
-                                fseek(trmsh, poly_group_vert_buff_offset)
-                                vert_buff_count = readlong(trmsh)
-                                vert_buff_offset = ftell(trmsh) + readlong(trmsh)
-                                fseek(trmsh, vert_buff_offset)
-                                vert_buff_struct = ftell(trmsh) - readlong(trmsh)
-                                fseek(trmsh, vert_buff_struct)
-                                vert_buff_struct_len = readshort(trmsh)
-
-                                if vert_buff_struct_len != 0x0008:
-                                    raise AssertionError(
-                                        "Unexpected VertexBuffer struct length!"
-                                    )
-                                vert_buff_struct_section_len = readshort(trmsh)
-                                vert_buff_struct_ptr_param = readshort(trmsh)
-                                vert_buff_struct_ptr_b = readshort(trmsh)
-
-                                if vert_buff_struct_ptr_param != 0:
-                                    fseek(
-                                        trmsh,
-                                        vert_buff_offset + vert_buff_struct_ptr_param,
-                                    )
-                                    vert_buff_param_offset = ftell(trmsh) + readlong(
-                                        trmsh
-                                    )
-                                    fseek(trmsh, vert_buff_param_offset)
-                                    vert_buff_param_count = readlong(trmsh)
-                                    for y in range(vert_buff_param_count):
-                                        vert_buff_param_offset = ftell(
-                                            trmsh
-                                        ) + readlong(trmsh)
-                                        vert_buff_param_ret = ftell(trmsh)
-                                        fseek(trmsh, vert_buff_param_offset)
-                                        vert_buff_param_struct = ftell(
-                                            trmsh
-                                        ) - readlong(trmsh)
-                                        fseek(trmsh, vert_buff_param_struct)
-                                        vert_buff_param_struct_len = readshort(trmsh)
-
-                                        if vert_buff_param_struct_len == 0x000C:
-                                            vert_buff_param_struct_section_len = (
-                                                readshort(trmsh)
-                                            )
-                                            vert_buff_param_ptr_unk_a = readshort(trmsh)
-                                            vert_buff_param_ptr_type = readshort(trmsh)
-                                            vert_buff_param_ptr_layer = readshort(trmsh)
-                                            vert_buff_param_ptr_fmt = readshort(trmsh)
-                                            vert_buff_param_ptr_position = 0
-                                        elif vert_buff_param_struct_len == 0x000E:
-                                            vert_buff_param_struct_section_len = (
-                                                readshort(trmsh)
-                                            )
-                                            vert_buff_param_ptr_unk_a = readshort(trmsh)
-                                            vert_buff_param_ptr_type = readshort(trmsh)
-                                            vert_buff_param_ptr_layer = readshort(trmsh)
-                                            vert_buff_param_ptr_fmt = readshort(trmsh)
-                                            vert_buff_param_ptr_position = readshort(
-                                                trmsh
-                                            )
-                                        else:
-                                            raise AssertionError(
-                                                "Unknown vertex buffer parameter struct length!"
-                                            )
-
-                                        vert_buff_param_layer = 0
-
-                                        if vert_buff_param_ptr_type != 0:
-                                            fseek(
-                                                trmsh,
-                                                vert_buff_param_offset
-                                                + vert_buff_param_ptr_type,
-                                            )
-                                            vert_buff_param_type = readlong(trmsh)
-                                        if vert_buff_param_ptr_layer != 0:
-                                            fseek(
-                                                trmsh,
-                                                vert_buff_param_offset
-                                                + vert_buff_param_ptr_layer,
-                                            )
-                                            vert_buff_param_layer = readlong(trmsh)
-                                        if vert_buff_param_ptr_fmt != 0:
-                                            fseek(
-                                                trmsh,
-                                                vert_buff_param_offset
-                                                + vert_buff_param_ptr_fmt,
-                                            )
-                                            vert_buff_param_format = readlong(trmsh)
-                                        if vert_buff_param_ptr_position != 0:
-                                            fseek(
-                                                trmsh,
-                                                vert_buff_param_offset
-                                                + vert_buff_param_ptr_position,
-                                            )
-                                            vert_buff_param_position = readlong(trmsh)
-                                        else:
-                                            vert_buff_param_position = 0
+                                                uvs3_fmt = "2Floats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 3:
+                                                if vert_buff_param_format != 0x30:
+                                                    raise AssertionError(
+                                                        "Unexpected UVs4 format!"
+                                                    )
 
-                                        # -- Types:
-                                        # -- 0x01: = Positions
-                                        # -- 0x02 = Normals
-                                        # -- 0x03 = Tangents
-                                        # -- 0x05 = Colors
-                                        # -- 0x06 = UVs
-                                        # -- 0x07 = NodeIDs
-                                        # -- 0x08 = Weights
-                                        #
-                                        # -- Formats:
-                                        # -- 0x14 = 4 bytes as float
-                                        # -- 0x16 = 4 bytes
-                                        # -- 0x27 = 4 shorts as float
-                                        # -- 0x2B = 4 half-floats
-                                        # -- 0x30 = 2 floats
-                                        # -- 0x33 = 3 floats
-                                        # -- 0x36 = 4 floats
-                                        print(
-                                            f"vert_buff_param_type = {vert_buff_param_type}"
-                                        )
-                                        if vert_buff_param_type == 0x01:
+                                                uvs4_fmt = "2Floats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            else:
+                                                raise AssertionError(
+                                                    "Unexpected UVs layer!"
+                                                )
+                                        elif vert_buff_param_type == 0x07:
                                             if vert_buff_param_layer != 0:
                                                 raise AssertionError(
-                                                    "Unexpected positions layer!"
+                                                    "Unexpected node IDs layer!"
                                                 )
 
-                                            if vert_buff_param_format != 0x33:
+                                            if vert_buff_param_format != 0x16:
                                                 raise AssertionError(
-                                                    "Unexpected positions format!"
+                                                    "Unexpected node IDs format!"
                                                 )
 
-                                            positions_fmt = "3Floats"
+                                            bones_fmt = "4Bytes"
                                             vert_buffer_stride = (
-                                                vert_buffer_stride + 0x0C
+                                                vert_buffer_stride + 0x04
                                             )
-                                        elif vert_buff_param_type == 0x02:
+                                        elif vert_buff_param_type == 0x08:
                                             if vert_buff_param_layer != 0:
                                                 raise AssertionError(
-                                                    "Unexpected normals layer!"
+                                                    "Unexpected weights layer!"
                                                 )
 
-                                            if vert_buff_param_format != 0x2B:
+                                            ##if vert_buff_param_format != 0x27:
+                                            ##  raise AssertionError("Unexpected weights format!")
+                                            if vert_buff_param_format == 0x16:
+                                                weights_fmt = "4Bytes"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x04
+                                                )
+                                            else:
+                                                weights_fmt = "4ShortsAsFloat"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                        elif vert_buff_param_type == 0x09:
+                                            if vert_buff_param_layer != 0:
                                                 raise AssertionError(
-                                                    "Unexpected normals format!"
+                                                    "Unexpected ?????? layer!"
                                                 )
 
-                                            normals_fmt = "4HalfFloats"
+                                            if vert_buff_param_format != 0x24:
+                                                raise AssertionError(
+                                                    "Unexpected ?????? layer!"
+                                                )
+
+                                            svunk_fmt = "1Long?"
                                             vert_buffer_stride = (
-                                                vert_buffer_stride + 0x08
-                                            )
-                                        elif vert_buff_param_type == 0x03:
-                                            if vert_buff_param_layer == 0:
-                                                if vert_buff_param_format != 0x2B:
-                                                    raise AssertionError(
-                                                        "Unexpected tangents format!"
-                                                    )
-
-                                                tangents_fmt = "4HalfFloats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 1:
-                                                if vert_buff_param_format != 0x2B:
-                                                    raise AssertionError(
-                                                        "Unexpected bitangents format!"
-                                                    )
-
-                                                bitangents_fmt = "4HalfFloats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 2:
-                                                if vert_buff_param_format != 0x2B:
-                                                    raise AssertionError(
-                                                        "Unexpected tritangents format!"
-                                                    )
-
-                                                tritangents_fmt = "4HalfFloats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            else:
-                                                raise AssertionError(
-                                                    "Unexpected tangents layer!"
-                                                )
-
-                                        elif vert_buff_param_type == 0x05:
-                                            print(
-                                                f"vert_buff_param_layer = {vert_buff_param_layer}"
-                                            )
-                                            if vert_buff_param_layer == 0:
-                                                print("bufflayer0 confirmed")
-                                                if vert_buff_param_format == 0x14:
-                                                    print(
-                                                        "vert_buff_param_format0x14 confirmed"
-                                                    )
-                                                    colors_fmt = "4BytesAsFloat"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x04
-                                                    )
-                                                elif vert_buff_param_format == 0x16:
-                                                    colors_fmt = "4Bytes"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x04
-                                                    )
-                                                elif vert_buff_param_format == 0x36:
-                                                    print(
-                                                        "vert_buff_param_format0x36 confirmed"
-                                                    )
-                                                    colors_fmt = "4Floats"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x10
-                                                    )
-                                                else:
-                                                    raise AssertionError(
-                                                        hex(vert_buff_param_format)
-                                                    )
-                                            elif vert_buff_param_layer == 1:
-                                                if vert_buff_param_format == 0x14:
-                                                    colors2_fmt = "4BytesAsFloat"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x04
-                                                    )
-                                                elif vert_buff_param_format == 0x16:
-                                                    colors_fmt = "4Bytes"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x04
-                                                    )
-                                                elif vert_buff_param_format == 0x36:
-                                                    colors2_fmt = "4Floats"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x10
-                                                    )
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unexpected colors2 format!"
-                                                    )
-
-                                        elif vert_buff_param_type == 0x06:
-                                            if vert_buff_param_layer == 0:
-                                                if vert_buff_param_format != 0x30:
-                                                    raise AssertionError(
-                                                        "Unexpected UVs format!"
-                                                    )
-
-                                                uvs_fmt = "2Floats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 1:
-                                                if vert_buff_param_format != 0x30:
-                                                    raise AssertionError(
-                                                        "Unexpected UVs2 format!"
-                                                    )
-
-                                                uvs2_fmt = "2Floats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 2:
-                                                if vert_buff_param_format != 0x30:
-                                                    raise AssertionError(
-                                                        "Unexpected UVs3 format!"
-                                                    )
-
-                                                uvs3_fmt = "2Floats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 3:
-                                                if vert_buff_param_format != 0x30:
-                                                    raise AssertionError(
-                                                        "Unexpected UVs4 format!"
-                                                    )
-
-                                                uvs4_fmt = "2Floats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            else:
-                                                raise AssertionError(
-                                                    "Unexpected UVs layer!"
-                                                )
-                                        elif vert_buff_param_type == 0x07:
-                                            if vert_buff_param_layer != 0:
-                                                raise AssertionError(
-                                                    "Unexpected node IDs layer!"
-                                                )
-
-                                            if vert_buff_param_format != 0x16:
-                                                raise AssertionError(
-                                                    "Unexpected node IDs format!"
-                                                )
-
-                                            bones_fmt = "4Bytes"
-                                            vert_buffer_stride = (
-                                                vert_buffer_stride + 0x04
-                                            )
-                                        elif vert_buff_param_type == 0x08:
-                                            if vert_buff_param_layer != 0:
-                                                raise AssertionError(
-                                                    "Unexpected weights layer!"
-                                                )
-
-                                            ##if vert_buff_param_format != 0x27:
-                                            ##  raise AssertionError("Unexpected weights format!")
-                                            if vert_buff_param_format == 0x16:
-                                                weights_fmt = "4Bytes"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x04
-                                                )
-                                            else:
-                                                weights_fmt = "4ShortsAsFloat"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                        elif vert_buff_param_type == 0x09:
-                                            if vert_buff_param_layer != 0:
-                                                raise AssertionError(
-                                                    "Unexpected ?????? layer!"
-                                                )
-
-                                            if vert_buff_param_format != 0x24:
-                                                raise AssertionError(
-                                                    "Unexpected ?????? layer!"
-                                                )
-
-                                            svunk_fmt = "1Long?"
-                                            vert_buffer_stride = (
-                                                vert_buffer_stride + 0x04
+                                                vert_buffer_stride + 0x04
                                             )
                                         else:
                                             raise AssertionError("Unknown vertex type!")
@@ -2776,6 +2217,8 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                     "poly_group_name": poly_group_name,
                                     "vis_group_name": vis_group_name,
                                     "vert_buffer_stride": vert_buffer_stride,
+                                    "vert_attributes": vert_attributes,
+                                    "polygon_type": polygon_type,
                                     "positions_fmt": positions_fmt,
                                     "normals_fmt": normals_fmt,
                                     "tangents_fmt": tangents_fmt,
@@ -2797,24 +2240,23 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                             vert_buffer_offset = ftell(trmbf) + readlong(trmbf)
                             vert_buffer_ret = ftell(trmbf)
                             fseek(trmbf, vert_buffer_offset)
-                            vert_buffer_struct = ftell(trmbf) - readlong(trmbf)
-                            fseek(trmbf, vert_buffer_struct)
-                            vert_buffer_struct_len = readshort(trmbf)
-                            print(hex(vert_buffer_struct_len))
-                            if vert_buffer_struct_len == 0x0008:
-                                vert_buffer_struct_section_length = readshort(trmbf)
-                                vert_buffer_struct_ptr_faces = readshort(trmbf)
-                                vert_buffer_struct_ptr_verts = readshort(trmbf)
-                                vert_buffer_struct_ptr_groups = 0
-                            elif vert_buffer_struct_len == 0x000A:
-                                vert_buffer_struct_section_length = readshort(trmbf)
-                                vert_buffer_struct_ptr_faces = readshort(trmbf)
-                                vert_buffer_struct_ptr_verts = readshort(trmbf)
-                                vert_buffer_struct_ptr_groups = readshort(trmbf)
-                            else:
+                            vert_buffer_struct = FlatTable(
+                                trmbf, vert_buffer_offset, TRMBF_BUFFER_SCHEMA
+                            )
+                            print(hex(vert_buffer_struct.vtable_len))
+                            if vert_buffer_struct.vtable_len not in (0x0008, 0x000A):
                                 raise AssertionError(
                                     "Unexpected vertex buffer struct length!"
                                 )
+                            vert_buffer_struct_ptr_faces = vert_buffer_struct.field(
+                                "faces"
+                            )
+                            vert_buffer_struct_ptr_verts = vert_buffer_struct.field(
+                                "verts"
+                            )
+                            vert_buffer_struct_ptr_groups = vert_buffer_struct.field(
+                                "groups"
+                            )
 
                             if vert_buffer_struct_ptr_verts != 0:
                                 fseek(
@@ -2839,20 +2281,19 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                         print(
                                             f"Vertex buffer {x} morph {y} header: {hex(ftell(trmbf))}"
                                         )
-                                    vert_buffer_sub_struct = ftell(trmbf) - readlong(
-                                        trmbf
+                                    vert_buffer_sub_struct = FlatTable(
+                                        trmbf,
+                                        vert_buffer_sub_offset,
+                                        TRMBF_BYTES_SCHEMA,
                                     )
-                                    fseek(trmbf, vert_buffer_sub_struct)
-                                    vert_buffer_sub_struct_len = readshort(trmbf)
 
-                                    if vert_buffer_sub_struct_len != 0x0006:
+                                    if vert_buffer_sub_struct.vtable_len != 0x0006:
                                         raise AssertionError(
                                             "Unexpected vertex buffer struct length!"
                                         )
-                                    vert_buffer_sub_struct_section_length = readshort(
-                                        trmbf
+                                    vert_buffer_sub_struct_ptr = (
+                                        vert_buffer_sub_struct.field("bytes")
                                     )
-                                    vert_buffer_sub_struct_ptr = readshort(trmbf)
 
                                     if vert_buffer_sub_struct_ptr != 0:
                                         fseek(
@@ -2870,347 +2311,58 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                                 f"Vertex buffer {x} start: {hex(ftell(trmbf))}"
                                             )
 
-                                            for v in range(
-                                                vert_buffer_byte_count
-                                                // poly_group_array[x][
+                                            vertices = read_vert_buffer(
+                                                trmbf,
+                                                poly_group_array[x]["vert_attributes"],
+                                                poly_group_array[x][
                                                     "vert_buffer_stride"
-                                                ]
-                                            ):
-                                                if (
-                                                    poly_group_array[x]["positions_fmt"]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    vx = readhalffloat(trmbf)
-                                                    vy = readhalffloat(trmbf)
-                                                    vz = readhalffloat(trmbf)
-                                                    vq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["positions_fmt"]
-                                                    == "3Floats"
-                                                ):
-                                                    vx = readfloat(trmbf)
-                                                    vy = readfloat(trmbf)
-                                                    vz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown positions type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x]["normals_fmt"]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    nx = readhalffloat(trmbf)
-                                                    ny = readhalffloat(trmbf)
-                                                    nz = readhalffloat(trmbf)
-                                                    nq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["normals_fmt"]
-                                                    == "3Floats"
-                                                ):
-                                                    nx = readfloat(trmbf)
-                                                    ny = readfloat(trmbf)
-                                                    nz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown normals type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x]["tangents_fmt"]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x]["tangents_fmt"]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    tanx = readhalffloat(trmbf)
-                                                    tany = readhalffloat(trmbf)
-                                                    tanz = readhalffloat(trmbf)
-                                                    tanq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["tangents_fmt"]
-                                                    == "3Floats"
-                                                ):
-                                                    tanx = readfloat(trmbf)
-                                                    tany = readfloat(trmbf)
-                                                    tanz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown tangents type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x][
-                                                        "bitangents_fmt"
-                                                    ]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x][
-                                                        "bitangents_fmt"
-                                                    ]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    bitanx = readhalffloat(trmbf)
-                                                    bitany = readhalffloat(trmbf)
-                                                    bitanz = readhalffloat(trmbf)
-                                                    bitanq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x][
-                                                        "bitangents_fmt"
-                                                    ]
-                                                    == "3Floats"
-                                                ):
-                                                    bitanx = readfloat(trmbf)
-                                                    bitany = readfloat(trmbf)
-                                                    bitanz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown bitangents type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x][
-                                                        "tritangents_fmt"
-                                                    ]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x][
-                                                        "tritangents_fmt"
-                                                    ]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    tritanx = readhalffloat(trmbf)
-                                                    tritany = readhalffloat(trmbf)
-                                                    tritanz = readhalffloat(trmbf)
-                                                    tritanq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x][
-                                                        "tritangents_fmt"
-                                                    ]
-                                                    == "3Floats"
-                                                ):
-                                                    tritanx = readfloat(trmbf)
-                                                    tritany = readfloat(trmbf)
-                                                    tritanz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown bitangents type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x]["uvs_fmt"]
-                                                    == "None"
-                                                ):
-                                                    tu = 0
-                                                    tv = 0
-                                                elif (
-                                                    poly_group_array[x]["uvs_fmt"]
-                                                    == "2Floats"
-                                                ):
-                                                    tu = readfloat(trmbf)
-                                                    tv = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown uvs type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x]["uvs2_fmt"]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x]["uvs2_fmt"]
-                                                    == "2Floats"
-                                                ):
-                                                    tu2 = readfloat(trmbf)
-                                                    tv2 = readfloat(trmbf)
-                                                    uv2_array.append((tu2, tv2))
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown uvs2 type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x]["uvs3_fmt"]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x]["uvs3_fmt"]
-                                                    == "2Floats"
-                                                ):
-                                                    tu3 = readfloat(trmbf)
-                                                    tv3 = readfloat(trmbf)
-                                                    uv3_array.append((tu3, tv3))
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown uvs3 type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x]["uvs4_fmt"]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x]["uvs4_fmt"]
-                                                    == "2Floats"
-                                                ):
-                                                    tu4 = readfloat(trmbf)
-                                                    tv4 = readfloat(trmbf)
-                                                    uv4_array.append((tu4, tv4))
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown uvs4 type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x]["colors_fmt"]
-                                                    == "None"
-                                                ):
-                                                    colorr = 255
-                                                    colorg = 255
-                                                    colorb = 255
-                                                    colora = 1
-                                                elif (
-                                                    poly_group_array[x]["colors_fmt"]
-                                                    == "4BytesAsFloat"
-                                                ):
-                                                    colorr = readbyte(trmbf)
-                                                    colorg = readbyte(trmbf)
-                                                    colorb = readbyte(trmbf)
-                                                    colora = readbyte(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["colors_fmt"]
-                                                    == "4Floats"
-                                                ):
-                                                    colorr = readfloat(trmbf) * 255
-                                                    colorg = readfloat(trmbf) * 255
-                                                    colorb = readfloat(trmbf) * 255
-                                                    colora = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown colors type!"
-                                                    )
-
-                                                if (
-                                                    poly_group_array[x]["colors2_fmt"]
-                                                    == "None"
-                                                ):
-                                                    colorr2 = 255
-                                                    colorg2 = 255
-                                                    colorb2 = 255
-                                                    colora2 = 1
-                                                elif (
-                                                    poly_group_array[x]["colors2_fmt"]
-                                                    == "4BytesAsFloat"
-                                                ):
-                                                    colorr2 = readbyte(trmbf)
-                                                    colorg2 = readbyte(trmbf)
-                                                    colorb2 = readbyte(trmbf)
-                                                    colora2 = readbyte(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["colors2_fmt"]
-                                                    == "4Floats"
-                                                ):
-                                                    colorr2 = readfloat(trmbf) * 255
-                                                    colorg2 = readfloat(trmbf) * 255
-                                                    colorb2 = readfloat(trmbf) * 255
-                                                    colora2 = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown colors 2 type!"
+                                                ],
+                                                vert_buffer_byte_count,
+                                            )
+                                            vert_names = vertices.dtype.names
+                                            vert_array = vertices["position0"]
+                                            normal_array = vertices["normal0"][:, :3]
+                                            if "uv0" in vert_names:
+                                                uv_array = vertices["uv0"]
+                                            else:
+                                                uv_array = np.zeros(
+                                                    (len(vertices), 2), dtype=np.float32
+                                                )
+                                            if "uv1" in vert_names:
+                                                uv2_array = vertices["uv1"]
+                                            if "uv2" in vert_names:
+                                                uv3_array = vertices["uv2"]
+                                            if "uv3" in vert_names:
+                                                uv4_array = vertices["uv3"]
+
+                                            if "color0" in vert_names:
+                                                colors = vertices["color0"]
+                                                if colors.dtype == np.float32:
+                                                    colors = colors * (
+                                                        255.0,
+                                                        255.0,
+                                                        255.0,
+                                                        1.0,
                                                     )
+                                                color_array = colors[:, :3]
+                                                alpha_array = colors[:, 3]
 
-                                                if (
-                                                    poly_group_array[x]["bones_fmt"]
-                                                    == "None"
-                                                ):
-                                                    bone1 = 0
-                                                    bone2 = 0
-                                                    bone3 = 0
-                                                    bone4 = 0
-                                                elif (
-                                                    poly_group_array[x]["bones_fmt"]
-                                                    == "4Bytes"
-                                                ):
-                                                    bone1 = readbyte(trmbf)
-                                                    bone2 = readbyte(trmbf)
-                                                    bone3 = readbyte(trmbf)
-                                                    bone4 = readbyte(trmbf)
+                                            if read_weights:
+                                                if "bones0" in vert_names:
+                                                    b1_array = vertices["bones0"]
                                                 else:
-                                                    raise AssertionError(
-                                                        "Unknown bones type!"
+                                                    b1_array = np.zeros(
+                                                        (len(vertices), 4),
+                                                        dtype=np.uint8,
                                                     )
-
-                                                if (
-                                                    poly_group_array[x]["weights_fmt"]
-                                                    == "None"
-                                                ):
-                                                    weight1 = 0
-                                                    weight2 = 0
-                                                    weight3 = 0
-                                                    weight4 = 0
-                                                elif (
-                                                    poly_group_array[x]["weights_fmt"]
-                                                    == "4ShortsAsFloat"
-                                                ):
-                                                    weight1 = readshort(trmbf) / 65535
-                                                    weight2 = readshort(trmbf) / 65535
-                                                    weight3 = readshort(trmbf) / 65535
-                                                    weight4 = readshort(trmbf) / 65535
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown weights type!"
+                                                if "weights0" in vert_names:
+                                                    w1_array = unorm_weights(
+                                                        vertices["weights0"]
                                                     )
-
-                                                if (
-                                                    poly_group_array[x]["svunk_fmt"]
-                                                    == "None"
-                                                ):
-                                                    SVUnk = 0
-                                                elif (
-                                                    poly_group_array[x]["svunk_fmt"]
-                                                    == "1Long?"
-                                                ):
-                                                    SVUnk = readlong(trmbf)
                                                 else:
-                                                    raise AssertionError(
-                                                        "Unknown ?????? type!"
-                                                    )
-
-                                                vert_array.append((vx, vy, vz))
-                                                normal_array.append((nx, ny, nz))
-
-                                                uv_array.append((tu, tv))
-
-                                                color_array.append(
-                                                    (colorr, colorg, colorb)
-                                                )
-                                                alpha_array.append(colora)
-                                                if trskl is not None or bone_structure is not None:
-                                                    w1_array.append(
-                                                        {
-                                                            "weight1": weight1,
-                                                            "weight2": weight2,
-                                                            "weight3": weight3,
-                                                            "weight4": weight4,
-                                                        }
-                                                    )
-                                                    b1_array.append(
-                                                        {
-                                                            "bone1": bone1,
-                                                            "bone2": bone2,
-                                                            "bone3": bone3,
-                                                            "bone4": bone4,
-                                                        }
+                                                    w1_array = np.zeros(
+                                                        (len(vertices), 4),
+                                                        dtype=np.float32,
                                                     )
 
                                             print(
@@ -3220,29 +2372,23 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                             print(
                                                 f"Vertex buffer {x} morph {y} start: {hex(ftell(trmbf))}"
                                             )
-                                            MorphVert_array = []
-                                            MorphNormal_array = []
-                                            for v in range(
-                                                int(vert_buffer_byte_count / 0x1C)
-                                            ):
-                                                # Morphs always seem to use this setup.
-                                                vx = readfloat(trmbf)
-                                                vy = readfloat(trmbf)
-                                                vz = readfloat(trmbf)
-                                                nx = readhalffloat(trmbf)
-                                                ny = readhalffloat(trmbf)
-                                                nz = readhalffloat(trmbf)
-                                                nq = readhalffloat(trmbf)
-                                                tanx = readhalffloat(trmbf)
-                                                tany = readhalffloat(trmbf)
-                                                tanz = readhalffloat(trmbf)
-                                                tanq = readhalffloat(trmbf)
-                                                MorphVert_array.append((vx, vy, vz))
-                                                MorphNormal_array.append((nx, ny, nz))
+                                            morph = read_morph_buffer(
+                                                trmbf, vert_buffer_byte_count
+                                            )
                                             print(
                                                 f"Vertex buffer {x} morph {y} end: {hex(ftell(trmbf))}"
                                             )
-                                            Morphs_array.append(MorphVert_array)
+                                            # Holds every vertex's morphed position.
+                                            morph_deltas = morph_position_deltas(
+                                                morph, vert_array
+                                            )
+                                            changed = morph_deltas.any(axis=1)
+                                            Morphs_array.append(
+                                                (
+                                                    np.flatnonzero(changed),
+                                                    morph_deltas[changed],
+                                                )
+                                            )
                                             # TODO: Continue implementing after line 3814
                                     fseek(trmbf, vert_buffer_sub_ret)
 
@@ -3260,16 +2406,17 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                     face_buff_ret = ftell(trmbf)
                                     fseek(trmbf, face_buff_offset)
                                     print(f"Facepoint {x} header: {hex(ftell(trmbf))}")
-                                    face_buff_struct = ftell(trmbf) - readlong(trmbf)
-                                    fseek(trmbf, face_buff_struct)
-                                    face_buff_struct_len = readshort(trmbf)
+                                    face_buff_struct = FlatTable(
+                                        trmbf, face_buff_offset, TRMBF_BYTES_SCHEMA
+                                    )
 
-                                    if face_buff_struct_len != 0x0006:
+                                    if face_buff_struct.vtable_len != 0x0006:
                                         raise AssertionError(
                                             "Unexpected face buffer struct length!"
                                         )
-                                    face_buffer_struct_section_length = readshort(trmbf)
-                                    face_buffer_struct_ptr = readshort(trmbf)
+                                    face_buffer_struct_ptr = face_buff_struct.field(
+                                        "bytes"
+                                    )
 
                                     if face_buffer_struct_ptr != 0:
                                         fseek(
@@ -3283,20 +2430,15 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                             f"Facepoint {x} start: {hex(ftell(trmbf))}"
                                         )
 
-                                        if (
-                                            len(vert_array) > 65536
-                                        ):  # is this a typo? I would imagine it to be 65535
-                                            for v in range(facepoint_byte_count // 12):
-                                                fa = readlong(trmbf)
-                                                fb = readlong(trmbf)
-                                                fc = readlong(trmbf)
-                                                face_array.append([fa, fb, fc])
-                                        else:
-                                            for v in range(facepoint_byte_count // 6):
-                                                fa = readshort(trmbf)
-                                                fb = readshort(trmbf)
-                                                fc = readshort(trmbf)
-                                                face_array.append([fa, fb, fc])
+                                        faces = read_face_buffer(
+                                            trmbf,
+                                            poly_group_array[x]["polygon_type"],
+                                            facepoint_byte_count,
+                                            len(vert_array),
+                                        )
+                                        if len(face_array) > 0:
+                                            faces = np.concatenate((face_array, faces))
+                                        face_array = faces
                                         print(f"Facepoint {x} end: {hex(ftell(trmbf))}")
                                     fseek(trmbf, face_buff_ret)
 
@@ -3396,7 +2538,7 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                             MorphName_array.append(group_morphname)
                                             fseek(trmsh, group_morhpnameret)
 
-                                        MorphVertIDs_array = []
+                                        MorphVertIDs_array = None
                                         group_offset = ftell(trmbf) + readlong(trmbf)
                                         group_ret = ftell(trmbf)
                                         fseek(trmbf, group_offset)
@@ -3457,3618 +2599,5067 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, basearmature):
                                             ) + readlong(trmbf)
                                             morphbuffergroupsbytecount = readlong(trmbf)
                                             if y == 0:
-                                                for v in range(
-                                                    morphbuffergroupsbytecount // 0x04
-                                                ):
-                                                    MorphVertID = readlong(trmbf)
-                                                    MorphVertIDs_array.append(
-                                                        MorphVertID
-                                                    )
+                                                MorphVertIDs_array = np.frombuffer(
+                                                    trmbf.buffer,
+                                                    "<u4",
+                                                    morphbuffergroupsbytecount // 0x04,
+                                                    ftell(trmbf),
+                                                )
                                             else:
-                                                MorphVert_array = []
-                                                MorphNormal_array = []
-                                                for v in range(len(vert_array)):
-                                                    MorphVert_array.append(
-                                                        vert_array[v]
-                                                    )
-                                                    MorphNormal_array.append(
-                                                        normal_array[v]
-                                                    )
-                                                for v in range(
-                                                    morphbuffergroupsbytecount // 0x1C
-                                                ):
-                                                    # Morphs always seem to use this setup.
-                                                    vx = readfloat(trmbf)
-                                                    vy = readfloat(trmbf)
-                                                    vz = readfloat(trmbf)
-                                                    nx = readhalffloat(trmbf)
-                                                    ny = readhalffloat(trmbf)
-                                                    nz = readhalffloat(trmbf)
-                                                    nq = readhalffloat(trmbf)
-                                                    tanx = readhalffloat(trmbf)
-                                                    tany = readhalffloat(trmbf)
-                                                    tanz = readhalffloat(trmbf)
-                                                    tanq = readhalffloat(trmbf)
-                                                    if MorphVertIDs_array[v] != 0:
-                                                        MorphVert_array[
-                                                            MorphVertIDs_array[v]
-                                                        ] = [
-                                                            vert_array[
-                                                                MorphVertIDs_array[v]
-                                                            ][0]
-                                                            + vx,
-                                                            vert_array[
-                                                                MorphVertIDs_array[v]
-                                                            ][1]
-                                                            + vy,
-                                                            vert_array[
-                                                                MorphVertIDs_array[v]
-                                                            ][2]
-                                                            + vz,
-                                                        ]
-                                                        MorphNormal_array[
-                                                            MorphVertIDs_array[v]
-                                                        ] = [
-                                                            vert_array[
-                                                                MorphVertIDs_array[v]
-                                                            ][0]
-                                                            + nx,
-                                                            vert_array[
-                                                                MorphVertIDs_array[v]
-                                                            ][1]
-                                                            + ny,
-                                                            vert_array[
-                                                                MorphVertIDs_array[v]
-                                                            ][2]
-                                                            + nz,
-                                                        ]
+                                                morph = read_morph_buffer(
+                                                    trmbf, morphbuffergroupsbytecount
+                                                )
+                                                morph_ids = MorphVertIDs_array[
+                                                    : len(morph)
+                                                ]
+                                                changed = morph_ids != 0
                                                 print(
                                                     f"Group {x} morph {y} end: {hex(ftell(trmbf))}"
                                                 )
-                                                Morphs_array.append(MorphVert_array)
+                                                Morphs_array.append(
+                                                    (
+                                                        morph_ids[changed],
+                                                        morph["position"][changed],
+                                                    )
+                                                )
                                             fseek(trmbf, groupret)
                                         fseek(trmbf, group_ret)
                             fseek(trmbf, vert_buffer_ret)
 
-                            print("Making object...")
-
-                            for b in range(len(w1_array)):
-                                w = {"boneids": [], "weights": []}
-                                maxweight = (
-                                    w1_array[b]["weight1"]
-                                    + w1_array[b]["weight2"]
-                                    + w1_array[b]["weight3"]
-                                    + w1_array[b]["weight4"]
-                                )
-
-                                if maxweight > 0:
-                                    if w1_array[b]["weight1"] > 0:
-                                        w["boneids"].append(b1_array[b]["bone1"])
-                                        w["weights"].append(w1_array[b]["weight1"])
-                                    if w1_array[b]["weight2"] > 0:
-                                        w["boneids"].append(b1_array[b]["bone2"])
-                                        w["weights"].append(w1_array[b]["weight2"])
-                                    if w1_array[b]["weight3"] > 0:
-                                        w["boneids"].append(b1_array[b]["bone3"])
-                                        w["weights"].append(w1_array[b]["weight3"])
-                                    if w1_array[b]["weight4"] > 0:
-                                        w["boneids"].append(b1_array[b]["bone4"])
-                                        w["weights"].append(w1_array[b]["weight4"])
-
-                                weight_array.append(w)
-
-                            if IN_BLENDER_ENV:
-                                # LINE 3257
-
-                                new_mesh = bpy.data.meshes.new(
-                                    f"{poly_group_name}_mesh"
-                                )
-                                new_mesh.from_pydata(vert_array, [], face_array)
-                                new_mesh.update()
-                                for p in new_mesh.polygons:
-                                    p.use_smooth = True
-                                new_object = bpy.data.objects.new(
-                                    poly_group_name, new_mesh
-                                )
-                                if len(MorphName_array) > 0:
-                                    sk_basis = new_object.shape_key_add(name="Basis")
-                                    sk_basis.interpolation = "KEY_LINEAR"
-                                    new_object.data.shape_keys.use_relative = True
-                                    print(MorphName_array)
-                                    for m in range(len(MorphName_array)):
-                                        sk = new_object.shape_key_add(
-                                            name=MorphName_array[m]
-                                        )
-                                        for i in range(len(Morphs_array[m])):
-                                            sk.data[i].co = Morphs_array[m][i]
-
-                                if bone_structure != None:
-                                    new_object.parent = bone_structure
-                                    new_object.modifiers.new(
-                                        name="Skeleton", type="ARMATURE"
-                                    )
-                                    new_object.modifiers["Skeleton"].object = (
-                                        bone_structure
-                                    )
-
-                                    for face in new_object.data.polygons:
-                                        for vert_idx, loop_idx in zip(
-                                            face.vertices, face.loop_indices
-                                        ):
-                                            print(len(weight_array))
-                                            print(vert_idx)
-                                            w = weight_array[vert_idx]
-                                            for i in range(len(w["boneids"])):
-                                                try:
-                                                    bone_id = bone_id_map[
-                                                        w["boneids"][i]
-                                                    ]
-                                                except:
-                                                    bone_id = None
-                                                if bone_id:
-                                                    weight = w["weights"][i]
-
-                                                    group = None
-                                                    if (
-                                                        new_object.vertex_groups.get(
-                                                            bone_id
-                                                        )
-                                                        == None
-                                                    ):
-                                                        group = new_object.vertex_groups.new(
-                                                            name=bone_id
-                                                        )
-                                                    else:
-                                                        group = (
-                                                            new_object.vertex_groups[
-                                                                bone_id
-                                                            ]
-                                                        )
-
-                                                    group.add(
-                                                        [vert_idx], weight, "REPLACE"
-                                                    )
-
-                                # # vertex colours
-                                color_layer = new_object.data.vertex_colors.new(
-                                    name="Color"
-                                )
-                                new_object.data.vertex_colors.active = color_layer
-                                # print(f"color_array: {len(color_array)}")
-                                # print(f"polygons: {len(new_object.data.polygons)}")
-                                for i, poly in enumerate(new_object.data.polygons):
-                                    # print(f"poly: {i}")
-                                    for v, vert in enumerate(poly.vertices):
-                                        loop_index = poly.loop_indices[v]
-
-                                        # print(f"loop_index: {loop_index}")
-                                        # print(color_array[vert][0], color_array[vert][1], color_array[vert][2], alpha_array[vert])
-
-                                        if alpha_array[vert] == 0:
-                                            alpha_array[vert] = 1
-                                        color_layer.data[loop_index].color = (
-                                            color_array[vert][0] / alpha_array[vert],
-                                            color_array[vert][1] / alpha_array[vert],
-                                            color_array[vert][2] / alpha_array[vert],
-                                            alpha_array[vert],
-                                        )
-
-                                for mat in materials:
-                                    new_object.data.materials.append(mat)
-
-                                # materials
-
-                                # uvs
-                                uv_layers = new_object.data.uv_layers
-                                uv_layer = uv_layers.new(name="UVMap")
-                                if len(uv2_array) > 0:
-                                    uv2_layer = uv_layers.new(name="UV2Map")
-                                if len(uv3_array) > 0:
-                                    uv3_layer = uv_layers.new(name="UV3Map")
-                                if len(uv4_array) > 0:
-                                    uv4_layer = uv_layers.new(name="UV4Map")
-                                uv_layers.active = uv_layer
-
-                                for i, poly in enumerate(new_object.data.polygons):
-                                    poly.material_index = face_mat_id_array[i]
-
-                                for face in new_object.data.polygons:
-                                    for vert_idx, loop_idx in zip(
-                                        face.vertices, face.loop_indices
-                                    ):
-                                        uv_layer.data[loop_idx].uv = uv_array[vert_idx]
-                                        if len(uv2_array) > 0:
-                                            uv2_layer.data[loop_idx].uv = uv2_array[
-                                                vert_idx
-                                            ]
-                                        if len(uv3_array) > 0:
-                                            uv3_layer.data[loop_idx].uv = uv3_array[
-                                                vert_idx
-                                            ]
-                                        if len(uv4_array) > 0:
-                                            uv4_layer.data[loop_idx].uv = uv4_array[
-                                                vert_idx
-                                            ]
-
-                                # normals
-                                if bpy.app.version < (4, 1, 0):
-                                    new_object.data.use_auto_smooth = True
-                                new_object.data.normals_split_custom_set_from_vertices(
-                                    normal_array
-                                )
-                                # add object to scene collection
-                                new_collection.objects.link(new_object)
-
-
-class PokeArcImport(Operator, ImportHelper):
-    """Open a TRMDL file from Pokémon Legends Arceus"""
-    bl_idname = "custom_import_scene.pokemonlegendsarceus"
-    bl_label = "Import"
-    bl_options = {"PRESET", "UNDO"}
-    filename_ext = ".trmdl"
-    filter_glob: StringProperty(
-        default="*.trmdl",
-        options={"HIDDEN"},
-        maxlen=255,
-    )
-    filepath = bpy.props.StringProperty(
-        subtype="FILE_PATH",
-    )
-    files = CollectionProperty(type=bpy.types.PropertyGroup)
-    rare: BoolProperty(
-        name="Load Shiny",
-        description="Uses rare material instead of normal one",
-        default=False,
-    )
-    multiple: BoolProperty(
-        name="Load All Folder",
-        description="Uses rare material instead of normal one",
-        default=False,
-    )
-    loadlods: BoolProperty(
-        name="Load LODS",
-        description="Uses rare material instead of normal one",
-        default=False,
-    )
-    def draw(self, context):
-        layout = self.layout
-        box = layout.box()
-        box.prop(self, "rare")
-        box = layout.box()
-        box.prop(self, "multiple")
-        box = layout.box()
-        box.prop(self, "loadlods")
-    def execute(self, context):
-        directory = os.path.dirname(self.filepath)
-        if self.multiple == False:
-            filename = os.path.basename(self.filepath)
-            f = open(os.path.join(directory, filename), "rb")
-            from_trmdl(directory, f, self.rare, self.loadlods)
-            f.close()
-            return {"FINISHED"}
-        else:
-            file_list = sorted(os.listdir(directory))
-            obj_list = [item for item in file_list if item.endswith(".trmdl")]
-            for item in obj_list:
-                f = open(os.path.join(directory, item), "rb")
-                from_trmdl(directory, f, self.rare, self.loadlods)
-                f.close()
-            return {"FINISHED"}
-
+                            poly_groups.append(
+                                {
+                                    "poly_group_name": poly_group_name,
+                                    "colors_fmt": colors_fmt,
+                                    "vert_array": vert_array,
+                                    "normal_array": normal_array,
+                                    "color_array": color_array,
+                                    "alpha_array": alpha_array,
+                                    "uv_arrays": (
+                                        uv_array,
+                                        uv2_array,
+                                        uv3_array,
+                                        uv4_array,
+                                    ),
+                                    "face_array": face_array,
+                                    "face_mat_id_array": face_mat_id_array,
+                                    "bone_indices": b1_array,
+                                    "bone_weights": w1_array,
+                                    "morph_names": MorphName_array,
+                                    "morphs": Morphs_array,
+                                }
+                            )
+                        trmbf_path = trmbf.name
+                        meshes = {"poly_groups": poly_groups, "trmbf_path": trmbf_path}
+                        parse_cache.put(trmsh_path, mesh_context, meshes, [trmbf_path])
+                        disk_cache.put_meshes(trmsh_entry, poly_groups, trmbf_path)
+        lods.append(poly_groups)
+        buffer_paths.append(trmbf_path)
+
+    model = ModelData(trmdl.name, options)
+    model.chara_check = chara_check
+    if skeleton_path is not None:
+        model.skeleton_name = trskl_name
+        model.skeleton_path = skeleton_path
+    model.bones = bones
+    model.materials = mat_data_array
+    if trmtr is not None:
+        model.materials_path = trmtr.name
+    model.lods = lods
+    model.lod_paths = [
+        dir_index.path(name) if dir_index.exists(name) else None
+        for name in trmsh_lods_array[:trmsh_count]
+    ]
+    model.buffer_paths = buffer_paths
+    return model
+
+
+def build_trmdlsv(model, dir_index, image_cache=None, material_cache=None):
+    """Creates the Blender data for a model read by parse_trmdlsv."""
+    bonestructh = model.options["bonestructh"]
+    basearmature = model.options["basearmature"]
+    bones = model.bones
+    mat_data_array = model.materials
 
-def from_trmdl(filep, trmdl, rare, loadlods):
     # make collection
+    base_armature = None
     if IN_BLENDER_ENV:
-        new_collection = bpy.data.collections.new(os.path.basename(trmdl.name))
-        bpy.context.scene.collection.children.link(new_collection)
+        if basearmature == "assigntobase":
+            base_armature = armature_registry.find("p0_base.trskl")
+            if base_armature is not None:
+                new_collection = base_armature["object"].users_collection[0]
+            else:
+                for collection in bpy.data.collections:
+                    for obj in collection.all_objects:
+                        if obj.data.name == "p0_base.trskl":
+                            new_collection = collection
+                            break
+        else:
+            new_collection = bpy.data.collections.new(
+                os.path.basename(model.filepath[:-6])
+            )
+            bpy.context.scene.collection.children.link(new_collection)
 
     textureextension = ".png"
+    if image_cache is None:
+        image_cache = ImageCache()
+    if material_cache is None:
+        material_cache = MaterialCache()
 
     materials = []
     bone_structure = None
-
-    trskl = None
-    trmsh = None
-    trmtr = None
-
-    trmsh_lods_array = []
     bone_array = []
     bone_id_map = {}
     bone_rig_array = []
-    trskl_bone_adjust = 0
-    chara_check = "None"
 
-    print("Parsing TRMDL...")
-
-    trmdl_file_start = readlong(trmdl)
-    fseek(trmdl, trmdl_file_start)
-    trmdl_struct = ftell(trmdl) - readlong(trmdl)
-    fseek(trmdl, trmdl_struct)
-    trmdl_struct_len = readshort(trmdl)
-
-    if trmdl_struct_len == 0x0012:
-        trmdl_struct_section_len = readshort(trmdl)
-        trmdl_struct_start = readshort(trmdl)
-        trmdl_struct_trmsh = readshort(trmdl)
-        trmdl_struct_trskl = readshort(trmdl)
-        trmdl_struct_trmtr = readshort(trmdl)
-        trmdl_struct_custom = readshort(trmdl)
-        trmdl_struct_bound_box = readshort(trmdl)
-        trmdl_struct_float = readshort(trmdl)
-    elif trmdl_struct_len == 0x0014:  # ScarletViolet Only
-        trmdl_struct_section_len = readshort(trmdl)
-        trmdl_struct_start = readshort(trmdl)
-        trmdl_struct_trmsh = readshort(trmdl)
-        trmdl_struct_trskl = readshort(trmdl)
-        trmdl_struct_trmtr = readshort(trmdl)
-        trmdl_struct_custom = readshort(trmdl)
-        trmdl_struct_bound_box = readshort(trmdl)
-        trmdl_struct_float = readshort(trmdl)
-        trmdl_struct_trltt = readshort(trmdl)
-    elif trmdl_struct_len == 0x0018:  # ScarletViolet Only
-        trmdl_struct_section_len = readshort(trmdl)
-        trmdl_struct_start = readshort(trmdl)
-        trmdl_struct_trmsh = readshort(trmdl)
-        trmdl_struct_trskl = readshort(trmdl)
-        trmdl_struct_trmtr = readshort(trmdl)
-        trmdl_struct_custom = readshort(trmdl)
-        trmdl_struct_bound_box = readshort(trmdl)
-        trmdl_struct_float = readshort(trmdl)
-        trmdl_struct_trltt = readshort(trmdl)
-        trmdl_struct_unka = readshort(trmdl)
-        trmdl_struct_unkb = readshort(trmdl)
-    else:
-        raise AssertionError("Unexpected TRMDL header struct length!")
+    if basearmature == "assigntobase":
+        if base_armature is not None:
+            bone_structure = base_armature["object"]
+            if bones is None:
+                bone_id_map.update(base_armature["bone_id_map"])
+        elif IN_BLENDER_ENV:
+            bone_structure = bpy.data.objects.get(new_collection.name + ".trmdl")
+
+    if basearmature == "loadbasearm" and model.skeleton_path is not None:
+        base_armature = armature_registry.get(model.skeleton_path, ("sv", bonestructh))
+        if base_armature is not None:
+            print("Using built base armature...")
+            bones = None
+            bone_structure = base_armature["object"]
+            bone_id_map.update(base_armature["bone_id_map"])
+            bone_rig_array.extend(base_armature["bone_rig_array"])
+        elif bones is None:
+            print("Base armature is gone since the parse, parsing its TRSKL")
+            reparsed = parse_model(model.filepath, model.options, dir_index, None, ())
+            bones = reparsed.bones
+
+    if bones is not None:
+        if IN_BLENDER_ENV:
+            new_armature = bpy.data.armatures.new(os.path.basename(model.skeleton_name))
+            bone_structure = bpy.data.objects.new(
+                os.path.basename(model.filepath), new_armature
+            )
+            new_collection.objects.link(bone_structure)
+            bpy.context.view_layer.objects.active = bone_structure
+            bpy.ops.object.editmode_toggle()
 
-    if trmdl_struct_trmsh != 0:
-        fseek(trmdl, trmdl_file_start + trmdl_struct_trmsh)
-        trmsh_start = ftell(trmdl) + readlong(trmdl)
-        fseek(trmdl, trmsh_start)
-        trmsh_count = readlong(trmdl)
-        for x in range(trmsh_count):
-            trmsh_offset = ftell(trmdl) + readlong(trmdl)
-            trmsh_ret = ftell(trmdl)
-            fseek(trmdl, trmsh_offset)
-            trmsh_struct = ftell(trmdl) - readlong(trmdl)
-            fseek(trmdl, trmsh_struct)
-            trmsh_struct_len = readshort(trmdl)
+        for bone in bones:
+            bone_name = bone["name"]
+            bone_parent = bone["parent"]
+            if bone["rig_id"] is not None:
+                while len(bone_rig_array) <= bone["rig_id"]:
+                    bone_rig_array.append("")
+                bone_rig_array[bone["rig_id"]] = bone_name
 
-            if trmsh_struct_len != 0x0006:
-                raise AssertionError("Unexpected TRMSH struct length!")
+            bone_matrix = mathutils.Matrix.LocRotScale(
+                bone["trs"], mathutils.Euler(bone["rot"]), bone["scl"]
+            )
 
-            trmsh_struct_section_len = readshort(trmdl)
-            trmsh_struct_ptr_name = readshort(trmdl)
+            if IN_BLENDER_ENV:
+                new_bone = new_armature.edit_bones.new(bone_name)
 
-            if trmsh_struct_ptr_name != 0:
-                fseek(trmdl, trmsh_offset + trmsh_struct_ptr_name)
-                trmsh_name_offset = ftell(trmdl) + readlong(trmdl)
-                fseek(trmdl, trmsh_name_offset)
-                trmsh_name_len = readlong(trmdl)
-                chara_check = readfixedstring(trmdl, 3)
-                fseek(trmdl, ftell(trmdl) - 3)
+                new_bone.use_connect = False
+                new_bone.use_inherit_rotation = True
 
-                if chara_check.startswith(("au_")):
-                    chara_check = "CommonNPC"
-                elif chara_check.startswith(("bu_")):
-                    chara_check = "CommonNPC"
-                elif chara_check.startswith(("cf_")):
-                    chara_check = "CommonNPC"
-                elif chara_check.startswith(("cm_")):
-                    chara_check = "CommonNPC"
-                elif chara_check.startswith(("df_")):
-                    chara_check = "CommonNPC"
-                elif chara_check.startswith(("dm_")):
-                    chara_check = "CommonNPC"
-                elif chara_check.startswith(("p1_")):
-                    chara_check = "Rei"
-                elif chara_check.startswith(("p2_")):
-                    chara_check = "Akari"
-                elif chara_check.startswith(("pm")):
-                    chara_check = "Pokemon"
-                else:
-                    chara_check = "None"
+                if bonestructh:
+                    if bone["h"] == 0 & bpy.app.version < (4, 1, 0):
+                        new_bone.use_inherit_scale = True
+                    else:
+                        new_bone.use_inherit_scale = False
 
-                trmsh_name = readfixedstring(trmdl, trmsh_name_len)
-                print(trmsh_name)
-                print(chara_check)
-                trmsh_lods_array.append(trmsh_name)
-            fseek(trmdl, trmsh_ret)
+                new_bone.use_local_location = True
 
-    if trmdl_struct_trskl != 0:
-        fseek(trmdl, trmdl_file_start + trmdl_struct_trskl)
-        trskl_start = ftell(trmdl) + readlong(trmdl)
-        fseek(trmdl, trskl_start)
-        trskl_struct = ftell(trmdl) - readlong(trmdl)
-        fseek(trmdl, trskl_struct)
-        trskl_struct_len = readshort(trmdl)
+                new_bone.head = (0, 0, 0)
+                new_bone.tail = (0, 0, 0.1)
+                new_bone.matrix = bone_matrix
 
-        if trskl_struct_len != 0x0006:
-            raise AssertionError("Unexpected TRSKL struct length!")
+                if bone_parent != 0:
+                    new_bone.parent = new_armature.edit_bones[bone_parent - 1]
+                    new_bone.matrix = (
+                        new_armature.edit_bones[bone_parent - 1].matrix @ bone_matrix
+                    )
 
-        trskl_struct_section_len = readshort(trmdl)
-        trskl_struct_ptr_name = readshort(trmdl)
+                if bone_name in bone_rig_array:
+                    bone_id_map[bone_rig_array.index(bone_name)] = bone_name
+                else:
+                    bone_rig_array.append(bone_name)
+                    bone_id_map[len(bone_rig_array) - 1] = bone_name
 
-        if trskl_struct_ptr_name != 0:
-            fseek(trmdl, trskl_start + trskl_struct_ptr_name)
-            trskl_name_offset = ftell(trmdl) + readlong(trmdl)
-            fseek(trmdl, trskl_name_offset)
-            trskl_name_len = readlong(trmdl)
-            trskl_name = readfixedstring(trmdl, trskl_name_len)
-            print(trskl_name)
+                bone_array.append(new_bone)
+        if IN_BLENDER_ENV:
+            bpy.ops.object.editmode_toggle()
+            if basearmature == "loadbasearm":
+                armature_registry.add(
+                    model.skeleton_path,
+                    ("sv", bonestructh),
+                    bone_structure,
+                    bone_id_map,
+                    bone_rig_array,
+                )
 
-            if os.path.exists(os.path.join(filep, trskl_name)):
-                trskl = open(os.path.join(filep, trskl_name), "rb")
-            else:
-                print(f"Can't find {trskl_name}!")
+    if mat_data_array is not None:
+        if IN_BLENDER_ENV:
+            # process materials
+            for m, mat in enumerate(mat_data_array):
+                fingerprint = material_cache.fingerprint(
+                    mat, dir_index, textureextension
+                )
+                material = material_cache.get(fingerprint)
+                if material is not None:
+                    print(f"Reusing material {material.name}")
+                    materials.append(material)
+                    continue
+                material = bpy.data.materials.new(name=mat["mat_name"])
+                material.use_nodes = True
+                materials.append(material)
+                material_cache.add(fingerprint, material)
 
-    if trmdl_struct_trmtr != 0:
-        fseek(trmdl, trmdl_file_start + trmdl_struct_trmtr)
-        trmtr_start = ftell(trmdl) + readlong(trmdl)
-        fseek(trmdl, trmtr_start)
-        trmtr_count = readlong(trmdl)
-        for x in range(trmtr_count):
-            trmtr_offset = ftell(trmdl) + readlong(trmdl)
-            trmtr_ret = ftell(trmdl)
-            fseek(trmdl, trmtr_offset)
-            trmtr_name_len = readlong(
-                trmdl
-            )  #  - 6 -- dunno why the extension was excluded
-            trmtr_name = readfixedstring(trmdl, trmtr_name_len)
-            # TODO ArceusShiny
-            # LINE 1227
-            print(trmtr_name)
-            if x == 0:
-                if rareis True:
-                    trmtr = open(
-                        os.path.join(filep, Path(trmtr_name).stem + "_rare.trmtr"), "rb"
-                    )
+                if "skin" in mat["mat_name"]:
+                    blend_type = "MULTIPLY"
                 else:
-                    trmtr = open(os.path.join(filep, trmtr_name), "rb")
-            fseek(trmdl, trmtr_ret)
-    fclose(trmdl)
+                    blend_type = "MIX"
 
-    # TODO create bone_rig_array
-    # LINE 1247
-    if chara_check == "Rei" or chara_check == "Akari":
-        trskl = trskl = open(os.path.join(filep, "p0_base.trskl"), "rb")
+                material_output = material.node_tree.nodes.get("Material Output")
+                principled_bsdf = material.node_tree.nodes.get("Principled BSDF")
+                material.node_tree.links.new(
+                    principled_bsdf.outputs[0], material_output.inputs[0]
+                )
 
-    if trskl is not None:
-        print("Parsing TRSKL...")
-        trskl_file_start = readlong(trskl)
-        fseek(trskl, trskl_file_start)
-        trskl_struct = ftell(trskl) - readlong(trskl)
-        fseek(trskl, trskl_struct)
-        trskl_struct_len = readshort(trskl)
-        if trskl_struct_len == 0x000C:
-            trskl_struct_section_len = readshort(trskl)
-            trskl_struct_start = readshort(trskl)
-            trskl_struct_bone = readshort(trskl)
-            trskl_struct_b = readshort(trskl)
-            trskl_struct_c = readshort(trskl)
-            trskl_struct_bone_adjust = 0
-        elif trskl_struct_len == 0x000E:
-            trskl_struct_section_len = readshort(trskl)
-            trskl_struct_start = readshort(trskl)
-            trskl_struct_bone = readshort(trskl)
-            trskl_struct_b = readshort(trskl)
-            trskl_struct_c = readshort(trskl)
-            trskl_struct_bone_adjust = readshort(trskl)
-        else:
-            raise AssertionError("Unexpected TRSKL header struct length!")
+                print(f"mat_shader = {mat['mat_shader']}")
 
-        if trskl_struct_bone_adjust != 0:
-            fseek(trskl, trskl_file_start + trskl_struct_bone_adjust)
-            trskl_bone_adjust = readlong(trskl)
-            print(f"Mesh node IDs start at {trskl_bone_adjust}")
+                material.blend_method = "BLEND"
+                material.show_transparent_back = False
+                material.shadow_method = "OPAQUE"
 
-        if trskl_struct_bone != 0:
-            fseek(trskl, trskl_file_start + trskl_struct_bone)
-            trskl_bone_start = ftell(trskl) + readlong(trskl)
-            fseek(trskl, trskl_bone_start)
-            bone_count = readlong(trskl)
+                color_output = principled_bsdf.inputs[0]
+                if mat["mat_shader"] == "Unlit":
+                    color_output = material_output.inputs[0]
+                if mat["mat_shader"] == "Transparent":
+                    material.blend_method = "BLEND"
+                    reflection = material.node_tree.nodes.new("ShaderNodeGroup")
+                    reflection.node_tree = get_shader_group(
+                        "TRMTR Reflection", build_reflection_group
+                    )
+                    reflectance = reflection.inputs["Reflectance"]
+                    reflectance.default_value = mat["mat_reflectance"]
 
-            if IN_BLENDER_ENV:
-                new_armature = bpy.data.armatures.new(os.path.basename(trmdl.name))
-                bone_structure = bpy.data.objects.new(
-                    os.path.basename(trmdl.name), new_armature
+                material.use_backface_culling = True
+
+                basecolor = (
+                    mat["mat_color_r"],
+                    mat["mat_color_g"],
+                    mat["mat_color_b"],
+                    1.0,
                 )
-                new_collection.objects.link(bone_structure)
-                bpy.context.view_layer.objects.active = bone_structure
-                bpy.ops.object.editmode_toggle()
+                # LAYER MASK MAP
 
-            for x in range(bone_count):
-                bone_offset = ftell(trskl) + readlong(trskl)
-                bone_ret = ftell(trskl)
-                fseek(trskl, bone_offset)
-                print(f"Bone {x} start: {hex(bone_offset)}")
-                trskl_bone_struct = ftell(trskl) - readlong(trskl)
-                fseek(trskl, trskl_bone_struct)
-                trskl_bone_struct_len = readshort(trskl)
-
-                if trskl_bone_struct_len == 0x0012:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = 0
-                elif trskl_bone_struct_len == 0x0014:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = readshort(trskl)
-                else:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = readshort(trskl)
+                lym_image_texture = material.node_tree.nodes.new("ShaderNodeTexImage")
+                if dir_index.exists(mat["mat_lym0"][:-5] + textureextension):
+                    lym_image_texture.image = image_cache.load(
+                        dir_index.path(mat["mat_lym0"][:-5] + textureextension)
+                    )
+                    lym_image_texture.image.colorspace_settings.name = "Non-Color"
 
-                if trskl_bone_struct_ptr_bone_merge != 0:
-                    fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone_merge)
-                    bone_merge_start = ftell(trskl) + readlong(trskl)
-                    fseek(trskl, bone_merge_start)
-                    bone_merge_string_len = readlong(trskl)
-                    if bone_merge_string_len != 0:
-                        bone_merge_string = readfixedstring(
-                            trskl, bone_merge_string_len
-                        )
-                        print(f"BoneMerge to {bone_merge_string}")
-                    else:
-                        bone_merge_string = ""
-
-                if trskl_bone_struct_ptr_bone != 0:
-                    fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone)
-                    bone_pos_start = ftell(trskl) + readlong(trskl)
-                    fseek(trskl, bone_pos_start)
-                    bone_pos_struct = ftell(trskl) - readlong(trskl)
-                    fseek(trskl, bone_pos_struct)
-                    bone_pos_struct_len = readshort(trskl)
+                color1 = (
+                    mat["mat_color1_r"],
+                    mat["mat_color1_g"],
+                    mat["mat_color1_b"],
+                    1.0,
+                )
+                color2 = (
+                    mat["mat_color2_r"],
+                    mat["mat_color2_g"],
+                    mat["mat_color2_b"],
+                    1.0,
+                )
+                color3 = (
+                    mat["mat_color3_r"],
+                    mat["mat_color3_g"],
+                    mat["mat_color3_b"],
+                    1.0,
+                )
+                color4 = (
+                    mat["mat_color4_r"],
+                    mat["mat_color4_g"],
+                    mat["mat_color4_b"],
+                    1.0,
+                )
 
-                    if bone_pos_struct_len != 0x000A:
-                        raise AssertionError("Unexpected bone position struct length!")
+                emcolor1 = (
+                    mat["mat_emcolor1_r"],
+                    mat["mat_emcolor1_g"],
+                    mat["mat_emcolor1_b"],
+                    1.0,
+                )
+                emcolor2 = (
+                    mat["mat_emcolor2_r"],
+                    mat["mat_emcolor2_g"],
+                    mat["mat_emcolor2_b"],
+                    1.0,
+                )
+                emcolor3 = (
+                    mat["mat_emcolor3_r"],
+                    mat["mat_emcolor3_g"],
+                    mat["mat_emcolor3_b"],
+                    1.0,
+                )
+                emcolor4 = (
+                    mat["mat_emcolor4_r"],
+                    mat["mat_emcolor4_g"],
+                    mat["mat_emcolor4_b"],
+                    1.0,
+                )
+                if emcolor1 == (1.0, 1.0, 1.0, 1.0):
+                    emcolor1 = (0.0, 0.0, 0.0, 0.0)
+                if emcolor2 == (1.0, 1.0, 1.0, 1.0):
+                    emcolor2 = (0.0, 0.0, 0.0, 0.0)
+                if emcolor3 == (1.0, 1.0, 1.0, 1.0):
+                    emcolor3 = (0.0, 0.0, 0.0, 0.0)
+                if emcolor4 == (1.0, 1.0, 1.0, 1.0):
+                    emcolor4 = (0.0, 0.0, 0.0, 0.0)
+                print(f'Material {mat["mat_name"]}:')
+                print(f"Color 1: {color1}")
+                print(f"Color 2: {color2}")
+                print(f"Color 3: {color3}")
+                print(f"Color 4: {color4}")
+                print(f"Emission Color 1: {emcolor1}")
+                print(f"Emission Color 2: {emcolor2}")
+                print(f"Emission Color 3: {emcolor3}")
+                print(f"Emission Color 4: {emcolor4}")
+                print("---")
 
-                    bone_pos_struct_section_len = readshort(trskl)
-                    bone_pos_struct_ptr_scl = readshort(trskl)
-                    bone_pos_struct_ptr_rot = readshort(trskl)
-                    bone_pos_struct_ptr_trs = readshort(trskl)
+                layer_group = material.node_tree.nodes.new("ShaderNodeGroup")
+                layer_group.node_tree = get_shader_group(
+                    f"TRMTR Layers {blend_type.title()}", build_layer_group, blend_type
+                )
+                colors = (color1, color2, color3, color4)
+                emcolors = (emcolor1, emcolor2, emcolor3, emcolor4)
+                inputs = layer_group.inputs
+                for i, (color, emcolor) in enumerate(zip(colors, emcolors), 1):
+                    inputs[f"Color {i}"].default_value = color
+                    inputs[f"Emission Color {i}"].default_value = emcolor
+                    # White layers leave the colour underneath as is.
+                    if color == (1.0, 1.0, 1.0, 1.0):
+                        inputs[f"Color {i} Factor"].default_value = 0.0
+                material.node_tree.links.new(
+                    lym_image_texture.outputs[0], layer_group.inputs["Layer Mask"]
+                )
+                material.node_tree.links.new(
+                    lym_image_texture.outputs[1], layer_group.inputs["Layer Mask Alpha"]
+                )
+                material.node_tree.links.new(layer_group.outputs["Color"], color_output)
+                material.node_tree.links.new(
+                    layer_group.outputs["Emission"], principled_bsdf.inputs[26]
+                )
 
-                    fseek(trskl, bone_pos_start + bone_pos_struct_ptr_trs)
-                    bone_tx = readfloat(trskl)
-                    bone_ty = readfloat(trskl)
-                    bone_tz = readfloat(trskl)
-                    # TODO ArceusScale
-                    # LINE 1797
-                    fseek(trskl, bone_pos_start + bone_pos_struct_ptr_rot)
-                    bone_rx = readfloat(trskl)
-                    bone_ry = readfloat(trskl)
-                    bone_rz = readfloat(trskl)
-                    fseek(trskl, bone_pos_start + bone_pos_struct_ptr_scl)
-                    bone_sx = readfloat(trskl)
-                    bone_sy = readfloat(trskl)
-                    bone_sz = readfloat(trskl)
+                if dir_index.exists(mat["mat_col0"][:-5] + textureextension):
+                    alb_image_texture = material.node_tree.nodes.new(
+                        "ShaderNodeTexImage"
+                    )
+                    alb_image_texture.image = image_cache.load(
+                        dir_index.path(mat["mat_col0"][:-5] + textureextension)
+                    )
+                    material.node_tree.links.new(
+                        alb_image_texture.outputs[0], layer_group.inputs["Base Color"]
+                    )
+                    material.node_tree.links.new(
+                        alb_image_texture.outputs[1], principled_bsdf.inputs[4]
+                    )
+                    if "hair" in mat["mat_name"] in mat["mat_name"] and basecolor != (
+                        1,
+                        1,
+                        1,
+                        1,
+                    ):
+                        haircolor = material.node_tree.nodes.new("ShaderNodeMixRGB")
+                        haircolor.blend_type = "MULTIPLY"
+                        haircolor.inputs[0].default_value = 1.0
+                        material.node_tree.links.new(
+                            alb_image_texture.outputs[0], haircolor.inputs[1]
+                        )
+                        haircolor.inputs[2].default_value = basecolor
+                        material.node_tree.links.new(haircolor.outputs[0], color_output)
 
-                    if trskl_bone_struct_ptr_string != 0:
-                        fseek(trskl, bone_offset + trskl_bone_struct_ptr_string)
-                        bone_string_start = ftell(trskl) + readlong(trskl)
-                        fseek(trskl, bone_string_start)
-                        bone_str_len = readlong(trskl)
-                        bone_name = readfixedstring(trskl, bone_str_len)
-                    if trskl_bone_struct_ptr_parent != 0x00:
-                        fseek(trskl, bone_offset + trskl_bone_struct_ptr_parent)
-                        bone_parent = readlong(trskl) + 1
+                mix_color5 = None
+                if mat["mat_enable_highlight_map"]:
+                    highlight_image_texture = material.node_tree.nodes.new(
+                        "ShaderNodeTexImage"
+                    )
+                    if dir_index.exists(mat["mat_highmsk0"][:-5] + ".png"):
+                        highlight_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_highmsk0"][:-5] + ".png")
+                        )
+                        highlight_image_texture.image.colorspace_settings.name = (
+                            "Non-Color"
+                        )
+                    elif dir_index.exists(mat["mat_col0"][:-8] + "msk.png"):
+                        highlight_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_col0"][:-8] + "msk.png")
+                        )
+                        highlight_image_texture.image.colorspace_settings.name = (
+                            "Non-Color"
+                        )
+                    elif dir_index.exists(mat["mat_col0"][:-8] + "msk.png"):
+                        highlight_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_col0"][:-8] + "msk.png")
+                        )
+                        highlight_image_texture.image.colorspace_settings.name = (
+                            "Non-Color"
+                        )
+                    elif (
+                        dir_index.exists(mat["mat_col0"][:-12] + "r_eye_msk.png")
+                        and mat["mat_name"] == "eye_r"
+                    ):
+                        highlight_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_col0"][:-12] + "r_eye_msk.png")
+                        )
+                        highlight_image_texture.image.colorspace_settings.name = (
+                            "Non-Color"
+                        )
+                    elif (
+                        dir_index.exists(mat["mat_col0"][:-12] + "l_eye_msk.png")
+                        and mat["mat_name"] == "eye_l"
+                    ):
+                        highlight_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_col0"][:-12] + "l_eye_msk.png")
+                        )
+                        highlight_image_texture.image.colorspace_settings.name = (
+                            "Non-Color"
+                        )
                     else:
-                        bone_parent = 0
-                    if trskl_bone_struct_ptr_rig_id != 0:
-                        fseek(trskl, bone_offset + trskl_bone_struct_ptr_rig_id)
-                        bone_rig_id = readlong(trskl) + trskl_bone_adjust
-
-                        while len(bone_rig_array) <= bone_rig_id:
-                            bone_rig_array.append("")
-                        bone_rig_array[bone_rig_id] = bone_name
-
-                    bone_matrix = mathutils.Matrix.LocRotScale(
-                        (bone_tx, bone_ty, bone_tz),
-                        mathutils.Euler((bone_rx, bone_ry, bone_rz)),
-                        (bone_sx, bone_sy, bone_sz),
+                        print("No Highlight")
+                    mix_color5 = material.node_tree.nodes.new("ShaderNodeMixRGB")
+                    mix_color5.blend_type = blend_type
+                    mix_color5.inputs[2].default_value = (1, 1, 1, 1)
+                    material.node_tree.links.new(
+                        highlight_image_texture.outputs[0], mix_color5.inputs[0]
                     )
+                    material.node_tree.links.new(
+                        layer_group.outputs["Color"], mix_color5.inputs[1]
+                    )
+                    material.node_tree.links.new(mix_color5.outputs[0], color_output)
 
-                    if IN_BLENDER_ENV:
-                        new_bone = new_armature.edit_bones.new(bone_name)
-
-                        new_bone.use_connect = False
-                        new_bone.use_inherit_rotation = True
-                        new_bone.use_inherit_scale = True
-                        new_bone.use_local_location = True
-
-                        new_bone.head = (0, 0, 0)
-                        new_bone.tail = (0, 0, 0.1)
-                        new_bone.matrix = bone_matrix
-
-                        if bone_parent != 0:
-                            new_bone.parent = bone_array[bone_parent - 1]
-                            new_bone.matrix = (
-                                bone_array[bone_parent - 1].matrix @ bone_matrix
-                            )
+                if mat["mat_enable_normal_map"]:
+                    normal_image_texture = material.node_tree.nodes.new(
+                        "ShaderNodeTexImage"
+                    )
+                    if dir_index.exists(mat["mat_nrm0"][:-5] + textureextension):
+                        normal_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_nrm0"][:-5] + textureextension)
+                        )
+                        normal_image_texture.image.colorspace_settings.name = (
+                            "Non-Color"
+                        )
+                    normal_map2 = material.node_tree.nodes.new("ShaderNodeGroup")
+                    normal_map2.node_tree = get_shader_group(
+                        "TRMTR Normal Map", build_normal_map_group
+                    )
+                    material.node_tree.links.new(
+                        normal_image_texture.outputs[0], normal_map2.inputs["Color"]
+                    )
+                    material.node_tree.links.new(
+                        normal_image_texture.outputs[1], normal_map2.inputs["Alpha"]
+                    )
+                    material.node_tree.links.new(
+                        normal_map2.outputs[0], principled_bsdf.inputs[5]
+                    )
 
-                        if bone_name in bone_rig_array:
-                            bone_id_map[bone_rig_array.index(bone_name)] = bone_name
-                        else:
-                            print(f"Bone {bone_name} not found in bone rig array!")
-                        bone_array.append(new_bone)
-                fseek(trskl, bone_ret)
-        fclose(trskl)
-        if IN_BLENDER_ENV:
-            bpy.ops.object.editmode_toggle()
+                if mat["mat_enable_metallic_map"]:
+                    metalness_image_texture = material.node_tree.nodes.new(
+                        "ShaderNodeTexImage"
+                    )
+                    if dir_index.exists(mat["mat_mtl0"][:-5] + textureextension):
+                        metalness_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_mtl0"][:-5] + textureextension)
+                        )
+                        metalness_image_texture.image.colorspace_settings.name = (
+                            "Non-Color"
+                        )
+                    material.node_tree.links.new(
+                        metalness_image_texture.outputs[0], principled_bsdf.inputs[1]
+                    )
 
-    if trmtr is not None:
-        print("Parsing TRMTR...")
-        trmtr_file_start = readlong(trmtr)
-        mat_data_array = []
-        fseek(trmtr, trmtr_file_start)
-        trmtr_struct = ftell(trmtr) - readlong(trmtr)
-        fseek(trmtr, trmtr_struct)
-        trmtr_struct_len = readshort(trmtr)
+                if mat["mat_enable_emission_color_map"]:
+                    emission_image_texture = material.node_tree.nodes.new(
+                        "ShaderNodeTexImage"
+                    )
+                    if dir_index.exists(mat["mat_emi0"][:-5] + textureextension):
+                        emission_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_emi0"][:-5] + textureextension)
+                        )
+                    material.node_tree.links.new(
+                        emission_image_texture.outputs[0], principled_bsdf.inputs[26]
+                    )
 
-        if trmtr_struct_len != 0x0008:
-            raise AssertionError("Unexpected TRMTR header struct length!")
-        trmtr_struct_section_len = readshort(trmtr)
-        trmtr_struct_start = readshort(trmtr)
-        trmtr_struct_material = readshort(trmtr)
+                if mat["mat_enable_roughness_map"]:
+                    roughness_image_texture = material.node_tree.nodes.new(
+                        "ShaderNodeTexImage"
+                    )
+                    if dir_index.exists(mat["mat_rgh0"][:-5] + textureextension):
+                        roughness_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_rgh0"][:-5] + textureextension)
+                        )
+                        roughness_image_texture.image.colorspace_settings.name = (
+                            "Non-Color"
+                        )
+                    material.node_tree.links.new(
+                        roughness_image_texture.outputs[0], principled_bsdf.inputs[2]
+                    )
 
-        if trmtr_struct_material != 0:
-            fseek(trmtr, trmtr_file_start + trmtr_struct_material)
-            mat_start = ftell(trmtr) + readlong(trmtr)
-            fseek(trmtr, mat_start)
-            mat_count = readlong(trmtr)
-            for x in range(mat_count):
-                mat_shader = "Standard"
-                mat_col0 = ""
-                mat_lym0 = ""
-                mat_nrm0 = ""
-                mat_ao0 = ""
-                mat_emi0 = ""
-                mat_rgh0 = ""
-                mat_mtl0 = ""
-                mat_msk0 = ""
-                mat_highmsk0 = ""
-                mat_uv_scale_u = 1.0
-                mat_uv_scale_v = 1.0
-                mat_uv_trs_u = 0
-                mat_uv_trs_v = 0
-                mat_uv_scale2_u = 1.0
-                mat_uv_scale2_v = 1.0
-                mat_uv_trs2_u = 0
-                mat_uv_trs2_v = 0
-                mat_color1_r = 1.0
-                mat_color1_g = 1.0
-                mat_color1_b = 1.0
-                mat_color2_r = 1.0
-                mat_color2_g = 1.0
-                mat_color2_b = 1.0
-                mat_color3_r = 1.0
-                mat_color3_g = 1.0
-                mat_color3_b = 1.0
-                mat_color4_r = 1.0
-                mat_color4_g = 1.0
-                mat_color4_b = 1.0
+                if mat["mat_enable_ao_map"]:
+                    ambientocclusion_image_texture = material.node_tree.nodes.new(
+                        "ShaderNodeTexImage"
+                    )
+                    if dir_index.exists(mat["mat_ao0"][:-5] + textureextension):
+                        ambientocclusion_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_ao0"][:-5] + textureextension)
+                        )
+                    mix_color6 = material.node_tree.nodes.new("ShaderNodeMixRGB")
+                    mix_color6.blend_type = "MULTIPLY"
+                    if (
+                        mat["mat_ao0"][:-5]
+                        == "../../glb_share_tex/texture_white_ao/texture_white_ao"
+                    ):
+                        mix_color6.inputs[0].default_value = 0
+                    else:
+                        mix_color6.inputs[0].default_value = 1.0
+                    material.node_tree.links.new(
+                        layer_group.outputs["Color"], mix_color6.inputs[1]
+                    )
+                    material.node_tree.links.new(
+                        ambientocclusion_image_texture.outputs[0],
+                        mix_color6.inputs[2],
+                    )
+                    material.node_tree.links.new(mix_color6.outputs[0], color_output)
+                    if "hair" in mat["mat_name"] in mat["mat_name"] and basecolor != (
+                        1,
+                        1,
+                        1,
+                        1,
+                    ):
+                        material.node_tree.links.new(
+                            mix_color6.outputs[0], haircolor.inputs[1]
+                        )
+                        material.node_tree.links.new(haircolor.outputs[0], color_output)
+                if dir_index.exists(mat["mat_col0"][:-5] + textureextension):
+                    if (
+                        color1 == (1.0, 1.0, 1.0, 1.0)
+                        and color2 == (1.0, 1.0, 1.0, 1.0)
+                        and color3 == (1.0, 1.0, 1.0, 1.0)
+                        and color4 == (1.0, 1.0, 1.0, 1.0)
+                    ):
+                        if mat["mat_enable_ao_map"]:
+                            material.node_tree.links.new(
+                                alb_image_texture.outputs[0], mix_color6.inputs[1]
+                            )
+                        elif mix_color5 is not None:
+                            material.node_tree.links.new(
+                                alb_image_texture.outputs[0], mix_color5.inputs[1]
+                            )
+                if "eyelash" in mat["mat_name"] and not dir_index.exists(
+                    mat["mat_col0"][:-5] + textureextension
+                ):
+                    material.node_tree.links.remove(principled_bsdf.inputs[0].links[0])
+                    color_output.default_value = basecolor
 
-                mat_emcolor1_r = 1.0
-                mat_emcolor1_g = 1.0
-                mat_emcolor1_b = 1.0
-                mat_emcolor2_r = 1.0
-                mat_emcolor2_g = 1.0
-                mat_emcolor2_b = 1.0
-                mat_emcolor3_r = 1.0
-                mat_emcolor3_g = 1.0
-                mat_emcolor3_b = 1.0
-                mat_emcolor4_r = 1.0
-                mat_emcolor4_g = 1.0
-                mat_emcolor4_b = 1.0
-                mat_emcolor5_r = 1.0
-                mat_emcolor5_g = 1.0
-                mat_emcolor5_b = 1.0
-                mat_rgh_layer0 = 1.0
-                mat_rgh_layer1 = 1.0
-                mat_rgh_layer2 = 1.0
-                mat_rgh_layer3 = 1.0
-                mat_rgh_layer4 = 1.0
-                mat_mtl_layer0 = 0.0
-                mat_mtl_layer1 = 0.0
-                mat_mtl_layer2 = 0.0
-                mat_mtl_layer3 = 0.0
-                mat_mtl_layer4 = 0.0
-                mat_reflectance = 0.0
-                mat_emm_intensity = 1.0
-                mat_offset = ftell(trmtr) + readlong(trmtr)
-                mat_ret = ftell(trmtr)
+    for poly_groups in model.lods:
+        for poly_group in poly_groups or ():
+            print("Making object...")
 
-                mat_enable_base_color_map = False
-                mat_enable_normal_map = False
-                mat_enable_ao_map = False
-                mat_enable_emission_color_map = False
-                mat_enable_roughness_map = False
-                mat_enable_metallic_map = False
-                mat_enable_displacement_map = False
-                mat_enable_highlight_map = False
+            if IN_BLENDER_ENV:
+                new_object = build_poly_group(
+                    poly_group, materials, bone_structure, bone_id_map
+                )
+                # add object to scene collection
+                new_collection.objects.link(new_object)
 
-                fseek(trmtr, mat_offset)
-                print("--------------------")
-                mat_struct = ftell(trmtr) - readlong(trmtr)
-                fseek(trmtr, mat_struct)
-                mat_struct_len = readshort(trmtr)
 
-                if mat_struct_len != 0x0024:
-                    raise AssertionError("Unexpected material struct length!")
-                mat_struct_section_len = readshort(trmtr)
-                mat_struct_ptr_param_a = readshort(trmtr)
-                mat_struct_ptr_param_b = readshort(trmtr)
-                mat_struct_ptr_param_c = readshort(trmtr)
-                mat_struct_ptr_param_d = readshort(trmtr)
-                mat_struct_ptr_param_e = readshort(trmtr)
-                mat_struct_ptr_param_f = readshort(trmtr)
-                mat_struct_ptr_param_g = readshort(trmtr)
-                mat_struct_ptr_param_h = readshort(trmtr)
-                mat_struct_ptr_param_i = readshort(trmtr)
-                mat_struct_ptr_param_j = readshort(trmtr)
-                mat_struct_ptr_param_k = readshort(trmtr)
-                mat_struct_ptr_param_l = readshort(trmtr)
-                mat_struct_ptr_param_m = readshort(trmtr)
-                mat_struct_ptr_param_n = readshort(trmtr)
-                mat_struct_ptr_param_o = readshort(trmtr)
-                mat_struct_ptr_param_p = readshort(trmtr)
+class PokeArcImport(Operator, ImportHelper):
+    """Open a TRMDL file from Pokémon Legends Arceus"""
+    bl_idname = "custom_import_scene.pokemonlegendsarceus"
+    bl_label = "Import"
+    bl_options = {"PRESET", "UNDO"}
+    filename_ext = ".trmdl"
+    filter_glob: StringProperty(
+        default="*.trmdl",
+        options={"HIDDEN"},
+        maxlen=255,
+    )
+    filepath = StringProperty(
+        subtype="FILE_PATH",
+    )
+    files = CollectionProperty(type=PropertyGroup)
+    rare: BoolProperty(
+        name="Load Shiny",
+        description="Uses rare material instead of normal one",
+        default=False,
+    )
+    multiple: BoolProperty(
+        name="Load All Folder",
+        description="Uses rare material instead of normal one",
+        default=False,
+    )
+    batch: BoolProperty(
+        name="Batch Import Subfolders",
+        description="Import every model under the folder and its subfolders, "
+        "resuming where the last batch stopped",
+        default=False,
+    )
+    loadlods: BoolProperty(
+        name="Load LODS",
+        description="Uses rare material instead of normal one",
+        default=False,
+    )
+    ignorecase: BoolProperty(
+        name="Ignore File Name Case",
+        description="Match the model's files regardless of upper/lower case",
+        default=False,
+    )
+    cachesize: IntProperty(
+        name="Parse Cache Size (MB)",
+        description="Memory kept for parsed files between imports, 0 turns it off",
+        default=512,
+        min=0,
+    )
+    diskcache: BoolProperty(
+        name="Disk Cache",
+        description="Keep decoded meshes and materials on disk for later sessions",
+        default=False,
+    )
+    diskcachesize: IntProperty(
+        name="Disk Cache Size (MB)",
+        description="Disk space kept for decoded files, the least recently used "
+        "are removed first",
+        default=1024,
+        min=0,
+    )
+    def draw(self, context):
+        layout = self.layout
+        box = layout.box()
+        box.prop(self, "rare")
+        box = layout.box()
+        box.prop(self, "multiple")
+        box.prop(self, "batch")
+        box = layout.box()
+        box.prop(self, "loadlods")
+        box = layout.box()
+        box.prop(self, "ignorecase")
+        box = layout.box()
+        box.prop(self, "cachesize")
+        box.label(text=parse_cache.summary())
+        box.operator(ClearParseCache.bl_idname)
+        box = layout.box()
+        box.prop(self, "diskcache")
+        box.prop(self, "diskcachesize")
+        box.operator(ClearDiskCache.bl_idname)
+    def execute(self, context):
+        directory = os.path.dirname(self.filepath)
+        image_cache = ImageCache()
+        material_cache = MaterialCache()
+        dir_index = DirectoryIndex(directory, self.ignorecase)
+        parse_cache.resize(self.cachesize * 1024 * 1024)
+        disk_cache_settings = None
+        if self.diskcache:
+            disk_cache_settings = {
+                "directory": disk_cache.root(),
+                "max_bytes": self.diskcachesize * 1024 * 1024,
+            }
+        options = {"game": "pla", "rare": self.rare, "loadlods": self.loadlods}
+        if self.multiple == False and self.batch == False:
+            filename = os.path.basename(self.filepath)
+            model = parse_model(
+                os.path.join(directory, filename),
+                options,
+                dir_index,
+                disk_cache_settings,
+            )
+            build_in_blender(model, dir_index, image_cache, material_cache)
+            image_cache.report()
+            material_cache.report()
+            parse_cache.report()
+            disk_cache.report()
+            return {"FINISHED"}
+        else:
+            manifest = None
+            if self.batch:
+                filepaths, dir_indexes = find_models(directory, self.ignorecase)
+                manifest = BatchManifest(directory, options)
+                filepaths, dir_indexes = manifest.pending(filepaths, dir_indexes)
+            else:
+                file_list = sorted(dir_index.names())
+                obj_list = [item for item in file_list if item.endswith(".trmdl")]
+                filepaths = [os.path.join(directory, item) for item in obj_list]
+                dir_indexes = [dir_index] * len(filepaths)
+            self.folder_import = FolderImport(
+                filepaths,
+                options,
+                dir_indexes,
+                image_cache,
+                material_cache,
+                manifest,
+                disk_cache_settings,
+            )
+            return self.folder_import.start(self, context)
+
+    def modal(self, context, event):
+        return self.folder_import.modal(self, context, event)
+
+
+def from_trmdl(
+    filep,
+    trmdl,
+    rare,
+    loadlods,
+    image_cache=None,
+    dir_index=None,
+    material_cache=None,
+):
+    if dir_index is None:
+        dir_index = DirectoryIndex(filep)
+    options = {"game": "pla", "rare": rare, "loadlods": loadlods}
+    loader = FileLoader(dir_index)
+    model = parse_trmdl(trmdl, options, dir_index, loader)
+    loader.close()
+    build_trmdl(model, dir_index, image_cache, material_cache)
+
+
+def parse_trmdl(trmdl, options, dir_index, loader, built_skeletons=()):
+    """Reads a Legends: Arceus TRMDL and the files it points to, without bpy."""
+    rare = options["rare"]
+    loadlods = options["loadlods"]
 
-                if mat_struct_ptr_param_a != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_a)
-                    mat_param_a_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_a_start)
-                    mat_name_len = readlong(trmtr)
-                    mat_name = readfixedstring(trmtr, mat_name_len)
-                    print(f"Material properties for {mat_name}:")
-                if mat_struct_ptr_param_b != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_b)
-                    mat_param_b_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_b_start)
-                    mat_param_b_section_count = readlong(trmtr)
-                    for z in range(mat_param_b_section_count):
-                        mat_param_b_offset = ftell(trmtr) + readlong(trmtr)
-                        mat_param_b_ret = ftell(trmtr)
-                        fseek(trmtr, mat_param_b_offset)
-                        mat_param_b_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_b_struct)
-                        mat_param_b_struct_len = readshort(trmtr)
+    trskl = None
+    trmsh = None
+    trmtr = None
 
-                        if mat_param_b_struct_len != 0x0008:
-                            raise AssertionError(
-                                "Unexpected material param b struct length!"
-                            )
-                        mat_param_b_struct_section_len = readshort(trmtr)
-                        mat_param_b_struct_ptr_string = readshort(trmtr)
-                        mat_param_b_struct_ptr_params = readshort(trmtr)
+    trmsh_lods_array = []
+    trskl_bone_adjust = 0
+    chara_check = "None"
 
-                        if mat_param_b_struct_ptr_string != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_b_offset + mat_param_b_struct_ptr_string,
-                            )
-                            mat_param_b_shader_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_b_shader_start)
-                            mat_param_b_shader_len = readlong(trmtr)
-                            mat_param_b_shader_string = readfixedstring(
-                                trmtr, mat_param_b_shader_len
-                            )
-                            print(f"Shader: {mat_param_b_shader_string}")
-                            mat_shader = mat_param_b_shader_string
-                        if mat_param_b_struct_ptr_params != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_b_offset + mat_param_b_struct_ptr_params,
-                            )
-                            mat_param_b_sub_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_b_sub_start)
-                            mat_param_b_sub_count = readlong(trmtr)
-                            for y in range(mat_param_b_sub_count):
-                                mat_param_b_sub_offset = ftell(trmtr) + readlong(trmtr)
-                                mat_param_b_sub_ret = ftell(trmtr)
-                                fseek(trmtr, mat_param_b_sub_offset)
-                                mat_param_b_sub_struct = ftell(trmtr) - readlong(trmtr)
-                                fseek(trmtr, mat_param_b_sub_struct)
-                                mat_param_b_sub_struct_len = readshort(trmtr)
+    print("Parsing TRMDL...")
 
-                                if mat_param_b_sub_struct_len != 0x0008:
-                                    raise AssertionError(
-                                        "Unexpected material param b sub struct length!"
-                                    )
-                                mat_param_b_sub_struct_section_len = readshort(trmtr)
-                                mat_param_b_sub_struct_ptr_string = readshort(trmtr)
-                                mat_param_b_sub_struct_ptr_value = readshort(trmtr)
+    trmdl_file_start = readlong(trmdl)
+    fseek(trmdl, trmdl_file_start)
+    trmdl_struct = FlatTable(trmdl, trmdl_file_start, TRMDL_SCHEMA)
 
-                                if mat_param_b_sub_struct_ptr_string != 0:
-                                    fseek(
-                                        trmtr,
-                                        mat_param_b_sub_offset
-                                        + mat_param_b_sub_struct_ptr_string,
-                                    )
-                                    mat_param_b_sub_string_start = ftell(
-                                        trmtr
-                                    ) + readlong(trmtr)
-                                    fseek(trmtr, mat_param_b_sub_string_start)
-                                    mat_param_b_sub_string_len = readlong(trmtr)
-                                    mat_param_b_sub_string = readfixedstring(
-                                        trmtr, mat_param_b_sub_string_len
-                                    )
-                                if mat_param_b_sub_struct_ptr_value != 0:
-                                    fseek(
-                                        trmtr,
-                                        mat_param_b_sub_offset
-                                        + mat_param_b_sub_struct_ptr_value,
-                                    )
-                                    mat_param_b_sub_value_start = ftell(
-                                        trmtr
-                                    ) + readlong(trmtr)
-                                    fseek(trmtr, mat_param_b_sub_value_start)
-                                    mat_param_b_sub_value_len = readlong(trmtr)
-                                    mat_param_b_sub_value = readfixedstring(
-                                        trmtr, mat_param_b_sub_value_len
-                                    )
-                                    print(
-                                        f"(param_b) {mat_param_b_sub_string}: {mat_param_b_sub_value}"
-                                    )
+    # 0x0014 and 0x0018 are ScarletViolet Only
+    if trmdl_struct.vtable_len not in (0x0012, 0x0014, 0x0018):
+        raise AssertionError("Unexpected TRMDL header struct length!")
+    trmdl_struct_trmsh = trmdl_struct.field("trmsh")
+    trmdl_struct_trskl = trmdl_struct.field("trskl")
+    trmdl_struct_trmtr = trmdl_struct.field("trmtr")
 
-                                if mat_param_b_sub_string == "EnableBaseColorMap":
-                                    mat_enable_base_color_map = (
-                                        mat_param_b_sub_value == "True"
-                                    )
-                                if mat_param_b_sub_string == "EnableNormalMap":
-                                    mat_enable_normal_map = (
-                                        mat_param_b_sub_value == "True"
-                                    )
-                                if mat_param_b_sub_string == "EnableAOMap":
-                                    mat_enable_ao_map = mat_param_b_sub_value == "True"
-                                if mat_param_b_sub_string == "EnableEmissionColorMap":
-                                    mat_enable_emission_color_map = (
-                                        mat_param_b_sub_value == "True"
-                                    )
-                                if mat_param_b_sub_string == "EnableRoughnessMap":
-                                    mat_enable_roughness_map = (
-                                        mat_param_b_sub_value == "True"
-                                    )
-                                if mat_param_b_sub_string == "EnableMetallicMap":
-                                    mat_enable_metallic_map = (
-                                        mat_param_b_sub_value == "True"
-                                    )
-                                if mat_param_b_sub_string == "EnableDisplacementMap":
-                                    mat_enable_displacement_map = (
-                                        mat_param_b_sub_value == "True"
-                                    )
-                                if mat_param_b_sub_string == "EnableHighlight":
-                                    mat_enable_highlight_map = (
-                                        mat_param_b_sub_value == "True"
-                                    )
-                                if mat_param_b_sub_string == "EnableOverrideColor":
-                                    mat_enable_override_color = (
-                                        mat_param_b_sub_value == "True"
-                                    )
-                                fseek(trmtr, mat_param_b_sub_ret)
-                        fseek(trmtr, mat_param_b_ret)
+    if trmdl_struct_trmsh != 0:
+        fseek(trmdl, trmdl_file_start + trmdl_struct_trmsh)
+        trmsh_start = ftell(trmdl) + readlong(trmdl)
+        fseek(trmdl, trmsh_start)
+        trmsh_count = readlong(trmdl)
+        for x in range(trmsh_count):
+            trmsh_offset = ftell(trmdl) + readlong(trmdl)
+            trmsh_ret = ftell(trmdl)
+            fseek(trmdl, trmsh_offset)
+            trmsh_struct = FlatTable(trmdl, trmsh_offset, TRMDL_NAME_SCHEMA)
 
-                if mat_struct_ptr_param_c != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_c)
-                    mat_param_c_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_c_start)
-                    mat_param_c_count = readlong(trmtr)
+            if trmsh_struct.vtable_len != 0x0006:
+                raise AssertionError("Unexpected TRMSH struct length!")
+            trmsh_struct_ptr_name = trmsh_struct.field("name")
 
-                    for z in range(mat_param_c_count):
-                        mat_param_c_offset = ftell(trmtr) + readlong(trmtr)
-                        mat_param_c_ret = ftell(trmtr)
-                        fseek(trmtr, mat_param_c_offset)
-                        mat_param_c_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_c_struct)
-                        mat_param_c_struct_len = readshort(trmtr)
-
-                        if mat_param_c_struct_len == 0x0008:
-                            mat_param_c_struct_section_len = readshort(trmtr)
-                            mat_param_c_struct_ptr_string = readshort(trmtr)
-                            mat_param_c_struct_ptr_value = readshort(trmtr)
-                            mat_param_c_struct_ptr_id = 0
-                        elif mat_param_c_struct_len == 0x000A:
-                            mat_param_c_struct_section_len = readshort(trmtr)
-                            mat_param_c_struct_ptr_string = readshort(trmtr)
-                            mat_param_c_struct_ptr_value = readshort(trmtr)
-                            mat_param_c_struct_ptr_id = readshort(trmtr)
-                        else:
-                            raise AssertionError(
-                                "Unexpected material param c struct length!"
-                            )
+            if trmsh_struct_ptr_name != 0:
+                fseek(trmdl, trmsh_offset + trmsh_struct_ptr_name)
+                trmsh_name_offset = ftell(trmdl) + readlong(trmdl)
+                fseek(trmdl, trmsh_name_offset)
+                trmsh_name_len = readlong(trmdl)
+                chara_check = readfixedstring(trmdl, 3)
+                fseek(trmdl, ftell(trmdl) - 3)
 
-                        if mat_param_c_struct_ptr_string != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_c_offset + mat_param_c_struct_ptr_string,
-                            )
-                            mat_param_c_string_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_c_string_start)
-                            mat_param_c_string_len = readlong(trmtr)
-                            mat_param_c_string = readfixedstring(
-                                trmtr, mat_param_c_string_len
-                            )
-                        if mat_param_c_struct_ptr_value != 0:
-                            fseek(
-                                trmtr, mat_param_c_offset + mat_param_c_struct_ptr_value
-                            )
-                            mat_param_c_value_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_c_value_start)
-                            mat_param_c_value_len = readlong(
-                                trmtr
-                            )  # - 5 # Trimming the ".bntx" from the end.
-                            mat_param_c_value = readfixedstring(
-                                trmtr, mat_param_c_value_len
-                            )
-                        if mat_param_c_struct_ptr_id != 0:
-                            fseek(trmtr, mat_param_c_offset + mat_param_c_struct_ptr_id)
-                            mat_param_c_id = readlong(trmtr)
-                        else:
-                            mat_param_c_id = 0
+                if chara_check.startswith(("au_")):
+                    chara_check = "CommonNPC"
+                elif chara_check.startswith(("bu_")):
+                    chara_check = "CommonNPC"
+                elif chara_check.startswith(("cf_")):
+                    chara_check = "CommonNPC"
+                elif chara_check.startswith(("cm_")):
+                    chara_check = "CommonNPC"
+                elif chara_check.startswith(("df_")):
+                    chara_check = "CommonNPC"
+                elif chara_check.startswith(("dm_")):
+                    chara_check = "CommonNPC"
+                elif chara_check.startswith(("p1_")):
+                    chara_check = "Rei"
+                elif chara_check.startswith(("p2_")):
+                    chara_check = "Akari"
+                elif chara_check.startswith(("pm")):
+                    chara_check = "Pokemon"
+                else:
+                    chara_check = "None"
 
-                        if mat_param_c_string == "BaseColorMap":
-                            mat_col0 = mat_param_c_value
-                        elif mat_param_c_string == "LayerMaskMap":
-                            mat_lym0 = mat_param_c_value
-                        elif mat_param_c_string == "NormalMap":
-                            mat_nrm0 = mat_param_c_value
-                        elif mat_param_c_string == "AOMap":
-                            mat_ao0 = mat_param_c_value
-                        elif mat_param_c_string == "EmissionColorMap":
-                            mat_emi0 = mat_param_c_value
-                        elif mat_param_c_string == "RoughnessMap":
-                            mat_rgh0 = mat_param_c_value
-                        elif mat_param_c_string == "MetallicMap":
-                            mat_mtl0 = mat_param_c_value
-                        elif mat_param_c_string == "DisplacementMap":
-                            mat_msk0 = mat_param_c_value
-                        elif mat_param_c_string == "HighlightMaskMap":
-                            mat_highmsk0 = mat_param_c_value
+                trmsh_name = readfixedstring(trmdl, trmsh_name_len)
+                print(trmsh_name)
+                print(chara_check)
+                trmsh_lods_array.append(trmsh_name)
+                if loadlods or x == 0:
+                    loader.fetch_mesh(trmsh_name)
+            fseek(trmdl, trmsh_ret)
 
-                        # -- There's also all of the following, which aren't automatically assigned to keep things simple.
-                        # -- "AOMap"
-                        # -- "AOMap1"
-                        # -- "AOMap2"
-                        # -- "BaseColorMap1"
-                        # -- "DisplacementMap"
-                        # -- "EyelidShadowMaskMap"
-                        # -- "FlowMap"
-                        # -- "FoamMaskMap"
-                        # -- "GrassCollisionMap"
-                        # -- "HighlightMaskMap"
-                        # -- "LowerEyelidColorMap"
-                        # -- "NormalMap1"
-                        # -- "NormalMap2"
-                        # -- "PackedMap"
-                        # -- "UpperEyelidColorMap"
-                        # -- "WeatherLayerMaskMap"
-                        # -- "WindMaskMap"
+    if trmdl_struct_trskl != 0:
+        fseek(trmdl, trmdl_file_start + trmdl_struct_trskl)
+        trskl_start = ftell(trmdl) + readlong(trmdl)
+        fseek(trmdl, trskl_start)
+        trskl_struct = FlatTable(trmdl, trskl_start, TRMDL_NAME_SCHEMA)
 
-                        print(
-                            f"(param_c) {mat_param_c_string}: {mat_param_c_value} [{mat_param_c_id}]"
-                        )
-                        fseek(trmtr, mat_param_c_ret)
+        if trskl_struct.vtable_len != 0x0006:
+            raise AssertionError("Unexpected TRSKL struct length!")
+        trskl_struct_ptr_name = trskl_struct.field("name")
 
-                if mat_struct_ptr_param_d != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_d)
-                    mat_param_d_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_d_start)
-                    mat_param_d_count = readlong(trmtr)
+        if trskl_struct_ptr_name != 0:
+            fseek(trmdl, trskl_start + trskl_struct_ptr_name)
+            trskl_name_offset = ftell(trmdl) + readlong(trmdl)
+            fseek(trmdl, trskl_name_offset)
+            trskl_name_len = readlong(trmdl)
+            trskl_name = readfixedstring(trmdl, trskl_name_len)
+            print(trskl_name)
 
-                    for z in range(mat_param_d_count):
-                        mat_param_d_offset = ftell(trmtr) + readlong(trmtr)
-                        mat_param_d_ret = ftell(trmtr)
-                        fseek(trmtr, mat_param_d_offset)
-                        mat_param_d_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_d_struct)
-                        mat_param_d_struct_len = readshort(trmtr)
+            if dir_index.exists(trskl_name):
+                trskl = loader.open(trskl_name)
+            else:
+                print(f"Can't find {trskl_name}!")
 
-                        if mat_param_d_struct_len != 0x001E:
-                            raise AssertionError(
-                                "Unexpected material param d struct length!"
-                            )
-                        mat_param_d_struct_section_len = readshort(trmtr)
-                        mat_param_d_struct_ptr_a = readshort(trmtr)
-                        mat_param_d_struct_ptr_b = readshort(trmtr)
-                        mat_param_d_struct_ptr_c = readshort(trmtr)
-                        mat_param_d_struct_ptr_d = readshort(trmtr)
-                        mat_param_d_struct_ptr_e = readshort(trmtr)
-                        mat_param_d_struct_ptr_f = readshort(trmtr)
-                        mat_param_d_struct_ptr_g = readshort(trmtr)
-                        mat_param_d_struct_ptr_h = readshort(trmtr)
-                        mat_param_d_struct_ptr_i = readshort(trmtr)
-                        mat_param_d_struct_ptr_j = readshort(trmtr)
-                        mat_param_d_struct_ptr_k = readshort(trmtr)
-                        mat_param_d_struct_ptr_l = readshort(trmtr)
-                        mat_param_d_struct_ptr_m = readshort(trmtr)
+    if trmdl_struct_trmtr != 0:
+        fseek(trmdl, trmdl_file_start + trmdl_struct_trmtr)
+        trmtr_start = ftell(trmdl) + readlong(trmdl)
+        fseek(trmdl, trmtr_start)
+        trmtr_count = readlong(trmdl)
+        for x in range(trmtr_count):
+            trmtr_offset = ftell(trmdl) + readlong(trmdl)
+            trmtr_ret = ftell(trmdl)
+            fseek(trmdl, trmtr_offset)
+            trmtr_name_len = readlong(
+                trmdl
+            )  #  - 6 -- dunno why the extension was excluded
+            trmtr_name = readfixedstring(trmdl, trmtr_name_len)
+            # TODO ArceusShiny
+            # LINE 1227
+            print(trmtr_name)
+            if x == 0:
+                if rare is True:
+                    trmtr = loader.open(Path(trmtr_name).stem + "_rare.trmtr")
+                else:
+                    trmtr = loader.open(trmtr_name)
+            fseek(trmdl, trmtr_ret)
+    fclose(trmdl)
 
-                        if mat_param_d_struct_ptr_a != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_a)
-                            mat_param_d_value_a = readlong(trmtr)
-                        else:
-                            mat_param_d_value_a = 0
-                        if mat_param_d_struct_ptr_b != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_b)
-                            mat_param_d_value_b = readlong(trmtr)
-                        else:
-                            mat_param_d_value_b = 0
-                        if mat_param_d_struct_ptr_c != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_c)
-                            mat_param_d_value_c = readlong(trmtr)
-                        else:
-                            mat_param_d_value_c = 0
-                        if mat_param_d_struct_ptr_d != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_d)
-                            mat_param_d_value_d = readlong(trmtr)
-                        else:
-                            mat_param_d_value_d = 0
-                        if mat_param_d_struct_ptr_e != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_e)
-                            mat_param_d_value_e = readlong(trmtr)
-                        else:
-                            mat_param_d_value_e = 0
-                        if mat_param_d_struct_ptr_f != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_f)
-                            mat_param_d_value_f = readlong(trmtr)
-                        else:
-                            mat_param_d_value_f = 0
-                        if mat_param_d_struct_ptr_g != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_g)
-                            mat_param_d_value_g = readlong(trmtr)
-                        else:
-                            mat_param_d_value_g = 0
-                        if mat_param_d_struct_ptr_h != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_h)
-                            mat_param_d_value_h = readlong(trmtr)
-                        else:
-                            mat_param_d_value_h = 0
-                        if mat_param_d_struct_ptr_i != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_i)
-                            mat_param_d_value_i = readlong(trmtr)
-                        else:
-                            mat_param_d_value_i = 0
-                        if mat_param_d_struct_ptr_j != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_j)
-                            mat_param_d_value_j = readlong(trmtr)
-                        else:
-                            mat_param_d_value_j = 0
-                        if mat_param_d_struct_ptr_k != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_k)
-                            mat_param_d_value_k = readlong(trmtr)
-                        else:
-                            mat_param_d_value_k = 0
-                        if mat_param_d_struct_ptr_l != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_l)
-                            mat_param_d_value_l = readlong(trmtr)
-                        else:
-                            mat_param_d_value_l = 0
-                        if mat_param_d_struct_ptr_m != 0:
-                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_m)
-                            mat_param_d_value_m1 = readfloat(trmtr)
-                            mat_param_d_value_m2 = readfloat(trmtr)
-                            mat_param_d_value_m3 = readfloat(trmtr)
-                        else:
-                            mat_param_d_value_m1 = 0
-                            mat_param_d_value_m2 = 0
-                            mat_param_d_value_m3 = 0
-
-                        print(
-                            f"Flags #{z}: {mat_param_d_value_a} | {mat_param_d_value_b} | {mat_param_d_value_c} | {mat_param_d_value_d} | {mat_param_d_value_e} | {mat_param_d_value_f} | {mat_param_d_value_g} | {mat_param_d_value_h} | {mat_param_d_value_i} | {mat_param_d_value_j} | {mat_param_d_value_k} | {mat_param_d_value_l} | {mat_param_d_value_m1} | {mat_param_d_value_m2} | {mat_param_d_value_m3}"
-                        )
-                        fseek(trmtr, mat_param_d_ret)
-
-                if mat_struct_ptr_param_e != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_e)
-                    mat_param_e_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_e_start)
-                    mat_param_e_count = readlong(trmtr)
-
-                    for z in range(mat_param_e_count):
-                        mat_param_e_offset = ftell(trmtr) + readlong(trmtr)
-                        mat_param_e_ret = ftell(trmtr)
-                        fseek(trmtr, mat_param_e_offset)
-                        mat_param_e_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_e_struct)
-                        mat_param_e_struct_len = readshort(trmtr)
-
-                        if mat_param_e_struct_len == 0x0006:
-                            mat_param_e_struct_section_len = readshort(trmtr)
-                            mat_param_e_struct_ptr_string = readshort(trmtr)
-                            mat_param_e_struct_ptr_value = 0
-                        elif mat_param_e_struct_len == 0x0008:
-                            mat_param_e_struct_section_len = readshort(trmtr)
-                            mat_param_e_struct_ptr_string = readshort(trmtr)
-                            mat_param_e_struct_ptr_value = readshort(trmtr)
-                        else:
-                            raise Exception(f"Unknown mat_param_e struct length!")
-
-                        if mat_param_e_struct_ptr_string != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_e_offset + mat_param_e_struct_ptr_string,
-                            )
-                            mat_param_e_string_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_e_string_start)
-                            mat_param_e_string_len = readlong(trmtr)
-                            mat_param_e_string = readfixedstring(
-                                trmtr, mat_param_e_string_len
-                            )
-
-                        if mat_param_e_struct_ptr_value != 0:
-                            fseek(
-                                trmtr, mat_param_e_offset + mat_param_e_struct_ptr_value
-                            )
-                            mat_param_e_value = readfloat(trmtr)
-                        else:
-                            mat_param_e_value = 0
-
-                        if mat_param_e_string == "Roughness":
-                            mat_rgh_layer0 = mat_param_e_value
-                        elif mat_param_e_string == "RoughnessLayer1":
-                            mat_rgh_layer1 = mat_param_e_value
-                        elif mat_param_e_string == "RoughnessLayer2":
-                            mat_rgh_layer2 = mat_param_e_value
-                        elif mat_param_e_string == "RoughnessLayer3":
-                            mat_rgh_layer3 = mat_param_e_value
-                        elif mat_param_e_string == "RoughnessLayer4":
-                            mat_rgh_layer4 = mat_param_e_value
-                        elif mat_param_e_string == "Metallic":
-                            mat_mtl_layer0 = mat_param_e_value
-                        elif mat_param_e_string == "MetallicLayer1":
-                            mat_mtl_layer1 = mat_param_e_value
-                        elif mat_param_e_string == "MetallicLayer2":
-                            mat_mtl_layer2 = mat_param_e_value
-                        elif mat_param_e_string == "MetallicLayer3":
-                            mat_mtl_layer3 = mat_param_e_value
-                        elif mat_param_e_string == "MetallicLayer4":
-                            mat_mtl_layer4 = mat_param_e_value
-                        elif mat_param_e_string == "Reflectance":
-                            mat_reflectance = mat_param_e_value
-                        elif mat_param_e_string == "EmissionIntensity":
-                            mat_emm_intensity = mat_param_e_value
-
-                        print(f"(param_e) {mat_param_e_string}: {mat_param_e_value}")
-                        fseek(trmtr, mat_param_e_ret)
+    # TODO create bone_rig_array
+    # LINE 1247
+    skeleton_path = None
+    if chara_check == "Rei" or chara_check == "Akari":
+        trskl = None
+        skeleton_path = dir_index.path("p0_base.trskl")
+        if armature_registry.key(skeleton_path, "pla") in built_skeletons:
+            print("Base armature is already built, not parsing its TRSKL")
+        else:
+            trskl = loader.open("p0_base.trskl")
+    if trskl is not None:
+        skeleton_path = trskl.name
 
-                if mat_struct_ptr_param_f != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_f)
-                    mat_param_f_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_f_start)
-                    mat_param_f_count = readlong(trmtr)
+    bones = None
+    if trskl is not None:
+        bones = parse_cache.get(trskl.name, "pla")
+        if bones is not None:
+            print("Using cached TRSKL...")
+            fclose(trskl)
 
-                    for z in range(mat_param_f_count):
-                        mat_param_f_offset = ftell(trmtr) + readlong(trmtr)
-                        mat_param_f_ret = ftell(trmtr)
-                        fseek(trmtr, mat_param_f_offset)
-                        mat_param_f_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_f_struct)
-                        mat_param_f_struct_len = readlong(trmtr)
+    if trskl is not None and bones is None:
+        print("Parsing TRSKL...")
+        bones = []
+        trskl_file_start = readlong(trskl)
+        fseek(trskl, trskl_file_start)
+        trskl_struct = FlatTable(trskl, trskl_file_start, TRSKL_SCHEMA)
+        if trskl_struct.vtable_len not in (0x000C, 0x000E):
+            raise AssertionError("Unexpected TRSKL header struct length!")
+        trskl_struct_bone = trskl_struct.field("bone")
+        trskl_struct_bone_adjust = trskl_struct.field("bone_adjust")
 
-                        if mat_param_f_struct_len != 0x0008:
-                            raise Exception(f"Unknown mat_param_f struct length!")
-                        mat_param_f_struct_section_len = readshort(trmtr)
-                        mat_param_f_struct_ptr_string = readshort(trmtr)
-                        mat_param_f_struct_ptr_values = readshort(trmtr)
+        if trskl_struct_bone_adjust != 0:
+            fseek(trskl, trskl_file_start + trskl_struct_bone_adjust)
+            trskl_bone_adjust = readlong(trskl)
+            print(f"Mesh node IDs start at {trskl_bone_adjust}")
 
-                        if mat_param_f_struct_ptr_string != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_f_offset + mat_param_f_struct_ptr_string,
-                            )
-                            mat_param_f_string_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_f_string_start)
-                            mat_param_f_string_len = readlong(trmtr)
-                            mat_param_f_string = readfixedstring(
-                                trmtr, mat_param_f_string_len
-                            )
+        if trskl_struct_bone != 0:
+            fseek(trskl, trskl_file_start + trskl_struct_bone)
+            trskl_bone_start = ftell(trskl) + readlong(trskl)
+            fseek(trskl, trskl_bone_start)
+            bone_count = readlong(trskl)
 
-                        if mat_param_f_struct_ptr_values != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_f_offset + mat_param_f_struct_ptr_values,
-                            )
-                            mat_param_f_value1 = readfloat(trmtr)
-                            mat_param_f_value2 = readfloat(trmtr)
-                        else:
-                            mat_param_f_value1 = mat_param_f_value2 = 0
+            for x in range(bone_count):
+                bone_offset = ftell(trskl) + readlong(trskl)
+                bone_ret = ftell(trskl)
+                fseek(trskl, bone_offset)
+                print(f"Bone {x} start: {hex(bone_offset)}")
+                trskl_bone_struct = FlatTable(trskl, bone_offset, TRSKL_BONE_SCHEMA)
+                trskl_bone_struct_ptr_string = trskl_bone_struct.field("string")
+                trskl_bone_struct_ptr_bone = trskl_bone_struct.field("bone")
+                trskl_bone_struct_ptr_parent = trskl_bone_struct.field("parent")
+                trskl_bone_struct_ptr_rig_id = trskl_bone_struct.field("rig_id")
+                trskl_bone_struct_ptr_bone_merge = trskl_bone_struct.field("bone_merge")
+                trskl_bone_struct_ptr_h = trskl_bone_struct.field("h")
 
-                        print(
-                            f"(param_f) {mat_param_f_string}: {mat_param_f_value1}, {mat_param_f_value2}"
+                if trskl_bone_struct_ptr_bone_merge != 0:
+                    fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone_merge)
+                    bone_merge_start = ftell(trskl) + readlong(trskl)
+                    fseek(trskl, bone_merge_start)
+                    bone_merge_string_len = readlong(trskl)
+                    if bone_merge_string_len != 0:
+                        bone_merge_string = readfixedstring(
+                            trskl, bone_merge_string_len
                         )
-                        fseek(trmtr, mat_param_f_ret)
-
-                if mat_struct_ptr_param_g != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_g)
-                    mat_param_g_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_g_start)
-                    mat_param_g_count = readlong(trmtr)
-
-                    for z in range(mat_param_g_count):
-                        mat_param_g_offset = ftell(trmtr) + readlong(trmtr)
-                        mat_param_g_ret = ftell(trmtr)
-                        fseek(trmtr, mat_param_g_offset)
-                        mat_param_g_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_g_struct)
-                        mat_param_g_struct_len = readlong(trmtr)
+                        print(f"BoneMerge to {bone_merge_string}")
+                    else:
+                        bone_merge_string = ""
 
-                        if mat_param_g_struct_len != 0x0008:
-                            raise Exception(f"Unknown mat_param_g struct length!")
-                        mat_param_g_struct_section_len = readshort(trmtr)
-                        mat_param_g_struct_ptr_string = readshort(trmtr)
-                        mat_param_g_struct_ptr_values = readshort(trmtr)
+                if trskl_bone_struct_ptr_bone != 0:
+                    fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone)
+                    bone_pos_start = ftell(trskl) + readlong(trskl)
+                    fseek(trskl, bone_pos_start)
+                    bone_pos_struct = FlatTable(
+                        trskl, bone_pos_start, TRSKL_TRANSFORM_SCHEMA
+                    )
 
-                        if mat_param_g_struct_ptr_string != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_g_offset + mat_param_g_struct_ptr_string,
-                            )
-                            mat_param_g_string_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_g_string_start)
-                            mat_param_g_string_len = readlong(trmtr)
-                            mat_param_g_string = readfixedstring(
-                                trmtr, mat_param_g_string_len
-                            )
+                    if bone_pos_struct.vtable_len != 0x000A:
+                        raise AssertionError("Unexpected bone position struct length!")
+                    bone_pos_struct_ptr_scl = bone_pos_struct.field("scl")
+                    bone_pos_struct_ptr_rot = bone_pos_struct.field("rot")
+                    bone_pos_struct_ptr_trs = bone_pos_struct.field("trs")
 
-                        if mat_param_g_struct_ptr_values != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_g_offset + mat_param_g_struct_ptr_values,
-                            )
-                            mat_param_g_value1 = readfloat(trmtr)
-                            mat_param_g_value2 = readfloat(trmtr)
-                            mat_param_g_value3 = readfloat(trmtr)
-                        else:
-                            mat_param_g_value1 = mat_param_g_value2 = (
-                                mat_param_g_value3
-                            ) = 0
+                    fseek(trskl, bone_pos_start + bone_pos_struct_ptr_trs)
+                    bone_tx = readfloat(trskl)
+                    bone_ty = readfloat(trskl)
+                    bone_tz = readfloat(trskl)
+                    # TODO ArceusScale
+                    # LINE 1797
+                    fseek(trskl, bone_pos_start + bone_pos_struct_ptr_rot)
+                    bone_rx = readfloat(trskl)
+                    bone_ry = readfloat(trskl)
+                    bone_rz = readfloat(trskl)
+                    fseek(trskl, bone_pos_start + bone_pos_struct_ptr_scl)
+                    bone_sx = readfloat(trskl)
+                    bone_sy = readfloat(trskl)
+                    bone_sz = readfloat(trskl)
 
-                        print(
-                            f"(param_g) {mat_param_g_string}: {mat_param_g_value1}, {mat_param_g_value2}, {mat_param_g_value3}"
-                        )
-                        fseek(trmtr, mat_param_g_ret)
+                    if trskl_bone_struct_ptr_string != 0:
+                        fseek(trskl, bone_offset + trskl_bone_struct_ptr_string)
+                        bone_string_start = ftell(trskl) + readlong(trskl)
+                        fseek(trskl, bone_string_start)
+                        bone_str_len = readlong(trskl)
+                        bone_name = readfixedstring(trskl, bone_str_len)
+                    if trskl_bone_struct_ptr_parent != 0x00:
+                        fseek(trskl, bone_offset + trskl_bone_struct_ptr_parent)
+                        bone_parent = readlong(trskl) + 1
+                    else:
+                        bone_parent = 0
+                    bone_rig_id = None
+                    if trskl_bone_struct_ptr_rig_id != 0:
+                        fseek(trskl, bone_offset + trskl_bone_struct_ptr_rig_id)
+                        bone_rig_id = readlong(trskl) + trskl_bone_adjust
 
-                if mat_struct_ptr_param_h != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_h)
-                    mat_param_h_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_h_start)
-                    mat_param_h_count = readlong(trmtr)
+                    bones.append(
+                        {
+                            "name": bone_name,
+                            "parent": bone_parent,
+                            "rig_id": bone_rig_id,
+                            "h": trskl_bone_struct_ptr_h,
+                            "trs": (bone_tx, bone_ty, bone_tz),
+                            "rot": (bone_rx, bone_ry, bone_rz),
+                            "scl": (bone_sx, bone_sy, bone_sz),
+                        }
+                    )
+                fseek(trskl, bone_ret)
+        fclose(trskl)
+        parse_cache.put(trskl.name, "pla", bones)
 
-                    for z in range(mat_param_h_count):
-                        mat_param_h_offset = ftell(trmtr) + readlong(trmtr)
-                        mat_param_h_ret = ftell(trmtr)
-                        fseek(trmtr, mat_param_h_offset)
-                        mat_param_h_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_h_struct)
-                        mat_param_h_struct_len = readshort(trmtr)
+    mat_data_array = None
+    if trmtr is not None:
+        mat_data_array = parse_cache.get(trmtr.name, "pla")
+        if mat_data_array is None:
+            trmtr_entry = disk_cache.entry(trmtr.name, "pla")
+            mat_data_array = disk_cache.get_materials(trmtr_entry)
+            if mat_data_array is not None:
+                parse_cache.put(trmtr.name, "pla", mat_data_array)
+        if mat_data_array is not None:
+            print("Using cached TRMTR...")
+            fclose(trmtr)
+
+    if trmtr is not None and mat_data_array is None:
+        print("Parsing TRMTR...")
+        trmtr_file_start = readlong(trmtr)
+        mat_data_array = []
+        fseek(trmtr, trmtr_file_start)
+        trmtr_struct = FlatTable(trmtr, trmtr_file_start, TRMTR_SCHEMA)
 
-                        if mat_param_h_struct_len != 0x0008:
-                            raise Exception(f"Unknown mat_param_h struct length!")
-                        mat_param_h_struct_section_len = readshort(trmtr)
-                        mat_param_h_struct_ptr_string = readshort(trmtr)
-                        mat_param_h_struct_ptr_values = readshort(trmtr)
+        if trmtr_struct.vtable_len != 0x0008:
+            raise AssertionError("Unexpected TRMTR header struct length!")
+        trmtr_struct_material = trmtr_struct.field("material")
 
-                        if mat_param_h_struct_ptr_string != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_h_offset + mat_param_h_struct_ptr_string,
-                            )
-                            mat_param_h_string_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_h_string_start)
-                            mat_param_h_string_len = readlong(trmtr)
-                            mat_param_h_string = readfixedstring(
-                                trmtr, mat_param_h_string_len
-                            )
-
-                        if mat_param_h_struct_ptr_values != 0:
-                            fseek(
-                                trmtr,
-                                mat_param_h_offset + mat_param_h_struct_ptr_values,
-                            )
-                            mat_param_h_value1 = readfloat(trmtr)
-                            mat_param_h_value2 = readfloat(trmtr)
-                            mat_param_h_value3 = readfloat(trmtr)
-                            mat_param_h_value4 = readfloat(trmtr)
-                        else:
-                            mat_param_h_value1 = mat_param_h_value2 = (
-                                mat_param_h_value3
-                            ) = mat_param_h_value4 = 0
+        if trmtr_struct_material != 0:
+            fseek(trmtr, trmtr_file_start + trmtr_struct_material)
+            mat_start = ftell(trmtr) + readlong(trmtr)
+            fseek(trmtr, mat_start)
+            mat_count = readlong(trmtr)
+            for x in range(mat_count):
+                mat_shader = "Standard"
+                mat_col0 = ""
+                mat_lym0 = ""
+                mat_nrm0 = ""
+                mat_ao0 = ""
+                mat_emi0 = ""
+                mat_rgh0 = ""
+                mat_mtl0 = ""
+                mat_msk0 = ""
+                mat_highmsk0 = ""
+                mat_uv_scale_u = 1.0
+                mat_uv_scale_v = 1.0
+                mat_uv_trs_u = 0
+                mat_uv_trs_v = 0
+                mat_uv_scale2_u = 1.0
+                mat_uv_scale2_v = 1.0
+                mat_uv_trs2_u = 0
+                mat_uv_trs2_v = 0
+                mat_color1_r = 1.0
+                mat_color1_g = 1.0
+                mat_color1_b = 1.0
+                mat_color2_r = 1.0
+                mat_color2_g = 1.0
+                mat_color2_b = 1.0
+                mat_color3_r = 1.0
+                mat_color3_g = 1.0
+                mat_color3_b = 1.0
+                mat_color4_r = 1.0
+                mat_color4_g = 1.0
+                mat_color4_b = 1.0
 
-                        if mat_param_h_string == "UVScaleOffset":
-                            mat_uv_scale_u = mat_param_h_value1
-                            mat_uv_scale_v = mat_param_h_value2
-                            mat_uv_trs_u = mat_param_h_value3
-                            mat_uv_trs_v = mat_param_h_value4
-                        elif mat_param_h_string == "UVScaleOffset1":
-                            mat_uv_scale2_u = mat_param_h_value1
-                            mat_uv_scale2_v = mat_param_h_value2
-                            mat_uv_trs2_u = mat_param_h_value3
-                            mat_uv_trs2_v = mat_param_h_value4
-                        elif mat_param_h_string == "BaseColorLayer1":
-                            mat_color1_r = mat_param_h_value1
-                            mat_color1_g = mat_param_h_value2
-                            mat_color1_b = mat_param_h_value3
-                        elif mat_param_h_string == "BaseColorLayer2":
-                            mat_color2_r = mat_param_h_value1
-                            mat_color2_g = mat_param_h_value2
-                            mat_color2_b = mat_param_h_value3
-                        elif mat_param_h_string == "BaseColorLayer3":
-                            mat_color3_r = mat_param_h_value1
-                            mat_color3_g = mat_param_h_value2
-                            mat_color3_b = mat_param_h_value3
-                        elif mat_param_h_string == "BaseColorLayer4":
-                            mat_color4_r = mat_param_h_value1
-                            mat_color4_g = mat_param_h_value2
-                            mat_color4_b = mat_param_h_value3
-                        elif mat_param_h_string == "EmissionColorLayer1":
-                            mat_emcolor1_r = mat_param_h_value1
-                            mat_emcolor1_g = mat_param_h_value2
-                            mat_emcolor1_b = mat_param_h_value3
-                        elif mat_param_h_string == "EmissionColorLayer2":
-                            mat_emcolor2_r = mat_param_h_value1
-                            mat_emcolor2_g = mat_param_h_value2
-                            mat_emcolor2_b = mat_param_h_value3
-                        elif mat_param_h_string == "EmissionColorLayer3":
-                            mat_emcolor3_r = mat_param_h_value1
-                            mat_emcolor3_g = mat_param_h_value2
-                            mat_emcolor3_b = mat_param_h_value3
-                        elif mat_param_h_string == "EmissionColorLayer4":
-                            mat_emcolor4_r = mat_param_h_value1
-                            mat_emcolor4_g = mat_param_h_value2
-                            mat_emcolor4_b = mat_param_h_value3
-                        elif mat_param_h_string == "EmissionColorLayer5":
-                            mat_emcolor5_r = mat_param_h_value1
-                            mat_emcolor5_g = mat_param_h_value2
-                            mat_emcolor5_b = mat_param_h_value3
-                        else:
-                            print(f"Unknown mat_param_h: {mat_param_h_string}")
+                mat_emcolor1_r = 1.0
+                mat_emcolor1_g = 1.0
+                mat_emcolor1_b = 1.0
+                mat_emcolor2_r = 1.0
+                mat_emcolor2_g = 1.0
+                mat_emcolor2_b = 1.0
+                mat_emcolor3_r = 1.0
+                mat_emcolor3_g = 1.0
+                mat_emcolor3_b = 1.0
+                mat_emcolor4_r = 1.0
+                mat_emcolor4_g = 1.0
+                mat_emcolor4_b = 1.0
+                mat_emcolor5_r = 1.0
+                mat_emcolor5_g = 1.0
+                mat_emcolor5_b = 1.0
+                mat_rgh_layer0 = 1.0
+                mat_rgh_layer1 = 1.0
+                mat_rgh_layer2 = 1.0
+                mat_rgh_layer3 = 1.0
+                mat_rgh_layer4 = 1.0
+                mat_mtl_layer0 = 0.0
+                mat_mtl_layer1 = 0.0
+                mat_mtl_layer2 = 0.0
+                mat_mtl_layer3 = 0.0
+                mat_mtl_layer4 = 0.0
+                mat_reflectance = 0.0
+                mat_emm_intensity = 1.0
+                mat_offset = ftell(trmtr) + readlong(trmtr)
+                mat_ret = ftell(trmtr)
 
-                        print(
-                            f"(param_h) {mat_param_h_string}: {mat_param_h_value1}, {mat_param_h_value2}, {mat_param_h_value3}, {mat_param_h_value4}"
-                        )
-                        fseek(trmtr, mat_param_h_ret)
+                mat_enable_base_color_map = False
+                mat_enable_normal_map = False
+                mat_enable_ao_map = False
+                mat_enable_emission_color_map = False
+                mat_enable_roughness_map = False
+                mat_enable_metallic_map = False
+                mat_enable_displacement_map = False
+                mat_enable_highlight_map = False
 
-                if mat_struct_ptr_param_i != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_i)
-                    mat_param_i_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_i_start)
-                    mat_param_i_struct = ftell(trmtr) - readlong(trmtr)
-                    fseek(trmtr, mat_param_i_struct)
-                    mat_param_i_struct_len = readlong(trmtr)
+                fseek(trmtr, mat_offset)
+                print("--------------------")
+                mat_struct = FlatTable(trmtr, mat_offset, TRMTR_MATERIAL_SCHEMA)
 
-                    if mat_param_i_struct_len != 0x0000:
-                        raise Exception(f"Unknown mat_param_i struct length!")
+                if mat_struct.vtable_len != 0x0024:
+                    raise AssertionError("Unexpected material struct length!")
+                mat_struct_ptr_param_a = mat_struct.field("param_a")
+                mat_struct_ptr_param_b = mat_struct.field("param_b")
+                mat_struct_ptr_param_c = mat_struct.field("param_c")
+                mat_struct_ptr_param_d = mat_struct.field("param_d")
+                mat_struct_ptr_param_e = mat_struct.field("param_e")
+                mat_struct_ptr_param_f = mat_struct.field("param_f")
+                mat_struct_ptr_param_g = mat_struct.field("param_g")
+                mat_struct_ptr_param_h = mat_struct.field("param_h")
+                mat_struct_ptr_param_i = mat_struct.field("param_i")
+                mat_struct_ptr_param_j = mat_struct.field("param_j")
+                mat_struct_ptr_param_k = mat_struct.field("param_k")
+                mat_struct_ptr_param_l = mat_struct.field("param_l")
+                mat_struct_ptr_param_m = mat_struct.field("param_m")
+                mat_struct_ptr_param_n = mat_struct.field("param_n")
+                mat_struct_ptr_param_o = mat_struct.field("param_o")
+                mat_struct_ptr_param_p = mat_struct.field("param_p")
 
-                if mat_struct_ptr_param_j != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_j)
-                    mat_param_j_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_j_start)
-                    mat_param_j_count = readlong(trmtr)
+                if mat_struct_ptr_param_a != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_a)
+                    mat_param_a_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_a_start)
+                    mat_name_len = readlong(trmtr)
+                    mat_name = readfixedstring(trmtr, mat_name_len)
+                    print(f"Material properties for {mat_name}:")
+                if mat_struct_ptr_param_b != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_b)
+                    mat_param_b_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_b_start)
+                    mat_param_b_section_count = readlong(trmtr)
+                    for z in range(mat_param_b_section_count):
+                        mat_param_b_offset = ftell(trmtr) + readlong(trmtr)
+                        mat_param_b_ret = ftell(trmtr)
+                        fseek(trmtr, mat_param_b_offset)
+                        mat_param_b_struct = FlatTable(
+                            trmtr, mat_param_b_offset, TRMTR_SHADER_SCHEMA
+                        )
 
-                    for y in range(mat_param_j_count):
-                        mat_param_j_offset = ftell(trmtr) + readlong(trmtr)
-                        mat_param_j_ret = ftell(trmtr)
-                        fseek(trmtr, mat_param_j_offset)
-                        mat_param_j_struct = ftell(trmtr) - readlong(trmtr)
-                        fseek(trmtr, mat_param_j_struct)
-                        mat_param_j_struct_len = readshort(trmtr)
-
-                        if mat_param_j_struct_len == 0x0006:
-                            mat_param_j_struct_section_len = readshort(trmtr)
-                            mat_param_j_struct_ptr_string = readshort(trmtr)
-                            mat_param_j_struct_ptr_value = 0
-                        elif mat_param_j_struct_len == 0x0008:
-                            mat_param_j_struct_section_len = readshort(trmtr)
-                            mat_param_j_struct_ptr_string = readshort(trmtr)
-                            mat_param_j_struct_ptr_value = readshort(trmtr)
-                        else:
-                            raise Exception(f"Unknown mat_param_j struct length!")
+                        if mat_param_b_struct.vtable_len != 0x0008:
+                            raise AssertionError(
+                                "Unexpected material param b struct length!"
+                            )
+                        mat_param_b_struct_ptr_string = mat_param_b_struct.field(
+                            "string"
+                        )
+                        mat_param_b_struct_ptr_params = mat_param_b_struct.field(
+                            "params"
+                        )
 
-                        if mat_param_j_struct_ptr_string != 0:
+                        if mat_param_b_struct_ptr_string != 0:
                             fseek(
                                 trmtr,
-                                mat_param_j_offset + mat_param_j_struct_ptr_string,
+                                mat_param_b_offset + mat_param_b_struct_ptr_string,
                             )
-                            mat_param_j_string_start = ftell(trmtr) + readlong(trmtr)
-                            fseek(trmtr, mat_param_j_string_start)
-                            mat_param_j_string_len = readlong(trmtr)
-                            mat_param_j_string = readfixedstring(
-                                trmtr, mat_param_j_string_len
+                            mat_param_b_shader_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_b_shader_start)
+                            mat_param_b_shader_len = readlong(trmtr)
+                            mat_param_b_shader_string = readfixedstring(
+                                trmtr, mat_param_b_shader_len
                             )
-
-                        if mat_param_j_struct_ptr_value != 0:
+                            print(f"Shader: {mat_param_b_shader_string}")
+                            mat_shader = mat_param_b_shader_string
+                        if mat_param_b_struct_ptr_params != 0:
                             fseek(
-                                trmtr, mat_param_j_offset + mat_param_j_struct_ptr_value
+                                trmtr,
+                                mat_param_b_offset + mat_param_b_struct_ptr_params,
                             )
-                            mat_param_j_value = readlong(trmtr)
-                        else:
-                            mat_param_j_value = "0"  # why is this a string?
-
-                        print(f"(param_j) {mat_param_j_string}: {mat_param_j_value}")
-                        fseek(trmtr, mat_param_j_ret)
-
-                if mat_struct_ptr_param_k != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_k)
-                    mat_param_k_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_k_start)
-                    mat_param_k_struct = ftell(trmtr) - readlong(trmtr)
-                    fseek(trmtr, mat_param_k_struct)
-                    mat_param_k_struct_len = readlong(trmtr)
-
-                    if mat_param_k_struct_len != 0x0000:
-                        raise Exception(f"Unexpected mat_param_k struct length!")
-
-                if mat_struct_ptr_param_l != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_l)
-                    mat_param_l_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_l_start)
-                    mat_param_l_struct = ftell(trmtr) - readlong(trmtr)
-                    fseek(trmtr, mat_param_l_struct)
-                    mat_param_l_struct_len = readlong(trmtr)
-
-                    if mat_param_l_struct_len != 0x0000:
-                        raise Exception(f"Unexpected mat_param_l struct length!")
+                            mat_param_b_sub_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_b_sub_start)
+                            mat_param_b_sub_count = readlong(trmtr)
+                            for y in range(mat_param_b_sub_count):
+                                mat_param_b_sub_offset = ftell(trmtr) + readlong(trmtr)
+                                mat_param_b_sub_ret = ftell(trmtr)
+                                fseek(trmtr, mat_param_b_sub_offset)
+                                mat_param_b_sub_struct = FlatTable(
+                                    trmtr, mat_param_b_sub_offset, TRMTR_PARAM_SCHEMA
+                                )
 
-                if mat_struct_ptr_param_m != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_m)
-                    mat_param_m_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_m_start)
-                    mat_param_m_struct = ftell(trmtr) - readlong(trmtr)
-                    fseek(trmtr, mat_param_m_struct)
-                    mat_param_m_struct_len = readlong(trmtr)
+                                if mat_param_b_sub_struct.vtable_len != 0x0008:
+                                    raise AssertionError(
+                                        "Unexpected material param b sub struct length!"
+                                    )
+                                mat_param_b_sub_struct_ptr_string = (
+                                    mat_param_b_sub_struct.field("string")
+                                )
+                                mat_param_b_sub_struct_ptr_value = (
+                                    mat_param_b_sub_struct.field("value")
+                                )
 
-                    if mat_param_m_struct_len != 0x0000:
-                        raise Exception(f"Unexpected mat_param_m struct length!")
+                                if mat_param_b_sub_struct_ptr_string != 0:
+                                    fseek(
+                                        trmtr,
+                                        mat_param_b_sub_offset
+                                        + mat_param_b_sub_struct_ptr_string,
+                                    )
+                                    mat_param_b_sub_string_start = ftell(
+                                        trmtr
+                                    ) + readlong(trmtr)
+                                    fseek(trmtr, mat_param_b_sub_string_start)
+                                    mat_param_b_sub_string_len = readlong(trmtr)
+                                    mat_param_b_sub_string = readfixedstring(
+                                        trmtr, mat_param_b_sub_string_len
+                                    )
+                                if mat_param_b_sub_struct_ptr_value != 0:
+                                    fseek(
+                                        trmtr,
+                                        mat_param_b_sub_offset
+                                        + mat_param_b_sub_struct_ptr_value,
+                                    )
+                                    mat_param_b_sub_value_start = ftell(
+                                        trmtr
+                                    ) + readlong(trmtr)
+                                    fseek(trmtr, mat_param_b_sub_value_start)
+                                    mat_param_b_sub_value_len = readlong(trmtr)
+                                    mat_param_b_sub_value = readfixedstring(
+                                        trmtr, mat_param_b_sub_value_len
+                                    )
+                                    print(
+                                        f"(param_b) {mat_param_b_sub_string}: {mat_param_b_sub_value}"
+                                    )
 
-                if mat_struct_ptr_param_n != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_n)
-                    mat_param_n_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_n_start)
-                    mat_param_n_struct = ftell(trmtr) - readlong(trmtr)
-                    fseek(trmtr, mat_param_n_struct)
-                    mat_param_n_struct_len = readshort(trmtr)
+                                if mat_param_b_sub_string == "EnableBaseColorMap":
+                                    mat_enable_base_color_map = (
+                                        mat_param_b_sub_value == "True"
+                                    )
+                                if mat_param_b_sub_string == "EnableNormalMap":
+                                    mat_enable_normal_map = (
+                                        mat_param_b_sub_value == "True"
+                                    )
+                                if mat_param_b_sub_string == "EnableAOMap":
+                                    mat_enable_ao_map = mat_param_b_sub_value == "True"
+                                if mat_param_b_sub_string == "EnableEmissionColorMap":
+                                    mat_enable_emission_color_map = (
+                                        mat_param_b_sub_value == "True"
+                                    )
+                                if mat_param_b_sub_string == "EnableRoughnessMap":
+                                    mat_enable_roughness_map = (
+                                        mat_param_b_sub_value == "True"
+                                    )
+                                if mat_param_b_sub_string == "EnableMetallicMap":
+                                    mat_enable_metallic_map = (
+                                        mat_param_b_sub_value == "True"
+                                    )
+                                if mat_param_b_sub_string == "EnableDisplacementMap":
+                                    mat_enable_displacement_map = (
+                                        mat_param_b_sub_value == "True"
+                                    )
+                                if mat_param_b_sub_string == "EnableHighlight":
+                                    mat_enable_highlight_map = (
+                                        mat_param_b_sub_value == "True"
+                                    )
+                                if mat_param_b_sub_string == "EnableOverrideColor":
+                                    mat_enable_override_color = (
+                                        mat_param_b_sub_value == "True"
+                                    )
+                                fseek(trmtr, mat_param_b_sub_ret)
+                        fseek(trmtr, mat_param_b_ret)
 
-                    if mat_param_n_struct_len == 0x0004:
-                        mat_param_n_struct_section_len = readshort(trmtr)
-                        mat_param_n_struct_unk = 0
-                    elif mat_param_n_struct_len == 0x0006:
-                        mat_param_n_struct_section_len = readshort(trmtr)
-                        mat_param_n_struct_unk = readshort(trmtr)
-                    else:
-                        raise Exception(f"Unexpected mat_param_n struct length!")
+                if mat_struct_ptr_param_c != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_c)
+                    mat_param_c_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_c_start)
+                    mat_param_c_count = readlong(trmtr)
 
-                    if mat_param_n_struct_unk != 0:
-                        fseek(trmtr, mat_param_n_start + mat_param_n_struct_unk)
-                        mat_param_n_value = readbyte(trmtr)
-                        print(f"Unknown value A = {mat_param_n_value}")
+                    for z in range(mat_param_c_count):
+                        mat_param_c_offset = ftell(trmtr) + readlong(trmtr)
+                        mat_param_c_ret = ftell(trmtr)
+                        fseek(trmtr, mat_param_c_offset)
+                        mat_param_c_struct = FlatTable(
+                            trmtr, mat_param_c_offset, TRMTR_TEXTURE_SCHEMA
+                        )
 
-                if mat_struct_ptr_param_o != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_o)
-                    mat_param_o_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_o_start)
-                    mat_param_o_struct = ftell(trmtr) - readlong(trmtr)
-                    fseek(trmtr, mat_param_o_struct)
-                    mat_param_o_struct_len = readshort(trmtr)
+                        if mat_param_c_struct.vtable_len not in (0x0008, 0x000A):
+                            raise AssertionError(
+                                "Unexpected material param c struct length!"
+                            )
+                        mat_param_c_struct_ptr_string = mat_param_c_struct.field(
+                            "string"
+                        )
+                        mat_param_c_struct_ptr_value = mat_param_c_struct.field("value")
+                        mat_param_c_struct_ptr_id = mat_param_c_struct.field("id")
 
-                    if mat_param_o_struct_len == 0x0004:
-                        mat_param_o_struct_section_len = readshort(trmtr)
-                        mat_param_o_struct_unk = 0
-                        mat_param_o_struct_value = 0
-                    elif mat_param_o_struct_len == 0x0008:
-                        mat_param_o_struct_section_len = readshort(trmtr)
-                        mat_param_o_struct_unk = readshort(trmtr)
-                        mat_param_o_struct_value = readshort(trmtr)
-                    else:
-                        raise Exception(f"Unexpected mat_param_o struct length!")
+                        if mat_param_c_struct_ptr_string != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_c_offset + mat_param_c_struct_ptr_string,
+                            )
+                            mat_param_c_string_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_c_string_start)
+                            mat_param_c_string_len = readlong(trmtr)
+                            mat_param_c_string = readfixedstring(
+                                trmtr, mat_param_c_string_len
+                            )
+                        if mat_param_c_struct_ptr_value != 0:
+                            fseek(
+                                trmtr, mat_param_c_offset + mat_param_c_struct_ptr_value
+                            )
+                            mat_param_c_value_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_c_value_start)
+                            mat_param_c_value_len = readlong(
+                                trmtr
+                            )  # - 5 # Trimming the ".bntx" from the end.
+                            mat_param_c_value = readfixedstring(
+                                trmtr, mat_param_c_value_len
+                            )
+                        if mat_param_c_struct_ptr_id != 0:
+                            fseek(trmtr, mat_param_c_offset + mat_param_c_struct_ptr_id)
+                            mat_param_c_id = readlong(trmtr)
+                        else:
+                            mat_param_c_id = 0
 
-                    if mat_param_o_struct_unk != 0:
-                        fseek(trmtr, mat_param_o_start + mat_param_o_struct_unk)
-                        mat_param_o_value = readbyte(trmtr)
-                        print(f"Unknown value B = {mat_param_o_value}")
+                        if mat_param_c_string == "BaseColorMap":
+                            mat_col0 = mat_param_c_value
+                        elif mat_param_c_string == "LayerMaskMap":
+                            mat_lym0 = mat_param_c_value
+                        elif mat_param_c_string == "NormalMap":
+                            mat_nrm0 = mat_param_c_value
+                        elif mat_param_c_string == "AOMap":
+                            mat_ao0 = mat_param_c_value
+                        elif mat_param_c_string == "EmissionColorMap":
+                            mat_emi0 = mat_param_c_value
+                        elif mat_param_c_string == "RoughnessMap":
+                            mat_rgh0 = mat_param_c_value
+                        elif mat_param_c_string == "MetallicMap":
+                            mat_mtl0 = mat_param_c_value
+                        elif mat_param_c_string == "DisplacementMap":
+                            mat_msk0 = mat_param_c_value
+                        elif mat_param_c_string == "HighlightMaskMap":
+                            mat_highmsk0 = mat_param_c_value
 
-                if mat_struct_ptr_param_p != 0:
-                    fseek(trmtr, mat_offset + mat_struct_ptr_param_p)
-                    mat_param_p_start = ftell(trmtr) + readlong(trmtr)
-                    fseek(trmtr, mat_param_p_start)
-                    mat_param_p_string_len = readlong(trmtr)
-                    mat_param_p_string = readfixedstring(trmtr, mat_param_p_string_len)
-                    print(mat_param_p_string)
+                        # -- There's also all of the following, which aren't automatically assigned to keep things simple.
+                        # -- "AOMap"
+                        # -- "AOMap1"
+                        # -- "AOMap2"
+                        # -- "BaseColorMap1"
+                        # -- "DisplacementMap"
+                        # -- "EyelidShadowMaskMap"
+                        # -- "FlowMap"
+                        # -- "FoamMaskMap"
+                        # -- "GrassCollisionMap"
+                        # -- "HighlightMaskMap"
+                        # -- "LowerEyelidColorMap"
+                        # -- "NormalMap1"
+                        # -- "NormalMap2"
+                        # -- "PackedMap"
+                        # -- "UpperEyelidColorMap"
+                        # -- "WeatherLayerMaskMap"
+                        # -- "WindMaskMap"
 
-                mat_data_array.append(
-                    {
-                        "mat_name": mat_name,
-                        "mat_shader": mat_shader,
-                        "mat_col0": mat_col0,
-                        "mat_lym0": mat_lym0,
-                        "mat_nrm0": mat_nrm0,
-                        "mat_ao0": mat_ao0,
-                        "mat_emi0": mat_emi0,
-                        "mat_rgh0": mat_rgh0,
-                        "mat_mtl0": mat_mtl0,
-                        "mat_msk0": mat_msk0,
-                        "mat_highmsk0": mat_highmsk0,
-                        "mat_color1_r": mat_color1_r,
-                        "mat_color1_g": mat_color1_g,
-                        "mat_color1_b": mat_color1_b,
-                        "mat_color2_r": mat_color2_r,
-                        "mat_color2_g": mat_color2_g,
-                        "mat_color2_b": mat_color2_b,
-                        "mat_color3_r": mat_color3_r,
-                        "mat_color3_g": mat_color3_g,
-                        "mat_color3_b": mat_color3_b,
-                        "mat_color4_r": mat_color4_r,
-                        "mat_color4_g": mat_color4_g,
-                        "mat_color4_b": mat_color4_b,
-                        "mat_emcolor1_r": mat_emcolor1_r,
-                        "mat_emcolor1_g": mat_emcolor1_g,
-                        "mat_emcolor1_b": mat_emcolor1_b,
-                        "mat_emcolor2_r": mat_emcolor2_r,
-                        "mat_emcolor2_g": mat_emcolor2_g,
-                        "mat_emcolor2_b": mat_emcolor2_b,
-                        "mat_emcolor3_r": mat_emcolor3_r,
-                        "mat_emcolor3_g": mat_emcolor3_g,
-                        "mat_emcolor3_b": mat_emcolor3_b,
-                        "mat_emcolor4_r": mat_emcolor4_r,
-                        "mat_emcolor4_g": mat_emcolor4_g,
-                        "mat_emcolor4_b": mat_emcolor4_b,
-                        "mat_emcolor5_r": mat_emcolor5_r,
-                        "mat_emcolor5_g": mat_emcolor5_g,
-                        "mat_emcolor5_b": mat_emcolor5_b,
-                        "mat_rgh_layer0": mat_rgh_layer0,
-                        "mat_rgh_layer1": mat_rgh_layer1,
-                        "mat_rgh_layer2": mat_rgh_layer2,
-                        "mat_rgh_layer3": mat_rgh_layer3,
-                        "mat_rgh_layer4": mat_rgh_layer4,
-                        "mat_mtl_layer0": mat_mtl_layer0,
-                        "mat_mtl_layer1": mat_mtl_layer1,
-                        "mat_mtl_layer2": mat_mtl_layer2,
-                        "mat_mtl_layer3": mat_mtl_layer3,
-                        "mat_mtl_layer4": mat_mtl_layer4,
-                        "mat_reflectance": mat_reflectance,
-                        "mat_emm_intensity": mat_emm_intensity,
-                        "mat_uv_scale_u": mat_uv_scale_u,
-                        "mat_uv_scale_v": mat_uv_scale_v,
-                        "mat_uv_scale2_u": mat_uv_scale2_u,
-                        "mat_uv_scale2_v": mat_uv_scale2_v,
-                        "mat_enable_base_color_map": mat_enable_base_color_map,
-                        "mat_enable_normal_map": mat_enable_normal_map,
-                        "mat_enable_ao_map": mat_enable_ao_map,
-                        "mat_enable_emission_color_map": mat_enable_emission_color_map,
-                        "mat_enable_roughness_map": mat_enable_roughness_map,
-                        "mat_enable_metallic_map": mat_enable_metallic_map,
-                        "mat_enable_displacement_map": mat_enable_displacement_map,
-                        "mat_enable_highlight_map": mat_enable_highlight_map,
-                    }
-                )
-                fseek(trmtr, mat_ret)
-            print("--------------------")
+                        print(
+                            f"(param_c) {mat_param_c_string}: {mat_param_c_value} [{mat_param_c_id}]"
+                        )
+                        fseek(trmtr, mat_param_c_ret)
 
-        fclose(trmtr)
+                if mat_struct_ptr_param_d != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_d)
+                    mat_param_d_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_d_start)
+                    mat_param_d_count = readlong(trmtr)
 
-        if IN_BLENDER_ENV:
-            # process materials
-            for m, mat in enumerate(mat_data_array):
-                material = bpy.data.materials.new(name=mat["mat_name"])
-                material.use_nodes = True
-                materials.append(material)
+                    for z in range(mat_param_d_count):
+                        mat_param_d_offset = ftell(trmtr) + readlong(trmtr)
+                        mat_param_d_ret = ftell(trmtr)
+                        fseek(trmtr, mat_param_d_offset)
+                        mat_param_d_struct = FlatTable(
+                            trmtr, mat_param_d_offset, TRMTR_SAMPLER_SCHEMA
+                        )
 
-                blend_type = "MIX"
+                        if mat_param_d_struct.vtable_len != 0x001E:
+                            raise AssertionError(
+                                "Unexpected material param d struct length!"
+                            )
+                        mat_param_d_struct_ptr_a = mat_param_d_struct.field("a")
+                        mat_param_d_struct_ptr_b = mat_param_d_struct.field("b")
+                        mat_param_d_struct_ptr_c = mat_param_d_struct.field("c")
+                        mat_param_d_struct_ptr_d = mat_param_d_struct.field("d")
+                        mat_param_d_struct_ptr_e = mat_param_d_struct.field("e")
+                        mat_param_d_struct_ptr_f = mat_param_d_struct.field("f")
+                        mat_param_d_struct_ptr_g = mat_param_d_struct.field("g")
+                        mat_param_d_struct_ptr_h = mat_param_d_struct.field("h")
+                        mat_param_d_struct_ptr_i = mat_param_d_struct.field("i")
+                        mat_param_d_struct_ptr_j = mat_param_d_struct.field("j")
+                        mat_param_d_struct_ptr_k = mat_param_d_struct.field("k")
+                        mat_param_d_struct_ptr_l = mat_param_d_struct.field("l")
+                        mat_param_d_struct_ptr_m = mat_param_d_struct.field("m")
 
-                material_output = material.node_tree.nodes.get("Material Output")
-                principled_bsdf = material.node_tree.nodes.get("Principled BSDF")
-                material.node_tree.links.new(
-                    principled_bsdf.outputs[0], material_output.inputs[0]
-                )
+                        if mat_param_d_struct_ptr_a != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_a)
+                            mat_param_d_value_a = readlong(trmtr)
+                        else:
+                            mat_param_d_value_a = 0
+                        if mat_param_d_struct_ptr_b != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_b)
+                            mat_param_d_value_b = readlong(trmtr)
+                        else:
+                            mat_param_d_value_b = 0
+                        if mat_param_d_struct_ptr_c != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_c)
+                            mat_param_d_value_c = readlong(trmtr)
+                        else:
+                            mat_param_d_value_c = 0
+                        if mat_param_d_struct_ptr_d != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_d)
+                            mat_param_d_value_d = readlong(trmtr)
+                        else:
+                            mat_param_d_value_d = 0
+                        if mat_param_d_struct_ptr_e != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_e)
+                            mat_param_d_value_e = readlong(trmtr)
+                        else:
+                            mat_param_d_value_e = 0
+                        if mat_param_d_struct_ptr_f != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_f)
+                            mat_param_d_value_f = readlong(trmtr)
+                        else:
+                            mat_param_d_value_f = 0
+                        if mat_param_d_struct_ptr_g != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_g)
+                            mat_param_d_value_g = readlong(trmtr)
+                        else:
+                            mat_param_d_value_g = 0
+                        if mat_param_d_struct_ptr_h != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_h)
+                            mat_param_d_value_h = readlong(trmtr)
+                        else:
+                            mat_param_d_value_h = 0
+                        if mat_param_d_struct_ptr_i != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_i)
+                            mat_param_d_value_i = readlong(trmtr)
+                        else:
+                            mat_param_d_value_i = 0
+                        if mat_param_d_struct_ptr_j != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_j)
+                            mat_param_d_value_j = readlong(trmtr)
+                        else:
+                            mat_param_d_value_j = 0
+                        if mat_param_d_struct_ptr_k != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_k)
+                            mat_param_d_value_k = readlong(trmtr)
+                        else:
+                            mat_param_d_value_k = 0
+                        if mat_param_d_struct_ptr_l != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_l)
+                            mat_param_d_value_l = readlong(trmtr)
+                        else:
+                            mat_param_d_value_l = 0
+                        if mat_param_d_struct_ptr_m != 0:
+                            fseek(trmtr, mat_param_d_offset + mat_param_d_struct_ptr_m)
+                            mat_param_d_value_m1 = readfloat(trmtr)
+                            mat_param_d_value_m2 = readfloat(trmtr)
+                            mat_param_d_value_m3 = readfloat(trmtr)
+                        else:
+                            mat_param_d_value_m1 = 0
+                            mat_param_d_value_m2 = 0
+                            mat_param_d_value_m3 = 0
 
-                print(f"mat_shader = {mat['mat_shader']}")
+                        print(
+                            f"Flags #{z}: {mat_param_d_value_a} | {mat_param_d_value_b} | {mat_param_d_value_c} | {mat_param_d_value_d} | {mat_param_d_value_e} | {mat_param_d_value_f} | {mat_param_d_value_g} | {mat_param_d_value_h} | {mat_param_d_value_i} | {mat_param_d_value_j} | {mat_param_d_value_k} | {mat_param_d_value_l} | {mat_param_d_value_m1} | {mat_param_d_value_m2} | {mat_param_d_value_m3}"
+                        )
+                        fseek(trmtr, mat_param_d_ret)
 
-                material.blend_method = "HASHED"
-                material.show_transparent_back = False
-                material.shadow_method = "OPAQUE"
+                if mat_struct_ptr_param_e != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_e)
+                    mat_param_e_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_e_start)
+                    mat_param_e_count = readlong(trmtr)
 
-                color_output = principled_bsdf.inputs[0]
-                if mat["mat_shader"] == "Unlit":
-                    color_output = material_output.inputs[0]
-                if mat["mat_shader"] == "Transparent":
-                    material.blend_method = "BLEND"
-                    reflectionpart1 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart1.operation = "SQRT"
-                    reflectionpart1.inputs[0].default_value = mat["mat_reflectance"]
+                    for z in range(mat_param_e_count):
+                        mat_param_e_offset = ftell(trmtr) + readlong(trmtr)
+                        mat_param_e_ret = ftell(trmtr)
+                        fseek(trmtr, mat_param_e_offset)
+                        mat_param_e_struct = FlatTable(
+                            trmtr, mat_param_e_offset, TRMTR_PARAM_SCHEMA
+                        )
 
-                    reflectionpart2 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart2.inputs[0].default_value = 1.0
-                    reflectionpart2.operation = "ADD"
+                        if mat_param_e_struct.vtable_len not in (0x0006, 0x0008):
+                            raise Exception(f"Unknown mat_param_e struct length!")
+                        mat_param_e_struct_ptr_string = mat_param_e_struct.field(
+                            "string"
+                        )
+                        mat_param_e_struct_ptr_value = mat_param_e_struct.field("value")
 
-                    reflectionpart3 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart3.inputs[0].default_value = 1.0
-                    reflectionpart3.operation = "SUBTRACT"
+                        if mat_param_e_struct_ptr_string != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_e_offset + mat_param_e_struct_ptr_string,
+                            )
+                            mat_param_e_string_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_e_string_start)
+                            mat_param_e_string_len = readlong(trmtr)
+                            mat_param_e_string = readfixedstring(
+                                trmtr, mat_param_e_string_len
+                            )
 
-                    reflectionpart4 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart4.operation = "DIVIDE"
+                        if mat_param_e_struct_ptr_value != 0:
+                            fseek(
+                                trmtr, mat_param_e_offset + mat_param_e_struct_ptr_value
+                            )
+                            mat_param_e_value = readfloat(trmtr)
+                        else:
+                            mat_param_e_value = 0
 
-                    reflectionpart5 = material.node_tree.nodes.new("ShaderNodeFresnel")
+                        if mat_param_e_string == "Roughness":
+                            mat_rgh_layer0 = mat_param_e_value
+                        elif mat_param_e_string == "RoughnessLayer1":
+                            mat_rgh_layer1 = mat_param_e_value
+                        elif mat_param_e_string == "RoughnessLayer2":
+                            mat_rgh_layer2 = mat_param_e_value
+                        elif mat_param_e_string == "RoughnessLayer3":
+                            mat_rgh_layer3 = mat_param_e_value
+                        elif mat_param_e_string == "RoughnessLayer4":
+                            mat_rgh_layer4 = mat_param_e_value
+                        elif mat_param_e_string == "Metallic":
+                            mat_mtl_layer0 = mat_param_e_value
+                        elif mat_param_e_string == "MetallicLayer1":
+                            mat_mtl_layer1 = mat_param_e_value
+                        elif mat_param_e_string == "MetallicLayer2":
+                            mat_mtl_layer2 = mat_param_e_value
+                        elif mat_param_e_string == "MetallicLayer3":
+                            mat_mtl_layer3 = mat_param_e_value
+                        elif mat_param_e_string == "MetallicLayer4":
+                            mat_mtl_layer4 = mat_param_e_value
+                        elif mat_param_e_string == "Reflectance":
+                            mat_reflectance = mat_param_e_value
+                        elif mat_param_e_string == "EmissionIntensity":
+                            mat_emm_intensity = mat_param_e_value
 
-                    reflectionpart6 = material.node_tree.nodes.new("ShaderNodeMath")
-                    reflectionpart6.inputs[0].default_value = 0.25
-                    reflectionpart6.operation = "SUBTRACT"
+                        print(f"(param_e) {mat_param_e_string}: {mat_param_e_value}")
+                        fseek(trmtr, mat_param_e_ret)
 
-                    material.node_tree.links.new(
-                        reflectionpart1.outputs[0], reflectionpart2.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        reflectionpart1.outputs[0], reflectionpart3.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        reflectionpart2.outputs[0], reflectionpart4.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        reflectionpart3.outputs[0], reflectionpart4.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        reflectionpart4.outputs[0], reflectionpart5.inputs[0]
-                    )
+                if mat_struct_ptr_param_f != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_f)
+                    mat_param_f_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_f_start)
+                    mat_param_f_count = readlong(trmtr)
 
-                material.use_backface_culling = True
+                    for z in range(mat_param_f_count):
+                        mat_param_f_offset = ftell(trmtr) + readlong(trmtr)
+                        mat_param_f_ret = ftell(trmtr)
+                        fseek(trmtr, mat_param_f_offset)
+                        mat_param_f_struct = ftell(trmtr) - readlong(trmtr)
+                        fseek(trmtr, mat_param_f_struct)
+                        mat_param_f_struct_len = readlong(trmtr)
 
-                if chara_check == "Pokemon" or mat["mat_name"] == "eye":
-                    # LAYER MASK MAP
+                        if mat_param_f_struct_len != 0x0008:
+                            raise Exception(f"Unknown mat_param_f struct length!")
+                        mat_param_f_struct_section_len = readshort(trmtr)
+                        mat_param_f_struct_ptr_string = readshort(trmtr)
+                        mat_param_f_struct_ptr_values = readshort(trmtr)
 
-                    lym_image_texture = material.node_tree.nodes.new(
-                        "ShaderNodeTexImage"
-                    )
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_lym0"][:-5] + textureextension)
-                        )
-                       is True
-                    ):
-                        lym_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_lym0"][:-5] + textureextension)
+                        if mat_param_f_struct_ptr_string != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_f_offset + mat_param_f_struct_ptr_string,
+                            )
+                            mat_param_f_string_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_f_string_start)
+                            mat_param_f_string_len = readlong(trmtr)
+                            mat_param_f_string = readfixedstring(
+                                trmtr, mat_param_f_string_len
+                            )
+
+                        if mat_param_f_struct_ptr_values != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_f_offset + mat_param_f_struct_ptr_values,
+                            )
+                            mat_param_f_value1 = readfloat(trmtr)
+                            mat_param_f_value2 = readfloat(trmtr)
+                        else:
+                            mat_param_f_value1 = mat_param_f_value2 = 0
+
+                        print(
+                            f"(param_f) {mat_param_f_string}: {mat_param_f_value1}, {mat_param_f_value2}"
                         )
-                        lym_image_texture.image.colorspace_settings.name = "Non-Color"
-                    huesaturationvalue = material.node_tree.nodes.new(
-                        "ShaderNodeHueSaturation"
-                    )
-                    huesaturationvalue.inputs[2].default_value = 2.0
-                    huesaturationvalue2 = material.node_tree.nodes.new(
-                        "ShaderNodeHueSaturation"
-                    )
-                    huesaturationvalue2.inputs[2].default_value = 2.0
+                        fseek(trmtr, mat_param_f_ret)
 
-                    color1 = (
-                        mat["mat_color1_r"],
-                        mat["mat_color1_g"],
-                        mat["mat_color1_b"],
-                        1.0,
-                    )
-                    color2 = (
-                        mat["mat_color2_r"],
-                        mat["mat_color2_g"],
-                        mat["mat_color2_b"],
-                        1.0,
-                    )
-                    color3 = (
-                        mat["mat_color3_r"],
-                        mat["mat_color3_g"],
-                        mat["mat_color3_b"],
-                        1.0,
-                    )
-                    color4 = (
-                        mat["mat_color4_r"],
-                        mat["mat_color4_g"],
-                        mat["mat_color4_b"],
-                        1.0,
-                    )
-
-                    emcolor1 = (
-                        mat["mat_emcolor1_r"],
-                        mat["mat_emcolor1_g"],
-                        mat["mat_emcolor1_b"],
-                        1.0,
-                    )
-                    emcolor2 = (
-                        mat["mat_emcolor2_r"],
-                        mat["mat_emcolor2_g"],
-                        mat["mat_emcolor2_b"],
-                        1.0,
-                    )
-                    emcolor3 = (
-                        mat["mat_emcolor3_r"],
-                        mat["mat_emcolor3_g"],
-                        mat["mat_emcolor3_b"],
-                        1.0,
-                    )
-                    emcolor4 = (
-                        mat["mat_emcolor4_r"],
-                        mat["mat_emcolor4_g"],
-                        mat["mat_emcolor4_b"],
-                        1.0,
-                    )
-                    if (
-                        emcolor1 == (1.0, 1.0, 1.0, 1.0)
-                        and emcolor2 == (1.0, 1.0, 1.0, 1.0)
-                        and emcolor3 == (1.0, 1.0, 1.0, 1.0)
-                        and emcolor4 == (1.0, 1.0, 1.0, 1.0)
-                    ):
-                        emcolor1 = (0.0, 0.0, 0.0, 0.0)
-                        emcolor2 = (0.0, 0.0, 0.0, 0.0)
-                        emcolor3 = (0.0, 0.0, 0.0, 0.0)
-                        emcolor4 = (0.0, 0.0, 0.0, 0.0)
-                    print(f'Material {mat["mat_name"]}:')
-                    print(f"Color 1: {color1}")
-                    print(f"Color 2: {color2}")
-                    print(f"Color 3: {color3}")
-                    print(f"Color 4: {color4}")
-                    print(f"Emission Color 1: {emcolor1}")
-                    print(f"Emission Color 2: {emcolor2}")
-                    print(f"Emission Color 3: {emcolor3}")
-                    print(f"Emission Color 4: {emcolor4}")
-                    print("---")
+                if mat_struct_ptr_param_g != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_g)
+                    mat_param_g_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_g_start)
+                    mat_param_g_count = readlong(trmtr)
 
-                    mix_color1 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_color1.blend_type = blend_type
-                    mix_color1.inputs[1].default_value = (1, 1, 1, 1)
-                    mix_color1.inputs[2].default_value = color1
-                    mix_color2 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_color2.blend_type = blend_type
-                    mix_color2.inputs[1].default_value = (0, 0, 0, 0)
-                    mix_color2.inputs[2].default_value = color2
-                    mix_color3 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_color3.blend_type = blend_type
-                    mix_color3.inputs[1].default_value = (0, 0, 0, 0)
-                    mix_color3.inputs[2].default_value = color3
-                    mix_color4 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_color4.blend_type = blend_type
-                    mix_color4.inputs[1].default_value = (0, 0, 0, 0)
-                    mix_color4.inputs[2].default_value = color4
-                    mix_color5 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_color5.blend_type = blend_type
-                    mix_color5.inputs[0].default_value = 0.0
-                    mix_color5.inputs[1].default_value = (0, 0, 0, 0)
-                    mix_color5.inputs[2].default_value = (1, 1, 1, 1)
+                    for z in range(mat_param_g_count):
+                        mat_param_g_offset = ftell(trmtr) + readlong(trmtr)
+                        mat_param_g_ret = ftell(trmtr)
+                        fseek(trmtr, mat_param_g_offset)
+                        mat_param_g_struct = ftell(trmtr) - readlong(trmtr)
+                        fseek(trmtr, mat_param_g_struct)
+                        mat_param_g_struct_len = readlong(trmtr)
 
-                    mix_emcolor1 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_emcolor1.blend_type = blend_type
-                    mix_emcolor1.inputs[1].default_value = (0, 0, 0, 0)
-                    mix_emcolor1.inputs[2].default_value = emcolor1
-                    mix_emcolor2 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_emcolor2.blend_type = blend_type
-                    mix_emcolor2.inputs[1].default_value = (0, 0, 0, 0)
-                    mix_emcolor2.inputs[2].default_value = emcolor2
-                    mix_emcolor3 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_emcolor3.blend_type = blend_type
-                    mix_emcolor3.inputs[1].default_value = (0, 0, 0, 0)
-                    mix_emcolor3.inputs[2].default_value = emcolor3
-                    mix_emcolor4 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                    mix_emcolor4.blend_type = blend_type
-                    mix_emcolor4.inputs[1].default_value = (0, 0, 0, 0)
-                    mix_emcolor4.inputs[2].default_value = emcolor4
+                        if mat_param_g_struct_len != 0x0008:
+                            raise Exception(f"Unknown mat_param_g struct length!")
+                        mat_param_g_struct_section_len = readshort(trmtr)
+                        mat_param_g_struct_ptr_string = readshort(trmtr)
+                        mat_param_g_struct_ptr_values = readshort(trmtr)
 
-                    material.node_tree.links.new(
-                        mix_color1.outputs[0], mix_color2.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        mix_color2.outputs[0], mix_color3.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        mix_color3.outputs[0], mix_color4.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        mix_color3.outputs[0], mix_color4.inputs[1]
-                    )
-                    material.node_tree.links.new(mix_color4.outputs[0], color_output)
+                        if mat_param_g_struct_ptr_string != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_g_offset + mat_param_g_struct_ptr_string,
+                            )
+                            mat_param_g_string_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_g_string_start)
+                            mat_param_g_string_len = readlong(trmtr)
+                            mat_param_g_string = readfixedstring(
+                                trmtr, mat_param_g_string_len
+                            )
 
-                    material.node_tree.links.new(
-                        mix_emcolor1.outputs[0], mix_emcolor2.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        mix_emcolor2.outputs[0], mix_emcolor3.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        mix_emcolor3.outputs[0], mix_emcolor4.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        mix_emcolor3.outputs[0], mix_emcolor4.inputs[1]
-                    )
-                    material.node_tree.links.new(
-                        mix_emcolor4.outputs[0], principled_bsdf.inputs[26]
-                    )
+                        if mat_param_g_struct_ptr_values != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_g_offset + mat_param_g_struct_ptr_values,
+                            )
+                            mat_param_g_value1 = readfloat(trmtr)
+                            mat_param_g_value2 = readfloat(trmtr)
+                            mat_param_g_value3 = readfloat(trmtr)
+                        else:
+                            mat_param_g_value1 = mat_param_g_value2 = (
+                                mat_param_g_value3
+                            ) = 0
 
-                    separate_color = material.node_tree.nodes.new(
-                        "ShaderNodeSeparateRGB"
-                    )
-                    material.node_tree.links.new(
-                        lym_image_texture.outputs[0], huesaturationvalue.inputs[4]
-                    )
-                    material.node_tree.links.new(
-                        huesaturationvalue.outputs[0], separate_color.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        separate_color.outputs[0], mix_color1.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        separate_color.outputs[1], mix_color2.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        separate_color.outputs[2], mix_color3.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        lym_image_texture.outputs[1], huesaturationvalue2.inputs[4]
-                    )
-                    material.node_tree.links.new(
-                        huesaturationvalue2.outputs[0], mix_color4.inputs[0]
-                    )
+                        print(
+                            f"(param_g) {mat_param_g_string}: {mat_param_g_value1}, {mat_param_g_value2}, {mat_param_g_value3}"
+                        )
+                        fseek(trmtr, mat_param_g_ret)
 
-                    material.node_tree.links.new(
-                        separate_color.outputs[0], mix_emcolor1.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        separate_color.outputs[1], mix_emcolor2.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        separate_color.outputs[2], mix_emcolor3.inputs[0]
-                    )
-                    material.node_tree.links.new(
-                        huesaturationvalue2.outputs[0], mix_emcolor4.inputs[0]
-                    )
+                if mat_struct_ptr_param_h != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_h)
+                    mat_param_h_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_h_start)
+                    mat_param_h_count = readlong(trmtr)
 
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_col0"][:-5] + textureextension)
-                        )
-                       is True
-                    ):
-                        alb_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        alb_image_texture.image = bpy.data.images.load(
-                            os.path.join(filep, mat["mat_col0"][:-5] + textureextension)
+                    for z in range(mat_param_h_count):
+                        mat_param_h_offset = ftell(trmtr) + readlong(trmtr)
+                        mat_param_h_ret = ftell(trmtr)
+                        fseek(trmtr, mat_param_h_offset)
+                        mat_param_h_struct = FlatTable(
+                            trmtr, mat_param_h_offset, TRMTR_VECTOR_SCHEMA
                         )
-                        material.node_tree.links.new(
-                            alb_image_texture.outputs[0], mix_color1.inputs[1]
+
+                        if mat_param_h_struct.vtable_len != 0x0008:
+                            raise Exception(f"Unknown mat_param_h struct length!")
+                        mat_param_h_struct_ptr_string = mat_param_h_struct.field(
+                            "string"
                         )
-                        material.node_tree.links.new(
-                            alb_image_texture.outputs[1], principled_bsdf.inputs[4]
+                        mat_param_h_struct_ptr_values = mat_param_h_struct.field(
+                            "values"
                         )
 
-                    if mat["mat_enable_highlight_map"]:
-                        highlight_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(filep, mat["mat_highmsk0"][:-5] + ".png")
-                            )
-                           is True
-                        ):
-                            highlight_image_texture.image = bpy.data.images.load(
-                                os.path.join(filep, mat["mat_highmsk0"][:-5] + ".png")
-                            )
-                            highlight_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        elif (
-                            os.path.exists(
-                                os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                            )
-                           is True
-                        ):
-                            highlight_image_texture.image = bpy.data.images.load(
-                                os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                            )
-                            highlight_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        elif (
-                            os.path.exists(
-                                os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                            )
-                           is True
-                        ):
-                            highlight_image_texture.image = bpy.data.images.load(
-                                os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                            )
-                            highlight_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        elif (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_col0"][:-12] + "r_eye_msk.png"
-                                )
-                            )
-                           is True
-                        ):
-                            highlight_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_col0"][:-12] + "r_eye_msk.png"
-                                )
-                            )
-                            highlight_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        elif (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_col0"][:-12] + "l_eye_msk.png"
-                                )
+                        if mat_param_h_struct_ptr_string != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_h_offset + mat_param_h_struct_ptr_string,
                             )
-                           is True
-                        ):
-                            highlight_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_col0"][:-12] + "l_eye_msk.png"
-                                )
+                            mat_param_h_string_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_h_string_start)
+                            mat_param_h_string_len = readlong(trmtr)
+                            mat_param_h_string = readfixedstring(
+                                trmtr, mat_param_h_string_len
                             )
-                            highlight_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
+
+                        if mat_param_h_struct_ptr_values != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_h_offset + mat_param_h_struct_ptr_values,
                             )
+                            mat_param_h_value1 = readfloat(trmtr)
+                            mat_param_h_value2 = readfloat(trmtr)
+                            mat_param_h_value3 = readfloat(trmtr)
+                            mat_param_h_value4 = readfloat(trmtr)
                         else:
-                            print("No Highlight")
-                        material.node_tree.links.new(
-                            highlight_image_texture.outputs[0], mix_color5.inputs[0]
-                        )
-                        material.node_tree.links.new(
-                            mix_color4.outputs[0], mix_color5.inputs[1]
-                        )
-                        material.node_tree.links.new(
-                            mix_color5.outputs[0], color_output
-                        )
+                            mat_param_h_value1 = mat_param_h_value2 = (
+                                mat_param_h_value3
+                            ) = mat_param_h_value4 = 0
 
-                    if mat["mat_enable_normal_map"]:
-                        normal_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_nrm0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            normal_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_nrm0"][:-5] + textureextension
-                                )
-                            )
-                            normal_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        separate_color2 = material.node_tree.nodes.new(
-                            "ShaderNodeSeparateRGB"
-                        )
-                        combine_color2 = material.node_tree.nodes.new(
-                            "ShaderNodeCombineColor"
-                        )
-                        normal_map2 = material.node_tree.nodes.new(
-                            "ShaderNodeNormalMap"
-                        )
-                        material.node_tree.links.new(
-                            normal_image_texture.outputs[0], separate_color2.inputs[0]
-                        )
-                        material.node_tree.links.new(
-                            separate_color2.outputs[0], combine_color2.inputs[0]
-                        )
-                        material.node_tree.links.new(
-                            separate_color2.outputs[1], combine_color2.inputs[1]
-                        )
-                        material.node_tree.links.new(
-                            normal_image_texture.outputs[1], combine_color2.inputs[2]
-                        )
-                        material.node_tree.links.new(
-                            combine_color2.outputs[0], normal_map2.inputs[1]
-                        )
-                        material.node_tree.links.new(
-                            normal_map2.outputs[0], principled_bsdf.inputs[5]
-                        )
-                        if mat["mat_shader"] == "Transparent":
-                            material.node_tree.links.new(
-                                normal_map2.outputs[0], reflectionpart5.inputs[1]
-                            )
-                            material.node_tree.links.new(
-                                reflectionpart5.outputs[0], reflectionpart6.inputs[1]
-                            )
-                            material.node_tree.links.new(
-                                reflectionpart6.outputs[0], principled_bsdf.inputs[4]
-                            )
+                        if mat_param_h_string == "UVScaleOffset":
+                            mat_uv_scale_u = mat_param_h_value1
+                            mat_uv_scale_v = mat_param_h_value2
+                            mat_uv_trs_u = mat_param_h_value3
+                            mat_uv_trs_v = mat_param_h_value4
+                        elif mat_param_h_string == "UVScaleOffset1":
+                            mat_uv_scale2_u = mat_param_h_value1
+                            mat_uv_scale2_v = mat_param_h_value2
+                            mat_uv_trs2_u = mat_param_h_value3
+                            mat_uv_trs2_v = mat_param_h_value4
+                        elif mat_param_h_string == "BaseColorLayer1":
+                            mat_color1_r = mat_param_h_value1
+                            mat_color1_g = mat_param_h_value2
+                            mat_color1_b = mat_param_h_value3
+                        elif mat_param_h_string == "BaseColorLayer2":
+                            mat_color2_r = mat_param_h_value1
+                            mat_color2_g = mat_param_h_value2
+                            mat_color2_b = mat_param_h_value3
+                        elif mat_param_h_string == "BaseColorLayer3":
+                            mat_color3_r = mat_param_h_value1
+                            mat_color3_g = mat_param_h_value2
+                            mat_color3_b = mat_param_h_value3
+                        elif mat_param_h_string == "BaseColorLayer4":
+                            mat_color4_r = mat_param_h_value1
+                            mat_color4_g = mat_param_h_value2
+                            mat_color4_b = mat_param_h_value3
+                        elif mat_param_h_string == "EmissionColorLayer1":
+                            mat_emcolor1_r = mat_param_h_value1
+                            mat_emcolor1_g = mat_param_h_value2
+                            mat_emcolor1_b = mat_param_h_value3
+                        elif mat_param_h_string == "EmissionColorLayer2":
+                            mat_emcolor2_r = mat_param_h_value1
+                            mat_emcolor2_g = mat_param_h_value2
+                            mat_emcolor2_b = mat_param_h_value3
+                        elif mat_param_h_string == "EmissionColorLayer3":
+                            mat_emcolor3_r = mat_param_h_value1
+                            mat_emcolor3_g = mat_param_h_value2
+                            mat_emcolor3_b = mat_param_h_value3
+                        elif mat_param_h_string == "EmissionColorLayer4":
+                            mat_emcolor4_r = mat_param_h_value1
+                            mat_emcolor4_g = mat_param_h_value2
+                            mat_emcolor4_b = mat_param_h_value3
+                        elif mat_param_h_string == "EmissionColorLayer5":
+                            mat_emcolor5_r = mat_param_h_value1
+                            mat_emcolor5_g = mat_param_h_value2
+                            mat_emcolor5_b = mat_param_h_value3
+                        else:
+                            print(f"Unknown mat_param_h: {mat_param_h_string}")
 
-                    if mat["mat_enable_metallic_map"]:
-                        metalness_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_mtl0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            metalness_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_mtl0"][:-5] + textureextension
-                                )
-                            )
-                            metalness_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        material.node_tree.links.new(
-                            metalness_image_texture.outputs[0],
-                            principled_bsdf.inputs[1],
+                        print(
+                            f"(param_h) {mat_param_h_string}: {mat_param_h_value1}, {mat_param_h_value2}, {mat_param_h_value3}, {mat_param_h_value4}"
                         )
+                        fseek(trmtr, mat_param_h_ret)
 
-                    if mat["mat_enable_emission_color_map"]:
-                        emission_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_emi0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            emission_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_emi0"][:-5] + textureextension
-                                )
-                            )
-                        material.node_tree.links.new(
-                            emission_image_texture.outputs[0],
-                            principled_bsdf.inputs[26],
-                        )
+                if mat_struct_ptr_param_i != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_i)
+                    mat_param_i_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_i_start)
+                    mat_param_i_struct = ftell(trmtr) - readlong(trmtr)
+                    fseek(trmtr, mat_param_i_struct)
+                    mat_param_i_struct_len = readlong(trmtr)
 
-                    if mat["mat_enable_roughness_map"]:
-                        roughness_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_rgh0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            roughness_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_rgh0"][:-5] + textureextension
-                                )
-                            )
-                            roughness_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        material.node_tree.links.new(
-                            roughness_image_texture.outputs[0],
-                            principled_bsdf.inputs[2],
-                        )
+                    if mat_param_i_struct_len != 0x0000:
+                        raise Exception(f"Unknown mat_param_i struct length!")
 
-                    if mat["mat_enable_ao_map"]:
-                        ambientocclusion_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_ao0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            ambientocclusion_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_ao0"][:-5] + textureextension
-                                )
-                            )
-                            ambientocclusion_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        mix_color6 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                        mix_color6.blend_type = "MULTIPLY"
-                        if (
-                            mat["mat_ao0"][:-5]
-                            == "../../glb_share_tex/texture_white_ao/texture_white_ao"
-                        ):
-                            mix_color6.inputs[0].default_value = 0
-                        else:
-                            mix_color6.inputs[0].default_value = 1.0
-                        if mix_color5is True:
-                            material.node_tree.links.new(
-                                mix_color5.outputs[0], mix_color6.inputs[0]
-                            )
-                            material.node_tree.links.new(
-                                ambientocclusion_image_texture.outputs[0],
-                                mix_color6.inputs[1],
-                            )
-                            material.node_tree.links.new(
-                                mix_color6.outputs[0], color_output
-                            )
-                        else:
-                            material.node_tree.links.new(
-                                mix_color4.outputs[0], mix_color6.inputs[1]
-                            )
-                            material.node_tree.links.new(
-                                ambientocclusion_image_texture.outputs[0],
-                                mix_color6.inputs[2],
-                            )
-                            material.node_tree.links.new(
-                                mix_color6.outputs[0], color_output
-                            )
-                    if (
-                        os.path.exists(
-                            os.path.join(filep, mat["mat_col0"][:-5] + textureextension)
-                        )
-                       is True
-                    ):
-                        if (
-                            color1 == (1.0, 1.0, 1.0, 1.0)
-                            and color2 == (1.0, 1.0, 1.0, 1.0)
-                            and color3 == (1.0, 1.0, 1.0, 1.0)
-                            and color4 == (1.0, 1.0, 1.0, 1.0)
-                        ):
-                            if mat["mat_enable_ao_map"]:
-                                material.node_tree.links.new(
-                                    alb_image_texture.outputs[0], mix_color6.inputs[1]
-                                )
-                            else:
-                                material.node_tree.links.new(
-                                    alb_image_texture.outputs[0], mix_color5.inputs[1]
-                                )
+                if mat_struct_ptr_param_j != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_j)
+                    mat_param_j_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_j_start)
+                    mat_param_j_count = readlong(trmtr)
 
-                else:
-                    if mat["mat_enable_base_color_map"]:
-                        alb_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_col0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            alb_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_col0"][:-5] + textureextension
-                                )
-                            )
-                        material.node_tree.links.new(
-                            alb_image_texture.outputs[0], color_output
-                        )
-                        material.node_tree.links.new(
-                            alb_image_texture.outputs[1], principled_bsdf.inputs[4]
+                    for y in range(mat_param_j_count):
+                        mat_param_j_offset = ftell(trmtr) + readlong(trmtr)
+                        mat_param_j_ret = ftell(trmtr)
+                        fseek(trmtr, mat_param_j_offset)
+                        mat_param_j_struct = FlatTable(
+                            trmtr, mat_param_j_offset, TRMTR_PARAM_SCHEMA
                         )
 
-                    if mat["mat_enable_highlight_map"]:
-                        highlight_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
+                        if mat_param_j_struct.vtable_len not in (0x0006, 0x0008):
+                            raise Exception(f"Unknown mat_param_j struct length!")
+                        mat_param_j_struct_ptr_string = mat_param_j_struct.field(
+                            "string"
                         )
-                        if (
-                            os.path.exists(
-                                os.path.join(filep, mat["mat_highmsk0"][:-5] + ".png")
+                        mat_param_j_struct_ptr_value = mat_param_j_struct.field("value")
+
+                        if mat_param_j_struct_ptr_string != 0:
+                            fseek(
+                                trmtr,
+                                mat_param_j_offset + mat_param_j_struct_ptr_string,
                             )
-                           is True
-                        ):
-                            highlight_image_texture.image = bpy.data.images.load(
-                                os.path.join(filep, mat["mat_highmsk0"][:-5] + ".png")
+                            mat_param_j_string_start = ftell(trmtr) + readlong(trmtr)
+                            fseek(trmtr, mat_param_j_string_start)
+                            mat_param_j_string_len = readlong(trmtr)
+                            mat_param_j_string = readfixedstring(
+                                trmtr, mat_param_j_string_len
                             )
-                            highlight_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
+
+                        if mat_param_j_struct_ptr_value != 0:
+                            fseek(
+                                trmtr, mat_param_j_offset + mat_param_j_struct_ptr_value
                             )
+                            mat_param_j_value = readlong(trmtr)
                         else:
-                            highlight_image_texture.image = bpy.data.images.load(
-                                os.path.join(filep, mat["mat_col0"][:-8] + "msk.png")
-                            )
-                            highlight_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        material.node_tree.links.new(
-                            highlight_image_texture.outputs[0], mix_color5.inputs[0]
-                        )
-                        material.node_tree.links.new(
-                            mix_color4.outputs[0], mix_color5.inputs[1]
-                        )
-                        material.node_tree.links.new(
-                            mix_color5.outputs[0], color_output
-                        )
+                            mat_param_j_value = "0"  # why is this a string?
 
-                    if mat["mat_enable_normal_map"]:
-                        normal_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_nrm0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            normal_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_nrm0"][:-5] + textureextension
-                                )
-                            )
-                            normal_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        separate_color2 = material.node_tree.nodes.new(
-                            "ShaderNodeSeparateRGB"
-                        )
-                        combine_color2 = material.node_tree.nodes.new(
-                            "ShaderNodeCombineColor"
-                        )
-                        normal_map2 = material.node_tree.nodes.new(
-                            "ShaderNodeNormalMap"
-                        )
-                        material.node_tree.links.new(
-                            normal_image_texture.outputs[0], separate_color2.inputs[0]
-                        )
-                        material.node_tree.links.new(
-                            separate_color2.outputs[0], combine_color2.inputs[0]
-                        )
-                        material.node_tree.links.new(
-                            separate_color2.outputs[1], combine_color2.inputs[1]
-                        )
-                        material.node_tree.links.new(
-                            normal_image_texture.outputs[1], combine_color2.inputs[2]
-                        )
-                        material.node_tree.links.new(
-                            combine_color2.outputs[0], normal_map2.inputs[1]
-                        )
-                        material.node_tree.links.new(
-                            normal_map2.outputs[0], principled_bsdf.inputs[5]
-                        )
-                        if mat["mat_shader"] == "Transparent":
-                            material.node_tree.links.new(
-                                normal_map2.outputs[0], reflectionpart5.inputs[1]
-                            )
-                            material.node_tree.links.new(
-                                reflectionpart5.outputs[0], principled_bsdf.inputs[4]
-                            )
+                        print(f"(param_j) {mat_param_j_string}: {mat_param_j_value}")
+                        fseek(trmtr, mat_param_j_ret)
 
-                    if mat["mat_enable_emission_color_map"]:
-                        emission_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_emi0"][:-5] + textureextension
-                                )
+                if mat_struct_ptr_param_k != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_k)
+                    mat_param_k_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_k_start)
+                    mat_param_k_struct = ftell(trmtr) - readlong(trmtr)
+                    fseek(trmtr, mat_param_k_struct)
+                    mat_param_k_struct_len = readlong(trmtr)
+
+                    if mat_param_k_struct_len != 0x0000:
+                        raise Exception(f"Unexpected mat_param_k struct length!")
+
+                if mat_struct_ptr_param_l != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_l)
+                    mat_param_l_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_l_start)
+                    mat_param_l_struct = ftell(trmtr) - readlong(trmtr)
+                    fseek(trmtr, mat_param_l_struct)
+                    mat_param_l_struct_len = readlong(trmtr)
+
+                    if mat_param_l_struct_len != 0x0000:
+                        raise Exception(f"Unexpected mat_param_l struct length!")
+
+                if mat_struct_ptr_param_m != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_m)
+                    mat_param_m_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_m_start)
+                    mat_param_m_struct = ftell(trmtr) - readlong(trmtr)
+                    fseek(trmtr, mat_param_m_struct)
+                    mat_param_m_struct_len = readlong(trmtr)
+
+                    if mat_param_m_struct_len != 0x0000:
+                        raise Exception(f"Unexpected mat_param_m struct length!")
+
+                if mat_struct_ptr_param_n != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_n)
+                    mat_param_n_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_n_start)
+                    mat_param_n_struct = ftell(trmtr) - readlong(trmtr)
+                    fseek(trmtr, mat_param_n_struct)
+                    mat_param_n_struct_len = readshort(trmtr)
+
+                    if mat_param_n_struct_len == 0x0004:
+                        mat_param_n_struct_section_len = readshort(trmtr)
+                        mat_param_n_struct_unk = 0
+                    elif mat_param_n_struct_len == 0x0006:
+                        mat_param_n_struct_section_len = readshort(trmtr)
+                        mat_param_n_struct_unk = readshort(trmtr)
+                    else:
+                        raise Exception(f"Unexpected mat_param_n struct length!")
+
+                    if mat_param_n_struct_unk != 0:
+                        fseek(trmtr, mat_param_n_start + mat_param_n_struct_unk)
+                        mat_param_n_value = readbyte(trmtr)
+                        print(f"Unknown value A = {mat_param_n_value}")
+
+                if mat_struct_ptr_param_o != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_o)
+                    mat_param_o_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_o_start)
+                    mat_param_o_struct = ftell(trmtr) - readlong(trmtr)
+                    fseek(trmtr, mat_param_o_struct)
+                    mat_param_o_struct_len = readshort(trmtr)
+
+                    if mat_param_o_struct_len == 0x0004:
+                        mat_param_o_struct_section_len = readshort(trmtr)
+                        mat_param_o_struct_unk = 0
+                        mat_param_o_struct_value = 0
+                    elif mat_param_o_struct_len == 0x0008:
+                        mat_param_o_struct_section_len = readshort(trmtr)
+                        mat_param_o_struct_unk = readshort(trmtr)
+                        mat_param_o_struct_value = readshort(trmtr)
+                    else:
+                        raise Exception(f"Unexpected mat_param_o struct length!")
+
+                    if mat_param_o_struct_unk != 0:
+                        fseek(trmtr, mat_param_o_start + mat_param_o_struct_unk)
+                        mat_param_o_value = readbyte(trmtr)
+                        print(f"Unknown value B = {mat_param_o_value}")
+
+                if mat_struct_ptr_param_p != 0:
+                    fseek(trmtr, mat_offset + mat_struct_ptr_param_p)
+                    mat_param_p_start = ftell(trmtr) + readlong(trmtr)
+                    fseek(trmtr, mat_param_p_start)
+                    mat_param_p_string_len = readlong(trmtr)
+                    mat_param_p_string = readfixedstring(trmtr, mat_param_p_string_len)
+                    print(mat_param_p_string)
+
+                mat_data_array.append(
+                    {
+                        "mat_name": mat_name,
+                        "mat_shader": mat_shader,
+                        "mat_col0": mat_col0,
+                        "mat_lym0": mat_lym0,
+                        "mat_nrm0": mat_nrm0,
+                        "mat_ao0": mat_ao0,
+                        "mat_emi0": mat_emi0,
+                        "mat_rgh0": mat_rgh0,
+                        "mat_mtl0": mat_mtl0,
+                        "mat_msk0": mat_msk0,
+                        "mat_highmsk0": mat_highmsk0,
+                        "mat_color1_r": mat_color1_r,
+                        "mat_color1_g": mat_color1_g,
+                        "mat_color1_b": mat_color1_b,
+                        "mat_color2_r": mat_color2_r,
+                        "mat_color2_g": mat_color2_g,
+                        "mat_color2_b": mat_color2_b,
+                        "mat_color3_r": mat_color3_r,
+                        "mat_color3_g": mat_color3_g,
+                        "mat_color3_b": mat_color3_b,
+                        "mat_color4_r": mat_color4_r,
+                        "mat_color4_g": mat_color4_g,
+                        "mat_color4_b": mat_color4_b,
+                        "mat_emcolor1_r": mat_emcolor1_r,
+                        "mat_emcolor1_g": mat_emcolor1_g,
+                        "mat_emcolor1_b": mat_emcolor1_b,
+                        "mat_emcolor2_r": mat_emcolor2_r,
+                        "mat_emcolor2_g": mat_emcolor2_g,
+                        "mat_emcolor2_b": mat_emcolor2_b,
+                        "mat_emcolor3_r": mat_emcolor3_r,
+                        "mat_emcolor3_g": mat_emcolor3_g,
+                        "mat_emcolor3_b": mat_emcolor3_b,
+                        "mat_emcolor4_r": mat_emcolor4_r,
+                        "mat_emcolor4_g": mat_emcolor4_g,
+                        "mat_emcolor4_b": mat_emcolor4_b,
+                        "mat_emcolor5_r": mat_emcolor5_r,
+                        "mat_emcolor5_g": mat_emcolor5_g,
+                        "mat_emcolor5_b": mat_emcolor5_b,
+                        "mat_rgh_layer0": mat_rgh_layer0,
+                        "mat_rgh_layer1": mat_rgh_layer1,
+                        "mat_rgh_layer2": mat_rgh_layer2,
+                        "mat_rgh_layer3": mat_rgh_layer3,
+                        "mat_rgh_layer4": mat_rgh_layer4,
+                        "mat_mtl_layer0": mat_mtl_layer0,
+                        "mat_mtl_layer1": mat_mtl_layer1,
+                        "mat_mtl_layer2": mat_mtl_layer2,
+                        "mat_mtl_layer3": mat_mtl_layer3,
+                        "mat_mtl_layer4": mat_mtl_layer4,
+                        "mat_reflectance": mat_reflectance,
+                        "mat_emm_intensity": mat_emm_intensity,
+                        "mat_uv_scale_u": mat_uv_scale_u,
+                        "mat_uv_scale_v": mat_uv_scale_v,
+                        "mat_uv_scale2_u": mat_uv_scale2_u,
+                        "mat_uv_scale2_v": mat_uv_scale2_v,
+                        "mat_enable_base_color_map": mat_enable_base_color_map,
+                        "mat_enable_normal_map": mat_enable_normal_map,
+                        "mat_enable_ao_map": mat_enable_ao_map,
+                        "mat_enable_emission_color_map": mat_enable_emission_color_map,
+                        "mat_enable_roughness_map": mat_enable_roughness_map,
+                        "mat_enable_metallic_map": mat_enable_metallic_map,
+                        "mat_enable_displacement_map": mat_enable_displacement_map,
+                        "mat_enable_highlight_map": mat_enable_highlight_map,
+                    }
+                )
+                fseek(trmtr, mat_ret)
+            print("--------------------")
+
+        fclose(trmtr)
+        parse_cache.put(trmtr.name, "pla", mat_data_array)
+        disk_cache.put_materials(trmtr_entry, mat_data_array)
+
+    if loadlods == False:
+        trmsh_count = 1
+
+    # What gets read from the meshes also depends on the material order and
+    # on whether there are bone weights to read.
+    mesh_context = (
+        "pla",
+        tuple(mat["mat_name"] for mat in mat_data_array or ()),
+        skeleton_path is not None,
+    )
+    lods = []
+    buffer_paths = []
+    for w in range(trmsh_count):
+        poly_groups = None
+        trmbf_path = None
+        meshes = None
+        if dir_index.exists(trmsh_lods_array[w]):
+            trmsh_path = dir_index.path(trmsh_lods_array[w])
+            meshes = parse_cache.get(trmsh_path, mesh_context)
+            if meshes is None:
+                trmsh_entry = disk_cache.entry(trmsh_path, mesh_context)
+                meshes = disk_cache.get_meshes(trmsh_entry, dir_index)
+
+        if meshes is not None:
+            print("Using cached TRMSH...")
+            poly_groups = meshes["poly_groups"]
+            trmbf_path = meshes["trmbf_path"]
+        elif dir_index.exists(trmsh_lods_array[w]):
+            poly_groups = []
+            poly_group_array = []
+            trmsh = loader.open(trmsh_lods_array[w])
+            trmsh_file_start = readlong(trmsh)
+            print("Parsing TRMSH...")
+            fseek(trmsh, trmsh_file_start)
+            trmsh_struct = FlatTable(trmsh, trmsh_file_start, TRMSH_SCHEMA)
+
+            if trmsh_struct.vtable_len != 0x000A:
+                raise AssertionError("Unexpected TRMSH header struct length!")
+            trmsh_struct_poly_group = trmsh_struct.field("poly_group")
+            trmsh_struct_trmbf = trmsh_struct.field("trmbf")
+
+            if trmsh_struct_trmbf != 0:
+                fseek(trmsh, trmsh_file_start + trmsh_struct_trmbf)
+                trmbf_filename_start = ftell(trmsh) + readlong(trmsh)
+                fseek(trmsh, trmbf_filename_start)
+                trmbf_filename_len = readlong(trmsh)
+                trmbf_filename = readfixedstring(trmsh, trmbf_filename_len)
+                print(trmbf_filename)
+
+                trmbf = None
+                if dir_index.exists(trmbf_filename):
+                    trmbf = loader.open(trmbf_filename)
+                else:
+                    raise AssertionError(f"Can't find {trmbf_filename}!")
+
+                if trmbf != None:
+                    print("Parsing TRMBF...")
+                    trmbf_file_start = readlong(trmbf)
+                    fseek(trmbf, trmbf_file_start)
+                    trmbf_struct = FlatTable(trmbf, trmbf_file_start, TRMBF_SCHEMA)
+
+                    if trmbf_struct.vtable_len != 0x0008:
+                        raise AssertionError("Unexpected TRMBF header struct length!")
+                    trmbf_struct_buffer = trmbf_struct.field("buffer")
+
+                    if trmsh_struct_poly_group != 0:
+                        fseek(trmsh, trmsh_file_start + trmsh_struct_poly_group)
+                        poly_group_start = ftell(trmsh) + readlong(trmsh)
+                        fseek(trmsh, poly_group_start)
+                        poly_group_count = readlong(trmsh)
+
+                        fseek(trmbf, trmbf_file_start + trmbf_struct_buffer)
+                        vert_buffer_start = ftell(trmbf) + readlong(trmbf)
+                        vert_buffer_count = readlong(trmbf)
+
+                        for x in range(poly_group_count):
+                            vert_array = []
+                            normal_array = []
+                            color_array = []
+                            alpha_array = []
+                            uv_array = []
+                            uv2_array = []
+                            uv3_array = []
+                            uv4_array = []
+                            face_array = []
+                            face_mat_id_array = []
+                            b1_array = []
+                            w1_array = []
+                            poly_group_name = ""
+                            vis_group_name = ""
+                            vert_buffer_stride = 0
+                            vert_attributes = []
+                            polygon_type = None
+                            mat_id = 0
+                            positions_fmt = "None"
+                            normals_fmt = "None"
+                            tangents_fmt = "None"
+                            bitangents_fmt = "None"
+                            tritangents_fmt = "None"
+                            uvs_fmt = "None"
+                            uvs2_fmt = "None"
+                            uvs3_fmt = "None"
+                            uvs4_fmt = "None"
+                            colors_fmt = "None"
+                            colors2_fmt = "None"
+                            bones_fmt = "None"
+                            weights_fmt = "None"
+                            svunk_fmt = "None"
+
+                            poly_group_offset = ftell(trmsh) + readlong(trmsh)
+                            poly_group_ret = ftell(trmsh)
+                            fseek(trmsh, poly_group_offset)
+                            print(f"PolyGroup offset #{x}: {hex(poly_group_offset)}")
+                            poly_group_struct = FlatTable(
+                                trmsh, poly_group_offset, TRMSH_POLY_GROUP_SCHEMA
                             )
-                           is True
-                        ):
-                            emission_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_emi0"][:-5] + textureextension
-                                )
+                            poly_group_struct_ptr_poly_group_name = (
+                                poly_group_struct.field("poly_group_name")
                             )
-                        material.node_tree.links.new(
-                            emission_image_texture.outputs[0],
-                            principled_bsdf.inputs[26],
-                        )
+                            poly_group_struct_ptp_unc_a = poly_group_struct.field(
+                                "unc_a"
+                            )
+                            poly_group_struct_ptr_vert_buff = poly_group_struct.field(
+                                "vert_buff"
+                            )
+                            poly_group_struct_ptr_mat_list = poly_group_struct.field(
+                                "mat_list"
+                            )
+                            poly_group_struct_ptr_vis_group_name = (
+                                poly_group_struct.field("vis_group_name")
+                            )
+
+                            if poly_group_struct_ptp_unc_a != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset + poly_group_struct_ptp_unc_a,
+                                )
+                                polygon_type = readlong(trmsh)
+
+                            if poly_group_struct_ptr_mat_list != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset + poly_group_struct_ptr_mat_list,
+                                )
+                                mat_offset = ftell(trmsh) + readlong(trmsh)
+                                fseek(trmsh, mat_offset)
+                                mat_count = readlong(trmsh)
+                                for y in range(mat_count):
+                                    mat_entry_offset = ftell(trmsh) + readlong(trmsh)
+                                    mat_ret = ftell(trmsh)
+                                    fseek(trmsh, mat_entry_offset)
+                                    mat_struct = FlatTable(
+                                        trmsh, mat_entry_offset, TRMSH_MATERIAL_SCHEMA
+                                    )
+
+                                    if mat_struct.vtable_len != 0x000E:
+                                        raise AssertionError(
+                                            "Unexpected material struct length!"
+                                        )
+                                    mat_struct_ptr_facepoint_count = mat_struct.field(
+                                        "facepoint_count"
+                                    )
+                                    mat_struct_ptr_facepoint_start = mat_struct.field(
+                                        "facepoint_start"
+                                    )
+                                    mat_struct_ptr_unk_c = mat_struct.field("unk_c")
+                                    mat_struct_ptr_string = mat_struct.field("string")
+                                    mat_struct_ptr_unk_d = mat_struct.field("unk_d")
+
+                                    if mat_struct_ptr_facepoint_count != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset
+                                            + mat_struct_ptr_facepoint_count,
+                                        )
+                                        mat_facepoint_count = int(readlong(trmsh) / 3)
+
+                                    if mat_struct_ptr_facepoint_start != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset
+                                            + mat_struct_ptr_facepoint_start,
+                                        )
+                                        mat_facepoint_start = int(readlong(trmsh) / 3)
+                                    else:
+                                        mat_facepoint_start = 0
+
+                                    if mat_struct_ptr_unk_c != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset + mat_struct_ptr_unk_c,
+                                        )
+                                        mat_unk_c = readlong(trmsh)
+
+                                    if mat_struct_ptr_string != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset + mat_struct_ptr_string,
+                                        )
+                                        mat_name_offset = ftell(trmsh) + readlong(trmsh)
+                                        fseek(trmsh, mat_name_offset)
+                                        mat_name_len = readlong(trmsh)
+                                        mat_name = readfixedstring(trmsh, mat_name_len)
+
+                                    if mat_struct_ptr_unk_d != 0:
+                                        fseek(
+                                            trmsh,
+                                            mat_entry_offset + mat_struct_ptr_unk_d,
+                                        )
+                                        mat_unk_d = readlong(trmsh)
+
+                                    mat_id = 0
+                                    for z in range(len(mat_data_array)):
+                                        if mat_data_array[z]["mat_name"] == mat_name:
+                                            mat_id = z
+                                            break
+
+                                    for z in range(mat_facepoint_count):
+                                        face_mat_id_array.append(mat_id)
+
+                                    print(
+                                        f"Material {mat_name}: FaceCount = {mat_facepoint_count}, FaceStart = {mat_facepoint_start}"
+                                    )
+                                    fseek(trmsh, mat_ret)
+
+                            if poly_group_struct_ptr_poly_group_name != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset
+                                    + poly_group_struct_ptr_poly_group_name,
+                                )
+                                poly_group_name_offset = ftell(trmsh) + readlong(trmsh)
+                                fseek(trmsh, poly_group_name_offset)
+                                poly_group_name_len = readlong(trmsh)
+                                poly_group_name = readfixedstring(
+                                    trmsh, poly_group_name_len
+                                )
+                                print(f"Building {poly_group_name}...")
+                            if poly_group_struct_ptr_vis_group_name != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset
+                                    + poly_group_struct_ptr_vis_group_name,
+                                )
+                                vis_group_name_offset = ftell(trmsh) + readlong(trmsh)
+                                fseek(trmsh, vis_group_name_offset)
+                                vis_group_name_len = readlong(trmsh)
+                                vis_group_name = readfixedstring(
+                                    trmsh, vis_group_name_len
+                                )
+                                # changed the output variable because the original seems to be a typo
+                                print(f"VisGroup: {vis_group_name}")
+                            if poly_group_struct_ptr_vert_buff != 0:
+                                fseek(
+                                    trmsh,
+                                    poly_group_offset + poly_group_struct_ptr_vert_buff,
+                                )
+                                poly_group_vert_buff_offset = ftell(trmsh) + readlong(
+                                    trmsh
+                                )
+                                fseek(trmsh, poly_group_vert_buff_offset)
+                                vert_buff_count = readlong(trmsh)
+                                vert_buff_offset = ftell(trmsh) + readlong(trmsh)
+                                fseek(trmsh, vert_buff_offset)
+                                vert_buff_struct = FlatTable(
+                                    trmsh, vert_buff_offset, TRMSH_VERT_BUFF_SCHEMA
+                                )
+
+                                if vert_buff_struct.vtable_len != 0x0008:
+                                    raise AssertionError(
+                                        "Unexpected VertexBuffer struct length!"
+                                    )
+                                vert_buff_struct_ptr_param = vert_buff_struct.field(
+                                    "param"
+                                )
+
+                                if vert_buff_struct_ptr_param != 0:
+                                    fseek(
+                                        trmsh,
+                                        vert_buff_offset + vert_buff_struct_ptr_param,
+                                    )
+                                    vert_buff_param_offset = ftell(trmsh) + readlong(
+                                        trmsh
+                                    )
+                                    fseek(trmsh, vert_buff_param_offset)
+                                    vert_buff_param_count = readlong(trmsh)
+                                    for y in range(vert_buff_param_count):
+                                        vert_buff_param_offset = ftell(
+                                            trmsh
+                                        ) + readlong(trmsh)
+                                        vert_buff_param_ret = ftell(trmsh)
+                                        fseek(trmsh, vert_buff_param_offset)
+                                        vert_buff_param_struct = FlatTable(
+                                            trmsh,
+                                            vert_buff_param_offset,
+                                            TRMSH_VERT_BUFF_PARAM_SCHEMA,
+                                        )
+
+                                        if vert_buff_param_struct.vtable_len not in (
+                                            0x000C,
+                                            0x000E,
+                                        ):
+                                            raise AssertionError(
+                                                "Unknown vertex buffer parameter struct length!"
+                                            )
+                                        vert_buff_param_ptr_type = (
+                                            vert_buff_param_struct.field("type")
+                                        )
+                                        vert_buff_param_ptr_layer = (
+                                            vert_buff_param_struct.field("layer")
+                                        )
+                                        vert_buff_param_ptr_fmt = (
+                                            vert_buff_param_struct.field("fmt")
+                                        )
+                                        vert_buff_param_ptr_position = (
+                                            vert_buff_param_struct.field("position")
+                                        )
+
+                                        vert_buff_param_layer = 0
+
+                                        if vert_buff_param_ptr_type != 0:
+                                            fseek(
+                                                trmsh,
+                                                vert_buff_param_offset
+                                                + vert_buff_param_ptr_type,
+                                            )
+                                            vert_buff_param_type = readlong(trmsh)
+                                        if vert_buff_param_ptr_layer != 0:
+                                            fseek(
+                                                trmsh,
+                                                vert_buff_param_offset
+                                                + vert_buff_param_ptr_layer,
+                                            )
+                                            vert_buff_param_layer = readlong(trmsh)
+                                        if vert_buff_param_ptr_fmt != 0:
+                                            fseek(
+                                                trmsh,
+                                                vert_buff_param_offset
+                                                + vert_buff_param_ptr_fmt,
+                                            )
+                                            vert_buff_param_format = readlong(trmsh)
+                                        if vert_buff_param_ptr_position != 0:
+                                            fseek(
+                                                trmsh,
+                                                vert_buff_param_offset
+                                                + vert_buff_param_ptr_position,
+                                            )
+                                            vert_buff_param_position = readlong(trmsh)
+                                        else:
+                                            # Older meshes leave out the position,
+                                            # attributes are packed back to back.
+                                            vert_buff_param_position = (
+                                                vert_buffer_stride
+                                            )
+                                        vert_attributes.append(
+                                            (
+                                                vert_buff_param_type,
+                                                vert_buff_param_layer,
+                                                vert_buff_param_format,
+                                                vert_buff_param_position,
+                                            )
+                                        )
+
+                                        # -- Types:
+                                        # -- 0x01: = Positions
+                                        # -- 0x02 = Normals
+                                        # -- 0x03 = Tangents
+                                        # -- 0x05 = Colors
+                                        # -- 0x06 = UVs
+                                        # -- 0x07 = NodeIDs
+                                        # -- 0x08 = Weights
+                                        #
+                                        # -- Formats:
+                                        # -- 0x14 = 4 bytes as float
+                                        # -- 0x16 = 4 bytes
+                                        # -- 0x27 = 4 shorts as float
+                                        # -- 0x2B = 4 half-floats
+                                        # -- 0x30 = 2 floats
+                                        # -- 0x33 = 3 floats
+                                        # -- 0x36 = 4 floats
+
+                                        if vert_buff_param_type == 0x01:
+                                            if vert_buff_param_layer != 0:
+                                                raise AssertionError(
+                                                    "Unexpected positions layer!"
+                                                )
+
+                                            if vert_buff_param_format != 0x33:
+                                                raise AssertionError(
+                                                    "Unexpected positions format!"
+                                                )
+
+                                            positions_fmt = "3Floats"
+                                            vert_buffer_stride = (
+                                                vert_buffer_stride + 0x0C
+                                            )
+                                        elif vert_buff_param_type == 0x02:
+                                            if vert_buff_param_layer != 0:
+                                                raise AssertionError(
+                                                    "Unexpected normals layer!"
+                                                )
+
+                                            if vert_buff_param_format != 0x2B:
+                                                raise AssertionError(
+                                                    "Unexpected normals format!"
+                                                )
+
+                                            normals_fmt = "4HalfFloats"
+                                            vert_buffer_stride = (
+                                                vert_buffer_stride + 0x08
+                                            )
+                                        elif vert_buff_param_type == 0x03:
+                                            if vert_buff_param_layer == 0:
+                                                if vert_buff_param_format != 0x2B:
+                                                    raise AssertionError(
+                                                        "Unexpected tangents format!"
+                                                    )
+
+                                                tangents_fmt = "4HalfFloats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 1:
+                                                if vert_buff_param_format != 0x2B:
+                                                    raise AssertionError(
+                                                        "Unexpected bitangents format!"
+                                                    )
+
+                                                bitangents_fmt = "4HalfFloats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 2:
+                                                if vert_buff_param_format != 0x2B:
+                                                    raise AssertionError(
+                                                        "Unexpected tritangents format!"
+                                                    )
+
+                                                tritangents_fmt = "4HalfFloats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            else:
+                                                raise AssertionError(
+                                                    "Unexpected tangents layer!"
+                                                )
+                                        elif vert_buff_param_type == 0x05:
+                                            if vert_buff_param_layer == 0:
+                                                if vert_buff_param_format == 0x14:
+                                                    colors_fmt = "4BytesAsFloat"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x04
+                                                    )
+                                                elif vert_buff_param_format == 0x36:
+                                                    colors_fmt = "4Floats"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x10
+                                                    )
+                                                else:
+                                                    raise AssertionError(
+                                                        "Unexpected colors format!"
+                                                    )
+                                            elif vert_buff_param_layer == 1:
+                                                if vert_buff_param_format == 0x14:
+                                                    colors2_fmt = "4BytesAsFloat"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x04
+                                                    )
+                                                elif vert_buff_param_format == 0x36:
+                                                    colors2_fmt = "4Floats"
+                                                    vert_buffer_stride = (
+                                                        vert_buffer_stride + 0x10
+                                                    )
+                                                else:
+                                                    raise AssertionError(
+                                                        "Unexpected colors2 format!"
+                                                    )
+                                        elif vert_buff_param_type == 0x06:
+                                            if vert_buff_param_layer == 0:
+                                                if vert_buff_param_format != 0x30:
+                                                    raise AssertionError(
+                                                        "Unexpected UVs format!"
+                                                    )
+
+                                                uvs_fmt = "2Floats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 1:
+                                                if vert_buff_param_format != 0x30:
+                                                    raise AssertionError(
+                                                        "Unexpected UVs2 format!"
+                                                    )
+
+                                                uvs2_fmt = "2Floats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 2:
+                                                if vert_buff_param_format != 0x30:
+                                                    raise AssertionError(
+                                                        "Unexpected UVs3 format!"
+                                                    )
+
+                                                uvs3_fmt = "2Floats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            elif vert_buff_param_layer == 3:
+                                                if vert_buff_param_format != 0x30:
+                                                    raise AssertionError(
+                                                        "Unexpected UVs4 format!"
+                                                    )
+
+                                                uvs4_fmt = "2Floats"
+                                                vert_buffer_stride = (
+                                                    vert_buffer_stride + 0x08
+                                                )
+                                            else:
+                                                raise AssertionError(
+                                                    "Unexpected UVs layer!"
+                                                )
+                                        elif vert_buff_param_type == 0x07:
+                                            if vert_buff_param_layer != 0:
+                                                raise AssertionError(
+                                                    "Unexpected node IDs layer!"
+                                                )
 
-                    if mat["mat_enable_metallic_map"]:
-                        metalness_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_mtl0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            metalness_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_mtl0"][:-5] + textureextension
-                                )
-                            )
-                            metalness_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        material.node_tree.links.new(
-                            metalness_image_texture.outputs[0],
-                            principled_bsdf.inputs[1],
-                        )
+                                            if vert_buff_param_format != 0x16:
+                                                raise AssertionError(
+                                                    "Unexpected node IDs format!"
+                                                )
 
-                    if mat["mat_enable_roughness_map"]:
-                        roughness_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_rgh0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            roughness_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_rgh0"][:-5] + textureextension
-                                )
-                            )
-                            roughness_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        material.node_tree.links.new(
-                            roughness_image_texture.outputs[0],
-                            principled_bsdf.inputs[2],
-                        )
+                                            bones_fmt = "4Bytes"
+                                            vert_buffer_stride = (
+                                                vert_buffer_stride + 0x04
+                                            )
+                                        elif vert_buff_param_type == 0x08:
+                                            if vert_buff_param_layer != 0:
+                                                raise AssertionError(
+                                                    "Unexpected weights layer!"
+                                                )
 
-                    if mat["mat_enable_ao_map"]:
-                        ambientocclusion_image_texture = material.node_tree.nodes.new(
-                            "ShaderNodeTexImage"
-                        )
-                        if (
-                            os.path.exists(
-                                os.path.join(
-                                    filep, mat["mat_ao0"][:-5] + textureextension
-                                )
-                            )
-                           is True
-                        ):
-                            ambientocclusion_image_texture.image = bpy.data.images.load(
-                                os.path.join(
-                                    filep, mat["mat_ao0"][:-5] + textureextension
-                                )
-                            )
-                            ambientocclusion_image_texture.image.colorspace_settings.name = (
-                                "Non-Color"
-                            )
-                        mix_color6 = material.node_tree.nodes.new("ShaderNodeMixRGB")
-                        mix_color6.blend_type = "MULTIPLY"
-                        if (
-                            mat["mat_ao0"][:-5]
-                            == "../../glb_share_tex/texture_white_ao/texture_white_ao"
-                        ):
-                            mix_color6.inputs[0].default_value = 0
-                        else:
-                            mix_color6.inputs[0].default_value = 1.0
-                        material.node_tree.links.new(
-                            alb_image_texture.outputs[0], mix_color6.inputs[1]
-                        )
-                        material.node_tree.links.new(
-                            ambientocclusion_image_texture.outputs[0],
-                            mix_color6.inputs[2],
-                        )
-                        material.node_tree.links.new(
-                            mix_color6.outputs[0], color_output
-                        )
+                                            if vert_buff_param_format != 0x27:
+                                                raise AssertionError(
+                                                    "Unexpected weights format!"
+                                                )
 
-    if loadlods == False:
-        trmsh_count = 1
+                                            weights_fmt = "4ShortsAsFloat"
+                                            vert_buffer_stride = (
+                                                vert_buffer_stride + 0x08
+                                            )
+                                        elif vert_buff_param_type == 0x09:
+                                            if vert_buff_param_layer != 0:
+                                                raise AssertionError(
+                                                    "Unexpected ?????? layer!"
+                                                )
 
-    for w in range(trmsh_count):
-        if os.path.exists(os.path.join(filep, trmsh_lods_array[w])):
-            poly_group_array = []
-            trmsh = open(os.path.join(filep, trmsh_lods_array[w]), "rb")
-            trmsh_file_start = readlong(trmsh)
-            print("Parsing TRMSH...")
-            fseek(trmsh, trmsh_file_start)
-            trmsh_struct = ftell(trmsh) - readlong(trmsh)
-            fseek(trmsh, trmsh_struct)
-            trmsh_struct_len = readshort(trmsh)
+                                            if vert_buff_param_format != 0x24:
+                                                raise AssertionError(
+                                                    "Unexpected ?????? layer!"
+                                                )
 
-            if trmsh_struct_len != 0x000A:
-                raise AssertionError("Unexpected TRMSH header struct length!")
-            trmsh_struct_section_len = readshort(trmsh)
-            trmsh_struct_start = readshort(trmsh)
-            trmsh_struct_poly_group = readshort(trmsh)
-            trmsh_struct_trmbf = readshort(trmsh)
+                                            svunk_fmt = "1Long?"
+                                            vert_buffer_stride = (
+                                                vert_buffer_stride + 0x04
+                                            )
+                                        else:
+                                            raise AssertionError("Unknown vertex type!")
 
-            if trmsh_struct_trmbf != 0:
-                fseek(trmsh, trmsh_file_start + trmsh_struct_trmbf)
-                trmbf_filename_start = ftell(trmsh) + readlong(trmsh)
-                fseek(trmsh, trmbf_filename_start)
-                trmbf_filename_len = readlong(trmsh)
-                trmbf_filename = readfixedstring(trmsh, trmbf_filename_len)
-                print(trmbf_filename)
+                                        fseek(trmsh, vert_buff_param_ret)
 
-                trmbf = None
-                if os.path.exists(os.path.join(filep, trmbf_filename)):
-                    trmbf = open(os.path.join(filep, trmbf_filename), "rb")
-                else:
-                    raise AssertionError(f"Can't find {trmbf_filename}!")
+                            poly_group_array.append(
+                                {
+                                    "poly_group_name": poly_group_name,
+                                    "vis_group_name": vis_group_name,
+                                    "vert_buffer_stride": vert_buffer_stride,
+                                    "vert_attributes": vert_attributes,
+                                    "polygon_type": polygon_type,
+                                    "positions_fmt": positions_fmt,
+                                    "normals_fmt": normals_fmt,
+                                    "tangents_fmt": tangents_fmt,
+                                    "bitangents_fmt": bitangents_fmt,
+                                    "tritangents_fmt": tritangents_fmt,
+                                    "uvs_fmt": uvs_fmt,
+                                    "uvs2_fmt": uvs2_fmt,
+                                    "uvs3_fmt": uvs3_fmt,
+                                    "uvs4_fmt": uvs4_fmt,
+                                    "colors_fmt": colors_fmt,
+                                    "colors2_fmt": colors2_fmt,
+                                    "bones_fmt": bones_fmt,
+                                    "weights_fmt": weights_fmt,
+                                    "svunk_fmt": svunk_fmt,
+                                }
+                            )
+                            fseek(trmsh, poly_group_ret)
 
-                if trmbf != None:
-                    print("Parsing TRMBF...")
-                    trmbf_file_start = readlong(trmbf)
-                    fseek(trmbf, trmbf_file_start)
-                    trmbf_struct = ftell(trmbf) - readlong(trmbf)
-                    fseek(trmbf, trmbf_struct)
-                    trmbf_struct_len = readshort(trmbf)
+                            vert_buffer_offset = ftell(trmbf) + readlong(trmbf)
+                            vert_buffer_ret = ftell(trmbf)
+                            fseek(trmbf, vert_buffer_offset)
+                            vert_buffer_struct = FlatTable(
+                                trmbf, vert_buffer_offset, TRMBF_BUFFER_SCHEMA
+                            )
+                            vert_buffer_struct_ptr_faces = vert_buffer_struct.field(
+                                "faces"
+                            )
+                            vert_buffer_struct_ptr_verts = vert_buffer_struct.field(
+                                "verts"
+                            )
 
-                    if trmbf_struct_len != 0x0008:
-                        raise AssertionError("Unexpected TRMBF header struct length!")
-                    trmbf_struct_section_len = readshort(trmbf)
-                    trmbf_struct_start = readshort(trmbf)
-                    trmbf_struct_buffer = readshort(trmbf)
+                            if vert_buffer_struct_ptr_verts != 0:
+                                fseek(
+                                    trmbf,
+                                    vert_buffer_offset + vert_buffer_struct_ptr_verts,
+                                )
+                                vert_buffer_sub_start = ftell(trmbf) + readlong(trmbf)
+                                fseek(trmbf, vert_buffer_sub_start)
+                                vert_buffer_sub_count = readlong(trmbf)
 
-                    if trmsh_struct_poly_group != 0:
-                        fseek(trmsh, trmsh_file_start + trmsh_struct_poly_group)
-                        poly_group_start = ftell(trmsh) + readlong(trmsh)
-                        fseek(trmsh, poly_group_start)
-                        poly_group_count = readlong(trmsh)
+                                for y in range(vert_buffer_sub_count):
+                                    vert_buffer_sub_offset = ftell(trmbf) + readlong(
+                                        trmbf
+                                    )
+                                    vert_buffer_sub_ret = ftell(trmbf)
+                                    fseek(trmbf, vert_buffer_sub_offset)
+                                    if y == 0:
+                                        print(
+                                            f"Vertex buffer {x} header: {hex(ftell(trmbf))}"
+                                        )
+                                    else:
+                                        print(
+                                            f"Vertex buffer {x} morph {y} header: {hex(ftell(trmbf))}"
+                                        )
+                                    vert_buffer_sub_struct = FlatTable(
+                                        trmbf,
+                                        vert_buffer_sub_offset,
+                                        TRMBF_BYTES_SCHEMA,
+                                    )
 
-                        fseek(trmbf, trmbf_file_start + trmbf_struct_buffer)
-                        vert_buffer_start = ftell(trmbf) + readlong(trmbf)
-                        vert_buffer_count = readlong(trmbf)
+                                    if vert_buffer_sub_struct.vtable_len != 0x0006:
+                                        raise AssertionError(
+                                            "Unexpected vertex buffer struct length!"
+                                        )
+                                    vert_buffer_sub_struct_ptr = (
+                                        vert_buffer_sub_struct.field("bytes")
+                                    )
 
-                        for x in range(poly_group_count):
-                            vert_array = []
-                            normal_array = []
-                            color_array = []
-                            alpha_array = []
-                            uv_array = []
-                            uv2_array = []
-                            uv3_array = []
-                            uv4_array = []
-                            face_array = []
-                            face_mat_id_array = []
-                            b1_array = []
-                            w1_array = []
-                            weight_array = []
-                            poly_group_name = ""
-                            vis_group_name = ""
-                            vert_buffer_stride = 0
-                            mat_id = 0
-                            positions_fmt = "None"
-                            normals_fmt = "None"
-                            tangents_fmt = "None"
-                            bitangents_fmt = "None"
-                            tritangents_fmt = "None"
-                            uvs_fmt = "None"
-                            uvs2_fmt = "None"
-                            uvs3_fmt = "None"
-                            uvs4_fmt = "None"
-                            colors_fmt = "None"
-                            colors2_fmt = "None"
-                            bones_fmt = "None"
-                            weights_fmt = "None"
-                            svunk_fmt = "None"
+                                    if vert_buffer_sub_struct_ptr != 0:
+                                        fseek(
+                                            trmbf,
+                                            vert_buffer_sub_offset
+                                            + vert_buffer_sub_struct_ptr,
+                                        )
+                                        vert_buffer_start = ftell(trmbf) + readlong(
+                                            trmbf
+                                        )
+                                        fseek(trmbf, vert_buffer_start)
+                                        vert_buffer_byte_count = readlong(trmbf)
+                                        if y == 0:
+                                            print(
+                                                f"Vertex buffer {x} start: {hex(ftell(trmbf))}"
+                                            )
 
-                            poly_group_offset = ftell(trmsh) + readlong(trmsh)
-                            poly_group_ret = ftell(trmsh)
-                            fseek(trmsh, poly_group_offset)
-                            print(f"PolyGroup offset #{x}: {hex(poly_group_offset)}")
-                            poly_group_struct = ftell(trmsh) - readlong(trmsh)
-                            fseek(trmsh, poly_group_struct)
-                            poly_group_struct_len = readshort(trmsh)
-
-                            poly_group_struct_section_len = readshort(trmsh)
-                            poly_group_struct_ptr_poly_group_name = readshort(trmsh)
-                            poly_group_struct_ptr_bbbox = readshort(trmsh)
-                            poly_group_struct_ptp_unc_a = readshort(trmsh)
-                            poly_group_struct_ptr_vert_buff = readshort(trmsh)
-                            poly_group_struct_ptr_mat_list = readshort(trmsh)
-                            poly_group_struct_ptr_unk_b = readshort(trmsh)
-                            poly_group_struct_ptr_unk_c = readshort(trmsh)
-                            poly_group_struct_ptr_unk_d = readshort(trmsh)
-                            poly_group_struct_ptr_unk_e = readshort(trmsh)
-                            poly_group_struct_ptr_unk_float = readshort(trmsh)
-                            poly_group_struct_ptr_unk_g = readshort(trmsh)
-                            poly_group_struct_ptr_unk_h = readshort(trmsh)
-                            poly_group_struct_ptr_vis_group_name = readshort(trmsh)
+                                            vertices = read_vert_buffer(
+                                                trmbf,
+                                                poly_group_array[x]["vert_attributes"],
+                                                poly_group_array[x][
+                                                    "vert_buffer_stride"
+                                                ],
+                                                vert_buffer_byte_count,
+                                            )
+                                            vert_names = vertices.dtype.names
+                                            vert_array = vertices["position0"]
+                                            normal_array = vertices["normal0"][:, :3]
+                                            if "uv0" in vert_names:
+                                                uv_array = vertices["uv0"]
+                                            else:
+                                                uv_array = np.zeros(
+                                                    (len(vertices), 2), dtype=np.float32
+                                                )
+                                            if "uv1" in vert_names:
+                                                uv2_array = vertices["uv1"]
+                                            if "uv2" in vert_names:
+                                                uv3_array = vertices["uv2"]
+                                            if "uv3" in vert_names:
+                                                uv4_array = vertices["uv3"]
+
+                                            if "color0" in vert_names:
+                                                colors = vertices["color0"]
+                                                if colors.dtype == np.float32:
+                                                    colors = colors * (
+                                                        255.0,
+                                                        255.0,
+                                                        255.0,
+                                                        1.0,
+                                                    )
+                                                    alpha_array = colors[:, 3]
+                                                else:
+                                                    alpha_array = colors[:, 3] / 255
+                                                color_array = colors[:, :3]
+
+                                            if skeleton_path is not None:
+                                                if "bones0" in vert_names:
+                                                    b1_array = vertices["bones0"]
+                                                else:
+                                                    b1_array = np.zeros(
+                                                        (len(vertices), 4),
+                                                        dtype=np.uint8,
+                                                    )
+                                                if "weights0" in vert_names:
+                                                    w1_array = unorm_weights(
+                                                        vertices["weights0"]
+                                                    )
+                                                else:
+                                                    w1_array = np.zeros(
+                                                        (len(vertices), 4),
+                                                        dtype=np.float32,
+                                                    )
 
-                            if poly_group_struct_ptr_mat_list != 0:
+                                            print(
+                                                f"Vertex buffer {x} end: {hex(ftell(trmbf))}"
+                                            )
+                                        else:
+                                            print(
+                                                f"Vertex buffer {x} morph {y} start: {hex(ftell(trmbf))}"
+                                            )
+                                            # MorphVert_array = #()
+                                            # MorphNormal_array = #()
+                                            for v in range(
+                                                int(vert_buffer_byte_count / 0x1C)
+                                            ):
+                                                # Morphs always seem to use this setup.
+                                                vx = readlong(trmbf)
+                                                vy = readlong(trmbf)
+                                                vz = readlong(trmbf)
+                                                nx = readhalffloat(trmbf)
+                                                ny = readhalffloat(trmbf)
+                                                nz = readhalffloat(trmbf)
+                                                nq = readhalffloat(trmbf)
+                                                tanx = readhalffloat(trmbf)
+                                                tany = readhalffloat(trmbf)
+                                                tanz = readhalffloat(trmbf)
+                                                tanq = readhalffloat(trmbf)
+                                                # append MorphVert_array [vx,vy,vz]
+                                                # append MorphNormal_array [nx,ny,nz]
+                                            print(
+                                                f"Vertex buffer {x} morph {y} end: {hex(ftell(trmbf))}"
+                                            )
+                                            # TODO: Continue implementing after line 3814
+                                    fseek(trmbf, vert_buffer_sub_ret)
+
+                            if vert_buffer_struct_ptr_faces != 0:
                                 fseek(
-                                    trmsh,
-                                    poly_group_offset + poly_group_struct_ptr_mat_list,
+                                    trmbf,
+                                    vert_buffer_offset + vert_buffer_struct_ptr_faces,
                                 )
-                                mat_offset = ftell(trmsh) + readlong(trmsh)
-                                fseek(trmsh, mat_offset)
-                                mat_count = readlong(trmsh)
-                                for y in range(mat_count):
-                                    mat_entry_offset = ftell(trmsh) + readlong(trmsh)
-                                    mat_ret = ftell(trmsh)
-                                    fseek(trmsh, mat_entry_offset)
-                                    mat_struct = ftell(trmsh) - readlong(trmsh)
-                                    fseek(trmsh, mat_struct)
-                                    mat_struct_len = readshort(trmsh)
+                                face_buffer_start = ftell(trmbf) + readlong(trmbf)
+                                fseek(trmbf, face_buffer_start)
+                                face_buffer_count = readlong(trmbf)
+
+                                for y in range(face_buffer_count):
+                                    face_buff_offset = ftell(trmbf) + readlong(trmbf)
+                                    face_buff_ret = ftell(trmbf)
+                                    fseek(trmbf, face_buff_offset)
+                                    print(f"Facepoint {x} header: {hex(ftell(trmbf))}")
+                                    face_buff_struct = FlatTable(
+                                        trmbf, face_buff_offset, TRMBF_BYTES_SCHEMA
+                                    )
 
-                                    if mat_struct_len != 0x000E:
+                                    if face_buff_struct.vtable_len != 0x0006:
                                         raise AssertionError(
-                                            "Unexpected material struct length!"
+                                            "Unexpected face buffer struct length!"
                                         )
-                                    mat_struct_section_len = readshort(trmsh)
-                                    mat_struct_ptr_facepoint_count = readshort(trmsh)
-                                    mat_struct_ptr_facepoint_start = readshort(trmsh)
-                                    mat_struct_ptr_unk_c = readshort(trmsh)
-                                    mat_struct_ptr_string = readshort(trmsh)
-                                    mat_struct_ptr_unk_d = readshort(trmsh)
+                                    face_buffer_struct_ptr = face_buff_struct.field(
+                                        "bytes"
+                                    )
 
-                                    if mat_struct_ptr_facepoint_count != 0:
+                                    if face_buffer_struct_ptr != 0:
                                         fseek(
-                                            trmsh,
-                                            mat_entry_offset
-                                            + mat_struct_ptr_facepoint_count,
+                                            trmbf,
+                                            face_buff_offset + face_buffer_struct_ptr,
                                         )
-                                        mat_facepoint_count = int(readlong(trmsh) / 3)
-
-                                    if mat_struct_ptr_facepoint_start != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset
-                                            + mat_struct_ptr_facepoint_start,
+                                        facepoint_start = ftell(trmbf) + readlong(trmbf)
+                                        fseek(trmbf, facepoint_start)
+                                        facepoint_byte_count = readlong(trmbf)
+                                        print(
+                                            f"Facepoint {x} start: {hex(ftell(trmbf))}"
                                         )
-                                        mat_facepoint_start = int(readlong(trmsh) / 3)
-                                    else:
-                                        mat_facepoint_start = 0
 
-                                    if mat_struct_ptr_unk_c != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset + mat_struct_ptr_unk_c,
+                                        faces = read_face_buffer(
+                                            trmbf,
+                                            poly_group_array[x]["polygon_type"],
+                                            facepoint_byte_count,
+                                            len(vert_array),
                                         )
-                                        mat_unk_c = readlong(trmsh)
+                                        if len(face_array) > 0:
+                                            faces = np.concatenate((face_array, faces))
+                                        face_array = faces
+                                        print(f"Facepoint {x} end: {hex(ftell(trmbf))}")
+                                    fseek(trmbf, face_buff_ret)
+                            fseek(trmbf, vert_buffer_ret)
 
-                                    if mat_struct_ptr_string != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset + mat_struct_ptr_string,
-                                        )
-                                        mat_name_offset = ftell(trmsh) + readlong(trmsh)
-                                        fseek(trmsh, mat_name_offset)
-                                        mat_name_len = readlong(trmsh)
-                                        mat_name = readfixedstring(trmsh, mat_name_len)
+                            poly_groups.append(
+                                {
+                                    "poly_group_name": poly_group_name,
+                                    "colors_fmt": colors_fmt,
+                                    "vert_array": vert_array,
+                                    "normal_array": normal_array,
+                                    "color_array": color_array,
+                                    "alpha_array": alpha_array,
+                                    "uv_arrays": (
+                                        uv_array,
+                                        uv2_array,
+                                        uv3_array,
+                                        uv4_array,
+                                    ),
+                                    "face_array": face_array,
+                                    "face_mat_id_array": face_mat_id_array,
+                                    "bone_indices": b1_array,
+                                    "bone_weights": w1_array,
+                                    "morph_names": [],
+                                    "morphs": [],
+                                }
+                            )
+                        trmbf_path = trmbf.name
+                        meshes = {"poly_groups": poly_groups, "trmbf_path": trmbf_path}
+                        parse_cache.put(trmsh_path, mesh_context, meshes, [trmbf_path])
+                        disk_cache.put_meshes(trmsh_entry, poly_groups, trmbf_path)
+        lods.append(poly_groups)
+        buffer_paths.append(trmbf_path)
+
+    model = ModelData(trmdl.name, options)
+    model.chara_check = chara_check
+    model.skeleton_path = skeleton_path
+    model.bones = bones
+    model.materials = mat_data_array
+    if trmtr is not None:
+        model.materials_path = trmtr.name
+    model.lods = lods
+    model.lod_paths = [
+        dir_index.path(name) if dir_index.exists(name) else None
+        for name in trmsh_lods_array[:trmsh_count]
+    ]
+    model.buffer_paths = buffer_paths
+    return model
+
+
+def build_trmdl(model, dir_index, image_cache=None, material_cache=None):
+    """Creates the Blender data for a model read by parse_trmdl."""
+    chara_check = model.chara_check
+    bones = model.bones
+    mat_data_array = model.materials
 
-                                    if mat_struct_ptr_unk_d != 0:
-                                        fseek(
-                                            trmsh,
-                                            mat_entry_offset + mat_struct_ptr_unk_d,
-                                        )
-                                        mat_unk_d = readlong(trmsh)
+    # make collection
+    if IN_BLENDER_ENV:
+        new_collection = bpy.data.collections.new(os.path.basename(model.filepath))
+        bpy.context.scene.collection.children.link(new_collection)
 
-                                    mat_id = 0
-                                    for z in range(len(mat_data_array)):
-                                        if mat_data_array[z]["mat_name"] == mat_name:
-                                            mat_id = z
-                                            break
+    textureextension = ".png"
+    if image_cache is None:
+        image_cache = ImageCache()
+    if material_cache is None:
+        material_cache = MaterialCache()
 
-                                    for z in range(mat_facepoint_count):
-                                        face_mat_id_array.append(mat_id)
+    materials = []
+    bone_structure = None
+    bone_array = []
+    bone_id_map = {}
+    bone_rig_array = []
 
-                                    print(
-                                        f"Material {mat_name}: FaceCount = {mat_facepoint_count}, FaceStart = {mat_facepoint_start}"
-                                    )
-                                    fseek(trmsh, mat_ret)
+    if (chara_check == "Rei" or chara_check == "Akari") and model.skeleton_path:
+        base_armature = armature_registry.get(model.skeleton_path, "pla")
+        if base_armature is not None:
+            print("Using built base armature...")
+            bones = None
+            bone_structure = base_armature["object"]
+            bone_id_map.update(base_armature["bone_id_map"])
+            bone_rig_array.extend(base_armature["bone_rig_array"])
+        elif bones is None:
+            print("Base armature is gone since the parse, parsing its TRSKL")
+            reparsed = parse_model(model.filepath, model.options, dir_index, None, ())
+            bones = reparsed.bones
+
+    if bones is not None:
+        if IN_BLENDER_ENV:
+            new_armature = bpy.data.armatures.new(os.path.basename(model.filepath))
+            bone_structure = bpy.data.objects.new(
+                os.path.basename(model.filepath), new_armature
+            )
+            new_collection.objects.link(bone_structure)
+            bpy.context.view_layer.objects.active = bone_structure
+            bpy.ops.object.editmode_toggle()
 
-                            if poly_group_struct_ptr_poly_group_name != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset
-                                    + poly_group_struct_ptr_poly_group_name,
-                                )
-                                poly_group_name_offset = ftell(trmsh) + readlong(trmsh)
-                                fseek(trmsh, poly_group_name_offset)
-                                poly_group_name_len = readlong(trmsh)
-                                poly_group_name = readfixedstring(
-                                    trmsh, poly_group_name_len
-                                )
-                                print(f"Building {poly_group_name}...")
-                            if poly_group_struct_ptr_vis_group_name != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset
-                                    + poly_group_struct_ptr_vis_group_name,
-                                )
-                                vis_group_name_offset = ftell(trmsh) + readlong(trmsh)
-                                fseek(trmsh, vis_group_name_offset)
-                                vis_group_name_len = readlong(trmsh)
-                                vis_group_name = readfixedstring(
-                                    trmsh, vis_group_name_len
-                                )
-                                # changed the output variable because the original seems to be a typo
-                                print(f"VisGroup: {vis_group_name}")
-                            if poly_group_struct_ptr_vert_buff != 0:
-                                fseek(
-                                    trmsh,
-                                    poly_group_offset + poly_group_struct_ptr_vert_buff,
-                                )
-                                poly_group_vert_buff_offset = ftell(trmsh) + readlong(
-                                    trmsh
-                                )
-                                fseek(trmsh, poly_group_vert_buff_offset)
-                                vert_buff_count = readlong(trmsh)
-                                vert_buff_offset = ftell(trmsh) + readlong(trmsh)
-                                fseek(trmsh, vert_buff_offset)
-                                vert_buff_struct = ftell(trmsh) - readlong(trmsh)
-                                fseek(trmsh, vert_buff_struct)
-                                vert_buff_struct_len = readshort(trmsh)
+        for bone in bones:
+            bone_name = bone["name"]
+            bone_parent = bone["parent"]
+            if bone["rig_id"] is not None:
+                while len(bone_rig_array) <= bone["rig_id"]:
+                    bone_rig_array.append("")
+                bone_rig_array[bone["rig_id"]] = bone_name
 
-                                if vert_buff_struct_len != 0x0008:
-                                    raise AssertionError(
-                                        "Unexpected VertexBuffer struct length!"
-                                    )
-                                vert_buff_struct_section_len = readshort(trmsh)
-                                vert_buff_struct_ptr_param = readshort(trmsh)
-                                vert_buff_struct_ptr_b = readshort(trmsh)
+            bone_matrix = mathutils.Matrix.LocRotScale(
+                bone["trs"], mathutils.Euler(bone["rot"]), bone["scl"]
+            )
 
-                                if vert_buff_struct_ptr_param != 0:
-                                    fseek(
-                                        trmsh,
-                                        vert_buff_offset + vert_buff_struct_ptr_param,
-                                    )
-                                    vert_buff_param_offset = ftell(trmsh) + readlong(
-                                        trmsh
-                                    )
-                                    fseek(trmsh, vert_buff_param_offset)
-                                    vert_buff_param_count = readlong(trmsh)
-                                    for y in range(vert_buff_param_count):
-                                        vert_buff_param_offset = ftell(
-                                            trmsh
-                                        ) + readlong(trmsh)
-                                        vert_buff_param_ret = ftell(trmsh)
-                                        fseek(trmsh, vert_buff_param_offset)
-                                        vert_buff_param_struct = ftell(
-                                            trmsh
-                                        ) - readlong(trmsh)
-                                        fseek(trmsh, vert_buff_param_struct)
-                                        vert_buff_param_struct_len = readshort(trmsh)
+            if IN_BLENDER_ENV:
+                new_bone = new_armature.edit_bones.new(bone_name)
 
-                                        if vert_buff_param_struct_len == 0x000C:
-                                            vert_buff_param_struct_section_len = (
-                                                readshort(trmsh)
-                                            )
-                                            vert_buff_param_ptr_unk_a = readshort(trmsh)
-                                            vert_buff_param_ptr_type = readshort(trmsh)
-                                            vert_buff_param_ptr_layer = readshort(trmsh)
-                                            vert_buff_param_ptr_fmt = readshort(trmsh)
-                                            vert_buff_param_ptr_position = 0
-                                        elif vert_buff_param_struct_len == 0x000E:
-                                            vert_buff_param_struct_section_len = (
-                                                readshort(trmsh)
-                                            )
-                                            vert_buff_param_ptr_unk_a = readshort(trmsh)
-                                            vert_buff_param_ptr_type = readshort(trmsh)
-                                            vert_buff_param_ptr_layer = readshort(trmsh)
-                                            vert_buff_param_ptr_fmt = readshort(trmsh)
-                                            vert_buff_param_ptr_position = readshort(
-                                                trmsh
-                                            )
-                                        else:
-                                            raise AssertionError(
-                                                "Unknown vertex buffer parameter struct length!"
-                                            )
+                new_bone.use_connect = False
+                new_bone.use_inherit_rotation = True
+                new_bone.use_inherit_scale = True
+                new_bone.use_local_location = True
 
-                                        vert_buff_param_layer = 0
+                new_bone.head = (0, 0, 0)
+                new_bone.tail = (0, 0, 0.1)
+                new_bone.matrix = bone_matrix
 
-                                        if vert_buff_param_ptr_type != 0:
-                                            fseek(
-                                                trmsh,
-                                                vert_buff_param_offset
-                                                + vert_buff_param_ptr_type,
-                                            )
-                                            vert_buff_param_type = readlong(trmsh)
-                                        if vert_buff_param_ptr_layer != 0:
-                                            fseek(
-                                                trmsh,
-                                                vert_buff_param_offset
-                                                + vert_buff_param_ptr_layer,
-                                            )
-                                            vert_buff_param_layer = readlong(trmsh)
-                                        if vert_buff_param_ptr_fmt != 0:
-                                            fseek(
-                                                trmsh,
-                                                vert_buff_param_offset
-                                                + vert_buff_param_ptr_fmt,
-                                            )
-                                            vert_buff_param_format = readlong(trmsh)
-                                        if vert_buff_param_ptr_position != 0:
-                                            fseek(
-                                                trmsh,
-                                                vert_buff_param_offset
-                                                + vert_buff_param_ptr_position,
-                                            )
-                                            vert_buff_param_position = readlong(trmsh)
-                                        else:
-                                            vert_buff_param_position = 0
+                if bone_parent != 0:
+                    new_bone.parent = bone_array[bone_parent - 1]
+                    new_bone.matrix = bone_array[bone_parent - 1].matrix @ bone_matrix
+
+                if bone_name in bone_rig_array:
+                    bone_id_map[bone_rig_array.index(bone_name)] = bone_name
+                else:
+                    print(f"Bone {bone_name} not found in bone rig array!")
+                bone_array.append(new_bone)
+        if IN_BLENDER_ENV:
+            bpy.ops.object.editmode_toggle()
+            if chara_check == "Rei" or chara_check == "Akari":
+                armature_registry.add(
+                    model.skeleton_path,
+                    "pla",
+                    bone_structure,
+                    bone_id_map,
+                    bone_rig_array,
+                )
+
+    if mat_data_array is not None:
+        if IN_BLENDER_ENV:
+            # process materials
+            for m, mat in enumerate(mat_data_array):
+                fingerprint = material_cache.fingerprint(
+                    mat, dir_index, textureextension, chara_check
+                )
+                material = material_cache.get(fingerprint)
+                if material is not None:
+                    print(f"Reusing material {material.name}")
+                    materials.append(material)
+                    continue
+                material = bpy.data.materials.new(name=mat["mat_name"])
+                material.use_nodes = True
+                materials.append(material)
+                material_cache.add(fingerprint, material)
+
+                blend_type = "MIX"
+
+                material_output = material.node_tree.nodes.get("Material Output")
+                principled_bsdf = material.node_tree.nodes.get("Principled BSDF")
+                material.node_tree.links.new(
+                    principled_bsdf.outputs[0], material_output.inputs[0]
+                )
+
+                print(f"mat_shader = {mat['mat_shader']}")
+
+                material.blend_method = "HASHED"
+                material.show_transparent_back = False
+                material.shadow_method = "OPAQUE"
 
-                                        # -- Types:
-                                        # -- 0x01: = Positions
-                                        # -- 0x02 = Normals
-                                        # -- 0x03 = Tangents
-                                        # -- 0x05 = Colors
-                                        # -- 0x06 = UVs
-                                        # -- 0x07 = NodeIDs
-                                        # -- 0x08 = Weights
-                                        #
-                                        # -- Formats:
-                                        # -- 0x14 = 4 bytes as float
-                                        # -- 0x16 = 4 bytes
-                                        # -- 0x27 = 4 shorts as float
-                                        # -- 0x2B = 4 half-floats
-                                        # -- 0x30 = 2 floats
-                                        # -- 0x33 = 3 floats
-                                        # -- 0x36 = 4 floats
+                color_output = principled_bsdf.inputs[0]
+                if mat["mat_shader"] == "Unlit":
+                    color_output = material_output.inputs[0]
+                if mat["mat_shader"] == "Transparent":
+                    material.blend_method = "BLEND"
+                    reflection = material.node_tree.nodes.new("ShaderNodeGroup")
+                    reflection.node_tree = get_shader_group(
+                        "TRMTR Reflection", build_reflection_group
+                    )
+                    reflectance = reflection.inputs["Reflectance"]
+                    reflectance.default_value = mat["mat_reflectance"]
 
-                                        if vert_buff_param_type == 0x01:
-                                            if vert_buff_param_layer != 0:
-                                                raise AssertionError(
-                                                    "Unexpected positions layer!"
-                                                )
+                material.use_backface_culling = True
 
-                                            if vert_buff_param_format != 0x33:
-                                                raise AssertionError(
-                                                    "Unexpected positions format!"
-                                                )
+                if chara_check == "Pokemon" or mat["mat_name"] == "eye":
+                    # LAYER MASK MAP
 
-                                            positions_fmt = "3Floats"
-                                            vert_buffer_stride = (
-                                                vert_buffer_stride + 0x0C
-                                            )
-                                        elif vert_buff_param_type == 0x02:
-                                            if vert_buff_param_layer != 0:
-                                                raise AssertionError(
-                                                    "Unexpected normals layer!"
-                                                )
+                    lym_image_texture = material.node_tree.nodes.new(
+                        "ShaderNodeTexImage"
+                    )
+                    if dir_index.exists(mat["mat_lym0"][:-5] + textureextension):
+                        lym_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_lym0"][:-5] + textureextension)
+                        )
+                        lym_image_texture.image.colorspace_settings.name = "Non-Color"
 
-                                            if vert_buff_param_format != 0x2B:
-                                                raise AssertionError(
-                                                    "Unexpected normals format!"
-                                                )
+                    color1 = (
+                        mat["mat_color1_r"],
+                        mat["mat_color1_g"],
+                        mat["mat_color1_b"],
+                        1.0,
+                    )
+                    color2 = (
+                        mat["mat_color2_r"],
+                        mat["mat_color2_g"],
+                        mat["mat_color2_b"],
+                        1.0,
+                    )
+                    color3 = (
+                        mat["mat_color3_r"],
+                        mat["mat_color3_g"],
+                        mat["mat_color3_b"],
+                        1.0,
+                    )
+                    color4 = (
+                        mat["mat_color4_r"],
+                        mat["mat_color4_g"],
+                        mat["mat_color4_b"],
+                        1.0,
+                    )
 
-                                            normals_fmt = "4HalfFloats"
-                                            vert_buffer_stride = (
-                                                vert_buffer_stride + 0x08
-                                            )
-                                        elif vert_buff_param_type == 0x03:
-                                            if vert_buff_param_layer == 0:
-                                                if vert_buff_param_format != 0x2B:
-                                                    raise AssertionError(
-                                                        "Unexpected tangents format!"
-                                                    )
+                    emcolor1 = (
+                        mat["mat_emcolor1_r"],
+                        mat["mat_emcolor1_g"],
+                        mat["mat_emcolor1_b"],
+                        1.0,
+                    )
+                    emcolor2 = (
+                        mat["mat_emcolor2_r"],
+                        mat["mat_emcolor2_g"],
+                        mat["mat_emcolor2_b"],
+                        1.0,
+                    )
+                    emcolor3 = (
+                        mat["mat_emcolor3_r"],
+                        mat["mat_emcolor3_g"],
+                        mat["mat_emcolor3_b"],
+                        1.0,
+                    )
+                    emcolor4 = (
+                        mat["mat_emcolor4_r"],
+                        mat["mat_emcolor4_g"],
+                        mat["mat_emcolor4_b"],
+                        1.0,
+                    )
+                    if (
+                        emcolor1 == (1.0, 1.0, 1.0, 1.0)
+                        and emcolor2 == (1.0, 1.0, 1.0, 1.0)
+                        and emcolor3 == (1.0, 1.0, 1.0, 1.0)
+                        and emcolor4 == (1.0, 1.0, 1.0, 1.0)
+                    ):
+                        emcolor1 = (0.0, 0.0, 0.0, 0.0)
+                        emcolor2 = (0.0, 0.0, 0.0, 0.0)
+                        emcolor3 = (0.0, 0.0, 0.0, 0.0)
+                        emcolor4 = (0.0, 0.0, 0.0, 0.0)
+                    print(f'Material {mat["mat_name"]}:')
+                    print(f"Color 1: {color1}")
+                    print(f"Color 2: {color2}")
+                    print(f"Color 3: {color3}")
+                    print(f"Color 4: {color4}")
+                    print(f"Emission Color 1: {emcolor1}")
+                    print(f"Emission Color 2: {emcolor2}")
+                    print(f"Emission Color 3: {emcolor3}")
+                    print(f"Emission Color 4: {emcolor4}")
+                    print("---")
 
-                                                tangents_fmt = "4HalfFloats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 1:
-                                                if vert_buff_param_format != 0x2B:
-                                                    raise AssertionError(
-                                                        "Unexpected bitangents format!"
-                                                    )
+                    layer_group = material.node_tree.nodes.new("ShaderNodeGroup")
+                    layer_group.node_tree = get_shader_group(
+                        f"TRMTR Layers {blend_type.title()}",
+                        build_layer_group,
+                        blend_type,
+                    )
+                    colors = (color1, color2, color3, color4)
+                    emcolors = (emcolor1, emcolor2, emcolor3, emcolor4)
+                    inputs = layer_group.inputs
+                    for i, (color, emcolor) in enumerate(zip(colors, emcolors), 1):
+                        inputs[f"Color {i}"].default_value = color
+                        inputs[f"Emission Color {i}"].default_value = emcolor
+                    material.node_tree.links.new(
+                        lym_image_texture.outputs[0], layer_group.inputs["Layer Mask"]
+                    )
+                    material.node_tree.links.new(
+                        lym_image_texture.outputs[1],
+                        layer_group.inputs["Layer Mask Alpha"],
+                    )
+                    material.node_tree.links.new(
+                        layer_group.outputs["Color"], color_output
+                    )
+                    material.node_tree.links.new(
+                        layer_group.outputs["Emission"], principled_bsdf.inputs[26]
+                    )
 
-                                                bitangents_fmt = "4HalfFloats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 2:
-                                                if vert_buff_param_format != 0x2B:
-                                                    raise AssertionError(
-                                                        "Unexpected tritangents format!"
-                                                    )
+                    if dir_index.exists(mat["mat_col0"][:-5] + textureextension):
+                        alb_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        alb_image_texture.image = image_cache.load(
+                            dir_index.path(mat["mat_col0"][:-5] + textureextension)
+                        )
+                        material.node_tree.links.new(
+                            alb_image_texture.outputs[0],
+                            layer_group.inputs["Base Color"],
+                        )
+                        material.node_tree.links.new(
+                            alb_image_texture.outputs[1], principled_bsdf.inputs[4]
+                        )
 
-                                                tritangents_fmt = "4HalfFloats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            else:
-                                                raise AssertionError(
-                                                    "Unexpected tangents layer!"
-                                                )
-                                        elif vert_buff_param_type == 0x05:
-                                            if vert_buff_param_layer == 0:
-                                                if vert_buff_param_format == 0x14:
-                                                    colors_fmt = "4BytesAsFloat"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x04
-                                                    )
-                                                elif vert_buff_param_format == 0x36:
-                                                    colors_fmt = "4Floats"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x10
-                                                    )
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unexpected colors format!"
-                                                    )
-                                            elif vert_buff_param_layer == 1:
-                                                if vert_buff_param_format == 0x14:
-                                                    colors2_fmt = "4BytesAsFloat"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x04
-                                                    )
-                                                elif vert_buff_param_format == 0x36:
-                                                    colors2_fmt = "4Floats"
-                                                    vert_buffer_stride = (
-                                                        vert_buffer_stride + 0x10
-                                                    )
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unexpected colors2 format!"
-                                                    )
-                                        elif vert_buff_param_type == 0x06:
-                                            if vert_buff_param_layer == 0:
-                                                if vert_buff_param_format != 0x30:
-                                                    raise AssertionError(
-                                                        "Unexpected UVs format!"
-                                                    )
+                    mix_color5 = None
+                    if mat["mat_enable_highlight_map"]:
+                        highlight_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_highmsk0"][:-5] + ".png"):
+                            highlight_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_highmsk0"][:-5] + ".png")
+                            )
+                            highlight_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        elif dir_index.exists(mat["mat_col0"][:-8] + "msk.png"):
+                            highlight_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_col0"][:-8] + "msk.png")
+                            )
+                            highlight_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        elif dir_index.exists(mat["mat_col0"][:-8] + "msk.png"):
+                            highlight_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_col0"][:-8] + "msk.png")
+                            )
+                            highlight_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        elif dir_index.exists(mat["mat_col0"][:-12] + "r_eye_msk.png"):
+                            highlight_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_col0"][:-12] + "r_eye_msk.png")
+                            )
+                            highlight_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        elif dir_index.exists(mat["mat_col0"][:-12] + "l_eye_msk.png"):
+                            highlight_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_col0"][:-12] + "l_eye_msk.png")
+                            )
+                            highlight_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        else:
+                            print("No Highlight")
+                        mix_color5 = material.node_tree.nodes.new("ShaderNodeMixRGB")
+                        mix_color5.blend_type = blend_type
+                        mix_color5.inputs[2].default_value = (1, 1, 1, 1)
+                        material.node_tree.links.new(
+                            highlight_image_texture.outputs[0], mix_color5.inputs[0]
+                        )
+                        material.node_tree.links.new(
+                            layer_group.outputs["Color"], mix_color5.inputs[1]
+                        )
+                        material.node_tree.links.new(
+                            mix_color5.outputs[0], color_output
+                        )
+
+                    if mat["mat_enable_normal_map"]:
+                        normal_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_nrm0"][:-5] + textureextension):
+                            normal_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_nrm0"][:-5] + textureextension)
+                            )
+                            normal_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        normal_map2 = material.node_tree.nodes.new("ShaderNodeGroup")
+                        normal_map2.node_tree = get_shader_group(
+                            "TRMTR Normal Map", build_normal_map_group
+                        )
+                        material.node_tree.links.new(
+                            normal_image_texture.outputs[0], normal_map2.inputs["Color"]
+                        )
+                        material.node_tree.links.new(
+                            normal_image_texture.outputs[1], normal_map2.inputs["Alpha"]
+                        )
+                        material.node_tree.links.new(
+                            normal_map2.outputs[0], principled_bsdf.inputs[5]
+                        )
+                        if mat["mat_shader"] == "Transparent":
+                            material.node_tree.links.new(
+                                normal_map2.outputs[0], reflection.inputs["Normal"]
+                            )
+                            material.node_tree.links.new(
+                                reflection.outputs["Reflection"],
+                                principled_bsdf.inputs[4],
+                            )
 
-                                                uvs_fmt = "2Floats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 1:
-                                                if vert_buff_param_format != 0x30:
-                                                    raise AssertionError(
-                                                        "Unexpected UVs2 format!"
-                                                    )
+                    if mat["mat_enable_metallic_map"]:
+                        metalness_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_mtl0"][:-5] + textureextension):
+                            metalness_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_mtl0"][:-5] + textureextension)
+                            )
+                            metalness_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        material.node_tree.links.new(
+                            metalness_image_texture.outputs[0],
+                            principled_bsdf.inputs[1],
+                        )
 
-                                                uvs2_fmt = "2Floats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 2:
-                                                if vert_buff_param_format != 0x30:
-                                                    raise AssertionError(
-                                                        "Unexpected UVs3 format!"
-                                                    )
+                    if mat["mat_enable_emission_color_map"]:
+                        emission_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_emi0"][:-5] + textureextension):
+                            emission_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_emi0"][:-5] + textureextension)
+                            )
+                        material.node_tree.links.new(
+                            emission_image_texture.outputs[0],
+                            principled_bsdf.inputs[26],
+                        )
 
-                                                uvs3_fmt = "2Floats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            elif vert_buff_param_layer == 3:
-                                                if vert_buff_param_format != 0x30:
-                                                    raise AssertionError(
-                                                        "Unexpected UVs4 format!"
-                                                    )
+                    if mat["mat_enable_roughness_map"]:
+                        roughness_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_rgh0"][:-5] + textureextension):
+                            roughness_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_rgh0"][:-5] + textureextension)
+                            )
+                            roughness_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        material.node_tree.links.new(
+                            roughness_image_texture.outputs[0],
+                            principled_bsdf.inputs[2],
+                        )
 
-                                                uvs4_fmt = "2Floats"
-                                                vert_buffer_stride = (
-                                                    vert_buffer_stride + 0x08
-                                                )
-                                            else:
-                                                raise AssertionError(
-                                                    "Unexpected UVs layer!"
-                                                )
-                                        elif vert_buff_param_type == 0x07:
-                                            if vert_buff_param_layer != 0:
-                                                raise AssertionError(
-                                                    "Unexpected node IDs layer!"
-                                                )
+                    if mat["mat_enable_ao_map"]:
+                        ambientocclusion_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_ao0"][:-5] + textureextension):
+                            ambientocclusion_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_ao0"][:-5] + textureextension)
+                            )
+                            ambientocclusion_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        mix_color6 = material.node_tree.nodes.new("ShaderNodeMixRGB")
+                        mix_color6.blend_type = "MULTIPLY"
+                        if (
+                            mat["mat_ao0"][:-5]
+                            == "../../glb_share_tex/texture_white_ao/texture_white_ao"
+                        ):
+                            mix_color6.inputs[0].default_value = 0
+                        else:
+                            mix_color6.inputs[0].default_value = 1.0
+                        material.node_tree.links.new(
+                            layer_group.outputs["Color"], mix_color6.inputs[1]
+                        )
+                        material.node_tree.links.new(
+                            ambientocclusion_image_texture.outputs[0],
+                            mix_color6.inputs[2],
+                        )
+                        material.node_tree.links.new(
+                            mix_color6.outputs[0], color_output
+                        )
+                    if dir_index.exists(mat["mat_col0"][:-5] + textureextension):
+                        if (
+                            color1 == (1.0, 1.0, 1.0, 1.0)
+                            and color2 == (1.0, 1.0, 1.0, 1.0)
+                            and color3 == (1.0, 1.0, 1.0, 1.0)
+                            and color4 == (1.0, 1.0, 1.0, 1.0)
+                        ):
+                            if mat["mat_enable_ao_map"]:
+                                material.node_tree.links.new(
+                                    alb_image_texture.outputs[0], mix_color6.inputs[1]
+                                )
+                            elif mix_color5 is not None:
+                                material.node_tree.links.new(
+                                    alb_image_texture.outputs[0], mix_color5.inputs[1]
+                                )
 
-                                            if vert_buff_param_format != 0x16:
-                                                raise AssertionError(
-                                                    "Unexpected node IDs format!"
-                                                )
+                else:
+                    alb_image_texture = None
+                    if mat["mat_enable_base_color_map"]:
+                        alb_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_col0"][:-5] + textureextension):
+                            alb_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_col0"][:-5] + textureextension)
+                            )
+                        material.node_tree.links.new(
+                            alb_image_texture.outputs[0], color_output
+                        )
+                        material.node_tree.links.new(
+                            alb_image_texture.outputs[1], principled_bsdf.inputs[4]
+                        )
 
-                                            bones_fmt = "4Bytes"
-                                            vert_buffer_stride = (
-                                                vert_buffer_stride + 0x04
-                                            )
-                                        elif vert_buff_param_type == 0x08:
-                                            if vert_buff_param_layer != 0:
-                                                raise AssertionError(
-                                                    "Unexpected weights layer!"
-                                                )
+                    if mat["mat_enable_highlight_map"]:
+                        highlight_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_highmsk0"][:-5] + ".png"):
+                            highlight_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_highmsk0"][:-5] + ".png")
+                            )
+                            highlight_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        elif dir_index.exists(mat["mat_col0"][:-8] + "msk.png"):
+                            highlight_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_col0"][:-8] + "msk.png")
+                            )
+                            highlight_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        else:
+                            print("No Highlight")
+                        mix_color5 = material.node_tree.nodes.new("ShaderNodeMixRGB")
+                        mix_color5.blend_type = blend_type
+                        mix_color5.inputs[2].default_value = (1, 1, 1, 1)
+                        material.node_tree.links.new(
+                            highlight_image_texture.outputs[0], mix_color5.inputs[0]
+                        )
+                        # Trainers have no layer group, the highlight goes over
+                        # the base color like it goes over the layers' color.
+                        if alb_image_texture is not None:
+                            material.node_tree.links.new(
+                                alb_image_texture.outputs[0], mix_color5.inputs[1]
+                            )
+                        material.node_tree.links.new(
+                            mix_color5.outputs[0], color_output
+                        )
 
-                                            if vert_buff_param_format != 0x27:
-                                                raise AssertionError(
-                                                    "Unexpected weights format!"
-                                                )
+                    if mat["mat_enable_normal_map"]:
+                        normal_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_nrm0"][:-5] + textureextension):
+                            normal_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_nrm0"][:-5] + textureextension)
+                            )
+                            normal_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        normal_map2 = material.node_tree.nodes.new("ShaderNodeGroup")
+                        normal_map2.node_tree = get_shader_group(
+                            "TRMTR Normal Map", build_normal_map_group
+                        )
+                        material.node_tree.links.new(
+                            normal_image_texture.outputs[0], normal_map2.inputs["Color"]
+                        )
+                        material.node_tree.links.new(
+                            normal_image_texture.outputs[1], normal_map2.inputs["Alpha"]
+                        )
+                        material.node_tree.links.new(
+                            normal_map2.outputs[0], principled_bsdf.inputs[5]
+                        )
+                        if mat["mat_shader"] == "Transparent":
+                            material.node_tree.links.new(
+                                normal_map2.outputs[0], reflection.inputs["Normal"]
+                            )
+                            material.node_tree.links.new(
+                                reflection.outputs["Fresnel"], principled_bsdf.inputs[4]
+                            )
 
-                                            weights_fmt = "4ShortsAsFloat"
-                                            vert_buffer_stride = (
-                                                vert_buffer_stride + 0x08
-                                            )
-                                        elif vert_buff_param_type == 0x09:
-                                            if vert_buff_param_layer != 0:
-                                                raise AssertionError(
-                                                    "Unexpected ?????? layer!"
-                                                )
+                    if mat["mat_enable_emission_color_map"]:
+                        emission_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_emi0"][:-5] + textureextension):
+                            emission_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_emi0"][:-5] + textureextension)
+                            )
+                        material.node_tree.links.new(
+                            emission_image_texture.outputs[0],
+                            principled_bsdf.inputs[26],
+                        )
 
-                                            if vert_buff_param_format != 0x24:
-                                                raise AssertionError(
-                                                    "Unexpected ?????? layer!"
-                                                )
+                    if mat["mat_enable_metallic_map"]:
+                        metalness_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_mtl0"][:-5] + textureextension):
+                            metalness_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_mtl0"][:-5] + textureextension)
+                            )
+                            metalness_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        material.node_tree.links.new(
+                            metalness_image_texture.outputs[0],
+                            principled_bsdf.inputs[1],
+                        )
+
+                    if mat["mat_enable_roughness_map"]:
+                        roughness_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_rgh0"][:-5] + textureextension):
+                            roughness_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_rgh0"][:-5] + textureextension)
+                            )
+                            roughness_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        material.node_tree.links.new(
+                            roughness_image_texture.outputs[0],
+                            principled_bsdf.inputs[2],
+                        )
+
+                    if mat["mat_enable_ao_map"]:
+                        ambientocclusion_image_texture = material.node_tree.nodes.new(
+                            "ShaderNodeTexImage"
+                        )
+                        if dir_index.exists(mat["mat_ao0"][:-5] + textureextension):
+                            ambientocclusion_image_texture.image = image_cache.load(
+                                dir_index.path(mat["mat_ao0"][:-5] + textureextension)
+                            )
+                            ambientocclusion_image_texture.image.colorspace_settings.name = (
+                                "Non-Color"
+                            )
+                        mix_color6 = material.node_tree.nodes.new("ShaderNodeMixRGB")
+                        mix_color6.blend_type = "MULTIPLY"
+                        if (
+                            mat["mat_ao0"][:-5]
+                            == "../../glb_share_tex/texture_white_ao/texture_white_ao"
+                        ):
+                            mix_color6.inputs[0].default_value = 0
+                        else:
+                            mix_color6.inputs[0].default_value = 1.0
+                        if alb_image_texture is not None:
+                            material.node_tree.links.new(
+                                alb_image_texture.outputs[0], mix_color6.inputs[1]
+                            )
+                        material.node_tree.links.new(
+                            ambientocclusion_image_texture.outputs[0],
+                            mix_color6.inputs[2],
+                        )
+                        material.node_tree.links.new(
+                            mix_color6.outputs[0], color_output
+                        )
 
-                                            svunk_fmt = "1Long?"
-                                            vert_buffer_stride = (
-                                                vert_buffer_stride + 0x04
-                                            )
-                                        else:
-                                            raise AssertionError("Unknown vertex type!")
+    for poly_groups in model.lods:
+        for poly_group in poly_groups or ():
+            print("Making object...")
 
-                                        fseek(trmsh, vert_buff_param_ret)
+            if IN_BLENDER_ENV:
+                new_object = build_poly_group(
+                    poly_group, materials, bone_structure, bone_id_map
+                )
+                # add object to scene collection
+                new_collection.objects.link(new_object)
 
-                            poly_group_array.append(
-                                {
-                                    "poly_group_name": poly_group_name,
-                                    "vis_group_name": vis_group_name,
-                                    "vert_buffer_stride": vert_buffer_stride,
-                                    "positions_fmt": positions_fmt,
-                                    "normals_fmt": normals_fmt,
-                                    "tangents_fmt": tangents_fmt,
-                                    "bitangents_fmt": bitangents_fmt,
-                                    "tritangents_fmt": tritangents_fmt,
-                                    "uvs_fmt": uvs_fmt,
-                                    "uvs2_fmt": uvs2_fmt,
-                                    "uvs3_fmt": uvs3_fmt,
-                                    "uvs4_fmt": uvs4_fmt,
-                                    "colors_fmt": colors_fmt,
-                                    "colors2_fmt": colors2_fmt,
-                                    "bones_fmt": bones_fmt,
-                                    "weights_fmt": weights_fmt,
-                                    "svunk_fmt": svunk_fmt,
-                                }
-                            )
-                            fseek(trmsh, poly_group_ret)
 
-                            vert_buffer_offset = ftell(trmbf) + readlong(trmbf)
-                            vert_buffer_ret = ftell(trmbf)
-                            fseek(trmbf, vert_buffer_offset)
-                            vert_buffer_struct = ftell(trmbf) - readlong(trmbf)
-                            fseek(trmbf, vert_buffer_struct)
-                            vert_buffer_struct_len = readshort(trmbf)
+# What parse_model does when options leave something out.
+MODEL_OPTIONS = {
+    "game": "sv",
+    "rare": False,
+    "loadlods": False,
+    "bonestructh": False,
+    "basearmature": "donothing",
+}
 
-                            vert_buffer_struct_section_length = readshort(trmbf)
-                            vert_buffer_struct_ptr_faces = readshort(trmbf)
-                            vert_buffer_struct_ptr_verts = readshort(trmbf)
 
-                            if vert_buffer_struct_ptr_verts != 0:
-                                fseek(
-                                    trmbf,
-                                    vert_buffer_offset + vert_buffer_struct_ptr_verts,
-                                )
-                                vert_buffer_sub_start = ftell(trmbf) + readlong(trmbf)
-                                fseek(trmbf, vert_buffer_sub_start)
-                                vert_buffer_sub_count = readlong(trmbf)
+class ModelData:
+    """Everything read from a TRMDL and its files, ready to be built.
+
+    Only holds dict records, lists and NumPy arrays, so it can be made
+    and kept without bpy. The records are the ones the parse functions
+    already put in the parse cache.
+    """
+
+    def __init__(self, filepath, options):
+        self.filepath = filepath
+        self.options = options
+        self.chara_check = "None"
+        # The TRSKL as the TRMDL names it and the path it was read from.
+        self.skeleton_name = None
+        self.skeleton_path = None
+        self.bones = None
+        self.materials = None
+        self.materials_path = None
+        # The poly groups of each LOD, None where its TRMSH is missing, the
+        # path of that TRMSH and of the TRMBF its buffers were read from.
+        self.lods = []
+        self.lod_paths = []
+        self.buffer_paths = []
+        # Every file the model depends on, textures included.
+        self.files = []
+        # Seconds parse_model took.
+        self.parse_time = 0.0
+
+
+def parse_model(
+    filepath, options, dir_index=None, disk_cache_settings=None, built_skeletons=None
+):
+    """Reads a TRMDL and everything it points to into a ModelData.
+
+    Doesn't touch bpy, options["game"] picks "sv" or "pla" parsing. The disk
+    cache is only used when disk_cache_settings gives its directory and size.
+    built_skeletons has the ArmatureRegistry keys of the base armatures that
+    are already built, by default the ones this process knows of.
+    """
+    options = {**MODEL_OPTIONS, **options}
+    if built_skeletons is None:
+        built_skeletons = armature_registry.built()
+    disk_cache.use(disk_cache_settings)
+    if dir_index is None:
+        dir_index = DirectoryIndex(os.path.dirname(filepath))
+    started = time.monotonic()
+    # The parse functions close it once they're done with it.
+    trmdl = BinaryView(filepath)
+    loader = FileLoader(dir_index)
+    try:
+        if options["game"] == "pla":
+            model = parse_trmdl(trmdl, options, dir_index, loader, built_skeletons)
+        else:
+            model = parse_trmdlsv(trmdl, options, dir_index, loader, built_skeletons)
+    finally:
+        loader.close()
+    model.files = model_files(model, dir_index)
+    model.parse_time = time.monotonic() - started
+    return model
+
+
+def model_files(model, dir_index):
+    """Returns the paths of the files a model was read from or will load."""
+    files = [model.filepath]
+    for path in (model.skeleton_path, model.materials_path):
+        if path is not None:
+            files.append(path)
+    for path in model.lod_paths + model.buffer_paths:
+        if path is not None:
+            files.append(path)
+    for mat in model.materials or ():
+        names = [
+            value[:-5] + ".png"
+            for value in mat.values()
+            if isinstance(value, str) and value.endswith(".bntx")
+        ]
+        # The masks the build looks for next to the color texture.
+        color = mat.get("mat_col0", "")
+        names += [
+            color[:-8] + "msk.png",
+            color[:-12] + "r_eye_msk.png",
+            color[:-12] + "l_eye_msk.png",
+        ]
+        files.extend(dir_index.path(name) for name in names if dir_index.exists(name))
+    return list(dict.fromkeys(files))
+
+
+def init_parse_worker():
+    # Each worker would otherwise keep its own copy of what it parsed.
+    parse_cache.resize(0)
+
+
+class ModelParser:
+    """Parses models in worker processes and hands them back in order.
+
+    next() returns the next model, waiting for it if it isn't parsed yet,
+    and ready() says whether it would have to wait. A single model is just
+    parsed in next(). dir_indexes has the DirectoryIndex of each file.
+    Parsing runs at most two models per worker ahead of next(), and a model
+    is let go of once next() returns it, so a big folder isn't held in
+    memory all at once.
+    """
+
+    def __init__(self, filepaths, options, dir_indexes, disk_cache_settings=None):
+        self.filepaths = filepaths
+        self.options = options
+        self.dir_indexes = dir_indexes
+        self.disk_cache_settings = disk_cache_settings
+        self.index = 0
+        self.executor = None
+        self.futures = [None] * len(filepaths)
+        self.submitted = 0
+        if len(filepaths) < 2:
+            return
+
+        # 61 is the most processes a pool can wait on under Windows.
+        self.max_workers = min(os.cpu_count() or 1, 61, len(filepaths))
+        # Forking Blender isn't safe, the workers start from a fresh interpreter.
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_parse_worker,
+        )
+        self.submit()
+
+    def submit(self):
+        """Tops up the parses in flight to two per worker past the next model."""
+        end = min(self.index + self.max_workers * 2, len(self.filepaths))
+        if self.submitted >= end:
+            return
+        # The workers can't look in the scene for armatures built already.
+        built_skeletons = armature_registry.built()
+        try:
+            while self.submitted < end:
+                index = self.submitted
+                self.futures[index] = self.executor.submit(
+                    parse_model,
+                    self.filepaths[index],
+                    self.options,
+                    self.dir_indexes[index],
+                    self.disk_cache_settings,
+                    built_skeletons,
+                )
+                self.submitted += 1
+        except BrokenProcessPool:
+            # Whatever isn't submitted gets parsed in next().
+            self.submitted = len(self.filepaths)
+
+    def done(self):
+        return self.index >= len(self.filepaths)
+
+    def ready(self):
+        if self.done():
+            return False
+        future = self.futures[self.index]
+        return future is None or future.done()
+
+    def next(self):
+        """Returns the next model, the parse's exception if it failed."""
+        index = self.index
+        filepath = self.filepaths[index]
+        future = self.futures[index]
+        # Moves on first so a model that fails is only tried once.
+        self.index += 1
+        # Dropped so the model goes away once it's built.
+        self.futures[index] = None
+        if self.executor is not None:
+            self.submit()
+        if future is not None:
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                print(f"Parse workers stopped, parsing {filepath} here")
+        return parse_model(
+            filepath, self.options, self.dir_indexes[index], self.disk_cache_settings
+        )
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FolderImport:
+    """Builds a folder of models from a timer so Blender stays usable.
+
+    The models are parsed by ModelParser's workers and every timer tick
+    builds the ones that are ready, for about time_slice seconds. Progress
+    goes to the status bar and Esc stops before the next model. A model
+    that fails is printed and skipped, and with a manifest each result is
+    recorded as it comes in.
+    """
+
+    time_slice = 0.1
+
+    def __init__(
+        self,
+        filepaths,
+        options,
+        dir_indexes,
+        image_cache,
+        material_cache,
+        manifest=None,
+        disk_cache_settings=None,
+    ):
+        self.filepaths = filepaths
+        self.dir_indexes = dir_indexes
+        self.image_cache = image_cache
+        self.material_cache = material_cache
+        self.manifest = manifest
+        self.parser = ModelParser(filepaths, options, dir_indexes, disk_cache_settings)
+        self.failed = []
+        self.started = time.monotonic()
+        self.timer = None
+
+    def start(self, operator, context):
+        if self.parser.done():
+            self.parser.close()
+            operator.report({"INFO"}, "Nothing to import")
+            return {"FINISHED"}
+        wm = context.window_manager
+        self.timer = wm.event_timer_add(0.05, window=context.window)
+        wm.modal_handler_add(operator)
+        wm.progress_begin(0, len(self.filepaths))
+        self.show_status(context)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, operator, context, event):
+        total = len(self.filepaths)
+        if event.type == "ESC":
+            self.finish(context)
+            operator.report(
+                {"WARNING"},
+                f"Import cancelled, done with {self.parser.index} of {total} models",
+            )
+            # Still finished, so what got built is one undo step.
+            return {"FINISHED"}
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        try:
+            deadline = time.monotonic() + self.time_slice
+            while self.parser.ready() and time.monotonic() < deadline:
+                self.import_next()
+        except Exception:
+            self.finish(context)
+            raise
+
+        if self.parser.done():
+            self.finish(context)
+            self.image_cache.report()
+            self.material_cache.report()
+            parse_cache.report()
+            disk_cache.report()
+            if self.failed:
+                print(f"{len(self.failed)} models failed:")
+                for filepath in self.failed:
+                    print(f"  {filepath}")
+                operator.report(
+                    {"WARNING"},
+                    f"Imported {total - len(self.failed)} of {total} models, "
+                    f"see the console for the {len(self.failed)} that failed",
+                )
+            else:
+                operator.report({"INFO"}, f"Imported {total} models")
+            return {"FINISHED"}
+        context.window_manager.progress_update(self.parser.index)
+        self.show_status(context)
+        return {"RUNNING_MODAL"}
+
+    def import_next(self):
+        index = self.parser.index
+        filepath = self.filepaths[index]
+        started = time.monotonic()
+        try:
+            model = self.parser.next()
+            build_in_blender(
+                model, self.dir_indexes[index], self.image_cache, self.material_cache
+            )
+        except Exception as e:
+            print(f"Failed to import {filepath}: {type(e).__name__}: {e}")
+            self.failed.append(filepath)
+            if self.manifest is not None:
+                self.manifest.record(
+                    filepath, "failed", time.monotonic() - started, repr(e)
+                )
+            return
+        if self.manifest is not None:
+            self.manifest.record(
+                filepath,
+                "done",
+                time.monotonic() - started,
+                None,
+                model.parse_time,
+                model.files,
+            )
+
+    def show_status(self, context):
+        index = self.parser.index
+        total = len(self.filepaths)
+        name = os.path.basename(self.filepaths[index])
+        text = f"Importing {name} ({index + 1}/{total})"
+        if index > 0:
+            left = (time.monotonic() - self.started) / index * (total - index)
+            text += f", about {left:.0f}s left"
+        if self.failed:
+            text += f", {len(self.failed)} failed"
+        context.workspace.status_text_set(text + ", Esc to cancel")
+
+    def finish(self, context):
+        self.parser.close()
+        wm = context.window_manager
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+
+def find_models(root, ignore_case=False):
+    """Lists the .trmdl files under root and its subfolders, in a stable order.
+
+    Returns the paths and the DirectoryIndex of each one's folder.
+    """
+    filepaths = []
+    dir_indexes = []
+    for directory, subdirs, _ in os.walk(root):
+        subdirs.sort()
+        dir_index = DirectoryIndex(directory, ignore_case)
+        for name in sorted(dir_index.names()):
+            if name.endswith(".trmdl"):
+                filepaths.append(os.path.join(directory, name))
+                dir_indexes.append(dir_index)
+    return filepaths, dir_indexes
+
+
+class BatchManifest:
+    """Records how each model of a batch import went, so a rerun resumes.
+
+    Kept as JSON in the batch's root folder and rewritten after every model,
+    so it survives Blender going down halfway. Models that were imported
+    before are skipped as long as neither the TRMDL nor the size and time
+    of any file it was read from, textures included, changed. Failed ones
+    are tried again.
+    """
+
+    filename = "trmdl_batch_manifest.json"
+
+    def __init__(self, root, options):
+        self.root = root
+        self.path = os.path.join(root, self.filename)
+        self.options = repr(sorted(options.items()))
+        self.files = {}
+        self.digests = {}
+        try:
+            with open(self.path) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            manifest = None
+        if manifest is not None:
+            if manifest.get("options") == self.options:
+                self.files = manifest["files"]
+            else:
+                print("Import options changed, starting the batch over")
+
+    def key(self, filepath):
+        return os.path.relpath(filepath, self.root).replace(os.sep, "/")
+
+    def pending(self, filepaths, dir_indexes):
+        """Leaves out the models that don't need importing again."""
+        todo = []
+        todo_indexes = []
+        for filepath, dir_index in zip(filepaths, dir_indexes):
+            key = self.key(filepath)
+            digest = file_digest(filepath)
+            self.digests[key] = digest
+            entry = self.files.get(key)
+            if (
+                entry is not None
+                and entry["status"] in ("done", "skipped")
+                and entry["digest"] == digest
+                and self.unchanged(entry)
+            ):
+                entry["status"] = "skipped"
+                continue
+            todo.append(filepath)
+            todo_indexes.append(dir_index)
+        print(f"Batch: {len(todo)} of {len(filepaths)} models to import")
+        self.save()
+        return todo, todo_indexes
+
+    def unchanged(self, entry):
+        """Whether the files an entry's model was read from are as recorded."""
+        # Entries from before dependencies were recorded get imported again.
+        if entry.get("dependencies") is None:
+            return False
+        return all(
+            file_stamp(os.path.join(self.root, name)) == stamp
+            for name, stamp in entry["dependencies"].items()
+        )
+
+    def record(self, filepath, status, seconds, error=None, parse_time=None, files=()):
+        key = self.key(filepath)
+        self.files[key] = {
+            "status": status,
+            "digest": self.digests.get(key) or file_digest(filepath),
+            "dependencies": {self.key(path): file_stamp(path) for path in files},
+            "seconds": round(seconds, 3),
+            "parse_seconds": None if parse_time is None else round(parse_time, 3),
+            "error": error,
+        }
+        self.save()
+
+    def save(self):
+        temp = f"{self.path}.tmp"
+        try:
+            with open(temp, "w") as file:
+                json.dump(
+                    {"options": self.options, "files": self.files}, file, indent=1
+                )
+            os.replace(temp, self.path)
+        except OSError as e:
+            print(f"Couldn't write batch manifest {self.path}: {e}")
 
-                                for y in range(vert_buffer_sub_count):
-                                    vert_buffer_sub_offset = ftell(trmbf) + readlong(
-                                        trmbf
-                                    )
-                                    vert_buffer_sub_ret = ftell(trmbf)
-                                    fseek(trmbf, vert_buffer_sub_offset)
-                                    if y == 0:
-                                        print(
-                                            f"Vertex buffer {x} header: {hex(ftell(trmbf))}"
-                                        )
-                                    else:
-                                        print(
-                                            f"Vertex buffer {x} morph {y} header: {hex(ftell(trmbf))}"
-                                        )
-                                    vert_buffer_sub_struct = ftell(trmbf) - readlong(
-                                        trmbf
-                                    )
-                                    fseek(trmbf, vert_buffer_sub_struct)
-                                    vert_buffer_sub_struct_len = readshort(trmbf)
 
-                                    if vert_buffer_sub_struct_len != 0x0006:
-                                        raise AssertionError(
-                                            "Unexpected vertex buffer struct length!"
-                                        )
-                                    vert_buffer_sub_struct_section_length = readshort(
-                                        trmbf
-                                    )
-                                    vert_buffer_sub_struct_ptr = readshort(trmbf)
+def build_in_blender(model, dir_index=None, image_cache=None, material_cache=None):
+    """Creates the collection, armature, materials and objects of a ModelData."""
+    if dir_index is None:
+        dir_index = DirectoryIndex(os.path.dirname(model.filepath))
+    if model.options["game"] == "pla":
+        build_trmdl(model, dir_index, image_cache, material_cache)
+    else:
+        build_trmdlsv(model, dir_index, image_cache, material_cache)
 
-                                    if vert_buffer_sub_struct_ptr != 0:
-                                        fseek(
-                                            trmbf,
-                                            vert_buffer_sub_offset
-                                            + vert_buffer_sub_struct_ptr,
-                                        )
-                                        vert_buffer_start = ftell(trmbf) + readlong(
-                                            trmbf
-                                        )
-                                        fseek(trmbf, vert_buffer_start)
-                                        vert_buffer_byte_count = readlong(trmbf)
-                                        if y == 0:
-                                            print(
-                                                f"Vertex buffer {x} start: {hex(ftell(trmbf))}"
-                                            )
 
-                                            for v in range(
-                                                vert_buffer_byte_count
-                                                // poly_group_array[x][
-                                                    "vert_buffer_stride"
-                                                ]
-                                            ):
-                                                if (
-                                                    poly_group_array[x]["positions_fmt"]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    vx = readhalffloat(trmbf)
-                                                    vy = readhalffloat(trmbf)
-                                                    vz = readhalffloat(trmbf)
-                                                    vq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["positions_fmt"]
-                                                    == "3Floats"
-                                                ):
-                                                    vx = readfloat(trmbf)
-                                                    vy = readfloat(trmbf)
-                                                    vz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown positions type!"
-                                                    )
+class ClearParseCache(Operator):
+    """Drop the parsed model files kept between imports"""
 
-                                                if (
-                                                    poly_group_array[x]["normals_fmt"]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    nx = readhalffloat(trmbf)
-                                                    ny = readhalffloat(trmbf)
-                                                    nz = readhalffloat(trmbf)
-                                                    nq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["normals_fmt"]
-                                                    == "3Floats"
-                                                ):
-                                                    nx = readfloat(trmbf)
-                                                    ny = readfloat(trmbf)
-                                                    nz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown normals type!"
-                                                    )
+    bl_idname = "custom_import_scene.clearparsecache"
+    bl_label = "Clear Parse Cache"
 
-                                                if (
-                                                    poly_group_array[x]["tangents_fmt"]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x]["tangents_fmt"]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    tanx = readhalffloat(trmbf)
-                                                    tany = readhalffloat(trmbf)
-                                                    tanz = readhalffloat(trmbf)
-                                                    tanq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["tangents_fmt"]
-                                                    == "3Floats"
-                                                ):
-                                                    tanx = readfloat(trmbf)
-                                                    tany = readfloat(trmbf)
-                                                    tanz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown tangents type!"
-                                                    )
+    def execute(self, context):
+        self.report({"INFO"}, f"Cleared {parse_cache.summary()}")
+        parse_cache.clear()
+        return {"FINISHED"}
 
-                                                if (
-                                                    poly_group_array[x][
-                                                        "bitangents_fmt"
-                                                    ]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x][
-                                                        "bitangents_fmt"
-                                                    ]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    bitanx = readhalffloat(trmbf)
-                                                    bitany = readhalffloat(trmbf)
-                                                    bitanz = readhalffloat(trmbf)
-                                                    bitanq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x][
-                                                        "bitangents_fmt"
-                                                    ]
-                                                    == "3Floats"
-                                                ):
-                                                    bitanx = readfloat(trmbf)
-                                                    bitany = readfloat(trmbf)
-                                                    bitanz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown bitangents type!"
-                                                    )
 
-                                                if (
-                                                    poly_group_array[x][
-                                                        "tritangents_fmt"
-                                                    ]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x][
-                                                        "tritangents_fmt"
-                                                    ]
-                                                    == "4HalfFloats"
-                                                ):
-                                                    tritanx = readhalffloat(trmbf)
-                                                    tritany = readhalffloat(trmbf)
-                                                    tritanz = readhalffloat(trmbf)
-                                                    tritanq = readhalffloat(trmbf)
-                                                elif (
-                                                    poly_group_array[x][
-                                                        "tritangents_fmt"
-                                                    ]
-                                                    == "3Floats"
-                                                ):
-                                                    tritanx = readfloat(trmbf)
-                                                    tritany = readfloat(trmbf)
-                                                    tritanz = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown bitangents type!"
-                                                    )
+class ClearDiskCache(Operator):
+    """Delete the decoded model files kept on disk"""
 
-                                                if (
-                                                    poly_group_array[x]["uvs_fmt"]
-                                                    == "None"
-                                                ):
-                                                    tu = 0
-                                                    tv = 0
-                                                elif (
-                                                    poly_group_array[x]["uvs_fmt"]
-                                                    == "2Floats"
-                                                ):
-                                                    tu = readfloat(trmbf)
-                                                    tv = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown uvs type!"
-                                                    )
+    bl_idname = "custom_import_scene.cleardiskcache"
+    bl_label = "Clear Disk Cache"
 
-                                                if (
-                                                    poly_group_array[x]["uvs2_fmt"]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x]["uvs2_fmt"]
-                                                    == "2Floats"
-                                                ):
-                                                    tu2 = readfloat(trmbf)
-                                                    tv2 = readfloat(trmbf)
-                                                    uv2_array.append((tu2, tv2))
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown uvs2 type!"
-                                                    )
+    def execute(self, context):
+        disk_cache.clear()
+        self.report({"INFO"}, f"Cleared {disk_cache.root()}")
+        return {"FINISHED"}
 
-                                                if (
-                                                    poly_group_array[x]["uvs3_fmt"]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x]["uvs3_fmt"]
-                                                    == "2Floats"
-                                                ):
-                                                    tu3 = readfloat(trmbf)
-                                                    tv3 = readfloat(trmbf)
-                                                    uv3_array.append((tu3, tv3))
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown uvs3 type!"
-                                                    )
 
-                                                if (
-                                                    poly_group_array[x]["uvs4_fmt"]
-                                                    == "None"
-                                                ):
-                                                    pass
-                                                elif (
-                                                    poly_group_array[x]["uvs4_fmt"]
-                                                    == "2Floats"
-                                                ):
-                                                    tu4 = readfloat(trmbf)
-                                                    tv4 = readfloat(trmbf)
-                                                    uv4_array.append((tu4, tv4))
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown uvs4 type!"
-                                                    )
+#### Utils ####
+class BinaryView:
+    """Reads a whole TR* file once and decodes fields straight from memory.
+
+    The *_at accessors take absolute offsets; the read* helpers below use the
+    cursor (seek/tell) so the ported maxscript logic can stay as it is.
+    """
+
+    u16 = struct.Struct("<H")
+    i32 = struct.Struct("<i")
+    f16 = struct.Struct("<e")
+    f32 = struct.Struct("<f")
+
+    def __init__(self, filepath, pending=None):
+        self.name = filepath
+        if pending is None:
+            with open(filepath, "rb") as file:
+                self.buffer = memoryview(file.read())
+        else:
+            # A future for the file's bytes, only waited on once it's read from.
+            self.pending = pending
+        self.offset = 0
+        self.vtables = {}
+
+    def __getattr__(self, name):
+        # Only reached while buffer isn't set, i.e. for a pending read.
+        if name != "buffer" or "pending" not in self.__dict__:
+            raise AttributeError(name)
+        self.buffer = memoryview(self.pending.result())
+        return self.buffer
+
+    def u8_at(self, offset):
+        return self.buffer[offset]
+
+    def u16_at(self, offset):
+        return self.u16.unpack_from(self.buffer, offset)[0]
+
+    def i32_at(self, offset):
+        return self.i32.unpack_from(self.buffer, offset)[0]
+
+    def f16_at(self, offset):
+        return self.f16.unpack_from(self.buffer, offset)[0]
+
+    def f32_at(self, offset):
+        return self.f32.unpack_from(self.buffer, offset)[0]
+
+    def str_at(self, offset, length):
+        return str(self.buffer[offset : offset + length], "utf-8")
+
+    def vtable_at(self, offset):
+        # FlatBuffers dedupes identical vtables, so most tables of a kind
+        # share one and it only gets decoded the first time.
+        vtable = self.vtables.get(offset)
+        if vtable is None:
+            vtable = struct.unpack_from(
+                f"<{self.u16_at(offset) // 2}H", self.buffer, offset
+            )
+            self.vtables[offset] = vtable
+        return vtable
+
+    def seek(self, offset):
+        self.offset = offset
+
+    def tell(self):
+        return self.offset
+
+    def close(self):
+        if "buffer" in self.__dict__:
+            self.buffer.release()
+        elif "pending" in self.__dict__:
+            self.pending.cancel()
+
+
+class FlatTable:
+    """A FlatBuffers table, with its fields looked up by name in a schema.
+
+    field() returns the field's offset relative to the table, like the
+    *_ptr_* shorts the parser used to read by hand. Fields past the end of
+    a shorter vtable come back as 0, same as fields the writer left out.
+    """
+
+    def __init__(self, file, offset, schema):
+        self.file = file
+        self.offset = offset
+        self.schema = schema
+        self.vtable = file.vtable_at(offset - file.i32_at(offset))
+        self.vtable_len = self.vtable[0]
+
+    def field(self, name):
+        slot = self.schema[name]
+        if slot < len(self.vtable):
+            return self.vtable[slot]
+        return 0
+
+
+def flatschema(*fields):
+    # Slots follow the vtable's own length and table length shorts.
+    return {field: slot for slot, field in enumerate(fields, 2)}
+
+
+# Field order of the TR* tables, as they come in the vtables. Names follow the
+# parser's *_struct_ptr_* variables.
+TRMDL_SCHEMA = flatschema(
+    "start",
+    "trmsh",
+    "trskl",
+    "trmtr",
+    "custom",
+    "bound_box",
+    "float",
+    "trltt",
+    "unka",
+    "unkb",
+)
+TRMDL_NAME_SCHEMA = flatschema("name")
+TRSKL_SCHEMA = flatschema("start", "bone", "b", "c", "bone_adjust")
+TRSKL_BONE_SCHEMA = flatschema(
+    "string", "bone", "c", "d", "parent", "rig_id", "bone_merge", "h"
+)
+TRSKL_TRANSFORM_SCHEMA = flatschema("scl", "rot", "trs")
+TRMTR_SCHEMA = flatschema("start", "material")
+TRMTR_MATERIAL_SCHEMA = flatschema(*(f"param_{x}" for x in "abcdefghijklmnop"))
+TRMTR_SHADER_SCHEMA = flatschema("string", "params")
+TRMTR_PARAM_SCHEMA = flatschema("string", "value")
+TRMTR_TEXTURE_SCHEMA = flatschema("string", "value", "id")
+TRMTR_SAMPLER_SCHEMA = flatschema(*"abcdefghijklm")
+TRMTR_VECTOR_SCHEMA = flatschema("string", "values")
+TRMSH_SCHEMA = flatschema("start", "poly_group", "trmbf")
+TRMSH_POLY_GROUP_SCHEMA = flatschema(
+    "poly_group_name",
+    "bbbox",
+    "unc_a",
+    "vert_buff",
+    "mat_list",
+    "unk_b",
+    "unk_c",
+    "unk_d",
+    "unk_e",
+    "unk_float",
+    "unk_g",
+    "morphname",
+    "vis_group_name",
+    "unk_i",
+    "group_name",
+)
+TRMSH_MATERIAL_SCHEMA = flatschema(
+    "facepoint_count", "facepoint_start", "unk_c", "string", "unk_d"
+)
+TRMSH_MORPH_NAME_SCHEMA = flatschema("ID", "name")
+TRMSH_VERT_BUFF_SCHEMA = flatschema("param", "b")
+TRMSH_VERT_BUFF_PARAM_SCHEMA = flatschema("unk_a", "type", "layer", "fmt", "position")
+TRMBF_SCHEMA = flatschema("start", "buffer")
+TRMBF_BUFFER_SCHEMA = flatschema("faces", "verts", "groups")
+TRMBF_BYTES_SCHEMA = flatschema("bytes")
+
+
+# TRMSH vertex attribute types and formats, as numpy field names and
+# (base type, count).
+VERT_TYPES = {
+    0x01: "position",
+    0x02: "normal",
+    0x03: "tangent",
+    0x05: "color",
+    0x06: "uv",
+    0x07: "bones",
+    0x08: "weights",
+    0x09: "svunk",
+}
+VERT_FORMATS = {
+    0x14: ("u1", 4),  # 4 bytes as float
+    0x16: ("u1", 4),  # 4 bytes
+    0x24: ("<u4", 1),  # ??????
+    0x27: ("<u2", 4),  # 4 shorts as float
+    0x2B: ("<f2", 4),  # 4 half-floats
+    0x30: ("<f4", 2),  # 2 floats
+    0x33: ("<f4", 3),  # 3 floats
+    0x36: ("<f4", 4),  # 4 floats
+}
 
-                                                if (
-                                                    poly_group_array[x]["colors_fmt"]
-                                                    == "None"
-                                                ):
-                                                    colorr = 255
-                                                    colorg = 255
-                                                    colorb = 255
-                                                    colora = 1
-                                                elif (
-                                                    poly_group_array[x]["colors_fmt"]
-                                                    == "4BytesAsFloat"
-                                                ):
-                                                    colorr = readbyte(trmbf)
-                                                    colorg = readbyte(trmbf)
-                                                    colorb = readbyte(trmbf)
-                                                    colora = (
-                                                        float(readbyte(trmbf)) / 255
-                                                    )
-                                                elif (
-                                                    poly_group_array[x]["colors_fmt"]
-                                                    == "4Floats"
-                                                ):
-                                                    colorr = readfloat(trmbf) * 255
-                                                    colorg = readfloat(trmbf) * 255
-                                                    colorb = readfloat(trmbf) * 255
-                                                    colora = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown colors type!"
-                                                    )
 
-                                                if (
-                                                    poly_group_array[x]["colors2_fmt"]
-                                                    == "None"
-                                                ):
-                                                    colorr2 = 255
-                                                    colorg2 = 255
-                                                    colorb2 = 255
-                                                    colora2 = 1
-                                                elif (
-                                                    poly_group_array[x]["colors2_fmt"]
-                                                    == "4BytesAsFloat"
-                                                ):
-                                                    colorr2 = readbyte(trmbf)
-                                                    colorg2 = readbyte(trmbf)
-                                                    colorb2 = readbyte(trmbf)
-                                                    colora2 = readbyte(trmbf)
-                                                elif (
-                                                    poly_group_array[x]["colors2_fmt"]
-                                                    == "4Floats"
-                                                ):
-                                                    colorr2 = readfloat(trmbf) * 255
-                                                    colorg2 = readfloat(trmbf) * 255
-                                                    colorb2 = readfloat(trmbf) * 255
-                                                    colora2 = readfloat(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown colors 2 type!"
-                                                    )
+def vert_buffer_dtype(vert_attributes, vert_buffer_stride):
+    # One field per (type, layer), e.g. "uv1" for the second UV layer.
+    names = []
+    formats = []
+    offsets = []
+    for vert_type, layer, fmt, position in vert_attributes:
+        names.append(f"{VERT_TYPES[vert_type]}{layer}")
+        if vert_type == 0x08 and fmt not in VERT_FORMATS:
+            # Weights in a format we don't know are read as 4 shorts.
+            fmt = 0x27
+        formats.append(VERT_FORMATS[fmt])
+        offsets.append(position)
+    return np.dtype(
+        {
+            "names": names,
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": vert_buffer_stride,
+        }
+    )
 
-                                                if (
-                                                    poly_group_array[x]["bones_fmt"]
-                                                    == "None"
-                                                ):
-                                                    bone1 = 0
-                                                    bone2 = 0
-                                                    bone3 = 0
-                                                    bone4 = 0
-                                                elif (
-                                                    poly_group_array[x]["bones_fmt"]
-                                                    == "4Bytes"
-                                                ):
-                                                    bone1 = readbyte(trmbf)
-                                                    bone2 = readbyte(trmbf)
-                                                    bone3 = readbyte(trmbf)
-                                                    bone4 = readbyte(trmbf)
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown bones type!"
-                                                    )
 
-                                                if (
-                                                    poly_group_array[x]["weights_fmt"]
-                                                    == "None"
-                                                ):
-                                                    weight1 = 0
-                                                    weight2 = 0
-                                                    weight3 = 0
-                                                    weight4 = 0
-                                                elif (
-                                                    poly_group_array[x]["weights_fmt"]
-                                                    == "4ShortsAsFloat"
-                                                ):
-                                                    weight1 = readshort(trmbf) / 65535
-                                                    weight2 = readshort(trmbf) / 65535
-                                                    weight3 = readshort(trmbf) / 65535
-                                                    weight4 = readshort(trmbf) / 65535
-                                                else:
-                                                    raise AssertionError(
-                                                        "Unknown weights type!"
-                                                    )
+def unorm_weights(weights):
+    """Blend weights as floats, integer formats scaled down from their max."""
+    if weights.dtype.kind in "ui":
+        return weights / np.iinfo(weights.dtype).max
+    return weights.astype(np.float32)
 
-                                                vert_array.append((vx, vy, vz))
-                                                normal_array.append((nx, ny, nz))
-                                                color_array.append(
-                                                    (colorr, colorg, colorb)
-                                                )
-                                                alpha_array.append(colora)
-                                                uv_array.append((tu, tv))
-                                                if trskl is not None:
-                                                    w1_array.append(
-                                                        {
-                                                            "weight1": weight1,
-                                                            "weight2": weight2,
-                                                            "weight3": weight3,
-                                                            "weight4": weight4,
-                                                        }
-                                                    )
-                                                    b1_array.append(
-                                                        {
-                                                            "bone1": bone1,
-                                                            "bone2": bone2,
-                                                            "bone3": bone3,
-                                                            "bone4": bone4,
-                                                        }
-                                                    )
 
-                                            print(
-                                                f"Vertex buffer {x} end: {hex(ftell(trmbf))}"
-                                            )
-                                        else:
-                                            print(
-                                                f"Vertex buffer {x} morph {y} start: {hex(ftell(trmbf))}"
-                                            )
-                                            # MorphVert_array = #()
-                                            # MorphNormal_array = #()
-                                            for v in range(
-                                                int(vert_buffer_byte_count / 0x1C)
-                                            ):
-                                                # Morphs always seem to use this setup.
-                                                vx = readlong(trmbf)
-                                                vy = readlong(trmbf)
-                                                vz = readlong(trmbf)
-                                                nx = readhalffloat(trmbf)
-                                                ny = readhalffloat(trmbf)
-                                                nz = readhalffloat(trmbf)
-                                                nq = readhalffloat(trmbf)
-                                                tanx = readhalffloat(trmbf)
-                                                tany = readhalffloat(trmbf)
-                                                tanz = readhalffloat(trmbf)
-                                                tanq = readhalffloat(trmbf)
-                                                # append MorphVert_array [vx,vy,vz]
-                                                # append MorphNormal_array [nx,ny,nz]
-                                            print(
-                                                f"Vertex buffer {x} morph {y} end: {hex(ftell(trmbf))}"
-                                            )
-                                            # TODO: Continue implementing after line 3814
-                                    fseek(trmbf, vert_buffer_sub_ret)
+def read_vert_buffer(file, vert_attributes, vert_buffer_stride, byte_count):
+    """Decodes the whole interleaved vertex buffer at the cursor at once."""
+    vertices = np.frombuffer(
+        file.buffer,
+        vert_buffer_dtype(vert_attributes, vert_buffer_stride),
+        byte_count // vert_buffer_stride,
+        file.tell(),
+    )
+    file.seek(file.tell() + vertices.nbytes)
+    return vertices
 
-                            if vert_buffer_struct_ptr_faces != 0:
-                                fseek(
-                                    trmbf,
-                                    vert_buffer_offset + vert_buffer_struct_ptr_faces,
-                                )
-                                face_buffer_start = ftell(trmbf) + readlong(trmbf)
-                                fseek(trmbf, face_buffer_start)
-                                face_buffer_count = readlong(trmbf)
 
-                                for y in range(face_buffer_count):
-                                    face_buff_offset = ftell(trmbf) + readlong(trmbf)
-                                    face_buff_ret = ftell(trmbf)
-                                    fseek(trmbf, face_buff_offset)
-                                    print(f"Facepoint {x} header: {hex(ftell(trmbf))}")
-                                    face_buff_struct = ftell(trmbf) - readlong(trmbf)
-                                    fseek(trmbf, face_buff_struct)
-                                    face_buff_struct_len = readshort(trmbf)
+# TRMSH PolygonType, the index size of the face buffer.
+POLYGON_TYPES = {
+    0: "u1",  # UINT8
+    1: "<u2",  # UINT16
+    2: "<u4",  # UINT32
+    3: "<u8",  # UINT64
+}
 
-                                    if face_buff_struct_len != 0x0006:
-                                        raise AssertionError(
-                                            "Unexpected face buffer struct length!"
-                                        )
-                                    face_buffer_struct_section_length = readshort(trmbf)
-                                    face_buffer_struct_ptr = readshort(trmbf)
 
-                                    if face_buffer_struct_ptr != 0:
-                                        fseek(
-                                            trmbf,
-                                            face_buff_offset + face_buffer_struct_ptr,
-                                        )
-                                        facepoint_start = ftell(trmbf) + readlong(trmbf)
-                                        fseek(trmbf, facepoint_start)
-                                        facepoint_byte_count = readlong(trmbf)
-                                        print(
-                                            f"Facepoint {x} start: {hex(ftell(trmbf))}"
-                                        )
+def read_face_buffer(file, polygon_type, byte_count, vert_count):
+    """Decodes the triangle list at the cursor as an (n, 3) index array."""
+    if polygon_type is None:
+        # Meshes that don't declare it; the old guess from the vertex count.
+        polygon_type = 2 if vert_count > 65536 else 1
+    if polygon_type not in POLYGON_TYPES:
+        raise AssertionError(f"Unexpected polygon type {polygon_type}!")
+    index_type = np.dtype(POLYGON_TYPES[polygon_type])
+    faces = np.frombuffer(
+        file.buffer,
+        index_type,
+        byte_count // (index_type.itemsize * 3) * 3,
+        file.tell(),
+    ).reshape(-1, 3)
+    file.seek(file.tell() + faces.nbytes)
+    return faces
+
+
+class FileLoader:
+    """Reads the files of one model on a few threads.
+
+    open() hands back a BinaryView straight away and its bytes get read in
+    the background, so the TRMDL can be parsed while the files it names are
+    still loading. A file opened twice, like a TRMBF shared by LODs, is read
+    once.
+    """
+
+    def __init__(self, dir_index, max_workers=4):
+        self.dir_index = dir_index
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.lock = threading.Lock()
+        self.reads = {}
+
+    def read(self, filepath):
+        with open(filepath, "rb") as file:
+            return file.read()
+
+    def fetch(self, name):
+        filepath = self.dir_index.path(name)
+        with self.lock:
+            future = self.reads.get(filepath)
+            if future is None:
+                future = self.executor.submit(self.read, filepath)
+                self.reads[filepath] = future
+        return filepath, future
+
+    def open(self, name):
+        return BinaryView(*self.fetch(name))
+
+    def fetch_mesh(self, name):
+        """Starts reading a TRMSH, then the TRMBF it points to."""
+        if not self.dir_index.exists(name):
+            return
+        filepath, future = self.fetch(name)
+        if not parse_cache.has(filepath):
+            future.add_done_callback(self.fetch_buffer)
+
+    def fetch_buffer(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        trmbf_name = trmsh_buffer_name(BinaryView(None, future))
+        if trmbf_name is not None and self.dir_index.exists(trmbf_name):
+            try:
+                self.fetch(trmbf_name)
+            except RuntimeError:
+                # Closed before the TRMSH came in.
+                pass
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def trmsh_buffer_name(trmsh):
+    """Returns the name of the TRMBF a TRMSH's buffers are in, if it has one."""
+    start = trmsh.i32_at(0)
+    field = FlatTable(trmsh, start, TRMSH_SCHEMA).field("trmbf")
+    if field == 0:
+        return None
+    name_start = start + field + trmsh.i32_at(start + field)
+    return trmsh.str_at(name_start + 4, trmsh.i32_at(name_start))
+
+
+class DirectoryIndex:
+    """Lists a model folder once so finding its files is a dict lookup.
+
+    With ignore_case, names match regardless of case and resolve to the
+    spelling on disk.
+    """
+
+    def __init__(self, directory, ignore_case=False):
+        self.directory = directory
+        self.ignore_case = ignore_case
+        self.files = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    self.files[self.key(entry.name)] = entry.name
+
+    def key(self, name):
+        return name.lower() if self.ignore_case else name
+
+    def names(self):
+        return list(self.files.values())
+
+    def exists(self, name):
+        return self.key(name) in self.files
+
+    def path(self, name):
+        """Full path of the file, or where it would be if it's missing."""
+        return os.path.join(self.directory, self.files.get(self.key(name), name))
+
+
+class ImageCache:
+    """Loads each texture once per import and hands out the same image after.
+
+    One is shared by every model of a "Load All Folder" import, so textures
+    the models have in common (eyes, skin) are only loaded the first time.
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, filepath):
+        key = os.path.normcase(os.path.abspath(filepath))
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+        self.misses += 1
+        image = bpy.data.images.load(filepath, check_existing=True)
+        self.images[key] = image
+        return image
+
+    def report(self):
+        print(f"Image cache: {self.hits} hits, {self.misses} misses")
+
+
+class MaterialCache:
+    """Hands out the material already built for an identical TRMTR entry.
+
+    Materials are fingerprinted on their parsed parameters and the texture
+    files those resolve to, so forms and LODs sharing a material set only
+    have it built once per import.
+    """
+
+    def __init__(self):
+        self.materials = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, mat, dir_index, textureextension, *extra):
+        textures = [
+            dir_index.path(value[:-5] + textureextension)
+            for key, value in sorted(mat.items())
+            if isinstance(value, str) and value.endswith(".bntx")
+        ]
+        data = repr((sorted(mat.items()), textures, extra))
+        return hashlib.sha1(data.encode()).hexdigest()
+
+    def get(self, fingerprint):
+        material = self.materials.get(fingerprint)
+        if material is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return material
+
+    def add(self, fingerprint, material):
+        self.materials[fingerprint] = material
+
+    def report(self):
+        print(f"Material cache: {self.hits} hits, {self.misses} misses")
+
+
+class ParseCache:
+    """Keeps the parsed, bpy-free contents of TR* files between imports.
+
+    Entries are checked against the size and modification time of the files
+    they were read from, so edited files get parsed again. Once the entries
+    add up to more than max_bytes the least recently used ones are dropped.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.entries = OrderedDict()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stamp(self, filepath):
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def key(self, filepath, context):
+        return (os.path.normcase(os.path.abspath(filepath)), context)
+
+    def sizeof(self, value):
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(map(self.sizeof, value.values()))
+        if isinstance(value, (list, tuple)):
+            return sys.getsizeof(value) + sum(map(self.sizeof, value))
+        return sys.getsizeof(value)
+
+    def detach(self, value):
+        # Arrays read with np.frombuffer would keep the whole file's buffer alive.
+        if isinstance(value, np.ndarray):
+            return value if value.base is None else value.copy()
+        if isinstance(value, dict):
+            return {name: self.detach(item) for name, item in value.items()}
+        if isinstance(value, list):
+            return [self.detach(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self.detach(item) for item in value)
+        return value
+
+    def has(self, filepath):
+        """Whether anything read from the file is kept, for any context."""
+        path = self.key(filepath, None)[0]
+        return any(key[0] == path for key in self.entries)
+
+    def get(self, filepath, context):
+        """Returns what was put for the file in this context, if still valid."""
+        key = self.key(filepath, context)
+        entry = self.entries.get(key)
+        if entry is not None:
+            if all(self.stamp(path) == stamp for path, stamp in entry["files"]):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry["value"]
+            self.drop(key)
+        self.misses += 1
+        return None
+
+    def put(self, filepath, context, value, dependencies=()):
+        """Stores a parse result, also tied to the other files it read from."""
+        key = self.key(filepath, context)
+        if key in self.entries:
+            self.drop(key)
+        value = self.detach(value)
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        files = [(path, self.stamp(path)) for path in (filepath, *dependencies)]
+        self.entries[key] = {"value": value, "files": files, "size": size}
+        self.size += size
+        self.trim()
+
+    def drop(self, key):
+        self.size -= self.entries.pop(key)["size"]
+
+    def trim(self):
+        while self.size > self.max_bytes:
+            self.drop(next(iter(self.entries)))
+
+    def resize(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.trim()
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def summary(self):
+        return (
+            f"Parse cache: {len(self.entries)} files, "
+            f"{self.size / 2**20:.1f} of {self.max_bytes / 2**20:.0f} MB, "
+            f"{self.hits} hits, {self.misses} misses"
+        )
+
+    def report(self):
+        print(self.summary())
+
+
+# Shared by every import until the add-on is reloaded.
+parse_cache = ParseCache()
+
+
+def file_stamp(filepath):
+    """Returns a file's size and modification time, None if it's gone."""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def file_digest(filepath):
+    """Returns the sha1 of a file's contents."""
+    sha = hashlib.sha1()
+    with open(filepath, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# Poly group fields that get stored as .npy files by DiskCache.
+MESH_ARRAY_FIELDS = (
+    "vert_array",
+    "normal_array",
+    "color_array",
+    "alpha_array",
+    "face_array",
+    "face_mat_id_array",
+    "bone_indices",
+    "bone_weights",
+)
 
-                                        if (
-                                            len(vert_array) > 65536
-                                        ):  # is this a typo? I would imagine it to be 65535
-                                            for v in range(facepoint_byte_count // 12):
-                                                fa = readlong(trmbf)
-                                                fb = readlong(trmbf)
-                                                fc = readlong(trmbf)
-                                                face_array.append([fa, fb, fc])
-                                        else:
-                                            for v in range(facepoint_byte_count // 6):
-                                                fa = readshort(trmbf)
-                                                fb = readshort(trmbf)
-                                                fc = readshort(trmbf)
-                                                face_array.append([fa, fb, fc])
-                                        print(f"Facepoint {x} end: {hex(ftell(trmbf))}")
-                                    fseek(trmbf, face_buff_ret)
-                            fseek(trmbf, vert_buffer_ret)
 
-                            print("Making object...")
+class DiskCache:
+    """Keeps decoded meshes and material tables on disk for later sessions.
+
+    Entries are named after the source file's path and the import mode, and
+    record the size and modification time of the files they were read from.
+    A file whose size and time still match is taken as is, one that was only
+    touched is hashed and compared with its contents when the entry was made.
+    Mesh arrays are uncompressed .npy files that get memory-mapped back in.
+    Writes that take the entries over max_bytes remove the ones used least
+    recently, imports that only read never list the folder.
+    """
+
+    def __init__(self, directory=None, max_bytes=1024 * 1024 * 1024):
+        self.directory = directory
+        # Off until it's pointed somewhere, finding the default folder needs bpy.
+        self.enabled = directory is not None
+        self.max_bytes = max_bytes
+        # Bytes the entries take up, None until the folder was first listed.
+        self.size = None
+        self.hits = 0
+        self.misses = 0
+
+    def use(self, settings):
+        """Points the cache at settings["directory"], None turns it off."""
+        if settings is None:
+            self.enabled = False
+            return
+        if settings["directory"] != self.directory:
+            self.directory = settings["directory"]
+            self.size = None
+        self.max_bytes = settings["max_bytes"]
+        self.enabled = True
+
+    def root(self):
+        if self.directory is None:
+            self.directory = bpy.utils.user_resource(
+                "DATAFILES", path="trmdl_cache", create=True
+            )
+        return self.directory
+
+    def entry(self, filepath, context):
+        """Returns the entry for a file in this context, None when off."""
+        if not self.enabled:
+            return None
+        path = os.path.normcase(os.path.abspath(filepath))
+        name = hashlib.sha1(repr((path, context)).encode()).hexdigest()
+        return {"directory": os.path.join(self.root(), name), "filepath": filepath}
+
+    def file_record(self, filepath):
+        return {"stamp": file_stamp(filepath), "digest": file_digest(filepath)}
+
+    def read_index(self, entry):
+        if entry is not None:
+            try:
+                with open(os.path.join(entry["directory"], "index.json")) as file:
+                    return json.load(file)
+            except (OSError, ValueError):
+                pass
+        return None
+
+    def check(self, entry, index, files):
+        """Whether the (record, filepath) files still have the recorded contents.
+
+        A file is only hashed when its size matches but its time doesn't, and
+        then its new time is saved so the next check doesn't hash it again.
+        """
+        restamped = False
+        for record, filepath in files:
+            stamp = file_stamp(filepath)
+            if stamp == record["stamp"]:
+                continue
+            if (
+                stamp is None
+                or stamp[0] != record["stamp"][0]
+                or file_digest(filepath) != record["digest"]
+            ):
+                return False
+            record["stamp"] = stamp
+            restamped = True
+
+        path = os.path.join(entry["directory"], "index.json")
+        temp = f"{path}.{os.getpid()}.tmp"
+        try:
+            if restamped:
+                with open(temp, "w") as file:
+                    json.dump(index, file)
+                os.replace(temp, path)
+            else:
+                # Eviction goes by the index's times, noatime mounts don't set them.
+                os.utime(path)
+        except OSError as e:
+            print(f"Couldn't update cache entry {entry['directory']}: {e}")
+        return True
+
+    def write_entry(self, entry, index, arrays=()):
+        # Written next to the entry first so a crash never leaves half of one.
+        directory = entry["directory"]
+        temp = f"{directory}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(temp, exist_ok=True)
+            for name, array in arrays:
+                np.save(os.path.join(temp, name), array, allow_pickle=False)
+            with open(os.path.join(temp, "index.json"), "w") as file:
+                json.dump(index, file)
+            written = self.entry_size(temp)
+            # An entry for an older version of the file is in the way.
+            if os.path.isdir(directory):
+                written -= self.entry_size(directory)
+                shutil.rmtree(directory, ignore_errors=True)
+            os.replace(temp, directory)
+        except Exception as e:
+            print(f"Couldn't write cache entry {directory}: {e!r}")
+            shutil.rmtree(temp, ignore_errors=True)
+            return
+        # Only listed again once the entries might not fit anymore.
+        if self.size is not None:
+            self.size += written
+        if self.size is None or self.size > self.max_bytes:
+            self.trim()
+
+    def get_materials(self, entry):
+        index = self.read_index(entry)
+        if index is None or not self.check(
+            entry, index, [(index["source"], entry["filepath"])]
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return index["materials"]
+
+    def put_materials(self, entry, mat_data_array):
+        if entry is not None:
+            index = {
+                "source": self.file_record(entry["filepath"]),
+                "materials": mat_data_array,
+            }
+            self.write_entry(entry, index)
+
+    def get_meshes(self, entry, dir_index):
+        index = self.read_index(entry)
+        if index is None or not dir_index.exists(index["trmbf"]):
+            self.misses += 1
+            return None
+        files = [
+            (index["source"], entry["filepath"]),
+            (index["trmbf_file"], dir_index.path(index["trmbf"])),
+        ]
+        if not self.check(entry, index, files):
+            self.misses += 1
+            return None
+
+        def load(name):
+            return np.load(os.path.join(entry["directory"], name), mmap_mode="r")
+
+
+        poly_groups = []
+        for i, group in enumerate(index["poly_groups"]):
+            poly_group = dict(group)
+            for field in MESH_ARRAY_FIELDS:
+                poly_group[field] = load(f"{i}_{field}.npy")
+            poly_group["uv_arrays"] = tuple(
+                load(f"{i}_uv{j}.npy") for j in range(len(UV_LAYER_NAMES))
+            )
+            poly_group["morphs"] = [
+                (load(f"{i}_morph{j}_ids.npy"), load(f"{i}_morph{j}_deltas.npy"))
+                for j in range(len(group["morph_names"]))
+            ]
+            poly_groups.append(poly_group)
+        self.hits += 1
+        return {
+            "poly_groups": poly_groups,
+            "trmbf_path": dir_index.path(index["trmbf"]),
+        }
+
+    def put_meshes(self, entry, poly_groups, trmbf_path):
+        if entry is None:
+            return
+        groups = []
+        arrays = []
+        for i, poly_group in enumerate(poly_groups):
+            groups.append(
+                {
+                    "poly_group_name": poly_group["poly_group_name"],
+                    "colors_fmt": poly_group["colors_fmt"],
+                    "morph_names": poly_group["morph_names"],
+                }
+            )
+            for field in MESH_ARRAY_FIELDS:
+                arrays.append((f"{i}_{field}.npy", np.asarray(poly_group[field])))
+            for j, uvs in enumerate(poly_group["uv_arrays"]):
+                arrays.append((f"{i}_uv{j}.npy", np.asarray(uvs)))
+            for j, (morph_ids, morph_deltas) in enumerate(poly_group["morphs"]):
+                arrays.append((f"{i}_morph{j}_ids.npy", morph_ids))
+                arrays.append((f"{i}_morph{j}_deltas.npy", morph_deltas))
+        index = {
+            "source": self.file_record(entry["filepath"]),
+            "trmbf": os.path.basename(trmbf_path),
+            "trmbf_file": self.file_record(trmbf_path),
+            "poly_groups": groups,
+        }
+        self.write_entry(entry, index, arrays)
+
+    def entry_size(self, path):
+        with os.scandir(path) as files:
+            return sum(file.stat().st_size for file in files)
+
+    def trim(self):
+        """Removes the least recently used entries until they fit in max_bytes."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as items:
+                for item in items:
+                    if not item.is_dir():
+                        continue
+                    size = self.entry_size(item.path)
+                    try:
+                        used = os.stat(os.path.join(item.path, "index.json")).st_atime
+                    except OSError:
+                        # Left over from a write that never finished.
+                        used = 0
+                    entries.append((used, size, item.path))
+        except OSError as e:
+            print(f"Couldn't read the disk cache at {self.directory}: {e}")
+            return
+        total = sum(size for used, size, path in entries)
+        for used, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+        self.size = total
+
+    def clear(self):
+        shutil.rmtree(self.root(), ignore_errors=True)
+        self.size = None
+        self.hits = 0
+        self.misses = 0
+
+    def report(self):
+        print(f"Disk cache: {self.hits} hits, {self.misses} misses")
+
+
+# Also shared by every import, parse_model points it at the add-on's data folder.
+disk_cache = DiskCache()
+
+
+class ArmatureRegistry:
+    """Remembers the armatures built from base skeletons during the session.
+
+    The pieces of an outfit all bind to the armature the first one built
+    instead of parsing the skeleton and going through edit mode again.
+    Skeletons are told apart by path, size and modification time.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def key(self, filepath, context):
+        path = os.path.normcase(os.path.abspath(filepath))
+        stamp = file_stamp(filepath)
+        return (path, None if stamp is None else tuple(stamp), context)
+
+    def built(self):
+        """Returns the keys of the armatures still there, for parse_model."""
+        return {key for key, entry in self.entries.items() if self.lookup(entry)}
+
+    def lookup(self, entry):
+        # Only names are kept, a removed object's Python reference would raise.
+        obj = bpy.data.objects.get(entry["object_name"])
+        if obj is None or obj.type != "ARMATURE":
+            return None
+        if obj.data.name != entry["armature_name"]:
+            return None
+        return {
+            "object": obj,
+            "bone_id_map": dict(entry["bone_id_map"]),
+            "bone_rig_array": list(entry["bone_rig_array"]),
+        }
+
+    def get(self, filepath, context):
+        """Returns the armature built from this skeleton file, if it's still there."""
+        entry = self.entries.get(self.key(filepath, context))
+        if entry is None:
+            return None
+        return self.lookup(entry)
+
+    def find(self, filename):
+        """Returns the latest armature built from a skeleton with this name."""
+        for key in reversed(list(self.entries)):
+            if os.path.basename(key[0]) == os.path.normcase(filename):
+                armature = self.lookup(self.entries[key])
+                if armature is not None:
+                    return armature
+        return None
+
+    def add(self, filepath, context, obj, bone_id_map, bone_rig_array):
+        self.entries[self.key(filepath, context)] = {
+            "object_name": obj.name,
+            "armature_name": obj.data.name,
+            "bone_id_map": dict(bone_id_map),
+            "bone_rig_array": list(bone_rig_array),
+        }
+
+
+armature_registry = ArmatureRegistry()
+
+
+def new_group_socket(group, in_out, socket_type, name):
+    if bpy.app.version < (4, 0, 0):
+        sockets = group.inputs if in_out == "INPUT" else group.outputs
+        return sockets.new(socket_type, name)
+    return group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+
+
+def get_shader_group(name, build, *args):
+    """Returns the named node group, building it the first time it's needed.
+
+    Materials instance these instead of each getting a copy of the nodes.
+    """
+    group = bpy.data.node_groups.get(name)
+    if group is None:
+        group = bpy.data.node_groups.new(name, "ShaderNodeTree")
+        build(group, *args)
+    return group
+
+
+def build_layer_group(group, blend_type):
+    """LYM layer mask colours: 4 base colour layers and 4 emission layers."""
+    base_color = new_group_socket(group, "INPUT", "NodeSocketColor", "Base Color")
+    base_color.default_value = (1, 1, 1, 1)
+    new_group_socket(group, "INPUT", "NodeSocketColor", "Layer Mask")
+    new_group_socket(group, "INPUT", "NodeSocketFloat", "Layer Mask Alpha")
+    for i in range(1, 5):
+        new_group_socket(group, "INPUT", "NodeSocketColor", f"Color {i}")
+        factor = new_group_socket(
+            group, "INPUT", "NodeSocketFloat", f"Color {i} Factor"
+        )
+        factor.default_value = 1.0
+        new_group_socket(group, "INPUT", "NodeSocketColor", f"Emission Color {i}")
+    new_group_socket(group, "OUTPUT", "NodeSocketColor", "Color")
+    new_group_socket(group, "OUTPUT", "NodeSocketColor", "Emission")
+
+    nodes = group.nodes
+    links = group.links
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+
+    huesaturationvalue = nodes.new("ShaderNodeHueSaturation")
+    huesaturationvalue.inputs[2].default_value = 2.0
+    huesaturationvalue2 = nodes.new("ShaderNodeHueSaturation")
+    huesaturationvalue2.inputs[2].default_value = 2.0
+    separate_color = nodes.new("ShaderNodeSeparateRGB")
+    links.new(group_input.outputs["Layer Mask"], huesaturationvalue.inputs[4])
+    links.new(group_input.outputs["Layer Mask Alpha"], huesaturationvalue2.inputs[4])
+    links.new(huesaturationvalue.outputs[0], separate_color.inputs[0])
+    masks = (*separate_color.outputs[:3], huesaturationvalue2.outputs[0])
+
+    color = group_input.outputs["Base Color"]
+    emcolor = None
+    for i, mask in enumerate(masks, 1):
+        factor = nodes.new("ShaderNodeMath")
+        factor.operation = "MULTIPLY"
+        links.new(mask, factor.inputs[0])
+        links.new(group_input.outputs[f"Color {i} Factor"], factor.inputs[1])
+
+        mix_color = nodes.new("ShaderNodeMixRGB")
+        mix_color.blend_type = blend_type
+        links.new(factor.outputs[0], mix_color.inputs[0])
+        links.new(color, mix_color.inputs[1])
+        links.new(group_input.outputs[f"Color {i}"], mix_color.inputs[2])
+        color = mix_color.outputs[0]
+
+        mix_emcolor = nodes.new("ShaderNodeMixRGB")
+        mix_emcolor.blend_type = blend_type
+        mix_emcolor.inputs[1].default_value = (0, 0, 0, 0)
+        links.new(mask, mix_emcolor.inputs[0])
+        if emcolor is not None:
+            links.new(emcolor, mix_emcolor.inputs[1])
+        links.new(group_input.outputs[f"Emission Color {i}"], mix_emcolor.inputs[2])
+        emcolor = mix_emcolor.outputs[0]
+
+    links.new(color, group_output.inputs["Color"])
+    links.new(emcolor, group_output.inputs["Emission"])
+
+
+def build_normal_map_group(group):
+    """Tangent space normal map with the blue channel taken from the alpha."""
+    new_group_socket(group, "INPUT", "NodeSocketColor", "Color")
+    new_group_socket(group, "INPUT", "NodeSocketFloat", "Alpha")
+    new_group_socket(group, "OUTPUT", "NodeSocketVector", "Normal")
+
+    nodes = group.nodes
+    links = group.links
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+
+    separate_color = nodes.new("ShaderNodeSeparateRGB")
+    combine_color = nodes.new("ShaderNodeCombineColor")
+    normal_map = nodes.new("ShaderNodeNormalMap")
+    links.new(group_input.outputs["Color"], separate_color.inputs[0])
+    links.new(separate_color.outputs[0], combine_color.inputs[0])
+    links.new(separate_color.outputs[1], combine_color.inputs[1])
+    links.new(group_input.outputs["Alpha"], combine_color.inputs[2])
+    links.new(combine_color.outputs[0], normal_map.inputs[1])
+    links.new(normal_map.outputs[0], group_output.inputs["Normal"])
+
+
+def build_reflection_group(group):
+    """Fresnel of the Transparent shader, IOR from the reflectance."""
+    new_group_socket(group, "INPUT", "NodeSocketFloat", "Reflectance")
+    new_group_socket(group, "INPUT", "NodeSocketVector", "Normal")
+    new_group_socket(group, "OUTPUT", "NodeSocketFloat", "Fresnel")
+    new_group_socket(group, "OUTPUT", "NodeSocketFloat", "Reflection")
+
+    nodes = group.nodes
+    links = group.links
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+
+    reflectionpart1 = nodes.new("ShaderNodeMath")
+    reflectionpart1.operation = "SQRT"
+    reflectionpart2 = nodes.new("ShaderNodeMath")
+    reflectionpart2.inputs[0].default_value = 1.0
+    reflectionpart2.operation = "ADD"
+    reflectionpart3 = nodes.new("ShaderNodeMath")
+    reflectionpart3.inputs[0].default_value = 1.0
+    reflectionpart3.operation = "SUBTRACT"
+    reflectionpart4 = nodes.new("ShaderNodeMath")
+    reflectionpart4.operation = "DIVIDE"
+    reflectionpart5 = nodes.new("ShaderNodeFresnel")
+    reflectionpart6 = nodes.new("ShaderNodeMath")
+    reflectionpart6.inputs[0].default_value = 0.25
+    reflectionpart6.operation = "SUBTRACT"
+
+    links.new(group_input.outputs["Reflectance"], reflectionpart1.inputs[0])
+    links.new(reflectionpart1.outputs[0], reflectionpart2.inputs[1])
+    links.new(reflectionpart1.outputs[0], reflectionpart3.inputs[1])
+    links.new(reflectionpart2.outputs[0], reflectionpart4.inputs[0])
+    links.new(reflectionpart3.outputs[0], reflectionpart4.inputs[1])
+    links.new(reflectionpart4.outputs[0], reflectionpart5.inputs[0])
+    links.new(group_input.outputs["Normal"], reflectionpart5.inputs[1])
+    links.new(reflectionpart5.outputs[0], reflectionpart6.inputs[1])
+    links.new(reflectionpart5.outputs[0], group_output.inputs["Fresnel"])
+    links.new(reflectionpart6.outputs[0], group_output.inputs["Reflection"])
+
+
+def build_mesh(name, vert_array, face_array, normal_array, face_mat_id_array):
+    """Builds a smooth shaded triangle mesh straight from the decoded arrays."""
+    verts = np.asarray(vert_array, dtype=np.float32).reshape(-1, 3)
+    faces = np.asarray(face_array, dtype=np.int32).reshape(-1, 3)
+    face_count = len(faces)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set("loop_total", np.full(face_count, 3, dtype=np.int32))
+    mesh.polygons.foreach_set(
+        "material_index", np.asarray(face_mat_id_array, dtype=np.int32)
+    )
+    mesh.update(calc_edges=True)
 
-                            for b in range(len(w1_array)):
-                                w = {"boneids": [], "weights": []}
-                                maxweight = (
-                                    w1_array[b]["weight1"]
-                                    + w1_array[b]["weight2"]
-                                    + w1_array[b]["weight3"]
-                                    + w1_array[b]["weight4"]
-                                )
+    if bpy.app.version < (4, 1, 0):
+        mesh.polygons.foreach_set("use_smooth", np.ones(face_count, dtype=bool))
+        mesh.use_auto_smooth = True
+    else:
+        mesh.shade_smooth()
+    mesh.normals_split_custom_set_from_vertices(
+        np.asarray(normal_array, dtype=np.float32).reshape(-1, 3)
+    )
+    return mesh
+
+
+def build_poly_group(poly_group, materials, bone_structure, bone_id_map):
+    """Makes the object of a parsed poly group, skinned to bone_structure."""
+    name = poly_group["poly_group_name"]
+    vert_array = poly_group["vert_array"]
+    new_mesh = build_mesh(
+        f"{name}_mesh",
+        vert_array,
+        poly_group["face_array"],
+        poly_group["normal_array"],
+        poly_group["face_mat_id_array"],
+    )
+    new_object = bpy.data.objects.new(name, new_mesh)
+    morph_names = poly_group["morph_names"]
+    if len(morph_names) > 0:
+        sk_basis = new_object.shape_key_add(name="Basis")
+        sk_basis.interpolation = "KEY_LINEAR"
+        new_object.data.shape_keys.use_relative = True
+        print(morph_names)
+        for morph_name, morph in zip(morph_names, poly_group["morphs"]):
+            sk = new_object.shape_key_add(name=morph_name)
+            set_shape_key(sk, vert_array, *morph)
+
+    if bone_structure != None:
+        new_object.parent = bone_structure
+        new_object.modifiers.new(name="Skeleton", type="ARMATURE")
+        new_object.modifiers["Skeleton"].object = bone_structure
+
+        set_vertex_weights(
+            new_object,
+            poly_group["bone_indices"],
+            poly_group["bone_weights"],
+            bone_id_map,
+        )
+
+    # vertex colours
+    if poly_group["colors_fmt"] != "None":
+        set_vertex_colors(
+            new_mesh, poly_group["color_array"], poly_group["alpha_array"]
+        )
+
+    for mat in materials:
+        new_object.data.materials.append(mat)
+
+    # uvs
+    set_uv_layers(new_mesh, poly_group["uv_arrays"])
+    return new_object
+
+
+def set_vertex_weights(obj, bone_indices, bone_weights, bone_id_map):
+    """Adds the skin weights as vertex groups, one add call per bone and weight."""
+    bone_indices = np.asarray(bone_indices, dtype=np.intp).reshape(-1, 4)
+    bone_weights = np.asarray(bone_weights, dtype=np.float32).reshape(-1, 4)
+    if len(bone_indices) == 0:
+        return
+
+    # Rig bone id -> index into group_names, -1 for ids the armature lacks.
+    bone_lut = np.full(bone_indices.max() + 1, -1, dtype=np.intp)
+    group_names = []
+    for bone_id, bone_name in bone_id_map.items():
+        if bone_name and bone_id < len(bone_lut):
+            bone_lut[bone_id] = len(group_names)
+            group_names.append(bone_name)
+
+    group_ids = bone_lut[bone_indices]
+    vert_ids, slots = np.nonzero((bone_weights > 0) & (group_ids >= 0))
+    group_ids = group_ids[vert_ids, slots]
+    weights = bone_weights[vert_ids, slots]
+
+    # A bone listed twice for one vertex keeps its last weight, as REPLACE did.
+    pairs = vert_ids * len(group_names) + group_ids
+    _, last = np.unique(pairs[::-1], return_index=True)
+    keep = len(pairs) - 1 - last
+    vert_ids, group_ids, weights = vert_ids[keep], group_ids[keep], weights[keep]
+
+    # Runs of vertices sharing a bone and weight go in with a single add.
+    order = np.lexsort((weights, group_ids))
+    vert_ids, group_ids, weights = vert_ids[order], group_ids[order], weights[order]
+    run_starts = np.flatnonzero(
+        (np.diff(group_ids, prepend=-1) != 0) | (np.diff(weights, prepend=-1) != 0)
+    )
+    run_ends = np.append(run_starts[1:], len(vert_ids))
+
+    groups = {}
+    for start, end in zip(run_starts, run_ends):
+        bone_name = group_names[group_ids[start]]
+        if bone_name not in groups:
+            groups[bone_name] = obj.vertex_groups.new(name=bone_name)
+        groups[bone_name].add(
+            vert_ids[start:end].tolist(), float(weights[start]), "REPLACE"
+        )
+
+
+# Names of the UV layers made for the mesh's UV sets, in order.
+UV_LAYER_NAMES = ("UVMap", "UV2Map", "UV3Map", "UV4Map")
+
+
+def set_uv_layers(mesh, uv_arrays):
+    """Writes the per-vertex UV sets to the face corners, one layer per set."""
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    for name, uvs in zip(UV_LAYER_NAMES, uv_arrays):
+        if len(uvs) > 0:
+            uv_layer = mesh.uv_layers.new(name=name)
+            uvs = np.asarray(uvs, dtype=np.float32)[loop_verts]
+            uv_layer.data.foreach_set("uv", uvs.ravel())
+    mesh.uv_layers.active_index = 0
+
+
+def set_vertex_colors(mesh, color_array, alpha_array):
+    """Adds the vertex colours, RGB divided by alpha, as a point color attribute."""
+    alpha = np.asarray(alpha_array, dtype=np.float32)
+    alpha = np.where(alpha == 0, 1, alpha)
+    colors = np.empty((len(alpha), 4), dtype=np.float32)
+    colors[:, :3] = np.asarray(color_array, dtype=np.float32) / alpha[:, None]
+    colors[:, 3] = alpha
+    color_layer = mesh.color_attributes.new("Color", "BYTE_COLOR", "POINT")
+    if bpy.app.version < (3, 4, 0):
+        color_layer.data.foreach_set("color", np.clip(colors, 0, 1).ravel())
+    else:
+        color_layer.data.foreach_set("color_srgb", np.clip(colors, 0, 1).ravel())
+    mesh.color_attributes.active_color = color_layer
 
-                                if maxweight > 0:
-                                    if w1_array[b]["weight1"] > 0:
-                                        w["boneids"].append(b1_array[b]["bone1"])
-                                        w["weights"].append(w1_array[b]["weight1"])
-                                    if w1_array[b]["weight2"] > 0:
-                                        w["boneids"].append(b1_array[b]["bone2"])
-                                        w["weights"].append(w1_array[b]["weight2"])
-                                    if w1_array[b]["weight3"] > 0:
-                                        w["boneids"].append(b1_array[b]["bone3"])
-                                        w["weights"].append(w1_array[b]["weight3"])
-                                    if w1_array[b]["weight4"] > 0:
-                                        w["boneids"].append(b1_array[b]["bone4"])
-                                        w["weights"].append(w1_array[b]["weight4"])
-
-                                weight_array.append(w)
-
-                            if IN_BLENDER_ENV:
-                                # LINE 3257
-
-                                new_mesh = bpy.data.meshes.new(
-                                    f"{poly_group_name}_mesh"
-                                )
-                                new_mesh.from_pydata(vert_array, [], face_array)
-                                new_mesh.update()
-                                new_object = bpy.data.objects.new(
-                                    poly_group_name, new_mesh
-                                )
 
-                                if bone_structure != None:
-                                    new_object.parent = bone_structure
-                                    new_object.modifiers.new(
-                                        name="Skeleton", type="ARMATURE"
-                                    )
-                                    new_object.modifiers["Skeleton"].object = (
-                                        bone_structure
-                                    )
+# Morph vertices are always laid out like this, 0x1C bytes each.
+MORPH_DTYPE = np.dtype(
+    [("position", "<f4", 3), ("normal", "<f2", 4), ("tangent", "<f2", 4)]
+)
 
-                                    for face in new_object.data.polygons:
-                                        for vert_idx, loop_idx in zip(
-                                            face.vertices, face.loop_indices
-                                        ):
-                                            w = weight_array[vert_idx]
 
-                                            for i in range(len(w["boneids"])):
-                                                bone_id = bone_id_map[w["boneids"][i]]
-                                                weight = w["weights"][i]
+def read_morph_buffer(file, byte_count):
+    """Decodes the morph vertices at the cursor."""
+    morph = np.frombuffer(
+        file.buffer, MORPH_DTYPE, byte_count // MORPH_DTYPE.itemsize, file.tell()
+    )
+    file.seek(file.tell() + morph.nbytes)
+    return morph
 
-                                                group = None
-                                                if (
-                                                    new_object.vertex_groups.get(
-                                                        bone_id
-                                                    )
-                                                    == None
-                                                ):
-                                                    group = (
-                                                        new_object.vertex_groups.new(
-                                                            name=bone_id
-                                                        )
-                                                    )
-                                                else:
-                                                    group = new_object.vertex_groups[
-                                                        bone_id
-                                                    ]
 
-                                                group.add([vert_idx], weight, "REPLACE")
+def morph_position_deltas(morph, vert_array):
+    """Offsets of each vertex in a morph, 0 for those past its end."""
+    positions = np.asarray(vert_array, dtype=np.float32)
+    morphed = positions.copy()
+    count = min(len(morph), len(positions))
+    morphed[:count] = morph["position"][:count]
+    return morphed - positions
 
-                                color_layer = new_object.data.vertex_colors.new(
-                                    name="Color"
-                                )
-                                new_object.data.vertex_colors.active = color_layer
-                                # print(f"color_array: {len(color_array)}")
-                                # print(f"polygons: {len(new_object.data.polygons)}")
-                                for i, poly in enumerate(new_object.data.polygons):
-                                    # print(f"poly: {i}")
-                                    for v, vert in enumerate(poly.vertices):
-                                        loop_index = poly.loop_indices[v]
-
-                                        # print(f"loop_index: {loop_index}")
-                                        # print((color_array[vert][0], color_array[vert][1], color_array[vert][2], 1))
-
-                                        color_layer.data[loop_index].color = (
-                                            color_array[vert][0] / alpha_array[vert],
-                                            color_array[vert][1] / alpha_array[vert],
-                                            color_array[vert][2] / alpha_array[vert],
-                                            alpha_array[vert],
-                                        )
 
-                                for mat in materials:
-                                    new_object.data.materials.append(mat)
-
-                                # materials
-                                for i, poly in enumerate(new_object.data.polygons):
-                                    poly.material_index = face_mat_id_array[i]
-
-                                # uvs
-                                uv_layers = new_object.data.uv_layers
-                                uv_layer = uv_layers.new(name="UVMap")
-                                if len(uv2_array) > 0:
-                                    uv2_layer = uv_layers.new(name="UV2Map")
-                                if len(uv3_array) > 0:
-                                    uv3_layer = uv_layers.new(name="UV3Map")
-                                if len(uv4_array) > 0:
-                                    uv4_layer = uv_layers.new(name="UV4Map")
-                                uv_layers.active = uv_layer
-
-                                for face in new_object.data.polygons:
-                                    for vert_idx, loop_idx in zip(
-                                        face.vertices, face.loop_indices
-                                    ):
-                                        uv_layer.data[loop_idx].uv = uv_array[vert_idx]
-                                        if len(uv2_array) > 0:
-                                            uv2_layer.data[loop_idx].uv = uv2_array[
-                                                vert_idx
-                                            ]
-                                        if len(uv3_array) > 0:
-                                            uv3_layer.data[loop_idx].uv = uv3_array[
-                                                vert_idx
-                                            ]
-                                        if len(uv4_array) > 0:
-                                            uv4_layer.data[loop_idx].uv = uv4_array[
-                                                vert_idx
-                                            ]
-
-                                # normals
-                                if bpy.app.version < (4, 1, 0):
-                                    new_object.data.use_auto_smooth = True
-                                new_object.data.normals_split_custom_set_from_vertices(
-                                    normal_array
-                                )
-                                # add object to scene collection
-                                new_collection.objects.link(new_object)
+def set_shape_key(shape_key, vert_array, morph_ids, morph_deltas):
+    """Fills a shape key with the base positions moved by a sparse morph."""
+    coords = np.array(vert_array, dtype=np.float32)
+    coords[morph_ids] += morph_deltas
+    shape_key.data.foreach_set("co", coords.ravel())
 
 
-#### Utils ####
 def readbyte(file):
-    return int.from_bytes(file.read(1), byteorder="little")
+    value = file.u8_at(file.offset)
+    file.offset += 1
+    return value
 
 
 def readshort(file):
-    return int.from_bytes(file.read(2), byteorder="little")
+    value = file.u16_at(file.offset)
+    file.offset += 2
+    return value
 
 
 def readlong(file):  # SIGNED!!!!
-    bytes_data = file.read(4)
-    # print(f"readlong: {bytes_data}")
-    return int.from_bytes(bytes_data, byteorder="little", signed=True)
+    value = file.i32_at(file.offset)
+    file.offset += 4
+    return value
 
 
 def readfloat(file):
-    return struct.unpack("<f", file.read(4))[0]
+    value = file.f32_at(file.offset)
+    file.offset += 4
+    return value
 
 
 def readhalffloat(file):
-    return struct.unpack("<e", file.read(2))[0]
+    value = file.f16_at(file.offset)
+    file.offset += 2
+    return value
 
 
 def readfixedstring(file, length):
-    bytes_data = file.read(length)
-    # print(f"readfixedstring ({length}): {bytes_data}")
-    return bytes_data.decode("utf-8")
+    value = file.str_at(file.offset, length)
+    file.offset += length
+    return value
 
 
 def fseek(file, offset):
@@ -7101,6 +7692,8 @@ def replace_current_menu_item(menu, item):
 def register():
     bpy.utils.register_class(PokeArcImport)
     bpy.utils.register_class(PokeSVImport)
+    bpy.utils.register_class(ClearParseCache)
+    bpy.utils.register_class(ClearDiskCache)
     replace_current_menu_item(
         bpy.types.TOPBAR_MT_file_import, ImportTRMDL_menu_func_import
     )
@@ -7109,6 +7702,8 @@ def register():
 def unregister():
     bpy.utils.unregister_class(PokeArcImport)
     bpy.utils.unregister_class(PokeSVImport)
+    bpy.utils.unregister_class(ClearParseCache)
+    bpy.utils.unregister_class(ClearDiskCache)
 
 
 if __name__ == "__main__":
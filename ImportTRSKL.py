@@ -62,7 +62,7 @@ class PokeSVSkelImport(bpy.types.Operator, ImportHelper):
         directory = os.path.dirname(self.filepath)
         if self.multiple == False:
             filename = os.path.basename(self.filepath)
-            f = open(os.path.join(directory, filename), "rb")
+            f = BinaryView(os.path.join(directory, filename))
             from_trsklsv(directory, f, self.bonestructh)
             f.close()
             return {"FINISHED"}
@@ -70,7 +70,7 @@ class PokeSVSkelImport(bpy.types.Operator, ImportHelper):
             file_list = sorted(os.listdir(directory))
             obj_list = [item for item in file_list if item.endswith(".trskl")]
             for item in obj_list:
-                f = open(os.path.join(directory, item), "rb")
+                f = BinaryView(os.path.join(directory, item))
                 from_trsklsv(directory, f, self.bonestructh)
                 f.close()
             return {"FINISHED"}
@@ -95,25 +95,11 @@ def from_trsklsv(filep, trskl, bonestructh):
         print("Parsing TRSKL...")
         trskl_file_start = readlong(trskl)
         fseek(trskl, trskl_file_start)
-        trskl_struct = ftell(trskl) - readlong(trskl)
-        fseek(trskl, trskl_struct)
-        trskl_struct_len = readshort(trskl)
-        if trskl_struct_len == 0x000C:
-            trskl_struct_section_len = readshort(trskl)
-            trskl_struct_start = readshort(trskl)
-            trskl_struct_bone = readshort(trskl)
-            trskl_struct_b = readshort(trskl)
-            trskl_struct_c = readshort(trskl)
-            trskl_struct_bone_adjust = 0
-        elif trskl_struct_len == 0x000E:
-            trskl_struct_section_len = readshort(trskl)
-            trskl_struct_start = readshort(trskl)
-            trskl_struct_bone = readshort(trskl)
-            trskl_struct_b = readshort(trskl)
-            trskl_struct_c = readshort(trskl)
-            trskl_struct_bone_adjust = readshort(trskl)
-        else:
+        trskl_struct = FlatTable(trskl, trskl_file_start, TRSKL_SCHEMA)
+        if trskl_struct.vtable_len not in (0x000C, 0x000E):
             raise AssertionError("Unexpected TRSKL header struct length!")
+        trskl_struct_bone = trskl_struct.field("bone")
+        trskl_struct_bone_adjust = trskl_struct.field("bone_adjust")
 
         if trskl_struct_bone_adjust != 0:
             fseek(trskl, trskl_file_start + trskl_struct_bone_adjust)
@@ -140,40 +126,13 @@ def from_trsklsv(filep, trskl, bonestructh):
                 bone_ret = ftell(trskl)
                 fseek(trskl, bone_offset)
                 print(f"Bone {x} start: {hex(bone_offset)}")
-                trskl_bone_struct = ftell(trskl) - readlong(trskl)
-                fseek(trskl, trskl_bone_struct)
-                trskl_bone_struct_len = readshort(trskl)
-
-                if trskl_bone_struct_len == 0x0012:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = 0
-                elif trskl_bone_struct_len == 0x0014:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = readshort(trskl)
-                else:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = readshort(trskl)
+                trskl_bone_struct = FlatTable(trskl, bone_offset, TRSKL_BONE_SCHEMA)
+                trskl_bone_struct_ptr_string = trskl_bone_struct.field("string")
+                trskl_bone_struct_ptr_bone = trskl_bone_struct.field("bone")
+                trskl_bone_struct_ptr_parent = trskl_bone_struct.field("parent")
+                trskl_bone_struct_ptr_rig_id = trskl_bone_struct.field("rig_id")
+                trskl_bone_struct_ptr_bone_merge = trskl_bone_struct.field("bone_merge")
+                trskl_bone_struct_ptr_h = trskl_bone_struct.field("h")
 
                 if trskl_bone_struct_ptr_bone_merge != 0:
                     fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone_merge)
@@ -192,17 +151,15 @@ def from_trsklsv(filep, trskl, bonestructh):
                     fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone)
                     bone_pos_start = ftell(trskl) + readlong(trskl)
                     fseek(trskl, bone_pos_start)
-                    bone_pos_struct = ftell(trskl) - readlong(trskl)
-                    fseek(trskl, bone_pos_struct)
-                    bone_pos_struct_len = readshort(trskl)
+                    bone_pos_struct = FlatTable(
+                        trskl, bone_pos_start, TRSKL_TRANSFORM_SCHEMA
+                    )
 
-                    if bone_pos_struct_len != 0x000A:
+                    if bone_pos_struct.vtable_len != 0x000A:
                         raise AssertionError("Unexpected bone position struct length!")
-
-                    bone_pos_struct_section_len = readshort(trskl)
-                    bone_pos_struct_ptr_scl = readshort(trskl)
-                    bone_pos_struct_ptr_rot = readshort(trskl)
-                    bone_pos_struct_ptr_trs = readshort(trskl)
+                    bone_pos_struct_ptr_scl = bone_pos_struct.field("scl")
+                    bone_pos_struct_ptr_rot = bone_pos_struct.field("rot")
+                    bone_pos_struct_ptr_trs = bone_pos_struct.field("trs")
 
                     fseek(trskl, bone_pos_start + bone_pos_struct_ptr_trs)
                     bone_tx = readfloat(trskl)
@@ -329,7 +286,7 @@ class PokeArcSkelImport(bpy.types.Operator, ImportHelper):
         directory = os.path.dirname(self.filepath)
         if self.multiple == False:
             filename = os.path.basename(self.filepath)
-            f = open(os.path.join(directory, filename), "rb")
+            f = BinaryView(os.path.join(directory, filename))
             from_trskl(directory, f, self.rare, self.loadlods)
             f.close()
             return {"FINISHED"}
@@ -337,7 +294,7 @@ class PokeArcSkelImport(bpy.types.Operator, ImportHelper):
             file_list = sorted(os.listdir(directory))
             obj_list = [item for item in file_list if item.endswith(".trskl")]
             for item in obj_list:
-                f = open(os.path.join(directory, item), "rb")
+                f = BinaryView(os.path.join(directory, item))
                 from_trskl(directory, f, self.rare, self.loadlods)
                 f.close()
             return {"FINISHED"}
@@ -357,35 +314,15 @@ def from_trskl(filep, trskl):
     trskl_bone_adjust = 0
     print("Parsing TRSKL...")
 
-    trskl_file_start = readlong(trskl)
-    fseek(trskl, trskl_file_start)
-    trskl_struct = ftell(trskl) - readlong(trskl)
-    fseek(trskl, trskl_struct)
-    trskl_struct_len = readshort(trskl)
-
     if trskl is not None:
         print("Parsing TRSKL...")
         trskl_file_start = readlong(trskl)
         fseek(trskl, trskl_file_start)
-        trskl_struct = ftell(trskl) - readlong(trskl)
-        fseek(trskl, trskl_struct)
-        trskl_struct_len = readshort(trskl)
-        if trskl_struct_len == 0x000C:
-            trskl_struct_section_len = readshort(trskl)
-            trskl_struct_start = readshort(trskl)
-            trskl_struct_bone = readshort(trskl)
-            trskl_struct_b = readshort(trskl)
-            trskl_struct_c = readshort(trskl)
-            trskl_struct_bone_adjust = 0
-        elif trskl_struct_len == 0x000E:
-            trskl_struct_section_len = readshort(trskl)
-            trskl_struct_start = readshort(trskl)
-            trskl_struct_bone = readshort(trskl)
-            trskl_struct_b = readshort(trskl)
-            trskl_struct_c = readshort(trskl)
-            trskl_struct_bone_adjust = readshort(trskl)
-        else:
+        trskl_struct = FlatTable(trskl, trskl_file_start, TRSKL_SCHEMA)
+        if trskl_struct.vtable_len not in (0x000C, 0x000E):
             raise AssertionError("Unexpected TRSKL header struct length!")
+        trskl_struct_bone = trskl_struct.field("bone")
+        trskl_struct_bone_adjust = trskl_struct.field("bone_adjust")
 
         if trskl_struct_bone_adjust != 0:
             fseek(trskl, trskl_file_start + trskl_struct_bone_adjust)
@@ -412,40 +349,13 @@ def from_trskl(filep, trskl):
                 bone_ret = ftell(trskl)
                 fseek(trskl, bone_offset)
                 print(f"Bone {x} start: {hex(bone_offset)}")
-                trskl_bone_struct = ftell(trskl) - readlong(trskl)
-                fseek(trskl, trskl_bone_struct)
-                trskl_bone_struct_len = readshort(trskl)
-
-                if trskl_bone_struct_len == 0x0012:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = 0
-                elif trskl_bone_struct_len == 0x0014:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = readshort(trskl)
-                else:
-                    trskl_bone_struct_ptr_section_len = readshort(trskl)
-                    trskl_bone_struct_ptr_string = readshort(trskl)
-                    trskl_bone_struct_ptr_bone = readshort(trskl)
-                    trskl_bone_struct_ptr_c = readshort(trskl)
-                    trskl_bone_struct_ptr_d = readshort(trskl)
-                    trskl_bone_struct_ptr_parent = readshort(trskl)
-                    trskl_bone_struct_ptr_rig_id = readshort(trskl)
-                    trskl_bone_struct_ptr_bone_merge = readshort(trskl)
-                    trskl_bone_struct_ptr_h = readshort(trskl)
+                trskl_bone_struct = FlatTable(trskl, bone_offset, TRSKL_BONE_SCHEMA)
+                trskl_bone_struct_ptr_string = trskl_bone_struct.field("string")
+                trskl_bone_struct_ptr_bone = trskl_bone_struct.field("bone")
+                trskl_bone_struct_ptr_parent = trskl_bone_struct.field("parent")
+                trskl_bone_struct_ptr_rig_id = trskl_bone_struct.field("rig_id")
+                trskl_bone_struct_ptr_bone_merge = trskl_bone_struct.field("bone_merge")
+                trskl_bone_struct_ptr_h = trskl_bone_struct.field("h")
 
                 if trskl_bone_struct_ptr_bone_merge != 0:
                     fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone_merge)
@@ -464,17 +374,15 @@ def from_trskl(filep, trskl):
                     fseek(trskl, bone_offset + trskl_bone_struct_ptr_bone)
                     bone_pos_start = ftell(trskl) + readlong(trskl)
                     fseek(trskl, bone_pos_start)
-                    bone_pos_struct = ftell(trskl) - readlong(trskl)
-                    fseek(trskl, bone_pos_struct)
-                    bone_pos_struct_len = readshort(trskl)
+                    bone_pos_struct = FlatTable(
+                        trskl, bone_pos_start, TRSKL_TRANSFORM_SCHEMA
+                    )
 
-                    if bone_pos_struct_len != 0x000A:
+                    if bone_pos_struct.vtable_len != 0x000A:
                         raise AssertionError("Unexpected bone position struct length!")
-
-                    bone_pos_struct_section_len = readshort(trskl)
-                    bone_pos_struct_ptr_scl = readshort(trskl)
-                    bone_pos_struct_ptr_rot = readshort(trskl)
-                    bone_pos_struct_ptr_trs = readshort(trskl)
+                    bone_pos_struct_ptr_scl = bone_pos_struct.field("scl")
+                    bone_pos_struct_ptr_rot = bone_pos_struct.field("rot")
+                    bone_pos_struct_ptr_trs = bone_pos_struct.field("trs")
 
                     fseek(trskl, bone_pos_start + bone_pos_struct_ptr_trs)
                     bone_tx = readfloat(trskl)
@@ -545,32 +453,134 @@ def from_trskl(filep, trskl):
             bpy.ops.object.editmode_toggle()
 
 
+class BinaryView:
+    """Reads a whole TR* file once and decodes fields straight from memory.
+
+    The *_at accessors take absolute offsets; the read* helpers below use the
+    cursor (seek/tell) so the ported maxscript logic can stay as it is.
+    """
+
+    u16 = struct.Struct("<H")
+    i32 = struct.Struct("<i")
+    f16 = struct.Struct("<e")
+    f32 = struct.Struct("<f")
+
+    def __init__(self, filepath):
+        self.name = filepath
+        with open(filepath, "rb") as file:
+            self.buffer = memoryview(file.read())
+        self.offset = 0
+        self.vtables = {}
+
+    def u8_at(self, offset):
+        return self.buffer[offset]
+
+    def u16_at(self, offset):
+        return self.u16.unpack_from(self.buffer, offset)[0]
+
+    def i32_at(self, offset):
+        return self.i32.unpack_from(self.buffer, offset)[0]
+
+    def f16_at(self, offset):
+        return self.f16.unpack_from(self.buffer, offset)[0]
+
+    def f32_at(self, offset):
+        return self.f32.unpack_from(self.buffer, offset)[0]
+
+    def str_at(self, offset, length):
+        return str(self.buffer[offset : offset + length], "utf-8")
+
+    def vtable_at(self, offset):
+        # FlatBuffers dedupes identical vtables, so most tables of a kind
+        # share one and it only gets decoded the first time.
+        vtable = self.vtables.get(offset)
+        if vtable is None:
+            vtable = struct.unpack_from(
+                f"<{self.u16_at(offset) // 2}H", self.buffer, offset
+            )
+            self.vtables[offset] = vtable
+        return vtable
+
+    def seek(self, offset):
+        self.offset = offset
+
+    def tell(self):
+        return self.offset
+
+    def close(self):
+        self.buffer.release()
+
+
+class FlatTable:
+    """A FlatBuffers table, with its fields looked up by name in a schema.
+
+    field() returns the field's offset relative to the table, like the
+    *_ptr_* shorts the parser used to read by hand. Fields past the end of
+    a shorter vtable come back as 0, same as fields the writer left out.
+    """
+
+    def __init__(self, file, offset, schema):
+        self.file = file
+        self.offset = offset
+        self.schema = schema
+        self.vtable = file.vtable_at(offset - file.i32_at(offset))
+        self.vtable_len = self.vtable[0]
+
+    def field(self, name):
+        slot = self.schema[name]
+        if slot < len(self.vtable):
+            return self.vtable[slot]
+        return 0
+
+
+def flatschema(*fields):
+    # Slots follow the vtable's own length and table length shorts.
+    return {field: slot for slot, field in enumerate(fields, 2)}
+
+
+# Field order of the TRSKL tables, as they come in the vtables. Names follow the
+# parser's *_struct_ptr_* variables.
+TRSKL_SCHEMA = flatschema("start", "bone", "b", "c", "bone_adjust")
+TRSKL_BONE_SCHEMA = flatschema(
+    "string", "bone", "c", "d", "parent", "rig_id", "bone_merge", "h"
+)
+TRSKL_TRANSFORM_SCHEMA = flatschema("scl", "rot", "trs")
+
+
 def readbyte(file):
-    return int.from_bytes(file.read(1), byteorder="little")
+    value = file.u8_at(file.offset)
+    file.offset += 1
+    return value
 
 
 def readshort(file):
-    return int.from_bytes(file.read(2), byteorder="little")
+    value = file.u16_at(file.offset)
+    file.offset += 2
+    return value
 
 
 def readlong(file):  # SIGNED!!!!
-    bytes_data = file.read(4)
-    # print(f"readlong: {bytes_data}")
-    return int.from_bytes(bytes_data, byteorder="little", signed=True)
+    value = file.i32_at(file.offset)
+    file.offset += 4
+    return value
 
 
 def readfloat(file):
-    return struct.unpack("<f", file.read(4))[0]
+    value = file.f32_at(file.offset)
+    file.offset += 4
+    return value
 
 
 def readhalffloat(file):
-    return struct.unpack("<e", file.read(2))[0]
+    value = file.f16_at(file.offset)
+    file.offset += 2
+    return value
 
 
 def readfixedstring(file, length):
-    bytes_data = file.read(length)
-    # print(f"readfixedstring ({length}): {bytes_data}")
-    return bytes_data.decode("utf-8")
+    value = file.str_at(file.offset, length)
+    file.offset += length
+    return value
 
 
 def fseek(file, offset):
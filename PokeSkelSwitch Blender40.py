@@ -65,7 +65,7 @@ class PokeSVSkelImport(bpy.types.Operator, ImportHelper):
     directory = os.path.dirname(self.filepath)
     if self.multiple == False:
       filename = os.path.basename(self.filepath)    
-      f = open(os.path.join(directory, filename), "rb")
+      f = BinaryView(os.path.join(directory, filename))
       from_trsklsv(directory, f, self.bonestructh)
       f.close()
       return {'FINISHED'}  
@@ -73,7 +73,7 @@ class PokeSVSkelImport(bpy.types.Operator, ImportHelper):
       file_list = sorted(os.listdir(directory))
       obj_list = [item for item in file_list if item.endswith('.trskl')]
       for item in obj_list:
-        f = open(os.path.join(directory, item), "rb")
+        f = BinaryView(os.path.join(directory, item))
         from_trsklsv(directory, f, self.bonestructh)
         f.close()
       return {'FINISHED'}
@@ -306,7 +306,7 @@ class PokeArcSkelImport(bpy.types.Operator, ImportHelper):
     directory = os.path.dirname(self.filepath)
     if self.multiple == False:
       filename = os.path.basename(self.filepath)    
-      f = open(os.path.join(directory, filename), "rb")
+      f = BinaryView(os.path.join(directory, filename))
       from_trskl(directory, f, self.rare, self.loadlods)
       f.close()
       return {'FINISHED'}  
@@ -314,7 +314,7 @@ class PokeArcSkelImport(bpy.types.Operator, ImportHelper):
       file_list = sorted(os.listdir(directory))
       obj_list = [item for item in file_list if item.endswith('.trskl')]
       for item in obj_list:
-        f = open(os.path.join(directory, item), "rb")
+        f = BinaryView(os.path.join(directory, item))
         from_trskl(directory, f, self.rare, self.loadlods)
         f.close()
       return {'FINISHED'}
@@ -495,35 +495,97 @@ def from_trskl(filep, trskl):
     if IN_BLENDER_ENV:
       bpy.ops.object.editmode_toggle()
 
+class BinaryView:
+  """Reads a whole TR* file once and decodes fields straight from memory.
+
+  The *_at accessors take absolute offsets; the read* helpers below use the
+  cursor (seek/tell) so the ported maxscript logic can stay as it is.
+  """
+
+  u16 = struct.Struct("<H")
+  i32 = struct.Struct("<i")
+  f16 = struct.Struct("<e")
+  f32 = struct.Struct("<f")
+
+  def __init__(self, filepath):
+    self.name = filepath
+    with open(filepath, "rb") as file:
+      self.buffer = memoryview(file.read())
+    self.offset = 0
+
+  def u8_at(self, offset):
+    return self.buffer[offset]
+
+  def u16_at(self, offset):
+    return self.u16.unpack_from(self.buffer, offset)[0]
+
+  def i32_at(self, offset):
+    return self.i32.unpack_from(self.buffer, offset)[0]
+
+  def f16_at(self, offset):
+    return self.f16.unpack_from(self.buffer, offset)[0]
+
+  def f32_at(self, offset):
+    return self.f32.unpack_from(self.buffer, offset)[0]
+
+  def str_at(self, offset, length):
+    return str(self.buffer[offset : offset + length], "utf-8")
+
+  def seek(self, offset):
+    self.offset = offset
+
+  def tell(self):
+    return self.offset
+
+  def close(self):
+    self.buffer.release()
+
+
 def readbyte(file):
-  return int.from_bytes(file.read(1), byteorder='little')
+  value = file.u8_at(file.offset)
+  file.offset += 1
+  return value
+
 
 def readshort(file):
-  return int.from_bytes(file.read(2), byteorder='little')
+  value = file.u16_at(file.offset)
+  file.offset += 2
+  return value
+
+
+def readlong(file):  # SIGNED!!!!
+  value = file.i32_at(file.offset)
+  file.offset += 4
+  return value
 
-def readlong(file): # SIGNED!!!!
-  bytes_data = file.read(4)
-  # print(f"readlong: {bytes_data}")
-  return int.from_bytes(bytes_data, byteorder='little', signed=True)
 
 def readfloat(file):
-  return struct.unpack('<f', file.read(4))[0]
+  value = file.f32_at(file.offset)
+  file.offset += 4
+  return value
+
 
 def readhalffloat(file):
-  return struct.unpack('<e', file.read(2))[0]
+  value = file.f16_at(file.offset)
+  file.offset += 2
+  return value
+
 
 def readfixedstring(file, length):
-  bytes_data = file.read(length)
-  # print(f"readfixedstring ({length}): {bytes_data}")
-  return bytes_data.decode('utf-8')
+  value = file.str_at(file.offset, length)
+  file.offset += length
+  return value
+
 
 def fseek(file, offset):
   # print(f"Seeking to {offset}")
   file.seek(offset)
 
+
 def ftell(file):
   return file.tell()
 
+
 def fclose(file):
   file.close()
 
@@ -29,6 +29,7 @@ from bpy.types import (
 )
 import bpy
 import mathutils
+import numpy as np
 import math
 import glob
 import shutil
@@ -98,7 +99,7 @@ class PokeSVImport(bpy.types.Operator, ImportHelper):
         directory = os.path.dirname(self.filepath)
         if self.multiple == False:
             filename = os.path.basename(self.filepath)
-            f = open(os.path.join(directory, filename), "rb")
+            f = BinaryView(os.path.join(directory, filename))
             from_trmdlsv(directory, f, self.rare, self.loadlods, self.bonestructh)
             f.close()
             return {"FINISHED"}
@@ -106,7 +107,7 @@ class PokeSVImport(bpy.types.Operator, ImportHelper):
             file_list = sorted(os.listdir(directory))
             obj_list = [item for item in file_list if item.endswith(".trmdl")]
             for item in obj_list:
-                f = open(os.path.join(directory, item), "rb")
+                f = BinaryView(os.path.join(directory, item))
                 from_trmdlsv(
                     directory,
                     f,
@@ -261,7 +262,7 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, loadbasearm):
             print(trskl_name)
 
             if os.path.exists(os.path.join(filep, trskl_name)):
-                trskl = open(os.path.join(filep, trskl_name), "rb")
+                trskl = BinaryView(os.path.join(filep, trskl_name))
             else:
                 print(f"Can't find {trskl_name}!")
 
@@ -283,11 +284,11 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, loadbasearm):
             print(trmtr_name)
             if x == 0:
                 if rare == True:
-                    trmtr = open(
-                        os.path.join(filep, Path(trmtr_name).stem + "_rare.trmtr"), "rb"
+                    trmtr = BinaryView(
+                        os.path.join(filep, Path(trmtr_name).stem + "_rare.trmtr")
                     )
                 else:
-                    trmtr = open(os.path.join(filep, trmtr_name), "rb")
+                    trmtr = BinaryView(os.path.join(filep, trmtr_name))
             fseek(trmdl, trmtr_ret)
     fclose(trmdl)
 
@@ -295,7 +296,7 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, loadbasearm):
     # LINE 1247
     if loadbasearm:
         if "Default" in chara_check and trskl is None:
-            trskl = open(os.path.join(filep, "p0_base.trskl"), "rb")
+            trskl = BinaryView(os.path.join(filep, "p0_base.trskl"))
 
     if trskl is not None:
         print("Parsing TRSKL...")
@@ -2126,7 +2127,7 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, loadbasearm):
     for w in range(trmsh_count):
         if os.path.exists(os.path.join(filep, trmsh_lods_array[w])):
             poly_group_array = []
-            trmsh = open(os.path.join(filep, trmsh_lods_array[w]), "rb")
+            trmsh = BinaryView(os.path.join(filep, trmsh_lods_array[w]))
             trmsh_file_start = readlong(trmsh)
             print("Parsing TRMSH...")
             fseek(trmsh, trmsh_file_start)
@@ -2151,7 +2152,7 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, loadbasearm):
 
                 trmbf = None
                 if os.path.exists(os.path.join(filep, trmbf_filename)):
-                    trmbf = open(os.path.join(filep, trmbf_filename), "rb")
+                    trmbf = BinaryView(os.path.join(filep, trmbf_filename))
                 else:
                     raise AssertionError(f"Can't find {trmbf_filename}!")
 
@@ -3557,13 +3558,13 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, loadbasearm):
                             if IN_BLENDER_ENV:
                                 # LINE 3257
 
-                                new_mesh = bpy.data.meshes.new(
-                                    f"{poly_group_name}_mesh"
+                                new_mesh = build_mesh(
+                                    f"{poly_group_name}_mesh",
+                                    vert_array,
+                                    face_array,
+                                    normal_array,
+                                    face_mat_id_array,
                                 )
-                                new_mesh.from_pydata(vert_array, [], face_array)
-                                new_mesh.update()
-                                for p in new_mesh.polygons:
-                                    p.use_smooth = True
                                 new_object = bpy.data.objects.new(
                                     poly_group_name, new_mesh
                                 )
@@ -3624,29 +3625,11 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, loadbasearm):
                                                         [vert_idx], weight, "REPLACE"
                                                     )
 
-                                # # vertex colours
-                                color_layer = new_object.data.vertex_colors.new(
-                                    name="Color"
-                                )
-                                new_object.data.vertex_colors.active = color_layer
-                                # print(f"color_array: {len(color_array)}")
-                                # print(f"polygons: {len(new_object.data.polygons)}")
-                                for i, poly in enumerate(new_object.data.polygons):
-                                    # print(f"poly: {i}")
-                                    for v, vert in enumerate(poly.vertices):
-                                        loop_index = poly.loop_indices[v]
-
-                                        # print(f"loop_index: {loop_index}")
-                                        # print(color_array[vert][0], color_array[vert][1], color_array[vert][2], alpha_array[vert])
-
-                                        if alpha_array[vert] == 0:
-                                            alpha_array[vert] = 1
-                                        color_layer.data[loop_index].color = (
-                                            color_array[vert][0] / alpha_array[vert],
-                                            color_array[vert][1] / alpha_array[vert],
-                                            color_array[vert][2] / alpha_array[vert],
-                                            alpha_array[vert],
-                                        )
+                                # vertex colours
+                                if poly_group_array[x]["colors_fmt"] != "None":
+                                    set_vertex_colors(
+                                        new_mesh, color_array, alpha_array
+                                    )
 
                                 for mat in materials:
                                     new_object.data.materials.append(mat)
@@ -3654,43 +3637,11 @@ def from_trmdlsv(filep, trmdl, rare, loadlods, bonestructh, loadbasearm):
                                 # materials
 
                                 # uvs
-                                uv_layers = new_object.data.uv_layers
-                                uv_layer = uv_layers.new(name="UVMap")
-                                if len(uv2_array) > 0:
-                                    uv2_layer = uv_layers.new(name="UV2Map")
-                                if len(uv3_array) > 0:
-                                    uv3_layer = uv_layers.new(name="UV3Map")
-                                if len(uv4_array) > 0:
-                                    uv4_layer = uv_layers.new(name="UV4Map")
-                                uv_layers.active = uv_layer
-
-                                for i, poly in enumerate(new_object.data.polygons):
-                                    poly.material_index = face_mat_id_array[i]
-
-                                for face in new_object.data.polygons:
-                                    for vert_idx, loop_idx in zip(
-                                        face.vertices, face.loop_indices
-                                    ):
-                                        uv_layer.data[loop_idx].uv = uv_array[vert_idx]
-                                        if len(uv2_array) > 0:
-                                            uv2_layer.data[loop_idx].uv = uv2_array[
-                                                vert_idx
-                                            ]
-                                        if len(uv3_array) > 0:
-                                            uv3_layer.data[loop_idx].uv = uv3_array[
-                                                vert_idx
-                                            ]
-                                        if len(uv4_array) > 0:
-                                            uv4_layer.data[loop_idx].uv = uv4_array[
-                                                vert_idx
-                                            ]
-
-                                # normals
-                                if bpy.app.version < (4, 1, 0):
-                                    new_object.data.use_auto_smooth = True
-                                new_object.data.normals_split_custom_set_from_vertices(
-                                    normal_array
+                                set_uv_layers(
+                                    new_mesh,
+                                    (uv_array, uv2_array, uv3_array, uv4_array),
                                 )
+
                                 # add object to scene collection
                                 new_collection.objects.link(new_object)
 
@@ -3740,7 +3691,7 @@ class PokeArcImport(bpy.types.Operator, ImportHelper):
         directory = os.path.dirname(self.filepath)
         if self.multiple == False:
             filename = os.path.basename(self.filepath)
-            f = open(os.path.join(directory, filename), "rb")
+            f = BinaryView(os.path.join(directory, filename))
             from_trmdl(directory, f, self.rare, self.loadlods)
             f.close()
             return {"FINISHED"}
@@ -3748,7 +3699,7 @@ class PokeArcImport(bpy.types.Operator, ImportHelper):
             file_list = sorted(os.listdir(directory))
             obj_list = [item for item in file_list if item.endswith(".trmdl")]
             for item in obj_list:
-                f = open(os.path.join(directory, item), "rb")
+                f = BinaryView(os.path.join(directory, item))
                 from_trmdl(directory, f, self.rare, self.loadlods)
                 f.close()
             return {"FINISHED"}
@@ -3895,7 +3846,7 @@ def from_trmdl(filep, trmdl, rare, loadlods):
             print(trskl_name)
 
             if os.path.exists(os.path.join(filep, trskl_name)):
-                trskl = open(os.path.join(filep, trskl_name), "rb")
+                trskl = BinaryView(os.path.join(filep, trskl_name))
             else:
                 print(f"Can't find {trskl_name}!")
 
@@ -3917,18 +3868,18 @@ def from_trmdl(filep, trmdl, rare, loadlods):
             print(trmtr_name)
             if x == 0:
                 if rare == True:
-                    trmtr = open(
-                        os.path.join(filep, Path(trmtr_name).stem + "_rare.trmtr"), "rb"
+                    trmtr = BinaryView(
+                        os.path.join(filep, Path(trmtr_name).stem + "_rare.trmtr")
                     )
                 else:
-                    trmtr = open(os.path.join(filep, trmtr_name), "rb")
+                    trmtr = BinaryView(os.path.join(filep, trmtr_name))
             fseek(trmdl, trmtr_ret)
     fclose(trmdl)
 
     # TODO create bone_rig_array
     # LINE 1247
     if chara_check == "Rei" or chara_check == "Akari":
-        trskl = trskl = open(os.path.join(filep, "p0_base.trskl"), "rb")
+        trskl = trskl = BinaryView(os.path.join(filep, "p0_base.trskl"))
 
     if trskl is not None:
         print("Parsing TRSKL...")
@@ -5861,7 +5812,7 @@ def from_trmdl(filep, trmdl, rare, loadlods):
     for w in range(trmsh_count):
         if os.path.exists(os.path.join(filep, trmsh_lods_array[w])):
             poly_group_array = []
-            trmsh = open(os.path.join(filep, trmsh_lods_array[w]), "rb")
+            trmsh = BinaryView(os.path.join(filep, trmsh_lods_array[w]))
             trmsh_file_start = readlong(trmsh)
             print("Parsing TRMSH...")
             fseek(trmsh, trmsh_file_start)
@@ -5886,7 +5837,7 @@ def from_trmdl(filep, trmdl, rare, loadlods):
 
                 trmbf = None
                 if os.path.exists(os.path.join(filep, trmbf_filename)):
-                    trmbf = open(os.path.join(filep, trmbf_filename), "rb")
+                    trmbf = BinaryView(os.path.join(filep, trmbf_filename))
                 else:
                     raise AssertionError(f"Can't find {trmbf_filename}!")
 
@@ -6926,11 +6877,13 @@ def from_trmdl(filep, trmdl, rare, loadlods):
                             if IN_BLENDER_ENV:
                                 # LINE 3257
 
-                                new_mesh = bpy.data.meshes.new(
-                                    f"{poly_group_name}_mesh"
+                                new_mesh = build_mesh(
+                                    f"{poly_group_name}_mesh",
+                                    vert_array,
+                                    face_array,
+                                    normal_array,
+                                    face_mat_id_array,
                                 )
-                                new_mesh.from_pydata(vert_array, [], face_array)
-                                new_mesh.update()
                                 new_object = bpy.data.objects.new(
                                     poly_group_name, new_mesh
                                 )
@@ -6973,100 +6926,163 @@ def from_trmdl(filep, trmdl, rare, loadlods):
 
                                                 group.add([vert_idx], weight, "REPLACE")
 
-                                color_layer = new_object.data.vertex_colors.new(
-                                    name="Color"
-                                )
-                                new_object.data.vertex_colors.active = color_layer
-                                # print(f"color_array: {len(color_array)}")
-                                # print(f"polygons: {len(new_object.data.polygons)}")
-                                for i, poly in enumerate(new_object.data.polygons):
-                                    # print(f"poly: {i}")
-                                    for v, vert in enumerate(poly.vertices):
-                                        loop_index = poly.loop_indices[v]
-
-                                        # print(f"loop_index: {loop_index}")
-                                        # print((color_array[vert][0], color_array[vert][1], color_array[vert][2], 1))
-
-                                        color_layer.data[loop_index].color = (
-                                            color_array[vert][0] / alpha_array[vert],
-                                            color_array[vert][1] / alpha_array[vert],
-                                            color_array[vert][2] / alpha_array[vert],
-                                            alpha_array[vert],
-                                        )
+                                # vertex colours
+                                if poly_group_array[x]["colors_fmt"] != "None":
+                                    set_vertex_colors(
+                                        new_mesh, color_array, alpha_array
+                                    )
 
                                 for mat in materials:
                                     new_object.data.materials.append(mat)
 
-                                # materials
-                                for i, poly in enumerate(new_object.data.polygons):
-                                    poly.material_index = face_mat_id_array[i]
-
                                 # uvs
-                                uv_layers = new_object.data.uv_layers
-                                uv_layer = uv_layers.new(name="UVMap")
-                                if len(uv2_array) > 0:
-                                    uv2_layer = uv_layers.new(name="UV2Map")
-                                if len(uv3_array) > 0:
-                                    uv3_layer = uv_layers.new(name="UV3Map")
-                                if len(uv4_array) > 0:
-                                    uv4_layer = uv_layers.new(name="UV4Map")
-                                uv_layers.active = uv_layer
-
-                                for face in new_object.data.polygons:
-                                    for vert_idx, loop_idx in zip(
-                                        face.vertices, face.loop_indices
-                                    ):
-                                        uv_layer.data[loop_idx].uv = uv_array[vert_idx]
-                                        if len(uv2_array) > 0:
-                                            uv2_layer.data[loop_idx].uv = uv2_array[
-                                                vert_idx
-                                            ]
-                                        if len(uv3_array) > 0:
-                                            uv3_layer.data[loop_idx].uv = uv3_array[
-                                                vert_idx
-                                            ]
-                                        if len(uv4_array) > 0:
-                                            uv4_layer.data[loop_idx].uv = uv4_array[
-                                                vert_idx
-                                            ]
-
-                                # normals
-                                if bpy.app.version < (4, 1, 0):
-                                    new_object.data.use_auto_smooth = True
-                                new_object.data.normals_split_custom_set_from_vertices(
-                                    normal_array
+                                set_uv_layers(
+                                    new_mesh,
+                                    (uv_array, uv2_array, uv3_array, uv4_array),
                                 )
+
                                 # add object to scene collection
                                 new_collection.objects.link(new_object)
 
 
 #### Utils ####
+class BinaryView:
+    """Reads a whole TR* file once and decodes fields straight from memory.
+
+    The *_at accessors take absolute offsets; the read* helpers below use the
+    cursor (seek/tell) so the ported maxscript logic can stay as it is.
+    """
+
+    u16 = struct.Struct("<H")
+    i32 = struct.Struct("<i")
+    f16 = struct.Struct("<e")
+    f32 = struct.Struct("<f")
+
+    def __init__(self, filepath):
+        self.name = filepath
+        with open(filepath, "rb") as file:
+            self.buffer = memoryview(file.read())
+        self.offset = 0
+
+    def u8_at(self, offset):
+        return self.buffer[offset]
+
+    def u16_at(self, offset):
+        return self.u16.unpack_from(self.buffer, offset)[0]
+
+    def i32_at(self, offset):
+        return self.i32.unpack_from(self.buffer, offset)[0]
+
+    def f16_at(self, offset):
+        return self.f16.unpack_from(self.buffer, offset)[0]
+
+    def f32_at(self, offset):
+        return self.f32.unpack_from(self.buffer, offset)[0]
+
+    def str_at(self, offset, length):
+        return str(self.buffer[offset : offset + length], "utf-8")
+
+    def seek(self, offset):
+        self.offset = offset
+
+    def tell(self):
+        return self.offset
+
+    def close(self):
+        self.buffer.release()
+
+
+def build_mesh(name, vert_array, face_array, normal_array, face_mat_id_array):
+    """Builds a smooth shaded triangle mesh straight from the decoded arrays."""
+    verts = np.asarray(vert_array, dtype=np.float32).reshape(-1, 3)
+    faces = np.asarray(face_array, dtype=np.int32).reshape(-1, 3)
+    face_count = len(faces)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, 3, dtype=np.int32))
+    mesh.polygons.foreach_set(
+        "material_index", np.asarray(face_mat_id_array, dtype=np.int32)
+    )
+    mesh.update(calc_edges=True)
+
+    if bpy.app.version < (4, 1, 0):
+        mesh.polygons.foreach_set("use_smooth", np.ones(face_count, dtype=bool))
+        mesh.use_auto_smooth = True
+    else:
+        mesh.shade_smooth()
+    mesh.normals_split_custom_set_from_vertices(
+        np.asarray(normal_array, dtype=np.float32).reshape(-1, 3)
+    )
+    return mesh
+
+
+# Names of the UV layers made for the mesh's UV sets, in order.
+UV_LAYER_NAMES = ("UVMap", "UV2Map", "UV3Map", "UV4Map")
+
+
+def set_uv_layers(mesh, uv_arrays):
+    """Writes the per-vertex UV sets to the face corners, one layer per set."""
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    for name, uvs in zip(UV_LAYER_NAMES, uv_arrays):
+        if len(uvs) > 0:
+            uv_layer = mesh.uv_layers.new(name=name)
+            uvs = np.asarray(uvs, dtype=np.float32)[loop_verts]
+            uv_layer.data.foreach_set("uv", uvs.ravel())
+    mesh.uv_layers.active_index = 0
+
+
+def set_vertex_colors(mesh, color_array, alpha_array):
+    """Adds the vertex colours, RGB divided by alpha, as a point color attribute."""
+    alpha = np.asarray(alpha_array, dtype=np.float32)
+    alpha = np.where(alpha == 0, 1, alpha)
+    colors = np.empty((len(alpha), 4), dtype=np.float32)
+    colors[:, :3] = np.asarray(color_array, dtype=np.float32) / alpha[:, None]
+    colors[:, 3] = alpha
+    color_layer = mesh.color_attributes.new("Color", "BYTE_COLOR", "POINT")
+    color_layer.data.foreach_set("color_srgb", np.clip(colors, 0, 1).ravel())
+    mesh.color_attributes.active_color = color_layer
+
+
 def readbyte(file):
-    return int.from_bytes(file.read(1), byteorder="little")
+    value = file.u8_at(file.offset)
+    file.offset += 1
+    return value
 
 
 def readshort(file):
-    return int.from_bytes(file.read(2), byteorder="little")
+    value = file.u16_at(file.offset)
+    file.offset += 2
+    return value
 
 
 def readlong(file):  # SIGNED!!!!
-    bytes_data = file.read(4)
-    # print(f"readlong: {bytes_data}")
-    return int.from_bytes(bytes_data, byteorder="little", signed=True)
+    value = file.i32_at(file.offset)
+    file.offset += 4
+    return value
 
 
 def readfloat(file):
-    return struct.unpack("<f", file.read(4))[0]
+    value = file.f32_at(file.offset)
+    file.offset += 4
+    return value
 
 
 def readhalffloat(file):
-    return struct.unpack("<e", file.read(2))[0]
+    value = file.f16_at(file.offset)
+    file.offset += 2
+    return value
 
 
 def readfixedstring(file, length):
-    bytes_data = file.read(length)
-    # print(f"readfixedstring ({length}): {bytes_data}")
-    return bytes_data.decode("utf-8")
+    value = file.str_at(file.offset, length)
+    file.offset += length
+    return value
 
 
 def fseek(file, offset):